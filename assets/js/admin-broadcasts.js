@@ -40,16 +40,51 @@ function addPadding(value, blockSize = 512) {
   return `${value}${padding})`;
 }
 
-function recipients() {
-  const script = document.getElementById("broadcastEncryptionRecipients");
-  if (!script?.textContent) {
-    return [];
+async function fetchAudiencePage(form, after) {
+  const url = new URL(form.dataset.audienceUrl, window.location.href);
+  url.searchParams.set("after", String(after));
+  if (form.dataset.audienceBroadcastId) {
+    url.searchParams.set("broadcast_id", form.dataset.audienceBroadcastId);
   }
-  try {
-    const parsed = JSON.parse(script.textContent);
-    return Array.isArray(parsed) ? parsed : [];
-  } catch {
-    return [];
+  const response = await fetch(url, {
+    credentials: "same-origin",
+    headers: {
+      Accept: "application/json",
+    },
+  });
+  const contentType = response.headers.get("content-type") || "";
+  if (response.redirected || !contentType.includes("application/json")) {
+    throw new Error(
+      "Broadcast session changed. Sign in again before continuing.",
+    );
+  }
+  const payload = await response.json();
+  if (!response.ok || !Array.isArray(payload.recipients)) {
+    throw new Error(
+      payload.error || "Broadcast recipients could not be loaded.",
+    );
+  }
+  return payload;
+}
+
+// Yields recipients page by page. The next page is requested as soon as a
+// page arrives, so it loads while the current one is encrypted and submitted.
+async function* audienceRecipients(form) {
+  let nextPage = fetchAudiencePage(form, 0);
+  while (nextPage) {
+    const page = await nextPage;
+    nextPage = Number.isInteger(page.next_after)
+      ? fetchAudiencePage(form, page.next_after)
+      : null;
+    for (const [userId, keys] of page.recipients) {
+      yield {
+        user_id: userId,
+        public_keys: keys.map(([fingerprint, armoredKey]) => ({
+          fingerprint,
+          armoredKey,
+        })),
+      };
+    }
   }
 }
 
@@ -103,24 +138,41 @@ function createBroadcastId() {
   ].join("-");
 }
 
+// Parsed keys by fingerprint, so a key shared by recipients is read once.
+const parsedKeys = new Map();
+
+function readRecipientKey({ fingerprint, armoredKey }) {
+  if (fingerprint && parsedKeys.has(fingerprint)) {
+    return parsedKeys.get(fingerprint);
+  }
+  const parsedKey = (async () => {
+    try {
+      const key = await openpgp.readKey({ armoredKey });
+      await key.verifyPrimaryKey();
+      await key.getEncryptionKey();
+      return key;
+    } catch (error) {
+      console.error("Skipping unusable recipient encryption key.", error);
+      return null;
+    }
+  })();
+  if (fingerprint) {
+    parsedKeys.set(fingerprint, parsedKey);
+  }
+  return parsedKey;
+}
+
 async function encryptMessage(publicKeys, message) {
-  const keys = Array.isArray(publicKeys) ? publicKeys : [publicKeys];
-  const parsedKeys = await Promise.all(
-    keys
-      .filter((key) => typeof key === "string" && key.trim())
-      .map(async (armoredKey) => {
-        try {
-          const key = await openpgp.readKey({ armoredKey });
-          await key.verifyPrimaryKey();
-          await key.getEncryptionKey();
-          return key;
-        } catch (error) {
-          console.error("Skipping unusable recipient encryption key.", error);
-          return null;
-        }
-      }),
-  );
-  const encryptionKeys = parsedKeys.filter(Boolean);
+  const encryptionKeys = (
+    await Promise.all(
+      publicKeys
+        .filter(
+          ({ armoredKey }) =>
+            typeof armoredKey === "string" && armoredKey.trim(),
+        )
+        .map(readRecipientKey),
+    )
+  ).filter(Boolean);
   if (encryptionKeys.length === 0) {
     throw new Error("Recipient encryption keys are missing.");
   }
@@ -323,9 +375,8 @@ document.addEventListener("DOMContentLoaded", function () {
     const failureTarget = form.querySelector(
       "input[name='encryption_failures']",
     );
-    const recipientEntries = recipients();
     const expectedUserIds = expectedRecipientIds();
-    if (!payloadTarget || !failureTarget || recipientEntries.length === 0) {
+    if (!payloadTarget || !failureTarget || expectedUserIds.length === 0) {
       alert("No users with PGP message keys match this audience.");
       return;
     }
@@ -355,22 +406,16 @@ document.addEventListener("DOMContentLoaded", function () {
         throw new Error("Message must be at least 10 characters.");
       }
 
-      let completedCount = 0;
+      const expectedUserIdSet = new Set(expectedUserIds);
+      const seenUserIds = new Set();
       const completedUserIds = [];
-      const totalBatches = Math.ceil(
-        recipientEntries.length / BROADCAST_BATCH_SIZE,
+      const totalBatches = Math.max(
+        1,
+        Math.ceil(expectedUserIds.length / BROADCAST_BATCH_SIZE),
       );
+      let batchNumber = 0;
 
-      updateStatus(status, "Sending broadcast: 1% complete...");
-      for (
-        let index = 0;
-        index < recipientEntries.length;
-        index += BROADCAST_BATCH_SIZE
-      ) {
-        const batch = recipientEntries.slice(
-          index,
-          index + BROADCAST_BATCH_SIZE,
-        );
+      const submitBatch = async (batch, isFinalChunk) => {
         const encryptedPayloads = {};
         const encryptionFailures = [];
 
@@ -391,6 +436,17 @@ document.addEventListener("DOMContentLoaded", function () {
           }),
         );
 
+        const batchUserIds = batch.map((recipient) => recipient.user_id);
+        if (isFinalChunk) {
+          // recipients that left the audience since the page loaded are skipped
+          for (const userId of expectedUserIds) {
+            if (!seenUserIds.has(userId)) {
+              encryptionFailures.push(userId);
+              batchUserIds.push(userId);
+            }
+          }
+        }
+
         if (
           Object.keys(encryptedPayloads).length === 0 &&
           encryptionFailures.length === 0
@@ -398,10 +454,8 @@ document.addEventListener("DOMContentLoaded", function () {
           throw new Error("No recipient messages could be encrypted.");
         }
 
-        completedUserIds.push(...batch.map((recipient) => recipient.user_id));
-        const isFinalChunk =
-          index + BROADCAST_BATCH_SIZE >= recipientEntries.length;
-        const batchNumber = Math.floor(index / BROADCAST_BATCH_SIZE) + 1;
+        completedUserIds.push(...batchUserIds);
+        batchNumber += 1;
         batchRequestStarted = true;
         const result = await submitBroadcastBatchWithRetry(
           form,
@@ -412,20 +466,39 @@ document.addEventListener("DOMContentLoaded", function () {
           isFinalChunk,
           status,
           batchNumber,
-          totalBatches,
+          Math.max(totalBatches, batchNumber),
         );
         ensureBroadcastIdInput(form, result.broadcast_id);
         submittedCount += Number(result.submitted_count || 0);
         skippedCount += Number(result.skipped_count || 0);
-        completedCount += batch.length;
         updateStatus(
           status,
           `Sending broadcast: ${progressPercent(
-            completedCount,
-            recipientEntries.length,
+            completedUserIds.length,
+            expectedUserIds.length,
           )}% complete...`,
         );
+      };
+
+      updateStatus(status, "Sending broadcast: 1% complete...");
+      // a full batch is only sent once another recipient follows it, so the
+      // final chunk is never empty
+      let pending = [];
+      for await (const recipient of audienceRecipients(form)) {
+        if (
+          !expectedUserIdSet.has(recipient.user_id) ||
+          seenUserIds.has(recipient.user_id)
+        ) {
+          continue;
+        }
+        seenUserIds.add(recipient.user_id);
+        pending.push(recipient);
+        if (pending.length > BROADCAST_BATCH_SIZE) {
+          await submitBatch(pending.slice(0, BROADCAST_BATCH_SIZE), false);
+          pending = pending.slice(BROADCAST_BATCH_SIZE);
+        }
       }
+      await submitBatch(pending, true);
 
       if (submittedCount === 0) {
         throw new Error("No recipient messages could be encrypted.");
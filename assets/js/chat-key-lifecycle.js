@@ -15,6 +15,9 @@
   let unlockedChatSigningPrivateKey = null;
   let pendingLoginPassword = null;
   let conversationSubmitInFlight = false;
+  let conversationRefreshTail = Promise.resolve(false);
+  let conversationRefreshQueued = null;
+  let conversationRefreshScroll = false;
   const state = {
     status: "empty",
     keyVersion: null,
@@ -1078,13 +1081,6 @@
     );
   }
 
-  function conversationMessagesSignature(sourceDocument = document) {
-    const copies =
-      sourceDocument.getElementById("conversationMessageCopies")?.textContent ||
-      "";
-    return `${conversationMessageIds(sourceDocument).join(",")}:${copies}`;
-  }
-
   function conversationMessageSenderIdFromPayload(encryptedPayload) {
     if (!encryptedPayload || typeof encryptedPayload !== "string") {
       return null;
@@ -1184,79 +1180,190 @@
     });
   }
 
-  async function refreshConversationMessages({
-    force = false,
-    scroll = false,
-  } = {}) {
+  function conversationMessageElement(message) {
     const root = document.getElementById("conversation-chat");
-    if (!root || state.status !== "unlocked") {
-      return false;
+    const article = document.createElement("article");
+    article.className = `conversation-message ${
+      message.is_own_message ? "is-own-message" : "is-other-message"
+    }`;
+    article.dataset.conversationMessageId = String(message.message_id);
+    article.setAttribute(
+      "aria-label",
+      message.is_own_message
+        ? "Your message"
+        : `Message from ${root?.dataset.conversationName || "Conversation"}`,
+    );
+
+    const time = document.createElement("time");
+    time.className = "meta";
+    time.setAttribute("data-conversation-message-time", "");
+    const body = document.createElement("p");
+    body.className = "conversation-message-body";
+    if (message.encrypted_payload) {
+      body.textContent = "Encrypted message. Waiting for browser chat key.";
+    } else {
+      body.classList.add("unavailable");
+      body.textContent = "This message was deleted.";
     }
+    article.append(time, body);
+    return article;
+  }
 
-    const thread = document.querySelector(".conversation-thread");
-    const currentCopies = document.getElementById("conversationMessageCopies");
-    if (!thread || !currentCopies) {
-      return false;
+  async function fetchConversationMessages(params) {
+    const root = document.getElementById("conversation-chat");
+    if (!root?.dataset.messagesUrl) {
+      return null;
     }
 
-    const response = await fetch(window.location.href, {
+    const url = new URL(root.dataset.messagesUrl, window.location.origin);
+    Object.entries(params).forEach(([name, value]) => {
+      url.searchParams.set(name, String(value));
+    });
+    const response = await fetch(url.toString(), {
       cache: "no-store",
       credentials: "same-origin",
-      headers: {
-        Accept: "text/html",
-        "X-Hushline-Conversation-Refresh": "true",
-      },
+      headers: { Accept: "application/json" },
     });
     if (!response.ok) {
-      return false;
+      return null;
     }
+    return response.json();
+  }
 
-    const nextDocument = new DOMParser().parseFromString(
-      await response.text(),
-      "text/html",
+  async function renderConversationMessages(messages) {
+    const fragment = document.createDocumentFragment();
+    messages.forEach((message) => {
+      fragment.append(conversationMessageElement(message));
+    });
+    const copies = messages.map((message) => ({
+      message_id: message.message_id,
+      encrypted_payload: message.encrypted_payload,
+    }));
+    if (state.status === "unlocked") {
+      await decryptConversationMessages(fragment, copies);
+    }
+    return { fragment, copies };
+  }
+
+  function storeConversationMessageCopies(copies, { prepend = false } = {}) {
+    const script = document.getElementById("conversationMessageCopies");
+    if (!script) {
+      return;
+    }
+    const currentCopies = jsonFromScript("conversationMessageCopies", []);
+    script.textContent = JSON.stringify(
+      prepend ? [...copies, ...currentCopies] : [...currentCopies, ...copies],
     );
-    const nextThread = nextDocument.querySelector(".conversation-thread");
-    const nextCopies = nextDocument.getElementById("conversationMessageCopies");
-    if (!nextThread || !nextCopies) {
+  }
+
+  async function appendNewConversationMessages({ scroll = false } = {}) {
+    const root = document.getElementById("conversation-chat");
+    if (!root || state.status !== "unlocked") {
       return false;
     }
 
-    if (
-      !force &&
-      conversationMessagesSignature(nextDocument) ===
-        conversationMessagesSignature()
-    ) {
+    const thread = document.querySelector(".conversation-thread");
+    if (!thread) {
       return false;
     }
 
-    await decryptConversationMessages(nextDocument);
-    const shouldScroll = scroll || conversationThreadIsNearBottom();
-    const previousScrollTop = thread.scrollTop;
-    currentCopies.textContent = nextCopies.textContent;
-    thread.replaceChildren(
-      ...Array.from(nextThread.children).map((child) => {
-        return document.importNode(child, true);
-      }),
-    );
-    thread.scrollTop = shouldScroll ? thread.scrollHeight : previousScrollTop;
-    return true;
+    // Only ask for messages past the newest one on the page; the server returns the viewer's
+    // copies in order, a page at a time.
+    const messageIds = conversationMessageIds();
+    let after = messageIds[messageIds.length - 1] || 0;
+    let appended = false;
+    let hasMore = true;
+    while (hasMore) {
+      const page = await fetchConversationMessages({ after });
+      if (!page || !Array.isArray(page.messages) || !page.messages.length) {
+        break;
+      }
+      after = page.messages[page.messages.length - 1].message_id;
+      hasMore = page.has_more === true;
+
+      const renderedIds = new Set(conversationMessageIds());
+      const messages = page.messages.filter(
+        (message) => !renderedIds.has(String(message.message_id)),
+      );
+      if (!messages.length) {
+        continue;
+      }
+
+      const { fragment, copies } = await renderConversationMessages(messages);
+      const shouldScroll = scroll || conversationThreadIsNearBottom();
+      const previousScrollTop = thread.scrollTop;
+      storeConversationMessageCopies(copies);
+      thread.append(fragment);
+      thread.scrollTop = shouldScroll ? thread.scrollHeight : previousScrollTop;
+      appended = true;
+    }
+    return appended;
+  }
+
+  // Every refresh (polling, live updates, after sending, after unlocking) runs through here one
+  // at a time. Callers that arrive while a refresh is running share the single one queued
+  // behind it, so it still sees anything saved after the running one fetched.
+  function refreshConversationMessages({ scroll = false } = {}) {
+    conversationRefreshScroll = conversationRefreshScroll || scroll;
+    if (!conversationRefreshQueued) {
+      conversationRefreshQueued = conversationRefreshTail
+        .catch(() => false)
+        .then(() => {
+          conversationRefreshQueued = null;
+          const shouldScroll = conversationRefreshScroll;
+          conversationRefreshScroll = false;
+          return appendNewConversationMessages({ scroll: shouldScroll });
+        });
+      conversationRefreshTail = conversationRefreshQueued;
+    }
+    return conversationRefreshQueued;
+  }
+
+  async function loadOlderConversationMessages() {
+    const thread = document.querySelector(".conversation-thread");
+    const button = document.getElementById("conversation-load-older");
+    const messageIds = conversationMessageIds();
+    if (!thread || !button || !messageIds.length) {
+      return;
+    }
+
+    button.disabled = true;
+    try {
+      const page = await fetchConversationMessages({ before: messageIds[0] });
+      if (!page || !Array.isArray(page.messages)) {
+        setConversationStatus("Earlier messages could not be loaded.");
+        return;
+      }
+
+      const { fragment, copies } = await renderConversationMessages(
+        page.messages,
+      );
+      // keep the oldest visible message where it is while history grows above it
+      const previousScrollHeight = thread.scrollHeight;
+      storeConversationMessageCopies(copies, { prepend: true });
+      button.after(fragment);
+      thread.scrollTop += thread.scrollHeight - previousScrollHeight;
+      button.hidden = page.has_more !== true;
+    } catch (error) {
+      setConversationStatus("Earlier messages could not be loaded.");
+    } finally {
+      button.disabled = false;
+    }
   }
 
-  async function decryptConversationMessages(sourceDocument = document) {
-    const copies = jsonFromScript(
-      "conversationMessageCopies",
-      [],
-      sourceDocument,
-    );
+  async function decryptConversationMessages(
+    container = document,
+    copies = jsonFromScript("conversationMessageCopies", []),
+  ) {
     for (const copy of copies) {
       if (!copy.encrypted_payload) {
         continue;
       }
 
-      const messageElement = sourceDocument.querySelector(
+      const messageElement = container.querySelector(
         `[data-conversation-message-id="${copy.message_id}"] .conversation-message-body`,
       );
-      const messageContainer = sourceDocument.querySelector(
+      const messageContainer = container.querySelector(
         `[data-conversation-message-id="${copy.message_id}"]`,
       );
       const messageTimeElement = messageContainer?.querySelector(
@@ -1386,7 +1493,7 @@
       }
       body.value = "";
       resizeConversationComposer();
-      await refreshConversationMessages({ force: true, scroll: true });
+      await refreshConversationMessages({ scroll: true });
       setConversationStatus("Reply sent.");
     } catch (error) {
       setConversationStatus("Reply could not be encrypted.");
@@ -1483,7 +1590,6 @@
     const intervalMs = Number.isFinite(configuredInterval)
       ? Math.max(conversationPollMinIntervalMs, configuredInterval)
       : 5000;
-    let isRefreshing = false;
     const refreshIfVisible = async () => {
       if (
         document.visibilityState !== "visible" ||
@@ -1491,20 +1597,48 @@
       ) {
         return;
       }
-      if (isRefreshing) {
-        return;
-      }
-      isRefreshing = true;
       try {
         await refreshConversationMessages();
       } catch (error) {
         return;
-      } finally {
-        isRefreshing = false;
       }
     };
 
-    window.setInterval(refreshIfVisible, intervalMs);
+    // Prefer pushed updates when the server offers them; keep polling as a fallback while the
+    // stream is unavailable or reconnecting.
+    let liveUpdatesConnected = false;
+    const liveUpdatesUrl = root.dataset.liveUpdatesUrl;
+    if (liveUpdatesUrl && "EventSource" in window) {
+      let hasConnected = false;
+      const liveUpdates = new EventSource(liveUpdatesUrl);
+      liveUpdates.addEventListener("open", () => {
+        liveUpdatesConnected = true;
+        if (hasConnected) {
+          void refreshIfVisible();
+        }
+        hasConnected = true;
+      });
+      liveUpdates.addEventListener("error", () => {
+        liveUpdatesConnected = false;
+      });
+      liveUpdates.addEventListener("conversation", (event) => {
+        let data = {};
+        try {
+          data = JSON.parse(event.data);
+        } catch (error) {
+          return;
+        }
+        if (data.conversation === root.dataset.conversationPublicId) {
+          void refreshIfVisible();
+        }
+      });
+    }
+
+    window.setInterval(() => {
+      if (!liveUpdatesConnected) {
+        void refreshIfVisible();
+      }
+    }, intervalMs);
     document.addEventListener("visibilitychange", refreshIfVisible);
     window.addEventListener("focus", refreshIfVisible);
   }
@@ -1527,7 +1661,7 @@
       }
       if (await restoreUnlockedChatKey(chatKey)) {
         await decryptConversationMessages();
-        await refreshConversationMessages({ force: true });
+        await refreshConversationMessages();
         setConversationComposeEnabled(root.dataset.canCompose === "true");
         setConversationUnlockVisible(false);
         setConversationSecureBadgeVisible(true);
@@ -1538,7 +1672,7 @@
       setConversationStatus("Checking for an unlocked chat session...");
       if (await restoreUnlockedChatKeyFromOtherTab(chatKey)) {
         await decryptConversationMessages();
-        await refreshConversationMessages({ force: true });
+        await refreshConversationMessages();
         setConversationComposeEnabled(root.dataset.canCompose === "true");
         setConversationUnlockVisible(false);
         setConversationSecureBadgeVisible(true);
@@ -1568,6 +1702,14 @@
     bindConversationPresence(root);
     bindConversationPolling(root);
 
+    const loadOlderButton = document.getElementById("conversation-load-older");
+    if (loadOlderButton && loadOlderButton.dataset.bound !== "true") {
+      loadOlderButton.dataset.bound = "true";
+      loadOlderButton.addEventListener("click", () => {
+        void loadOlderConversationMessages();
+      });
+    }
+
     const form = document.getElementById("conversation-compose-form");
     if (form && form.dataset.bound !== "true") {
       form.dataset.bound = "true";
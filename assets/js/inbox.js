@@ -74,7 +74,13 @@ document.addEventListener("DOMContentLoaded", function () {
     };
 
     const refreshInbox = async () => {
-      if (document.hidden) {
+      // replacing the list would drop a selection the user is building for a bulk action
+      if (
+        document.hidden ||
+        document.querySelector(
+          ".message-list input[name='message_ids']:checked",
+        )
+      ) {
         return;
       }
 
@@ -104,6 +110,38 @@ document.addEventListener("DOMContentLoaded", function () {
       }
     };
 
-    window.setInterval(refreshInbox, inboxPollIntervalMs);
+    // Prefer pushed updates when the server offers them; keep polling as a fallback while the
+    // stream is unavailable or reconnecting.
+    let liveUpdatesConnected = false;
+    const liveUpdatesUrl = inboxTabsNav.dataset.liveUpdatesUrl;
+    if (liveUpdatesUrl && "EventSource" in window) {
+      let hasConnected = false;
+      const liveUpdates = new EventSource(liveUpdatesUrl);
+      liveUpdates.addEventListener("open", () => {
+        liveUpdatesConnected = true;
+        if (hasConnected) {
+          // catch up on anything that happened while reconnecting
+          refreshInbox();
+        }
+        hasConnected = true;
+      });
+      liveUpdates.addEventListener("error", () => {
+        liveUpdatesConnected = false;
+      });
+      for (const eventName of ["inbox", "conversation"]) {
+        liveUpdates.addEventListener(eventName, refreshInbox);
+      }
+      document.addEventListener("visibilitychange", () => {
+        if (!document.hidden && liveUpdatesConnected) {
+          refreshInbox();
+        }
+      });
+    }
+
+    window.setInterval(() => {
+      if (!liveUpdatesConnected) {
+        refreshInbox();
+      }
+    }, inboxPollIntervalMs);
   }
 });
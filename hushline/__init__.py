@@ -10,10 +10,17 @@ from jinja2 import StrictUndefined
 from werkzeug.exceptions import HTTPException, InternalServerError
 from werkzeug.wrappers.response import Response
 
-from hushline import admin, premium, routes, settings, storage
+from hushline import admin, premium, routes, settings, storage, timing
 from hushline.auth import CHAT_KEY_SESSION_ID_SESSION_KEY, rotate_chat_key_session_id
+from hushline.brand_images import picture_sources
+from hushline.cli_broadcasts import register_broadcasts_commands
+from hushline.cli_data_exports import register_data_exports_commands
+from hushline.cli_deletions import register_deletions_commands
 from hushline.cli_encrypted_field import register_encrypted_field_commands
+from hushline.cli_maintenance import register_maintenance_commands
+from hushline.cli_notifications import register_notifications_commands
 from hushline.cli_password_hash import register_password_hash_commands
+from hushline.cli_profile_links import register_profile_links_commands
 from hushline.cli_reg import register_reg_commands
 from hushline.cli_stripe import register_stripe_commands
 from hushline.config import SPLASH_SCREEN_DURATION_MS, AliasMode, load_config
@@ -22,7 +29,7 @@ from hushline.external_urls import canonical_external_url
 from hushline.md import md_to_html
 from hushline.model import OrganizationSetting, User
 from hushline.secure_session import EncryptedSessionInterface
-from hushline.storage import public_store
+from hushline.storage import private_store, public_store
 from hushline.version import __version__
 
 PERMISSIONS_POLICY = ", ".join(
@@ -66,8 +73,17 @@ def create_app(config: Optional[Mapping[str, Any]] = None) -> Flask:
     db.init_app(app)
     migrate.init_app(app, db)
     public_store.init_app(app)
+    private_store.init_app(app)
+    if app.config.get("DATA_EXPORT_JOBS_ENABLED") and not private_store.is_configured(app):
+        # queued exports are stored privately, so without a store they could never be built
+        app.logger.error(
+            "DATA_EXPORT_JOBS_ENABLED requires BLOB_STORAGE_PRIVATE_DRIVER; "
+            "data exports will be built in the request instead"
+        )
+        app.config["DATA_EXPORT_JOBS_ENABLED"] = False
 
     routes.init_app(app)
+    timing.init_app(app)
     for module in [admin, settings, storage]:
         app.register_blueprint(module.create_blueprint())
 
@@ -172,8 +188,14 @@ def create_app(config: Optional[Mapping[str, Any]] = None) -> Flask:
     register_error_handlers(app)
 
     # Register custom CLI commands
+    register_broadcasts_commands(app)
+    register_data_exports_commands(app)
+    register_deletions_commands(app)
     register_encrypted_field_commands(app)
+    register_maintenance_commands(app)
+    register_notifications_commands(app)
     register_password_hash_commands(app)
+    register_profile_links_commands(app)
     register_reg_commands(app)
     register_stripe_commands(app)
 
@@ -325,30 +347,41 @@ def configure_jinja(app: Flask) -> None:
         return data
 
     @app.context_processor
-    def inject_logo() -> dict[str, bool | str | None]:
+    def inject_logo() -> dict[str, Any]:
+        settings = OrganizationSetting.fetch(
+            OrganizationSetting.BRAND_LOGO,
+            OrganizationSetting.BRAND_LOGO_VARIANTS,
+            OrganizationSetting.BRAND_SPLASH_LOGO,
+            OrganizationSetting.BRAND_SPLASH_LOGO_VARIANTS,
+        )
+
+        def public_url(path: str) -> str:
+            return url_for("storage.public", path=path)
+
+        # logos uploaded before variants were made have no `<source>`s, only the fallback
         brand_logo_url = None
-        if setting := OrganizationSetting.fetch_one(OrganizationSetting.BRAND_LOGO):
-            brand_logo_url = url_for("storage.public", path=setting)
+        brand_logo_sources: list[dict[str, str]] = []
+        if setting := settings[OrganizationSetting.BRAND_LOGO]:
+            brand_logo_url = public_url(setting)
+            brand_logo_sources = picture_sources(
+                settings[OrganizationSetting.BRAND_LOGO_VARIANTS], public_url
+            )
 
         splash_logo_url = None
-        if setting := OrganizationSetting.fetch_one(OrganizationSetting.BRAND_SPLASH_LOGO):
-            cache_buster = OrganizationSetting.fetch_one(
-                OrganizationSetting.BRAND_SPLASH_LOGO_CACHE_BUSTER
+        splash_logo_sources: list[dict[str, str]] = []
+        if setting := settings[OrganizationSetting.BRAND_SPLASH_LOGO]:
+            splash_logo_url = public_url(setting)
+            splash_logo_sources = picture_sources(
+                settings[OrganizationSetting.BRAND_SPLASH_LOGO_VARIANTS], public_url
             )
-            if cache_buster:
-                splash_logo_url = url_for(
-                    "storage.public",
-                    path=setting,
-                    v=cache_buster,
-                )
-            else:
-                splash_logo_url = url_for("storage.public", path=setting)
 
         skip_splash_seen_mark = bool(session.pop("skip_first_load_splash_seen_mark", False))
 
         return {
             "brand_logo_url": brand_logo_url,
+            "brand_logo_sources": brand_logo_sources,
             "splash_logo_url": splash_logo_url,
+            "splash_logo_sources": splash_logo_sources,
             "skip_splash_seen_mark": skip_splash_seen_mark,
         }
 
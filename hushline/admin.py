@@ -7,12 +7,16 @@ from hushline.auth import admin_authentication_required
 from hushline.db import db
 from hushline.model import AccountCategory, OrganizationSetting, Tier, User, Username
 from hushline.premium import update_price
+from hushline.storage import private_store
 from hushline.user_deletion import (
+    account_deletion_queue_enabled,
     delete_user_and_related,
     delete_username_and_related,
     has_deletion_blocking_stripe_invoice,
     has_deletion_blocking_stripe_invoice_event,
     has_deletion_blocking_stripe_subscription_event,
+    tombstone_user,
+    tombstone_username,
 )
 from hushline.utils import parse_bool
 
@@ -233,6 +237,7 @@ def create_blueprint() -> Blueprint:
             flash("⛔️ You cannot delete your own account from the admin panel.", "danger")
             return abort(400)
 
+        export_archives: list[str] = []
         with db.session.begin_nested():
             user = db.session.get(User, user_id)
             if user is None:
@@ -271,10 +276,16 @@ def create_blueprint() -> Blueprint:
                 )
                 return abort(400)
 
-            delete_user_and_related(user)
+            if account_deletion_queue_enabled():
+                tombstone_user(user)
+                message = "🔥 User account deleted. Its related information is being erased."
+            else:
+                export_archives = delete_user_and_related(user)
+                message = "🔥 User account and all related information have been deleted."
 
         db.session.commit()
-        flash("🔥 User account and all related information have been deleted.", "success")
+        private_store.discard(export_archives)
+        flash(message, "success")
         return redirect(url_for("settings.admin"))
 
     @bp.route("/delete_username/<int:username_id>", methods=["POST"])
@@ -289,9 +300,14 @@ def create_blueprint() -> Blueprint:
             flash("⛔️ You cannot delete a primary username here.", "danger")
             return abort(400)
 
-        delete_username_and_related(username)
+        if account_deletion_queue_enabled():
+            tombstone_username(username)
+            message = "🔥 Alias has been deleted. Its related data is being erased."
+        else:
+            delete_username_and_related(username)
+            message = "🔥 Alias and related data have been deleted."
         db.session.commit()
-        flash("🔥 Alias and related data have been deleted.", "success")
+        flash(message, "success")
         return redirect(url_for("settings.admin"))
 
     return bp
@@ -107,7 +107,7 @@ def get_session_user() -> User | None:
         return None
 
     user = db.session.get(User, user_id)
-    if user is None or not user.session_id:
+    if user is None or not user.session_id or user.deleted_at is not None:
         clear_auth_session()
         return None
 
@@ -0,0 +1,186 @@
+"""
+Uploaded brand logos are re-encoded before they are stored, since every page of the app shows
+them. Each upload is validated, stripped of its metadata, and downsized to the box the logo is
+drawn in, then stored as AVIF, WebP, and PNG variants at 1x and 2x pixel density. A PNG fallback
+is stored too, for browsers without `<picture>` support, the favicon, and the web manifest.
+"""
+
+import io
+from collections.abc import Collection
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Any, Callable, NamedTuple
+
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from hushline.storage import public_store
+
+# the CSS boxes the logos are drawn in (`.brand-logo` and `.first-load-splash-logo`), in CSS
+# pixels; a height of None leaves the height to the aspect ratio
+BRAND_LOGO_BOX = (80, 24)
+SPLASH_LOGO_BOX = (208, None)
+# the splash screen shows the brand logo when there is no splash logo, so the brand logo's
+# fallback is sized for the larger of the two boxes
+BRAND_LOGO_FALLBACK_BOX = SPLASH_LOGO_BOX
+
+# a variant is only made for a density that the upload has enough pixels to fill
+DENSITIES = (1, 2)
+# uploads are decoded and resized while the request waits; the largest variant is 416 pixels wide
+MAX_SOURCE_PIXELS = 2048 * 2048
+# the source is reduced once, to at least this many times the largest variant, before the
+# variants are resized from it
+_REDUCING_GAP = 2
+
+_AVIF_QUALITY = 60
+_WEBP_QUALITY = 85
+# in the order browsers should prefer them
+_FORMATS: tuple[tuple[str, str, str, dict[str, Any]], ...] = (
+    ("image/avif", "AVIF", ".avif", {"quality": _AVIF_QUALITY, "speed": 6}),
+    ("image/webp", "WEBP", ".webp", {"quality": _WEBP_QUALITY, "method": 6}),
+    ("image/png", "PNG", ".png", {"optimize": True}),
+)
+
+# encoding is the slow part of an upload. Pillow releases the GIL while it encodes, so the
+# variants of one upload are encoded in parallel, and concurrent uploads share the pool's threads
+# instead of each adding more.
+_ENCODER_THREADS = 4
+_executor = ThreadPoolExecutor(max_workers=_ENCODER_THREADS, thread_name_prefix="brand-image")
+
+
+class InvalidBrandImageError(ValueError):
+    pass
+
+
+class BrandImage(NamedTuple):
+    path: str
+    variants: list[dict[str, Any]]
+
+
+def _open(readable: IO[bytes]) -> Image.Image:
+    try:
+        readable.seek(0)
+        with Image.open(readable, formats=["PNG"]) as probe:
+            width, height = probe.size
+            if width * height > MAX_SOURCE_PIXELS:
+                raise InvalidBrandImageError(
+                    f"Images can be at most {MAX_SOURCE_PIXELS:,} pixels in total."
+                )
+            probe.verify()
+
+        # `verify` leaves the image unusable, so it has to be opened again
+        readable.seek(0)
+        with Image.open(readable, formats=["PNG"]) as upload:
+            upload.load()
+            oriented = ImageOps.exif_transpose(upload)
+            image = oriented.convert("RGBA" if oriented.has_transparency_data else "RGB")
+    except (OSError, SyntaxError, UnidentifiedImageError, Image.DecompressionBombError) as e:
+        raise InvalidBrandImageError("The file is not a valid PNG image.") from e
+
+    # copying only the pixels leaves behind text chunks, EXIF, ICC profiles, and timestamps, which
+    # `convert` would otherwise carry over and the encoders would write back out
+    return Image.frombytes(image.mode, image.size, image.tobytes())
+
+
+def _fit(size: tuple[int, int], box: tuple[int, int | None], density: int) -> tuple[int, int]:
+    width, height = size
+    box_width, box_height = box
+    scale = min(1.0, box_width * density / width)
+    if box_height is not None:
+        scale = min(scale, box_height * density / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _sizes(size: tuple[int, int], box: tuple[int, int | None]) -> dict[int, tuple[int, int]]:
+    base = _fit(size, box, 1)
+    return {
+        density: _fit(size, box, density)
+        for density in DENSITIES
+        if size[0] >= base[0] * density and size[1] >= base[1] * density
+    }
+
+
+def _formats() -> list[tuple[str, str, str, dict[str, Any]]]:
+    return [fmt for fmt in _FORMATS if fmt[1] != "AVIF" or features.check("avif")]
+
+
+def _reduce(image: Image.Image, largest: tuple[int, int]) -> Image.Image:
+    factor = min(
+        image.width // (largest[0] * _REDUCING_GAP), image.height // (largest[1] * _REDUCING_GAP)
+    )
+    return image.reduce(factor) if factor > 1 else image
+
+
+def _encode(
+    image: Image.Image, size: tuple[int, int], image_format: str, options: dict[str, Any]
+) -> io.BytesIO:
+    # each job resizes its own copy since `save` writes encoder state onto the image
+    resized = image.resize(size, Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    resized.save(buffer, image_format, **options)
+    buffer.seek(0)
+    return buffer
+
+
+def store_brand_image(
+    readable: IO[bytes],
+    stem: str,
+    box: tuple[int, int | None],
+    fallback_box: tuple[int, int | None] | None = None,
+    keep: Collection[str] = (),
+) -> BrandImage:
+    """
+    Store the variants of an uploaded logo under `stem` and return them with the path of the
+    fallback PNG, which fits `fallback_box` (by default `box`) at the highest density. Raises
+    `InvalidBrandImageError` if the upload is not a usable PNG. If storing fails partway, the
+    files already stored are deleted again, except for those in `keep`, the logo's current files.
+    """
+    image = _open(readable)
+    _, png_format, png_suffix, png_options = _FORMATS[-1]
+    fallback_size = _fit(image.size, fallback_box or box, max(DENSITIES))
+    sizes = _sizes(image.size, box)
+    image = _reduce(image, max([fallback_size, *sizes.values()]))
+    fallback_job = _executor.submit(_encode, image, fallback_size, png_format, png_options)
+    jobs = [
+        (density, mime, suffix, _executor.submit(_encode, image, size, image_format, options))
+        for mime, image_format, suffix, options in _formats()
+        for density, size in sizes.items()
+    ]
+
+    stored: list[str] = []
+    try:
+        variants = []
+        for density, mime, suffix, future in jobs:
+            stored.append(public_store.put_content_addressed(stem, future.result(), suffix))
+            variants.append({"path": stored[-1], "type": mime, "density": density})
+        # usually the same bytes, and so the same path, as the largest PNG variant
+        path = public_store.put_content_addressed(stem, fallback_job.result(), png_suffix)
+    except Exception:
+        for job in (fallback_job, *(future for _, _, _, future in jobs)):
+            job.cancel()
+        public_store.discard(set(stored).difference(keep))
+        raise
+    return BrandImage(path=path, variants=variants)
+
+
+def brand_image_paths(path: Any, variants: Any) -> set[str]:
+    """Every stored file of a logo, given the values of its two settings."""
+    paths = {path} if isinstance(path, str) else set()
+    if isinstance(variants, list):
+        paths.update(v["path"] for v in variants if isinstance(v, dict) and "path" in v)
+    return paths
+
+
+def picture_sources(variants: Any, url_for_path: Callable[[str], str]) -> list[dict[str, str]]:
+    """The `<source>` elements of a logo's `<picture>`, in the order browsers should try them."""
+    if not isinstance(variants, list):
+        return []
+
+    sources = []
+    for mime, _, _, _ in _FORMATS:
+        candidates = sorted(
+            (v for v in variants if isinstance(v, dict) and v.get("type") == mime),
+            key=lambda v: v["density"],
+        )
+        if candidates:
+            srcset = ", ".join(f"{url_for_path(v['path'])} {v['density']}x" for v in candidates)
+            sources.append({"type": mime, "srcset": srcset})
+    return sources
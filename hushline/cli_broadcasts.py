@@ -0,0 +1,43 @@
+import time
+
+import click
+from flask import Flask
+from flask.cli import AppGroup
+
+from hushline.settings.broadcast import (
+    BROADCAST_NOTIFICATION_QUEUE_ENABLED,
+    send_queued_broadcast_notifications,
+)
+
+
+def register_broadcasts_commands(app: Flask) -> None:
+    broadcasts_cli = AppGroup("broadcasts", help="Admin broadcast commands")
+
+    @broadcasts_cli.command("worker")
+    @click.option("--once", is_flag=True, help="Exit once no notification is queued.")
+    @click.option("--batch-size", default=100, show_default=True, type=click.IntRange(min=1))
+    @click.option(
+        "--poll-interval",
+        default=5.0,
+        show_default=True,
+        type=click.FloatRange(min=0.1),
+        help="Seconds to wait when no notification is queued.",
+    )
+    def worker(once: bool, batch_size: int, poll_interval: float) -> None:
+        """Send notification email for submitted broadcast messages"""
+        if not app.config.get(BROADCAST_NOTIFICATION_QUEUE_ENABLED):
+            app.logger.warning(
+                f"{BROADCAST_NOTIFICATION_QUEUE_ENABLED} is not set; only previously queued "
+                "notifications will be sent"
+            )
+
+        while True:
+            claimed = send_queued_broadcast_notifications(batch_size)
+            if claimed:
+                app.logger.info("Sent %s broadcast notification(s)", claimed)
+            if claimed < batch_size:
+                if once:
+                    return
+                time.sleep(poll_interval)
+
+    app.cli.add_command(broadcasts_cli)
@@ -0,0 +1,63 @@
+import time
+
+import click
+from flask import Flask
+from flask.cli import AppGroup
+
+from hushline.settings.data_export import (
+    DATA_EXPORT_JOBS_ENABLED,
+    purge_expired_data_exports,
+    run_data_export_jobs,
+)
+from hushline.storage import private_store
+
+
+def register_data_exports_commands(app: Flask) -> None:
+    data_exports_cli = AppGroup("data-exports", help="Data export commands")
+
+    @data_exports_cli.command("worker")
+    @click.option("--once", is_flag=True, help="Exit once no export is queued.")
+    @click.option("--batch-size", default=5, show_default=True, type=click.IntRange(min=1))
+    @click.option(
+        "--poll-interval",
+        default=5.0,
+        show_default=True,
+        type=click.FloatRange(min=0.1),
+        help="Seconds to wait when no export is queued.",
+    )
+    def worker(once: bool, batch_size: int, poll_interval: float) -> None:
+        """Build queued data exports and purge expired ones"""
+        if not private_store.is_configured(app):
+            raise click.ClickException(
+                "BLOB_STORAGE_PRIVATE_DRIVER is not set; exports cannot be stored"
+            )
+        if not app.config.get(DATA_EXPORT_JOBS_ENABLED):
+            app.logger.warning(
+                f"{DATA_EXPORT_JOBS_ENABLED} is not set; only previously queued exports will be "
+                "built"
+            )
+
+        while True:
+            purged = purge_expired_data_exports(batch_size)
+            if purged:
+                app.logger.info("Purged %s expired data export(s)", purged)
+            claimed = run_data_export_jobs(batch_size)
+            if claimed:
+                app.logger.info("Built %s data export(s)", claimed)
+            if claimed < batch_size:
+                if once:
+                    return
+                time.sleep(poll_interval)
+
+    @data_exports_cli.command("purge")
+    @click.option("--batch-size", default=100, show_default=True, type=click.IntRange(min=1))
+    def purge(batch_size: int) -> None:
+        """Delete expired data exports and their archives"""
+        purged = 0
+        while count := purge_expired_data_exports(batch_size):
+            purged += count
+            if count < batch_size:
+                break
+        click.echo(f"Purged {purged} data export(s)")
+
+    app.cli.add_command(data_exports_cli)
@@ -0,0 +1,73 @@
+import time
+
+import click
+from flask import Flask
+from flask.cli import AppGroup
+
+from hushline.db import db
+from hushline.model import DeletionJob
+from hushline.user_deletion import ACCOUNT_DELETION_QUEUE_ENABLED, run_deletion_batch
+
+
+def register_deletions_commands(app: Flask) -> None:
+    deletions_cli = AppGroup("deletions", help="Account deletion commands")
+
+    @deletions_cli.command("worker")
+    @click.option("--once", is_flag=True, help="Exit once no deletion is due.")
+    @click.option(
+        "--batch-size",
+        default=1000,
+        show_default=True,
+        type=click.IntRange(min=1),
+        help="Rows deleted per transaction.",
+    )
+    @click.option(
+        "--poll-interval",
+        default=5.0,
+        show_default=True,
+        type=click.FloatRange(min=0.1),
+        help="Seconds to wait when no deletion is due.",
+    )
+    def worker(once: bool, batch_size: int, poll_interval: float) -> None:
+        """Delete the data of tombstoned accounts and usernames in batches"""
+        if not app.config.get(ACCOUNT_DELETION_QUEUE_ENABLED):
+            app.logger.warning(
+                f"{ACCOUNT_DELETION_QUEUE_ENABLED} is not set; only previously queued deletions "
+                "will be processed"
+            )
+
+        while True:
+            if not run_deletion_batch(batch_size):
+                if once:
+                    return
+                time.sleep(poll_interval)
+
+    @deletions_cli.command("status")
+    def status() -> None:
+        """Show deletion jobs that are not done"""
+        jobs = db.session.scalars(
+            db.select(DeletionJob)
+            .where(DeletionJob.status != DeletionJob.STATUS_DONE)
+            .order_by(DeletionJob.id)
+        ).all()
+        if not jobs:
+            click.echo("No pending or failed deletions")
+        for job in jobs:
+            target = f"username {job.username_id}" if job.username_id else f"user {job.user_id}"
+            line = f"{job.id}\t{job.status}\t{target}\t{job.rows_deleted} rows deleted"
+            if job.last_error:
+                line += f"\t{job.last_error}"
+            click.echo(line)
+
+    @deletions_cli.command("retry")
+    @click.argument("job_id", type=int)
+    def retry(job_id: int) -> None:
+        """Queue a failed deletion job again"""
+        job = db.session.get(DeletionJob, job_id)
+        if job is None or job.status != DeletionJob.STATUS_FAILED:
+            raise click.ClickException(f"No failed deletion job {job_id}")
+        job.requeue()
+        db.session.commit()
+        click.echo(f"Requeued deletion job {job_id}")
+
+    app.cli.add_command(deletions_cli)
@@ -291,6 +291,7 @@ def _aad_values_for_row(contract: EncryptedFieldContract, row: Any) -> dict[str,
             and contract.table == "users"
             or aad_field == "notification_recipient_id"
             or aad_field == "field_value_id"
+            or aad_field == "email_outbox_id"
         ):
             value = row["id"]
         elif aad_field in row:
@@ -408,6 +409,7 @@ def _preflight_scan_columns(contract: EncryptedFieldContract, table: Any) -> lis
             and contract.table == "users"
             or aad_field == "notification_recipient_id"
             or aad_field == "field_value_id"
+            or aad_field == "email_outbox_id"
         ):
             continue
         if aad_field in table.c and aad_field not in selected:
@@ -0,0 +1,109 @@
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+import click
+from flask import Flask, current_app
+from flask.cli import AppGroup
+
+from hushline.db import db, delete_batch
+from hushline.model import (
+    AuthenticationLog,
+    EmailOutbox,
+    InitialConversationNonce,
+    PasswordResetToken,
+)
+from hushline.ratelimit import rate_limiter
+
+_AUTHENTICATION_LOG_RETENTION_DAYS = 30
+_INITIAL_CONVERSATION_NONCE_RETENTION_DAYS = 7
+_EMAIL_OUTBOX_RETENTION_DAYS = 7
+
+
+def _retention(name: str, default: int) -> timedelta:
+    value = current_app.config.get(name, default)
+    try:
+        return timedelta(days=max(1, int(value)))
+    except (TypeError, ValueError):
+        return timedelta(days=default)
+
+
+def _prune_batches() -> dict[str, Callable[[int], int]]:
+    """One function per table that deletes a batch of expired rows and returns the row count."""
+    # these tables store naive local timestamps
+    local_now = datetime.now()
+    now = datetime.now(UTC)
+    authentication_log_cutoff = local_now - _retention(
+        "AUTHENTICATION_LOG_RETENTION_DAYS", _AUTHENTICATION_LOG_RETENTION_DAYS
+    )
+    # a replayed submission also needs a CSRF token and CAPTCHA that expire long before this
+    nonce_cutoff = now - _retention(
+        "INITIAL_CONVERSATION_NONCE_RETENTION_DAYS", _INITIAL_CONVERSATION_NONCE_RETENTION_DAYS
+    )
+    email_outbox_cutoff = now - _retention(
+        "EMAIL_OUTBOX_RETENTION_DAYS", _EMAIL_OUTBOX_RETENTION_DAYS
+    )
+
+    return {
+        "rate_limit_buckets": lambda batch_size: rate_limiter().prune(batch_size=batch_size),
+        "password_reset_tokens": lambda batch_size: delete_batch(
+            PasswordResetToken, PasswordResetToken.expires_at < local_now, batch_size
+        ),
+        "initial_conversation_nonces": lambda batch_size: delete_batch(
+            InitialConversationNonce,
+            InitialConversationNonce.created_at < nonce_cutoff,
+            batch_size,
+        ),
+        "authentication_logs": lambda batch_size: delete_batch(
+            AuthenticationLog, AuthenticationLog.timestamp < authentication_log_cutoff, batch_size
+        ),
+        "email_outbox": lambda batch_size: delete_batch(
+            EmailOutbox,
+            db.and_(
+                EmailOutbox.status != EmailOutbox.STATUS_PENDING,
+                EmailOutbox.created_at < email_outbox_cutoff,
+            ),
+            batch_size,
+        ),
+    }
+
+
+def prune_expired_rows(*, batch_size: int, max_seconds: float) -> dict[str, int]:
+    """
+    Delete expired rows table by table, one committed batch at a time, and return how many rows
+    were deleted from each table. Stops early once `max_seconds` have passed, so a backlog is
+    worked off over several scheduled runs rather than in one long transaction.
+    """
+    deadline = time.monotonic() + max_seconds
+    deleted: dict[str, int] = {}
+    for name, prune_batch in _prune_batches().items():
+        deleted[name] = 0
+        while time.monotonic() < deadline:
+            count = prune_batch(batch_size)
+            db.session.commit()
+            deleted[name] += count
+            if count < batch_size:
+                break
+    return deleted
+
+
+def register_maintenance_commands(app: Flask) -> None:
+    maintenance_cli = AppGroup("maintenance", help="Database maintenance commands")
+
+    @maintenance_cli.command("prune")
+    @click.option("--batch-size", default=1000, show_default=True, type=click.IntRange(min=1))
+    @click.option(
+        "--max-seconds",
+        default=60.0,
+        show_default=True,
+        type=click.FloatRange(min=0),
+        help="Stop starting new batches after this many seconds.",
+    )
+    def prune(batch_size: int, max_seconds: float) -> None:
+        """Delete expired rate limit, password reset, nonce, log and outbox rows"""
+        deleted = prune_expired_rows(batch_size=batch_size, max_seconds=max_seconds)
+        for name, count in deleted.items():
+            click.echo(f"{name}: {count}")
+        app.logger.info("Pruned expired rows", extra={"deleted": deleted})
+
+    app.cli.add_command(maintenance_cli)
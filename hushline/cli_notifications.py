@@ -0,0 +1,115 @@
+import smtplib
+import time
+from datetime import timedelta
+
+import click
+from cryptography.fernet import InvalidToken
+from flask import Flask, current_app
+from flask.cli import AppGroup
+
+from hushline.db import db
+from hushline.email import send_email
+from hushline.model import EmailOutbox, User
+from hushline.routes.common import notification_smtp_config
+
+_EMAIL_OUTBOX_MAX_ATTEMPTS = 6
+_EMAIL_OUTBOX_RETRY_BASE_SECONDS = 30
+_EMAIL_OUTBOX_RETRY_MAX_SECONDS = 3600
+
+
+def _email_outbox_config(name: str, default: int) -> int:
+    value = current_app.config.get(name, default)
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def email_outbox_retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff after the given number of failed attempts, capped."""
+    base = _email_outbox_config("EMAIL_OUTBOX_RETRY_BASE_SECONDS", _EMAIL_OUTBOX_RETRY_BASE_SECONDS)
+    cap = _email_outbox_config("EMAIL_OUTBOX_RETRY_MAX_SECONDS", _EMAIL_OUTBOX_RETRY_MAX_SECONDS)
+    return timedelta(seconds=min(cap, base * 2 ** max(0, attempts - 1)))
+
+
+def _deliver(row: EmailOutbox) -> None:
+    max_attempts = _email_outbox_config("EMAIL_OUTBOX_MAX_ATTEMPTS", _EMAIL_OUTBOX_MAX_ATTEMPTS)
+    user = db.session.get(User, row.user_id)
+    try:
+        body = row.body
+    except InvalidToken:
+        current_app.logger.error("Queued email %s could not be decrypted", row.id)
+        row.mark_failed("Body could not be decrypted")
+        return
+    try:
+        smtp_config = notification_smtp_config(user) if user is not None else None
+        if smtp_config is None:
+            row.mark_failed("SMTP is not configured")
+            return
+        # retries are scheduled through the outbox, so never sleep inside the worker
+        if send_email(row.to_email, row.subject, body or "", smtp_config, row.reply_to, attempts=1):
+            row.mark_sent()
+            return
+        error = "SMTP delivery failed"
+    except (KeyError, OSError, TypeError, ValueError, smtplib.SMTPException) as e:
+        current_app.logger.error("Error sending queued email %s: %s", row.id, str(e), exc_info=True)
+        error = str(e) or type(e).__name__
+
+    if row.attempts + 1 >= max_attempts:
+        current_app.logger.error(
+            "Giving up on queued email %s after %s attempts", row.id, row.attempts + 1
+        )
+        row.mark_failed(error)
+    else:
+        row.mark_retry(error, delay=email_outbox_retry_delay(row.attempts + 1))
+
+
+def deliver_email_outbox(batch_size: int) -> int:
+    """
+    Deliver up to `batch_size` due outbox rows and return how many were attempted.
+
+    Each row is claimed, sent and updated in its own transaction, so a crashed worker leaves at
+    most one row whose outcome is unknown and releases every other claim immediately.
+    """
+    attempted = 0
+    while attempted < batch_size:
+        row = EmailOutbox.claim_next()
+        if row is None:
+            db.session.rollback()
+            break
+        _deliver(row)
+        db.session.commit()
+        attempted += 1
+    return attempted
+
+
+def register_notifications_commands(app: Flask) -> None:
+    notifications_cli = AppGroup("notifications", help="Notification email commands")
+
+    @notifications_cli.command("worker")
+    @click.option("--once", is_flag=True, help="Exit once no queued email is due.")
+    @click.option("--batch-size", default=100, show_default=True, type=click.IntRange(min=1))
+    @click.option(
+        "--poll-interval",
+        default=5.0,
+        show_default=True,
+        type=click.FloatRange(min=0.1),
+        help="Seconds to wait when no queued email is due.",
+    )
+    def worker(once: bool, batch_size: int, poll_interval: float) -> None:
+        """Deliver queued notification email"""
+        if not app.config.get("EMAIL_OUTBOX_ENABLED"):
+            app.logger.warning(
+                "EMAIL_OUTBOX_ENABLED is not set; only previously queued email will be delivered"
+            )
+
+        while True:
+            attempted = deliver_email_outbox(batch_size)
+            if attempted:
+                app.logger.info("Attempted delivery of %s queued email(s)", attempted)
+            if attempted < batch_size:
+                if once:
+                    return
+                time.sleep(poll_interval)
+
+    app.cli.add_command(notifications_cli)
@@ -0,0 +1,132 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import click
+from flask import Flask
+from flask.cli import AppGroup
+
+from hushline.db import db
+from hushline.external_urls import canonical_external_url
+from hushline.model import ProfileLinkVerification, Username
+from hushline.settings.common import (
+    PROFILE_LINK_VERIFICATION_QUEUE_ENABLED,
+    is_verifiable_profile_link,
+    verify_profile_links,
+)
+
+# long enough for a full batch at the per-request timeout, after which a crashed worker's claims
+# are picked up again
+_PROFILE_LINK_CLAIM_LEASE = timedelta(minutes=5)
+
+
+def run_profile_link_verifications(batch_size: int, concurrency: int) -> int:
+    """
+    Verify up to `batch_size` queued links and return how many were claimed.
+
+    Claims are committed before any page is fetched, and results are applied in a second short
+    transaction, skipping links that were changed or re-queued while they were being checked.
+    """
+    jobs = ProfileLinkVerification.claim_batch(batch_size, lease=_PROFILE_LINK_CLAIM_LEASE)
+    for job in jobs:
+        db.session.expunge(job)
+    db.session.commit()
+    if not jobs:
+        return 0
+
+    results = asyncio.run(
+        verify_profile_links({(job.url, job.profile_url) for job in jobs}, concurrency=concurrency)
+    )
+    for job in jobs:
+        if not job.lock_if_unchanged():
+            continue
+        username = db.session.get(Username, job.username_id)
+        value = getattr(username, f"extra_field_value{job.field_index}", None)
+        if username is not None and value == job.url:
+            setattr(
+                username,
+                f"extra_field_verified{job.field_index}",
+                results.get((job.url, job.profile_url), False),
+            )
+        db.session.execute(
+            db.delete(ProfileLinkVerification).where(ProfileLinkVerification.id == job.id)
+        )
+    db.session.commit()
+    return len(jobs)
+
+
+def queue_profile_link_reverification(batch_size: int) -> int:
+    """Queue every verifiable extra field link and return how many were queued."""
+    queued = 0
+    usernames = db.session.scalars(
+        db.select(Username)
+        .where(
+            db.or_(*(getattr(Username, f"extra_field_value{i}").is_not(None) for i in range(1, 5)))
+        )
+        .order_by(Username.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for username in usernames:
+        links = {
+            i: value
+            for i in range(1, 5)
+            if is_verifiable_profile_link(value := getattr(username, f"extra_field_value{i}"))
+        }
+        if not links:
+            continue
+        profile_url = canonical_external_url("profile", username=username._username)
+        for i, url in links.items():
+            ProfileLinkVerification.enqueue(username.id, i, url, profile_url)
+        queued += len(links)
+    db.session.commit()
+    return queued
+
+
+def register_profile_links_commands(app: Flask) -> None:
+    profile_links_cli = AppGroup("profile-links", help="Profile link verification commands")
+
+    @profile_links_cli.command("worker")
+    @click.option("--once", is_flag=True, help="Exit once no queued link is left.")
+    @click.option("--batch-size", default=50, show_default=True, type=click.IntRange(min=1))
+    @click.option(
+        "--concurrency",
+        default=8,
+        show_default=True,
+        type=click.IntRange(min=1),
+        help="Most pages fetched at once.",
+    )
+    @click.option(
+        "--poll-interval",
+        default=5.0,
+        show_default=True,
+        type=click.FloatRange(min=0.1),
+        help="Seconds to wait when no link is queued.",
+    )
+    def worker(once: bool, batch_size: int, concurrency: int, poll_interval: float) -> None:
+        """Verify queued profile links"""
+        if not app.config.get(PROFILE_LINK_VERIFICATION_QUEUE_ENABLED):
+            app.logger.warning(
+                f"{PROFILE_LINK_VERIFICATION_QUEUE_ENABLED} is not set; only links queued by "
+                "`flask profile-links reverify` will be verified"
+            )
+
+        while True:
+            claimed = run_profile_link_verifications(batch_size, concurrency)
+            if claimed:
+                app.logger.info("Verified %s queued profile link(s)", claimed)
+            if claimed < batch_size:
+                if once:
+                    return
+                time.sleep(poll_interval)
+
+    @profile_links_cli.command("reverify")
+    @click.option("--batch-size", default=500, show_default=True, type=click.IntRange(min=1))
+    def reverify(batch_size: int) -> None:
+        """Queue every profile link for verification by the worker"""
+        # url_for needs a request when SERVER_NAME is unset; PUBLIC_BASE_URL still supplies the
+        # host of the generated profile URLs
+        with app.test_request_context():
+            queued = queue_profile_link_reverification(batch_size)
+        click.echo(f"Queued {queued} profile link(s)")
+
+    app.cli.add_command(profile_links_cli)
@@ -53,6 +53,19 @@ class FieldsMode(Enum):
         raise ConfigParseError(f"Not a valid value for {cls.__name__}: {string!r}")
 
 
+@unique
+class RateLimitBackendKind(Enum):
+    MEMORY = "memory"
+    POSTGRES = "postgres"
+
+    @classmethod
+    def parse(cls, string: str) -> Self:
+        for var in cls:
+            if var.value == string:
+                return var
+        raise ConfigParseError(f"Not a valid value for {cls.__name__}: {string!r}")
+
+
 @unique
 class EncryptedFieldWriteFormat(Enum):
     LEGACY_FERNET = "legacy-fernet"
@@ -187,13 +200,20 @@ def _load_hushline_misc(env: Mapping[str, str]) -> Mapping[str, Any]:
         data[SPLASH_SCREEN_DURATION_MS] = 2000
 
     bool_configs = [
+        ("ACCOUNT_DELETION_QUEUE_ENABLED", False),
+        ("BROADCAST_NOTIFICATION_QUEUE_ENABLED", False),
+        ("DATA_EXPORT_JOBS_ENABLED", False),
         ("DIRECTORY_VERIFIED_TAB_ENABLED", True),
+        ("EMAIL_OUTBOX_ENABLED", False),
         (ENCRYPTED_FIELD_AES_GCM_WRITES_ENABLED, False),
         (ENCRYPTED_FIELD_LEGACY_READS_ENABLED, True),
         ("FILE_UPLOADS_ENABLED", False),
+        ("LIVE_UPDATES_ENABLED", False),
         (PASSWORD_HASH_REHASH_ON_AUTH_ENABLED, False),
         (PASSWORD_HASH_WRITE_USE_WERKZEUG_SCRYPT, False),
+        ("PROFILE_LINK_VERIFICATION_QUEUE_ENABLED", False),
         ("REGISTRATION_SETTINGS_ENABLED", True),
+        ("REQUEST_TIMING_ENABLED", False),
         ("USER_VERIFICATION_ENABLED", False),
     ]
     for key, default in bool_configs:
@@ -212,6 +232,11 @@ def _load_hushline_misc(env: Mapping[str, str]) -> Mapping[str, Any]:
     else:
         data["FIELDS_MODE"] = FieldsMode.ALWAYS
 
+    if rate_limit_backend := env.get("RATE_LIMIT_BACKEND"):
+        data["RATE_LIMIT_BACKEND"] = RateLimitBackendKind.parse(rate_limit_backend)
+    else:
+        data["RATE_LIMIT_BACKEND"] = RateLimitBackendKind.POSTGRES
+
     if encrypted_field_write_format := env.get(ENCRYPTED_FIELD_WRITE_FORMAT):
         data[ENCRYPTED_FIELD_WRITE_FORMAT] = EncryptedFieldWriteFormat.parse(
             encrypted_field_write_format
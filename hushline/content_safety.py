@@ -1,11 +1,14 @@
 import logging
 import os
 import re
+from collections.abc import Iterable, Mapping
 from functools import lru_cache
 from typing import Protocol
 
 try:
     from better_profanity import profanity
+    from better_profanity.constants import ALLOWED_CHARACTERS
+    from better_profanity.utils import get_complete_path_of_file, read_wordlist
 except ModuleNotFoundError:  # pragma: no cover
     profanity = None
 
@@ -17,16 +20,125 @@ class _ProfanityEngine(Protocol):
     def contains_profanity(self, text: str) -> bool: ...
 
 
-def _allowlist() -> set[str]:
-    value = os.getenv(_ALLOWLIST_ENV_VAR, "")
-    return {item.strip().casefold() for item in value.split(",") if item.strip()}
+class CensorMatcher:
+    """
+    Matches text against a censor word list with the same rules as better-profanity, built once.
+
+    Words are runs of `word_chars`. A censor word matches a word, or a run of up to as many
+    following words as the longest multi-word entry needs, joined either directly or with the
+    separators between them. Each censor character also matches its leetspeak substitutes from
+    `char_map`, so "a$$" matches "ass".
+
+    The censor list is compiled into an automaton over censor characters. Since matches must
+    start and end on word boundaries, it is only entered at the start of each word, and because a
+    substitute such as "*" or "1" can stand for several letters it is run as a set of states.
+    Each word is scanned once per start instead of being compared against every censor word.
+    """
+
+    def __init__(
+        self,
+        words: Iterable[str],
+        *,
+        char_map: Mapping[str, Iterable[str]],
+        word_chars: Iterable[str],
+    ) -> None:
+        self._transitions: list[dict[str, int]] = [{}]
+        self._accepting: set[int] = set()
+        self._word_chars = frozenset(word_chars)
+        # how many words after the first a censor word can span
+        self._max_extra_words = 1
+        for word in words:
+            censor_word = word.lower()
+            self._add(censor_word)
+            self._max_extra_words = max(
+                self._max_extra_words,
+                sum(1 for char in censor_word if char not in self._word_chars),
+            )
+
+        # text character -> censor characters it can stand for
+        substitutes: dict[str, set[str]] = {}
+        for censor_char, variants in char_map.items():
+            for variant in variants:
+                substitutes.setdefault(variant, set()).add(censor_char)
+        self._stands_for = {
+            char: tuple(censor_chars | ({char} if char not in char_map else set()))
+            for char, censor_chars in substitutes.items()
+        }
+
+    def _add(self, word: str) -> None:
+        state = 0
+        for char in word:
+            next_state = self._transitions[state].get(char)
+            if next_state is None:
+                next_state = len(self._transitions)
+                self._transitions.append({})
+                self._transitions[state][char] = next_state
+            state = next_state
+        self._accepting.add(state)
+
+    def _advance(self, states: set[int], text: str) -> set[int]:
+        transitions = self._transitions
+        for char in text:
+            if not states:
+                break
+            censor_chars = self._stands_for.get(char, (char,))
+            states = {
+                next_state
+                for state in states
+                for censor_char in censor_chars
+                if (next_state := transitions[state].get(censor_char)) is not None
+            }
+        return states
+
+    def _words(self, text: str) -> list[tuple[int, int]]:
+        words = []
+        start = None
+        for index, char in enumerate(text):
+            if char in self._word_chars:
+                if start is None:
+                    start = index
+            elif start is not None:
+                words.append((start, index))
+                start = None
+        if start is not None:
+            words.append((start, len(text)))
+        return words
+
+    def contains_profanity(self, text: str) -> bool:
+        text = text.lower()
+        words = self._words(text)
+        accepting = self._accepting
+        for first, (start, end) in enumerate(words):
+            joined = self._advance({0}, text[start:end])
+            if joined & accepting:
+                return True
+            separated = joined
+            last = min(len(words) - 1, first + self._max_extra_words)
+            for index in range(first + 1, last + 1):
+                if not joined and not separated:
+                    break
+                word_start, word_end = words[index]
+                word = text[word_start:word_end]
+                separator = text[words[index - 1][1] : word_start]
+                joined = self._advance(joined, word)
+                separated = self._advance(self._advance(separated, separator), word)
+                if (joined | separated) & accepting:
+                    return True
+        return False
+
 
+@lru_cache(maxsize=8)
+def _allowlist_pattern(value: str) -> re.Pattern[str] | None:
+    terms = {item.strip().casefold() for item in value.split(",") if item.strip()}
+    if not terms:
+        return None
+    # longest first, so a term is not cut short by another term it starts with
+    alternatives = "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+    return re.compile(rf"\b(?:{alternatives})\b", flags=re.IGNORECASE)
 
-def _strip_allowlisted_terms(text: str, allowlist: set[str]) -> str:
-    sanitized = text
-    for term in sorted(allowlist, key=len, reverse=True):
-        sanitized = re.sub(rf"\b{re.escape(term)}\b", " ", sanitized, flags=re.IGNORECASE)
-    return sanitized
+
+def _strip_allowlisted_terms(text: str, pattern: re.Pattern[str]) -> str:
+    return pattern.sub(" ", text)
 
 
 @lru_cache(maxsize=1)
@@ -41,9 +153,12 @@ def _profanity_engine() -> _ProfanityEngine | None:
     if profanity is None:
         _log_missing_library_once()
         return None
-    # Load the package-provided local wordlist once.
-    profanity.load_censor_words()
-    return profanity
+    # Compile the package-provided local wordlist once.
+    return CensorMatcher(
+        read_wordlist(get_complete_path_of_file("profanity_wordlist.txt")),
+        char_map=profanity.CHARS_MAPPING,
+        word_chars=ALLOWED_CHARACTERS,
+    )
 
 
 def contains_disallowed_text(text: str | None) -> bool:
@@ -51,8 +166,8 @@ def contains_disallowed_text(text: str | None) -> bool:
         return False
 
     candidate = text.casefold()
-    allowlist = _allowlist()
-    if allowlist:
+    allowlist = _allowlist_pattern(os.getenv(_ALLOWLIST_ENV_VAR, ""))
+    if allowlist is not None:
         candidate = _strip_allowlisted_terms(candidate, allowlist)
 
     engine = _profanity_engine()
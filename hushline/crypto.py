@@ -170,6 +170,13 @@ ENCRYPTED_FIELD_CONTRACTS = (
         column="_value",
         aad_fields=("field_definition_id", "field_value_id", "message_id"),
     ),
+    EncryptedFieldContract(
+        id="EmailOutbox.body",
+        domain="hushline.encrypted-field.email_outbox.body",
+        table="email_outbox",
+        column="body",
+        aad_fields=("email_outbox_id", "user_id"),
+    ),
 )
 ENCRYPTED_FIELD_CONTRACT_BY_ID = {contract.id: contract for contract in ENCRYPTED_FIELD_CONTRACTS}
 
@@ -698,6 +705,14 @@ def is_valid_pgp_key(key: str) -> bool:
         return False
 
 
+def pgp_key_fingerprint(key: str) -> str | None:
+    """The uppercase hex fingerprint of an armored public key, or None if it cannot be parsed."""
+    try:
+        return Cert.from_bytes(key.encode()).fingerprint.upper()
+    except (RuntimeError, TypeError, ValueError):
+        return None
+
+
 def can_encrypt_with_pgp_key(key: str) -> bool:
     """
     Validate that we can encrypt a message with the provided public key.
@@ -1,6 +1,8 @@
+from typing import Any
+
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import MetaData
+from sqlalchemy import ColumnElement, MetaData
 
 metadata = MetaData(
     naming_convention={
@@ -14,3 +16,12 @@ metadata = MetaData(
 
 db = SQLAlchemy(metadata=metadata)
 migrate = Migrate()
+
+
+def delete_batch(model: Any, condition: ColumnElement[bool], batch_size: int) -> int:
+    """Delete up to `batch_size` rows matching `condition`, skipping rows locked by requests."""
+    batch = db.select(model.id).where(condition).limit(batch_size).with_for_update(skip_locked=True)
+    result = db.session.execute(
+        db.delete(model).where(condition, model.id.in_(batch.scalar_subquery()))
+    )
+    return result.rowcount or 0  # type: ignore[attr-defined]
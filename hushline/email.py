@@ -1,12 +1,14 @@
+import hashlib
 import ipaddress
 import smtplib
 import socket
 import ssl
+import threading
 import time
-from contextlib import contextmanager
-from dataclasses import dataclass
+from contextlib import ExitStack, contextmanager, suppress
+from dataclasses import dataclass, field
 from email.mime.text import MIMEText
-from typing import Generator
+from typing import Final, Generator
 
 from flask import current_app
 
@@ -20,6 +22,8 @@ class SMTPConfig:
     port: int
     password: str
     sender: str
+    # validated addresses for `server`; when set, connections go only to these
+    addresses: tuple[str, ...] = field(default=(), compare=False, repr=False)
 
     def validate(self) -> bool:
         return all([self.username, self.server, self.port, self.password, self.sender])
@@ -41,19 +45,58 @@ def create_smtp_config(  # noqa PLR0913
             raise ValueError(f"Invalid SMTP encryption protocol: {encryption.value}")
 
 
+class _PinnedSMTP(smtplib.SMTP):
+    """
+    SMTP client that only connects to already validated addresses. The hostname is still used for
+    EHLO and TLS certificate checks, so a DNS change between validation and connecting cannot
+    redirect the session.
+    """
+
+    def __init__(self, host: str, port: int, *, timeout: float, addresses: tuple[str, ...]) -> None:
+        self._pinned_addresses = addresses
+        super().__init__(host, port, timeout=timeout)
+
+    def _get_socket(self, host: str, port: int, timeout: float) -> socket.socket:
+        error: OSError | None = None
+        for address in self._pinned_addresses:
+            try:
+                return socket.create_connection((address, port), timeout, self.source_address)
+            except OSError as e:
+                error = e
+        raise error or OSError(f"No validated addresses for SMTP host {host!r}")
+
+
+class _PinnedSMTP_SSL(smtplib.SMTP_SSL, _PinnedSMTP):
+    def __init__(self, host: str, port: int, *, timeout: float, addresses: tuple[str, ...]) -> None:
+        self._pinned_addresses = addresses
+        smtplib.SMTP_SSL.__init__(self, host, port, timeout=timeout)
+
+
 class SSL_SMTPConfig(SMTPConfig):
+    def _connect(self, timeout: int) -> smtplib.SMTP_SSL:
+        if self.addresses:
+            return _PinnedSMTP_SSL(
+                self.server, self.port, timeout=timeout, addresses=self.addresses
+            )
+        return smtplib.SMTP_SSL(self.server, self.port, timeout=timeout)
+
     @contextmanager
     def smtp_login(self, timeout: int = 10) -> Generator[smtplib.SMTP, None, None]:
-        with smtplib.SMTP_SSL(self.server, self.port, timeout=timeout) as server:
+        with self._connect(timeout) as server:
             server.ehlo()
             server.login(self.username, self.password)
             yield server
 
 
 class StartTLS_SMTPConfig(SMTPConfig):
+    def _connect(self, timeout: int) -> smtplib.SMTP:
+        if self.addresses:
+            return _PinnedSMTP(self.server, self.port, timeout=timeout, addresses=self.addresses)
+        return smtplib.SMTP(self.server, self.port, timeout=timeout)
+
     @contextmanager
     def smtp_login(self, timeout: int = 10) -> Generator[smtplib.SMTP, None, None]:
-        with smtplib.SMTP(self.server, self.port, timeout=timeout) as server:
+        with self._connect(timeout) as server:
             server.ehlo()
             server.starttls(context=ssl.create_default_context())
             server.ehlo()
@@ -61,21 +104,238 @@ class StartTLS_SMTPConfig(SMTPConfig):
             yield server
 
 
-def is_safe_smtp_host(host: str) -> bool:
+_SMTP_POOL_EXTENSION = "hushline_smtp_pool"
+_SMTP_POOL_IDLE_SECONDS = 30
+_SMTP_POOL_MAX_MESSAGES = 50
+_SMTP_POOL_MAX_IDLE_PER_KEY = 4
+
+SMTPPoolKey = tuple[str, str, int, str, str]
+
+
+def _smtp_pool_config(name: str, default: int) -> int:
+    value = current_app.config.get(name, default)
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def _smtp_connection_is_alive(server: smtplib.SMTP) -> bool:
+    try:
+        code, _ = server.noop()
+    except (OSError, TypeError, ValueError, smtplib.SMTPException):
+        return False
+    return code == 250  # noqa: PLR2004
+
+
+@dataclass
+class _PooledSMTPConnection:
+    server: smtplib.SMTP
+    stack: ExitStack
+    messages_sent: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+    def close(self) -> None:
+        with suppress(OSError, smtplib.SMTPException):
+            self.stack.close()
+
+
+class SMTPConnectionPool:
+    """
+    Authenticated SMTP connections kept open between sends.
+
+    Connections are keyed by encryption, server, port, username and a digest of the password, so
+    a connection is only reused by a config that could have logged in on its own. Idle connections
+    are closed after SMTP_POOL_IDLE_SECONDS and checked with NOOP before reuse, and a connection is
+    retired after SMTP_POOL_MAX_MESSAGES messages. Set SMTP_POOL_MAX_MESSAGES to 1 to disable reuse.
+    """
+
+    def __init__(self) -> None:
+        self._idle: dict[SMTPPoolKey, list[_PooledSMTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(smtp_config: SMTPConfig) -> SMTPPoolKey:
+        password_digest = hashlib.sha256(smtp_config.password.encode()).hexdigest()
+        return (
+            type(smtp_config).__name__,
+            smtp_config.server.casefold(),
+            smtp_config.port,
+            smtp_config.username,
+            password_digest,
+        )
+
+    def _take_idle(self, key: SMTPPoolKey, idle_seconds: int) -> _PooledSMTPConnection | None:
+        now = time.monotonic()
+        expired: list[_PooledSMTPConnection] = []
+        connection = None
+        with self._lock:
+            for pool_key, connections in list(self._idle.items()):
+                fresh = [c for c in connections if now - c.last_used < idle_seconds]
+                expired.extend(c for c in connections if now - c.last_used >= idle_seconds)
+                if fresh:
+                    self._idle[pool_key] = fresh
+                else:
+                    del self._idle[pool_key]
+            if idle := self._idle.get(key):
+                connection = idle.pop()
+        for stale in expired:
+            stale.close()
+        return connection
+
+    def _release(self, key: SMTPPoolKey, connection: _PooledSMTPConnection) -> None:
+        connection.last_used = time.monotonic()
+        with self._lock:
+            connections = self._idle.setdefault(key, [])
+            if len(connections) < _SMTP_POOL_MAX_IDLE_PER_KEY:
+                connections.append(connection)
+                return
+        connection.close()
+
+    @contextmanager
+    def connection(
+        self, smtp_config: SMTPConfig, *, timeout: int = 10
+    ) -> Generator[smtplib.SMTP, None, None]:
+        key = self.key(smtp_config)
+        idle_seconds = _smtp_pool_config("SMTP_POOL_IDLE_SECONDS", _SMTP_POOL_IDLE_SECONDS)
+        max_messages = _smtp_pool_config("SMTP_POOL_MAX_MESSAGES", _SMTP_POOL_MAX_MESSAGES)
+
+        connection = None
+        while (candidate := self._take_idle(key, idle_seconds)) is not None:
+            if _smtp_connection_is_alive(candidate.server):
+                connection = candidate
+                break
+            candidate.close()
+        if connection is None:
+            stack = ExitStack()
+            server = stack.enter_context(smtp_config.smtp_login(timeout=timeout))
+            connection = _PooledSMTPConnection(server=server, stack=stack)
+
+        try:
+            yield connection.server
+        except BaseException:
+            # the session state is unknown after any failure, so never hand it out again
+            connection.close()
+            raise
+
+        connection.messages_sent += 1
+        if connection.messages_sent >= max_messages:
+            connection.close()
+        else:
+            self._release(key, connection)
+
+    def close_all(self) -> None:
+        with self._lock:
+            connections = [c for pooled in self._idle.values() for c in pooled]
+            self._idle.clear()
+        for connection in connections:
+            connection.close()
+
+
+def smtp_connection_pool() -> SMTPConnectionPool:
+    return current_app.extensions.setdefault(_SMTP_POOL_EXTENSION, SMTPConnectionPool())
+
+
+SMTP_HOST_RESOLUTION_COUNTER_EVENT: Final = "smtp_host_resolution_counter"
+SMTP_HOST_RESOLUTION_CACHE_HIT_COUNTER: Final = "smtp_host_resolution_cache_hit_total"
+SMTP_HOST_RESOLUTION_CACHE_MISS_COUNTER: Final = "smtp_host_resolution_cache_miss_total"
+_SMTP_HOST_CACHE_EXTENSION = "hushline_smtp_host_cache"
+_SMTP_HOST_CACHE_TTL_SECONDS = 300
+_SMTP_HOST_CACHE_TTL_MAX_SECONDS = 3600
+_SMTP_HOST_CACHE_MAX_HOSTS = 1024
+
+
+class SMTPHostResolutionCache:
+    """
+    Validated public addresses per SMTP host, kept for SMTP_HOST_CACHE_TTL_SECONDS (at most an
+    hour). Only hosts that passed validation are cached, so a host that is unsafe or unresolvable
+    is looked up again on the next send.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str, tuple[float, tuple[str, ...]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str) -> tuple[str, ...] | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is None:
+                return None
+            expires_at, addresses = entry
+            if expires_at <= now:
+                del self._entries[host]
+                return None
+            return addresses
+
+    def put(self, host: str, addresses: tuple[str, ...], ttl_seconds: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if host not in self._entries and len(self._entries) >= _SMTP_HOST_CACHE_MAX_HOSTS:
+                self._entries = {
+                    cached_host: entry
+                    for cached_host, entry in self._entries.items()
+                    if entry[0] > now
+                }
+                if len(self._entries) >= _SMTP_HOST_CACHE_MAX_HOSTS:
+                    oldest = min(
+                        self._entries, key=lambda cached_host: self._entries[cached_host][0]
+                    )
+                    del self._entries[oldest]
+            self._entries[host] = (now + ttl_seconds, addresses)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def smtp_host_resolution_cache() -> SMTPHostResolutionCache:
+    return current_app.extensions.setdefault(_SMTP_HOST_CACHE_EXTENSION, SMTPHostResolutionCache())
+
+
+def _smtp_host_cache_ttl_seconds() -> int:
+    value = current_app.config.get("SMTP_HOST_CACHE_TTL_SECONDS", _SMTP_HOST_CACHE_TTL_SECONDS)
+    try:
+        return min(_SMTP_HOST_CACHE_TTL_MAX_SECONDS, max(1, int(value)))
+    except (TypeError, ValueError):
+        return _SMTP_HOST_CACHE_TTL_SECONDS
+
+
+def _emit_smtp_host_resolution_counter(counter_name: str) -> None:
+    current_app.logger.info(
+        "SMTP host resolution counter",
+        extra={
+            "event": SMTP_HOST_RESOLUTION_COUNTER_EVENT,
+            "counter_name": counter_name,
+            "count": 1,
+        },
+    )
+
+
+def resolve_safe_smtp_host(host: str) -> tuple[str, ...] | None:
+    """The validated public addresses for `host`, or None if it must not be used for SMTP."""
     if not host:
         current_app.logger.warning("SMTP server validation failed: empty host")
-        return False
+        return None
 
     if host.lower() == "localhost":
         current_app.logger.warning("SMTP server validation failed: localhost is not allowed")
-        return False
+        return None
+
+    cache = smtp_host_resolution_cache()
+    cache_key = host.casefold()
+    if (cached_addresses := cache.get(cache_key)) is not None:
+        _emit_smtp_host_resolution_counter(SMTP_HOST_RESOLUTION_CACHE_HIT_COUNTER)
+        return cached_addresses
+    _emit_smtp_host_resolution_counter(SMTP_HOST_RESOLUTION_CACHE_MISS_COUNTER)
 
     try:
         addrinfo = socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)
     except OSError as e:
         current_app.logger.warning(f"SMTP server validation failed: {host!r} unresolved ({e})")
-        return False
+        return None
 
+    addresses: list[str] = []
     for _, _, _, _, sockaddr in addrinfo:
         ip_str = sockaddr[0]
         try:
@@ -84,22 +344,41 @@ def is_safe_smtp_host(host: str) -> bool:
             current_app.logger.warning(
                 f"SMTP server validation failed: invalid IP {ip_str!r} for host {host!r}"
             )
-            return False
+            return None
         if not ip.is_global:
             current_app.logger.warning(
                 f"SMTP server validation failed: {host!r} resolved to non-public IP {ip}"
             )
-            return False
+            return None
+        if str(ip) not in addresses:
+            addresses.append(str(ip))
 
-    return True
+    if not addresses:
+        current_app.logger.warning(f"SMTP server validation failed: {host!r} has no addresses")
+        return None
+
+    cache.put(cache_key, tuple(addresses), _smtp_host_cache_ttl_seconds())
+    return tuple(addresses)
+
+
+def is_safe_smtp_host(host: str) -> bool:
+    return resolve_safe_smtp_host(host) is not None
 
 
-def send_email(
-    to_email: str, subject: str, body: str, smtp_config: SMTPConfig, reply_to: str | None = None
+def send_email(  # noqa: PLR0913
+    to_email: str,
+    subject: str,
+    body: str,
+    smtp_config: SMTPConfig,
+    reply_to: str | None = None,
+    *,
+    attempts: int | None = None,
 ) -> bool:
-    if not is_safe_smtp_host(smtp_config.server):
+    addresses = resolve_safe_smtp_host(smtp_config.server)
+    if addresses is None:
         current_app.logger.error(f"Blocked SMTP delivery to unsafe host {smtp_config.server!r}")
         return False
+    smtp_config.addresses = addresses
     current_app.logger.debug(
         f"SMTP settings being used: Server: {smtp_config.server}, "
         f"Port: {smtp_config.port}, Username: {smtp_config.username}"
@@ -124,13 +403,14 @@ def send_email(
         return False
 
     timeout = int(current_app.config.get("SMTP_TIMEOUT", 10))
-    attempts = int(current_app.config.get("SMTP_SEND_ATTEMPTS", 3))
+    if attempts is None:
+        attempts = int(current_app.config.get("SMTP_SEND_ATTEMPTS", 3))
     retry_delay = float(current_app.config.get("SMTP_SEND_RETRY_DELAY_SEC", 2))
 
     for attempt in range(1, attempts + 1):
         message_submission_attempted = False
         try:
-            with smtp_config.smtp_login(timeout=timeout) as server:
+            with smtp_connection_pool().connection(smtp_config, timeout=timeout) as server:
                 message_submission_attempted = True
                 refusals = server.send_message(message)
             if refusals:
@@ -3,11 +3,14 @@ import io
 import json
 import re
 import textwrap
+import threading
+import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 from email.parser import HeaderParser
 from email.utils import parseaddr
-from typing import Any
+from typing import Any, Generic, TypeVar
 
 import dns.exception
 import dns.resolver
@@ -16,6 +19,53 @@ _AUTH_RESULTS_RE = re.compile(r"\b(dkim|spf|dmarc)\s*=\s*([a-zA-Z0-9_-]+)")
 _MAX_EMAIL_HEADER_COUNT = 250
 _MAX_DKIM_SIGNATURE_HEADERS = 20
 _MAX_DKIM_KEY_LOOKUPS = 10
+_DKIM_LOOKUP_TIMEOUT_SECONDS = 3.0
+_DKIM_KEY_CACHE_MAX_TTL_SECONDS = 300.0
+_DKIM_KEY_CACHE_NEGATIVE_TTL_SECONDS = 60.0
+_DKIM_KEY_CACHE_MAX_ENTRIES = 1024
+_REPORT_CACHE_TTL_SECONDS = 600.0
+_REPORT_CACHE_MAX_ENTRIES = 256
+
+_T = TypeVar("_T")
+
+
+class _TTLCache(Generic[_T]):
+    """A small thread-safe cache whose entries expire, dropping the oldest entry when full."""
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: dict[str, tuple[float, _T]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> _T | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: str, value: _T, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+            while len(self._entries) >= self._max_entries:
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# DKIM key lookups by query name, shared by every analysis in the process
+_dkim_key_cache: _TTLCache[dict[str, Any]] = _TTLCache(_DKIM_KEY_CACHE_MAX_ENTRIES)
+# reports by header digest, so the evidence download reuses the analysis the user just saw
+_report_cache: _TTLCache[dict[str, Any]] = _TTLCache(_REPORT_CACHE_MAX_ENTRIES)
 
 
 def _parse_tag_value_pairs(value: str) -> dict[str, str]:
@@ -50,19 +100,30 @@ def _extract_authentication_results(headers: list[str]) -> dict[str, str]:
     return results
 
 
+def _cached_dkim_key(selector: str, domain: str) -> dict[str, Any] | None:
+    query_name = f"{selector}._domainkey.{domain}".strip(".")
+    cached = _dkim_key_cache.get(query_name.lower())
+    if cached is None:
+        return None
+    return {**cached, "selector": selector, "domain": domain, "query_name": query_name}
+
+
 def _lookup_dkim_key(
     selector: str, domain: str, resolver: dns.resolver.Resolver | None = None
 ) -> dict[str, Any]:
-    resolver = resolver or dns.resolver.Resolver()
-    resolver.lifetime = 3.0
-    resolver.timeout = 3.0
+    if (cached := _cached_dkim_key(selector, domain)) is not None:
+        return cached
 
     query_name = f"{selector}._domainkey.{domain}".strip(".")
+    cache_key = query_name.lower()
+    resolver = resolver or dns.resolver.Resolver()
+    resolver.lifetime = _DKIM_LOOKUP_TIMEOUT_SECONDS
+    resolver.timeout = _DKIM_LOOKUP_TIMEOUT_SECONDS
 
     try:
         records = resolver.resolve(query_name, "TXT")
     except dns.resolver.NXDOMAIN:
-        return {
+        lookup = {
             "selector": selector,
             "domain": domain,
             "query_name": query_name,
@@ -72,6 +133,8 @@ def _lookup_dkim_key(
             "dnssec_validated": False,
             "error": "No DKIM key found at this DNS name.",
         }
+        _dkim_key_cache.set(cache_key, lookup, _DKIM_KEY_CACHE_NEGATIVE_TTL_SECONDS)
+        return lookup
     except (
         dns.resolver.NoAnswer,
         dns.resolver.NoNameservers,
@@ -113,7 +176,7 @@ def _lookup_dkim_key(
     # resolver transport, do not report DNSSEC validation for DKIM key lookups here.
     dnssec_validated = False
 
-    return {
+    lookup = {
         "selector": selector,
         "domain": domain,
         "query_name": query_name,
@@ -123,6 +186,34 @@ def _lookup_dkim_key(
         "dnssec_validated": dnssec_validated,
         "error": None,
     }
+    # honour the record's TTL, but never serve a rotated key for long
+    rrset = getattr(records, "rrset", None)
+    ttl = min(
+        float(getattr(rrset, "ttl", _DKIM_KEY_CACHE_MAX_TTL_SECONDS)),
+        _DKIM_KEY_CACHE_MAX_TTL_SECONDS,
+    )
+    _dkim_key_cache.set(cache_key, lookup, ttl)
+    return lookup
+
+
+def _lookup_dkim_keys(keys: list[tuple[str, str]]) -> list[dict[str, Any]]:
+    """
+    Look up the DKIM keys for `(selector, domain)` pairs concurrently and return them in order.
+    Cached keys are served without DNS, and one resolver is shared by the remaining lookups.
+    """
+    lookups = [_cached_dkim_key(selector, domain) for selector, domain in keys]
+    misses = [index for index, lookup in enumerate(lookups) if lookup is None]
+    if misses:
+        resolver = dns.resolver.Resolver()
+        with ThreadPoolExecutor(max_workers=len(misses)) as executor:
+            for index, lookup in zip(
+                misses,
+                executor.map(
+                    lambda index: _lookup_dkim_key(*keys[index], resolver=resolver), misses
+                ),
+            ):
+                lookups[index] = lookup
+    return [lookup for lookup in lookups if lookup is not None]
 
 
 def _build_executive_summary(
@@ -391,7 +482,17 @@ def _build_interpretation(report: dict[str, Any]) -> dict[str, list[str]]:
     return interpretation
 
 
+def _report_cache_key(raw_headers: str) -> str:
+    return hashlib.sha256((raw_headers or "").encode("utf-8")).hexdigest()
+
+
 def analyze_raw_email_headers(raw_headers: str) -> dict[str, Any]:
+    report = _analyze_raw_email_headers(raw_headers)
+    _report_cache.set(_report_cache_key(raw_headers), report, _REPORT_CACHE_TTL_SECONDS)
+    return report
+
+
+def _analyze_raw_email_headers(raw_headers: str) -> dict[str, Any]:
     message = HeaderParser().parsestr(raw_headers or "")
     if not message.keys():
         raise ValueError("No email headers detected. Paste the raw headers and try again.")
@@ -418,9 +519,7 @@ def analyze_raw_email_headers(raw_headers: str) -> dict[str, Any]:
         )
 
     dkim_signatures: list[dict[str, Any]] = []
-    dkim_key_lookups: list[dict[str, Any]] = []
-    dkim_lookup_cache: dict[tuple[str, str], dict[str, Any]] = {}
-    resolver: dns.resolver.Resolver | None = None
+    dkim_keys: dict[tuple[str, str], tuple[str, str]] = {}
     dkim_lookup_limit_reached = False
     for dkim_header in dkim_headers:
         tags = _parse_tag_value_pairs(dkim_header)
@@ -440,18 +539,14 @@ def analyze_raw_email_headers(raw_headers: str) -> dict[str, Any]:
         }
         dkim_signatures.append(signature)
         if selector and domain:
-            cache_key = (selector.lower(), domain.lower())
-            if cache_key in dkim_lookup_cache:
+            key = (selector.lower(), domain.lower())
+            if key in dkim_keys:
                 continue
-            if len(dkim_lookup_cache) >= _MAX_DKIM_KEY_LOOKUPS:
+            if len(dkim_keys) >= _MAX_DKIM_KEY_LOOKUPS:
                 dkim_lookup_limit_reached = True
                 continue
-            if resolver is None:
-                resolver = dns.resolver.Resolver()
-            dkim_lookup_cache[cache_key] = _lookup_dkim_key(
-                selector=selector, domain=domain, resolver=resolver
-            )
-            dkim_key_lookups.append(dkim_lookup_cache[cache_key])
+            dkim_keys[key] = (selector, domain)
+    dkim_key_lookups = _lookup_dkim_keys(list(dkim_keys.values()))
 
     alignment = {
         "from_matches_return_path": bool(
@@ -730,7 +825,10 @@ def _render_report_pdf(report: dict[str, Any], created_at: datetime) -> bytes:
 
 
 def create_evidence_zip(raw_headers: str) -> bytes:
-    report = analyze_raw_email_headers(raw_headers)
+    # the report the user was just shown, unless it expired or another worker analyzed it
+    report = _report_cache.get(_report_cache_key(raw_headers)) or analyze_raw_email_headers(
+        raw_headers
+    )
     created_at = datetime.now(UTC)
 
     artifacts: dict[str, bytes] = {
@@ -2,7 +2,6 @@ import html
 import ipaddress
 import time
 from dataclasses import dataclass
-from datetime import datetime
 from hashlib import sha256
 from hmac import new as hmac_new
 
@@ -10,7 +9,8 @@ from flask import current_app, request
 
 from hushline.db import db
 from hushline.external_urls import canonical_external_url
-from hushline.model import EmbedRateLimitAttempt, Username
+from hushline.model import Username
+from hushline.ratelimit import RateLimit, rate_limiter
 
 EMBED_ABUSE_COUNTER_EVENT = "embed_form_abuse_counter"
 EMBED_SUBMISSION_ATTEMPT_COUNTER = "embed_form_submission_attempt_total"
@@ -108,54 +108,35 @@ def embed_source_bucket_hash() -> str:
 
 def check_embed_rate_limit(username: Username) -> EmbedRateLimitResult:
     window_seconds = int(current_app.config.get("EMBED_RATE_LIMIT_WINDOW_SECONDS", 600))
-    limits = {
-        "profile": int(current_app.config.get("EMBED_RATE_LIMIT_PROFILE_MAX", 30)),
-        "source": int(current_app.config.get("EMBED_RATE_LIMIT_SOURCE_MAX", 10)),
-        "deployment": int(current_app.config.get("EMBED_RATE_LIMIT_DEPLOYMENT_MAX", 200)),
-    }
-    now = time.time()
-    window_start = datetime.fromtimestamp(now - window_seconds)
-    created_at = datetime.fromtimestamp(now)
     profile_hash = embed_profile_hash(username)
     source_bucket_hash = embed_source_bucket_hash()
-    buckets = {
-        "profile": profile_hash,
-        "source": source_bucket_hash,
-        "deployment": _embed_hmac("deployment"),
-    }
-
-    db.session.execute(
-        db.delete(EmbedRateLimitAttempt).where(EmbedRateLimitAttempt.created_at < window_start)
-    )
-
-    limited_scopes: list[str] = []
-    for scope, bucket_hash in buckets.items():
-        attempts = db.session.scalar(
-            db.select(db.func.count())
-            .select_from(EmbedRateLimitAttempt)
-            .where(
-                EmbedRateLimitAttempt.scope == scope,
-                EmbedRateLimitAttempt.bucket_hash == bucket_hash,
-                EmbedRateLimitAttempt.created_at >= window_start,
-            )
-        )
-        if limits[scope] > 0 and attempts is not None and attempts >= limits[scope]:
-            limited_scopes.append(scope)
-
-    if not limited_scopes:
-        for scope, bucket_hash in buckets.items():
-            db.session.add(
-                EmbedRateLimitAttempt(
-                    scope=scope,
-                    bucket_hash=bucket_hash,
-                    created_at=created_at,
-                )
-            )
+    limits = [
+        RateLimit(
+            scope="profile",
+            key=f"embed:profile:{profile_hash}",
+            limit=int(current_app.config.get("EMBED_RATE_LIMIT_PROFILE_MAX", 30)),
+            window_seconds=window_seconds,
+        ),
+        RateLimit(
+            scope="source",
+            key=f"embed:source:{source_bucket_hash}",
+            limit=int(current_app.config.get("EMBED_RATE_LIMIT_SOURCE_MAX", 10)),
+            window_seconds=window_seconds,
+        ),
+        RateLimit(
+            scope="deployment",
+            key=f"embed:deployment:{_embed_hmac('deployment')}",
+            limit=int(current_app.config.get("EMBED_RATE_LIMIT_DEPLOYMENT_MAX", 200)),
+            window_seconds=window_seconds,
+        ),
+    ]
+
+    result = rate_limiter().hit(limits, now=time.time())
     db.session.commit()
 
     return EmbedRateLimitResult(
-        limited=bool(limited_scopes),
-        limited_scopes=tuple(limited_scopes),
+        limited=result.limited,
+        limited_scopes=result.limited_scopes,
         profile_hash=profile_hash,
         source_bucket_hash=source_bucket_hash,
     )
@@ -4,7 +4,7 @@ from typing import Any, Mapping
 
 from flask_wtf import FlaskForm
 from markupsafe import Markup
-from wtforms import Field, Form, SelectField, StringField, SubmitField
+from wtforms import Field, Form, SelectField, SelectMultipleField, StringField, SubmitField
 from wtforms.validators import DataRequired, Length, ValidationError
 from wtforms.widgets.core import html_params
 
@@ -110,6 +110,19 @@ class DeleteMessageForm(FlaskForm):
     submit = SubmitField("Delete", widget=Button())
 
 
+class BulkMessagesForm(FlaskForm):
+    # public ids of the selected messages; ownership is enforced by the query, not the choices
+    message_ids = SelectMultipleField(validate_choice=False, validators=[DataRequired()])
+
+
+class BulkMessageStatusForm(BulkMessagesForm):
+    status = SelectField(
+        choices=[(x.name, x.emoji + " " + x.display_str) for x in MessageStatus],
+        validators=[DataRequired()],
+        coerce=coerce_status,
+    )
+
+
 class DeleteConversationForm(FlaskForm):
     submit = SubmitField("Delete", widget=Button())
 
@@ -0,0 +1,93 @@
+"""
+Push notifications for open inbox and conversation pages.
+
+Writers queue an update with `notify_users()` inside their transaction. Postgres only delivers a
+NOTIFY once that transaction commits, so listeners never hear about rows they can't read yet.
+`iter_user_updates()` holds one LISTEN connection per open stream and filters the shared channel
+down to a single user's updates. That connection is opened outside the engine's pool, since a
+stream holds it for its whole lifetime and would otherwise take a slot from short requests.
+"""
+
+import json
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+import psycopg
+from flask import current_app
+
+from hushline.db import db
+
+LIVE_UPDATES_CHANNEL = "hushline_live_updates"
+LIVE_UPDATE_CONVERSATION = "conversation"
+LIVE_UPDATE_INBOX = "inbox"
+_LIVE_UPDATE_EVENTS = {LIVE_UPDATE_CONVERSATION, LIVE_UPDATE_INBOX}
+
+
+@dataclass(frozen=True)
+class LiveUpdate:
+    event: str
+    user_ids: frozenset[int]
+    conversation: str | None = None
+
+    def to_payload(self) -> str:
+        data: dict[str, Any] = {"event": self.event, "user_ids": sorted(self.user_ids)}
+        if self.conversation is not None:
+            data["conversation"] = self.conversation
+        return json.dumps(data, separators=(",", ":"))
+
+    @classmethod
+    def from_payload(cls, payload: str) -> "LiveUpdate | None":
+        try:
+            data = json.loads(payload)
+            event = data["event"]
+            user_ids = frozenset(int(x) for x in data["user_ids"])
+            conversation = data.get("conversation")
+        except (KeyError, TypeError, ValueError):
+            return None
+        if event not in _LIVE_UPDATE_EVENTS or not (
+            conversation is None or isinstance(conversation, str)
+        ):
+            return None
+        return cls(event=event, user_ids=user_ids, conversation=conversation)
+
+    def to_sse(self) -> str:
+        """Format for a browser. Never includes other users' ids."""
+        data = {"conversation": self.conversation} if self.conversation else {}
+        return f"event: {self.event}\ndata: {json.dumps(data)}\n\n"
+
+
+def notify_users(user_ids: Iterable[int], event: str, *, conversation: str | None = None) -> None:
+    """Queue an update for `user_ids`. Delivered when the current transaction commits."""
+    update = LiveUpdate(event=event, user_ids=frozenset(user_ids), conversation=conversation)
+    if not update.user_ids:
+        return
+    db.session.execute(db.select(db.func.pg_notify(LIVE_UPDATES_CHANNEL, update.to_payload())))
+
+
+def iter_user_updates(
+    user_id: int, *, duration_seconds: float, keepalive_seconds: float
+) -> Iterator[LiveUpdate | None]:
+    """
+    Yield committed updates addressed to `user_id` until `duration_seconds` elapse. `None` is
+    yielded whenever `keepalive_seconds` pass so callers can keep idle connections open.
+    """
+    deadline = time.monotonic() + duration_seconds
+    conninfo = db.engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+    with psycopg.connect(conninfo, autocommit=True) as connection:
+        connection.execute(f"LISTEN {LIVE_UPDATES_CHANNEL}")
+        while (remaining := deadline - time.monotonic()) > 0:
+            # drain into a list: psycopg holds the connection lock while its generator is
+            # suspended, which would deadlock closing the connection if our caller stops early
+            notifies = list(
+                connection.notifies(timeout=min(keepalive_seconds, remaining), stop_after=1)
+            )
+            if not notifies:
+                yield None
+            for notify in notifies:
+                update = LiveUpdate.from_payload(notify.payload)
+                if update is None:
+                    current_app.logger.warning("Ignoring malformed live update payload")
+                elif user_id in update.user_ids:
+                    yield update
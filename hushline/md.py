@@ -1,32 +1,133 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
 import markdown
 from bleach import clean
 from markupsafe import Markup
 
+# sanitized HTML kept per process; bios and status texts are short, so this holds thousands
+MARKDOWN_CACHE_MAX_BYTES = 4 * 1024 * 1024
 
-def md_to_html(md: str | Markup) -> Markup:
-    if isinstance(md, Markup):
-        return md
+_ALLOWED_TAGS = [
+    "p",
+    "span",
+    "b",
+    "strong",
+    "i",
+    "em",
+    "a",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "ul",
+    "ol",
+    "li",
+]
+
+
+@dataclass(frozen=True)
+class MarkdownCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class MarkdownCache:
+    """
+    LRU of sanitized HTML keyed by a digest of the markdown source, bounded by the UTF-8 encoded
+    size of the HTML it holds.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        # each entry keeps its size, so evicting does not encode the HTML again
+        self._entries: OrderedDict[bytes, tuple[Markup, int]] = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(md: str) -> bytes:
+        return hashlib.blake2b(md.encode(), digest_size=16).digest()
+
+    def get(self, md: str) -> Markup | None:
+        key = self._key(md)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, md: str, html: Markup) -> None:
+        size = len(html.encode())
+        # one huge document must not flush everything else
+        if size > self._max_bytes // 4:
+            return
+        key = self._key(md)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._entries[key] = (html, size)
+            self._size += size
+            while self._size > self._max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self._evictions += 1
+
+    def stats(self) -> MarkdownCacheStats:
+        with self._lock:
+            return MarkdownCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                size_bytes=self._size,
+                max_bytes=self._max_bytes,
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = self._hits = self._misses = self._evictions = 0
+
+
+markdown_cache = MarkdownCache(MARKDOWN_CACHE_MAX_BYTES)
+
+
+def _render(md: str) -> Markup:
     return Markup(
         clean(
             markdown.markdown(md),
-            tags=[
-                "p",
-                "span",
-                "b",
-                "strong",
-                "i",
-                "em",
-                "a",
-                "h1",
-                "h2",
-                "h3",
-                "h4",
-                "h5",
-                "h6",
-                "ul",
-                "ol",
-                "li",
-            ],
+            tags=_ALLOWED_TAGS,
             attributes={"a": ["href"]},
         )
     )
+
+
+def md_to_html(md: str | Markup) -> Markup:
+    if isinstance(md, Markup):
+        return md
+    html = markdown_cache.get(md)
+    if html is None:
+        html = _render(md)
+        markdown_cache.put(md, html)
+    return html
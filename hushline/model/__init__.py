@@ -3,14 +3,16 @@
 from hushline.model.admin_broadcast import AdminBroadcast, AdminBroadcastRecipient
 from hushline.model.authentication_log import AuthenticationLog
 from hushline.model.chat_key import ChatKey
-from hushline.model.chat_rate_limit_attempt import ChatRateLimitAttempt
 from hushline.model.conversation import (
     Conversation,
     ConversationMessage,
     ConversationMessageCopy,
     ConversationParticipant,
 )
-from hushline.model.embed_rate_limit_attempt import EmbedRateLimitAttempt
+from hushline.model.conversation_presence import ConversationPresence
+from hushline.model.data_export_job import DataExportJob
+from hushline.model.deletion_job import DeletionJob
+from hushline.model.email_outbox import EmailOutbox
 from hushline.model.enums import (
     AccountCategory,
     FieldType,
@@ -21,7 +23,11 @@ from hushline.model.enums import (
     StripeSubscriptionStatusEnum,
 )
 from hushline.model.field_definition import FieldDefinition
-from hushline.model.field_value import FieldValue
+from hushline.model.field_value import (
+    FieldValue,
+    reserve_message_and_field_value_id_pairs,
+    reserve_message_and_field_value_ids,
+)
 from hushline.model.globaleaks_directory_listing import (
     GlobaLeaksDirectoryListing,
     get_globaleaks_directory_listing,
@@ -38,13 +44,14 @@ from hushline.model.newsroom_directory_listing import (
 )
 from hushline.model.notification_recipient import NotificationRecipient
 from hushline.model.organization_setting import OrganizationSetting
-from hushline.model.password_reset_attempt import PasswordResetAttempt
 from hushline.model.password_reset_token import PasswordResetToken
+from hushline.model.profile_link_verification import ProfileLinkCheck, ProfileLinkVerification
 from hushline.model.public_record_listing import (
     PublicRecordListing,
     get_public_record_listing,
     get_public_record_listings,
 )
+from hushline.model.rate_limit_bucket import RateLimitBucket
 from hushline.model.securedrop_directory_listing import (
     SecureDropDirectoryListing,
     get_securedrop_directory_listing,
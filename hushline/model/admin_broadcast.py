@@ -91,6 +91,10 @@ class AdminBroadcast(Model):
             for recipient in self.recipients
         )
 
+    @property
+    def notification_pending_count(self) -> int:
+        return sum(recipient.notification_pending for recipient in self.recipients)
+
     def mark_updated(self) -> None:
         self.updated_at = _utc_now()
 
@@ -112,6 +116,11 @@ class AdminBroadcastRecipient(Model):
             "broadcast_id",
             "status",
         ),
+        Index(
+            "ix_admin_broadcast_recipients_notification_pending",
+            "id",
+            postgresql_where=text("status = 'submitted' AND notified_at IS NULL"),
+        ),
     )
 
     STATUS_PENDING = "pending"
@@ -140,6 +149,8 @@ class AdminBroadcastRecipient(Model):
         nullable=True,
     )
     failure_reason: Mapped[str | None] = mapped_column(db.String(64), nullable=True)
+    # set once the notification email for a submitted message has been handed off
+    notified_at: Mapped[datetime | None] = mapped_column(db.DateTime(timezone=True))
     created_at: Mapped[datetime] = mapped_column(
         db.DateTime(timezone=True),
         default=_utc_now,
@@ -160,6 +171,39 @@ class AdminBroadcastRecipient(Model):
     def __init__(self, **kwargs: Any) -> None:
         super().__init__(**kwargs)
 
+    @property
+    def notification_pending(self) -> bool:
+        return self.status == self.STATUS_SUBMITTED and self.notified_at is None
+
+    @classmethod
+    def claim_notifications(cls, batch_size: int) -> list[int]:
+        """
+        Mark up to `batch_size` submitted recipients as notified and return their user ids.
+
+        Rows locked by another worker are skipped, so any number of workers can share the queue.
+        The caller commits the claim before sending over SMTP, or with the queued email when the
+        outbox is enabled, so each recipient is notified at most once.
+        """
+        claimable = (
+            db.select(cls.id)
+            .where(cls.status == cls.STATUS_SUBMITTED, cls.notified_at.is_(None))
+            .order_by(cls.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        return list(
+            db.session.scalars(
+                db.update(cls)
+                .where(cls.id.in_(claimable.scalar_subquery()))
+                .values(notified_at=_utc_now())
+                .returning(cls.user_id),
+                execution_options={"synchronize_session": False},
+            ).all()
+        )
+
+    def mark_notified(self) -> None:
+        self.notified_at = _utc_now()
+
     def mark_submitted(self, message: "Message") -> None:
         self.status = self.STATUS_SUBMITTED
         self.message = message
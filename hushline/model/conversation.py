@@ -1,15 +1,17 @@
+from collections.abc import Iterable
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 from uuid import uuid4
 
-from sqlalchemy import Index, UniqueConstraint, text
+from sqlalchemy import Index, UniqueConstraint, and_, case, or_, text, tuple_
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from hushline.db import db
 
 if TYPE_CHECKING:
     from flask_sqlalchemy.model import Model
-    from sqlalchemy import Select
+    from sqlalchemy import ScalarSelect, Select
+    from sqlalchemy.orm import InstrumentedAttribute
 
     from hushline.model.message import Message
     from hushline.model.user import User
@@ -31,6 +33,13 @@ class Conversation(Model):
     created_at: Mapped[datetime] = mapped_column(
         db.DateTime(timezone=True), server_default=text("NOW()"), nullable=False
     )
+    last_message_id: Mapped[int | None] = mapped_column(
+        db.ForeignKey("conversation_messages.id", ondelete="SET NULL"), index=True
+    )
+    last_message_at: Mapped[datetime | None] = mapped_column(db.DateTime(timezone=True))
+    message_count: Mapped[int] = mapped_column(
+        db.Integer, nullable=False, default=0, server_default=text("0")
+    )
 
     participants: Mapped[list["ConversationParticipant"]] = relationship(
         back_populates="conversation",
@@ -41,6 +50,7 @@ class Conversation(Model):
         back_populates="conversation",
         cascade="all, delete-orphan",
         order_by="ConversationMessage.id.asc()",
+        foreign_keys="ConversationMessage.conversation_id",
     )
     initial_message: Mapped["Message | None"] = relationship(
         "Message",
@@ -63,6 +73,108 @@ class Conversation(Model):
             None,
         )
 
+    def record_message(self, message: "ConversationMessage") -> None:
+        """Fold a newly flushed message into the denormalized inbox summary.
+
+        The summary is updated with SQL expressions evaluated against the row being updated, not
+        the values loaded into this session, so concurrent appends to the same conversation can't
+        lose each other's increments or move the latest message backwards.
+        """
+        cls = type(self)
+        copy_recipient_ids = {
+            encrypted_copy.recipient_participant_id for encrypted_copy in message.encrypted_copies
+        }
+        self.last_message_id = case(
+            (cls.last_message_at > message.created_at, cls.last_message_id),
+            else_=message.id,
+        )
+        # GREATEST ignores NULL, so the first message sets it
+        self.last_message_at = db.func.greatest(cls.last_message_at, message.created_at)
+        self.message_count = cls.message_count + 1
+        for participant in self.participants:
+            participant.has_unread = participant.id != message.sender_participant_id
+            if participant.id not in copy_recipient_ids:
+                participant.missing_copy_count = ConversationParticipant.missing_copy_count + 1
+
+    @classmethod
+    def refresh_summaries(cls, conversation_ids: Iterable[int]) -> None:
+        """Recompute the denormalized inbox summary from the stored messages and copies.
+
+        Used when messages or copies are removed in bulk, where incrementally maintaining the
+        counters isn't possible.
+        """
+        conversation_ids = list(conversation_ids)
+        if not conversation_ids:
+            return
+
+        def latest_message_column(column: "InstrumentedAttribute[Any]") -> "ScalarSelect[Any]":
+            return (
+                db.select(column)
+                .where(ConversationMessage.conversation_id == cls.id)
+                .order_by(ConversationMessage.created_at.desc(), ConversationMessage.id.desc())
+                .limit(1)
+                .scalar_subquery()
+            )
+
+        db.session.execute(
+            db.update(cls)
+            .where(cls.id.in_(conversation_ids))
+            .values(
+                last_message_id=latest_message_column(ConversationMessage.id),
+                last_message_at=latest_message_column(ConversationMessage.created_at),
+                message_count=db.select(db.func.count(ConversationMessage.id))
+                .where(ConversationMessage.conversation_id == cls.id)
+                .scalar_subquery(),
+            ),
+            execution_options={"synchronize_session": False},
+        )
+
+        latest = db.aliased(ConversationMessage)
+        last_read = db.aliased(ConversationMessage)
+        has_unread = (
+            db.select(latest.id)
+            .join(cls, cls.last_message_id == latest.id)
+            .outerjoin(last_read, last_read.id == ConversationParticipant.last_read_message_id)
+            .where(cls.id == ConversationParticipant.conversation_id)
+            .where(latest.sender_participant_id != ConversationParticipant.id)
+            .where(
+                or_(
+                    and_(
+                        last_read.id.is_not(None),
+                        tuple_(latest.created_at, latest.id)
+                        > tuple_(last_read.created_at, last_read.id),
+                    ),
+                    and_(
+                        last_read.id.is_(None),
+                        or_(
+                            ConversationParticipant.last_read_at.is_(None),
+                            latest.created_at > ConversationParticipant.last_read_at,
+                        ),
+                    ),
+                )
+            )
+            .exists()
+        )
+        missing_copy_count = (
+            db.select(db.func.count(ConversationMessage.id))
+            .where(ConversationMessage.conversation_id == ConversationParticipant.conversation_id)
+            .where(
+                ~db.select(ConversationMessageCopy.id)
+                .where(ConversationMessageCopy.conversation_message_id == ConversationMessage.id)
+                .where(
+                    ConversationMessageCopy.recipient_participant_id == ConversationParticipant.id
+                )
+                .exists()
+            )
+            .scalar_subquery()
+        )
+        db.session.execute(
+            db.update(ConversationParticipant)
+            .where(ConversationParticipant.conversation_id.in_(conversation_ids))
+            .values(has_unread=has_unread, missing_copy_count=missing_copy_count),
+            execution_options={"synchronize_session": False},
+        )
+
 
 class ConversationParticipant(Model):
     __tablename__ = "conversation_participants"
@@ -86,7 +198,6 @@ class ConversationParticipant(Model):
         db.ForeignKey("conversation_messages.id", ondelete="SET NULL"),
         index=True,
     )
-    last_active_at: Mapped[datetime | None] = mapped_column(db.DateTime(timezone=True))
     deleted_at: Mapped[datetime | None] = mapped_column(db.DateTime(timezone=True))
     has_usable_public_key: Mapped[bool] = mapped_column(
         db.Boolean,
@@ -94,6 +205,15 @@ class ConversationParticipant(Model):
         default=False,
         server_default=text("false"),
     )
+    has_unread: Mapped[bool] = mapped_column(
+        db.Boolean,
+        nullable=False,
+        default=False,
+        server_default=text("false"),
+    )
+    missing_copy_count: Mapped[int] = mapped_column(
+        db.Integer, nullable=False, default=0, server_default=text("0")
+    )
 
     conversation: Mapped["Conversation"] = relationship(back_populates="participants")
     user: Mapped["User"] = relationship(back_populates="conversation_participants")
@@ -136,7 +256,9 @@ class ConversationMessage(Model):
         db.DateTime(timezone=True), server_default=text("NOW()"), nullable=False
     )
 
-    conversation: Mapped["Conversation"] = relationship(back_populates="messages")
+    conversation: Mapped["Conversation"] = relationship(
+        back_populates="messages", foreign_keys=[conversation_id]
+    )
     sender_participant: Mapped["ConversationParticipant"] = relationship(
         back_populates="sent_messages",
         foreign_keys=[sender_participant_id],
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+from sqlalchemy import DDL, event
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Mapped, mapped_column
+
+from hushline.db import db
+
+if TYPE_CHECKING:
+    from flask_sqlalchemy.model import Model
+else:
+    Model = db.Model
+
+
+class ConversationPresence(Model):
+    """
+    Last heartbeat per conversation participant.
+
+    Presence is rewritten every few seconds by every open conversation tab and is worthless after
+    a couple of minutes, so it lives outside `conversation_participants` in an UNLOGGED table:
+    heartbeats write no WAL and never contend with the participant row locks taken by message
+    appends. Losing the table on a crash only means a few notification emails are not suppressed.
+    """
+
+    __tablename__ = "conversation_presence"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    participant_id: Mapped[int] = mapped_column(
+        db.ForeignKey("conversation_participants.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_id: Mapped[int] = mapped_column(
+        db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    last_active_at: Mapped[datetime] = mapped_column(db.DateTime(timezone=True), nullable=False)
+
+    @classmethod
+    def mark_active(
+        cls, participant_id: int, user_id: int, *, now: datetime, coalesce: timedelta
+    ) -> None:
+        """
+        Record a heartbeat. Heartbeats arriving within `coalesce` of the stored one are dropped,
+        so many tabs polling the same conversation cost at most one row update per window.
+        """
+        statement = insert(cls).values(
+            participant_id=participant_id, user_id=user_id, last_active_at=now
+        )
+        db.session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[cls.participant_id],
+                set_={"last_active_at": statement.excluded.last_active_at},
+                where=cls.last_active_at < statement.excluded.last_active_at - coalesce,
+            )
+        )
+
+    @classmethod
+    def last_active_at_for(cls, participant_id: int) -> datetime | None:
+        return db.session.scalar(
+            db.select(cls.last_active_at).where(cls.participant_id == participant_id)
+        )
+
+    @classmethod
+    def user_is_active(cls, user_id: int, *, since: datetime) -> bool:
+        return bool(
+            db.session.scalar(
+                db.select(
+                    db.select(cls.participant_id)
+                    .where(cls.user_id == user_id, cls.last_active_at >= since)
+                    .exists()
+                )
+            )
+        )
+
+
+# heartbeats only touch last_active_at, which is not indexed, so leaving room on each page lets
+# Postgres apply them as HOT updates in place
+event.listen(
+    ConversationPresence.__table__,  # type: ignore[attr-defined]
+    "after_create",
+    DDL("ALTER TABLE conversation_presence SET (fillfactor = 50)"),
+)
@@ -0,0 +1,229 @@
+import secrets
+from datetime import UTC, datetime, timedelta
+from hashlib import sha256
+from typing import TYPE_CHECKING, Any
+from uuid import uuid4
+
+from sqlalchemy import Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from hushline.db import db
+
+if TYPE_CHECKING:
+    from flask_sqlalchemy.model import Model
+else:
+    Model = db.Model
+
+
+def _utc_now() -> datetime:
+    return datetime.now(UTC)
+
+
+def hash_data_export_download_token(token: str) -> str:
+    return sha256(token.encode("utf-8")).hexdigest()
+
+
+class DataExportJob(Model):
+    """
+    A data export built by `flask data-exports worker`.
+
+    The archive is encrypted to the user's PGP key before it is written to private blob storage.
+    It is fetched with a short-lived download token that stays valid until one download has been
+    sent in full, so an interrupted download can be resumed with Range requests. Artifacts and
+    rows are purged once `expires_at` passes.
+    """
+
+    __tablename__ = "data_export_jobs"
+    __table_args__ = (
+        Index(
+            "ix_data_export_jobs_pending_enqueued_at",
+            "enqueued_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        Index("ix_data_export_jobs_expires_at", "expires_at"),
+    )
+
+    STATUS_PENDING = "pending"
+    STATUS_READY = "ready"
+    STATUS_FAILED = "failed"
+
+    TOKEN_HASH_LENGTH = 64
+
+    id: Mapped[int] = mapped_column(primary_key=True, nullable=False, autoincrement=True)
+    public_id: Mapped[str] = mapped_column(
+        db.String(36), nullable=False, unique=True, default=lambda: str(uuid4())
+    )
+    user_id: Mapped[int] = mapped_column(
+        db.ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    status: Mapped[str] = mapped_column(
+        db.String(32),
+        nullable=False,
+        default=STATUS_PENDING,
+        server_default=STATUS_PENDING,
+    )
+    enqueued_at: Mapped[datetime] = mapped_column(
+        db.DateTime(timezone=True),
+        default=_utc_now,
+        server_default=text("NOW()"),
+        nullable=False,
+    )
+    claimed_until: Mapped[datetime | None] = mapped_column(db.DateTime(timezone=True))
+    completed_at: Mapped[datetime | None] = mapped_column(db.DateTime(timezone=True))
+    expires_at: Mapped[datetime | None] = mapped_column(db.DateTime(timezone=True))
+    size_bytes: Mapped[int | None] = mapped_column(db.BigInteger)
+    download_token_hash: Mapped[str | None] = mapped_column(
+        db.String(TOKEN_HASH_LENGTH), unique=True
+    )
+    download_token_expires_at: Mapped[datetime | None] = mapped_column(db.DateTime(timezone=True))
+    downloaded_at: Mapped[datetime | None] = mapped_column(db.DateTime(timezone=True))
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+
+    @property
+    def storage_path(self) -> str:
+        return f"data-exports/{self.public_id}.zip.asc"
+
+    @property
+    def is_pending(self) -> bool:
+        return self.status == self.STATUS_PENDING
+
+    @property
+    def is_ready(self) -> bool:
+        return self.status == self.STATUS_READY
+
+    @property
+    def is_failed(self) -> bool:
+        return self.status == self.STATUS_FAILED
+
+    @classmethod
+    def latest_for_user(
+        cls, user_id: int, *, now: datetime | None = None
+    ) -> "DataExportJob | None":
+        return db.session.scalars(
+            db.select(cls)
+            .where(
+                cls.user_id == user_id,
+                db.or_(cls.expires_at.is_(None), cls.expires_at > (now or _utc_now())),
+            )
+            .order_by(cls.id.desc())
+            .limit(1)
+        ).first()
+
+    @classmethod
+    def ready_for_user(
+        cls, public_id: str, user_id: int, *, now: datetime | None = None
+    ) -> "DataExportJob | None":
+        return db.session.scalars(
+            db.select(cls).where(
+                cls.public_id == public_id,
+                cls.user_id == user_id,
+                cls.status == cls.STATUS_READY,
+                cls.expires_at > (now or _utc_now()),
+            )
+        ).first()
+
+    @classmethod
+    def pending_for_user(cls, user_id: int) -> "DataExportJob | None":
+        return db.session.scalars(
+            db.select(cls).where(cls.user_id == user_id, cls.status == cls.STATUS_PENDING).limit(1)
+        ).first()
+
+    @classmethod
+    def claim_batch(
+        cls, batch_size: int, *, lease: timedelta, now: datetime | None = None
+    ) -> list["DataExportJob"]:
+        """
+        Lease up to `batch_size` pending jobs to the caller and return them. The caller commits
+        the claim before building anything, and jobs whose lease expired are claimed again.
+        """
+        now = now or _utc_now()
+        claimable = (
+            db.select(cls.id)
+            .where(
+                cls.status == cls.STATUS_PENDING,
+                db.or_(cls.claimed_until.is_(None), cls.claimed_until < now),
+            )
+            .order_by(cls.enqueued_at, cls.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        return list(
+            db.session.scalars(
+                db.update(cls)
+                .where(cls.id.in_(claimable.scalar_subquery()))
+                .values(claimed_until=now + lease)
+                .returning(cls),
+                execution_options={"synchronize_session": False},
+            ).all()
+        )
+
+    @classmethod
+    def lock_pending(cls, job_id: int) -> "DataExportJob | None":
+        """Lock a claimed job for the rest of the transaction if it still exists and is pending."""
+        return db.session.scalars(
+            db.select(cls)
+            .where(cls.id == job_id, cls.status == cls.STATUS_PENDING)
+            .with_for_update()
+        ).first()
+
+    @classmethod
+    def claim_expired(
+        cls, batch_size: int, *, now: datetime | None = None
+    ) -> list["DataExportJob"]:
+        """Lock up to `batch_size` expired jobs for the current transaction."""
+        return list(
+            db.session.scalars(
+                db.select(cls)
+                .where(cls.expires_at <= (now or _utc_now()))
+                .order_by(cls.expires_at, cls.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            ).all()
+        )
+
+    @classmethod
+    def for_download_token(
+        cls, token: str, user_id: int, *, now: datetime | None = None
+    ) -> "DataExportJob | None":
+        now = now or _utc_now()
+        return db.session.scalars(
+            db.select(cls).where(
+                cls.download_token_hash == hash_data_export_download_token(token),
+                cls.user_id == user_id,
+                cls.status == cls.STATUS_READY,
+                cls.download_token_expires_at > now,
+                cls.expires_at > now,
+            )
+        ).first()
+
+    def mark_ready(self, size_bytes: int, *, retention: timedelta) -> None:
+        now = _utc_now()
+        self.status = self.STATUS_READY
+        self.size_bytes = size_bytes
+        self.completed_at = now
+        self.expires_at = now + retention
+        self.claimed_until = None
+
+    def mark_failed(self, *, retention: timedelta) -> None:
+        now = _utc_now()
+        self.status = self.STATUS_FAILED
+        self.completed_at = now
+        # kept for a while so the settings page can say what happened
+        self.expires_at = now + retention
+        self.claimed_until = None
+
+    def issue_download_token(self, *, ttl: timedelta) -> str:
+        """Replace any earlier download token with a new one and return it."""
+        token = secrets.token_urlsafe(32)
+        self.download_token_hash = hash_data_export_download_token(token)
+        self.download_token_expires_at = _utc_now() + ttl
+        return token
+
+    def mark_downloaded(self) -> None:
+        self.downloaded_at = _utc_now()
+        self.download_token_hash = None
+        self.download_token_expires_at = None
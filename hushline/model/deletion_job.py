@@ -0,0 +1,114 @@
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from hushline.db import db
+
+if TYPE_CHECKING:
+    from flask_sqlalchemy.model import Model
+else:
+    Model = db.Model
+
+
+def _utc_now() -> datetime:
+    return datetime.now(UTC)
+
+
+class DeletionJob(Model):
+    """
+    An account, or one of its usernames, being deleted by `flask deletions worker`.
+
+    The account or username is tombstoned when the job is queued, and the worker deletes its data
+    in bounded batches, one transaction each, before deleting the row itself. The ids are not
+    foreign keys because the job outlives the rows it deletes.
+    """
+
+    __tablename__ = "deletion_jobs"
+    __table_args__ = (
+        Index(
+            "ix_deletion_jobs_pending_next_attempt_at",
+            "next_attempt_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
+
+    STATUS_PENDING = "pending"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    LAST_ERROR_MAX_LENGTH = 255
+
+    id: Mapped[int] = mapped_column(primary_key=True, nullable=False, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(db.Integer, nullable=False, index=True)
+    # set when only this username, not the whole account, is being deleted
+    username_id: Mapped[int | None] = mapped_column(db.Integer)
+    status: Mapped[str] = mapped_column(
+        db.String(32),
+        nullable=False,
+        default=STATUS_PENDING,
+        server_default=STATUS_PENDING,
+    )
+    rows_deleted: Mapped[int] = mapped_column(
+        db.BigInteger, nullable=False, default=0, server_default=text("0")
+    )
+    attempts: Mapped[int] = mapped_column(
+        db.Integer, nullable=False, default=0, server_default=text("0")
+    )
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        db.DateTime(timezone=True),
+        default=_utc_now,
+        server_default=text("NOW()"),
+        nullable=False,
+    )
+    last_error: Mapped[str | None] = mapped_column(db.String(LAST_ERROR_MAX_LENGTH), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        db.DateTime(timezone=True),
+        default=_utc_now,
+        server_default=text("NOW()"),
+        nullable=False,
+    )
+    completed_at: Mapped[datetime | None] = mapped_column(db.DateTime(timezone=True))
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+
+    @classmethod
+    def claim_next(cls, *, now: datetime | None = None) -> "DeletionJob | None":
+        """
+        Lock the next due job for the current transaction. Jobs locked by other workers are
+        skipped, so one job is only ever worked on by one worker at a time.
+        """
+        return db.session.scalars(
+            db.select(cls)
+            .where(cls.status == cls.STATUS_PENDING, cls.next_attempt_at <= (now or _utc_now()))
+            .order_by(cls.next_attempt_at, cls.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        ).first()
+
+    def record_progress(self, count: int) -> None:
+        self.rows_deleted += count
+        self.attempts = 0
+        self.last_error = None
+
+    def mark_done(self) -> None:
+        self.status = self.STATUS_DONE
+        self.completed_at = _utc_now()
+        self.last_error = None
+
+    def mark_retry(self, error: str, *, delay: timedelta) -> None:
+        self.attempts += 1
+        self.next_attempt_at = _utc_now() + delay
+        self.last_error = error[: self.LAST_ERROR_MAX_LENGTH]
+
+    def mark_failed(self, error: str) -> None:
+        self.status = self.STATUS_FAILED
+        self.attempts += 1
+        self.last_error = error[: self.LAST_ERROR_MAX_LENGTH]
+
+    def requeue(self) -> None:
+        self.status = self.STATUS_PENDING
+        self.attempts = 0
+        self.next_attempt_at = _utc_now()
@@ -0,0 +1,156 @@
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from hushline.config import EncryptedFieldWriteFormat
+from hushline.crypto import (
+    ENCRYPTED_FIELD_CONTRACT_BY_ID,
+    decrypt_field,
+    encrypt_field,
+    encrypted_field_write_format,
+    is_encrypted_field_aead_envelope,
+)
+from hushline.db import db
+
+if TYPE_CHECKING:
+    from flask_sqlalchemy.model import Model
+else:
+    Model = db.Model
+
+
+def _utc_now() -> datetime:
+    return datetime.now(UTC)
+
+
+class EmailOutbox(Model):
+    """
+    Notification email waiting for delivery by `flask notifications worker`.
+
+    Bodies can hold submitted field values, so they are stored with `encrypt_field` like
+    `FieldValue.value`, on top of any PGP encryption for the recipient. SMTP settings are not
+    copied: the worker resolves them from the user when it sends. Bodies are cleared once a row
+    is sent or permanently failed.
+    """
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index(
+            "ix_email_outbox_pending_next_attempt_at",
+            "next_attempt_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
+
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+
+    LAST_ERROR_MAX_LENGTH = 255
+
+    id: Mapped[int] = mapped_column(primary_key=True, nullable=False, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(
+        db.ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    to_email: Mapped[str] = mapped_column(db.String(255), nullable=False)
+    reply_to: Mapped[str | None] = mapped_column(db.String(255), nullable=True)
+    subject: Mapped[str] = mapped_column(db.String(255), nullable=False)
+    _body: Mapped[str | None] = mapped_column("body", db.Text, nullable=True)
+    status: Mapped[str] = mapped_column(
+        db.String(32),
+        nullable=False,
+        default=STATUS_PENDING,
+        server_default=STATUS_PENDING,
+    )
+    attempts: Mapped[int] = mapped_column(
+        db.Integer, nullable=False, default=0, server_default=text("0")
+    )
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        db.DateTime(timezone=True),
+        default=_utc_now,
+        server_default=text("NOW()"),
+        nullable=False,
+    )
+    last_error: Mapped[str | None] = mapped_column(db.String(LAST_ERROR_MAX_LENGTH), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        db.DateTime(timezone=True),
+        default=_utc_now,
+        server_default=text("NOW()"),
+        nullable=False,
+    )
+    sent_at: Mapped[datetime | None] = mapped_column(db.DateTime(timezone=True))
+
+    def __init__(self, *, body: str | None = None, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.body = body
+
+    def _encrypted_field_aad_values(self) -> dict[str, int]:
+        if (
+            self.id is None
+            and encrypted_field_write_format() == EncryptedFieldWriteFormat.ENVELOPE_AES_GCM
+        ):
+            db.session.add(self)
+            db.session.flush()
+        if self.id is None or self.user_id is None:
+            raise ValueError("Email outbox encrypted-field AAD requires persisted row ids")
+        return {"email_outbox_id": self.id, "user_id": self.user_id}
+
+    @property
+    def body(self) -> str | None:
+        if self._body is None:
+            return None
+        if not is_encrypted_field_aead_envelope(self._body):
+            return decrypt_field(self._body)
+        return decrypt_field(
+            self._body,
+            contract=ENCRYPTED_FIELD_CONTRACT_BY_ID["EmailOutbox.body"],
+            aad_values=self._encrypted_field_aad_values(),
+        )
+
+    @body.setter
+    def body(self, value: str | None) -> None:
+        if value is None:
+            self._body = None
+        elif encrypted_field_write_format() != EncryptedFieldWriteFormat.ENVELOPE_AES_GCM:
+            self._body = encrypt_field(value)
+        else:
+            self._body = encrypt_field(
+                value,
+                contract=ENCRYPTED_FIELD_CONTRACT_BY_ID["EmailOutbox.body"],
+                aad_values=self._encrypted_field_aad_values(),
+            )
+
+    @classmethod
+    def claim_next(cls, *, now: datetime | None = None) -> "EmailOutbox | None":
+        """
+        Lock the next due row for the current transaction. Rows locked by other workers are
+        skipped rather than waited on, so any number of workers can drain the outbox at once.
+        """
+        return db.session.scalars(
+            db.select(cls)
+            .where(cls.status == cls.STATUS_PENDING, cls.next_attempt_at <= (now or _utc_now()))
+            .order_by(cls.next_attempt_at, cls.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        ).first()
+
+    def mark_sent(self) -> None:
+        self.status = self.STATUS_SENT
+        self.attempts += 1
+        self.sent_at = _utc_now()
+        self.last_error = None
+        self.body = None
+
+    def mark_retry(self, error: str, *, delay: timedelta) -> None:
+        self.attempts += 1
+        self.next_attempt_at = _utc_now() + delay
+        self.last_error = error[: self.LAST_ERROR_MAX_LENGTH]
+
+    def mark_failed(self, error: str) -> None:
+        self.status = self.STATUS_FAILED
+        self.attempts += 1
+        self.last_error = error[: self.LAST_ERROR_MAX_LENGTH]
+        self.body = None
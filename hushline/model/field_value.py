@@ -1,6 +1,7 @@
 import secrets
 from typing import TYPE_CHECKING
 
+from sqlalchemy import text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from hushline.config import EncryptedFieldWriteFormat
@@ -42,6 +43,40 @@ def add_padding(value: str, block_size: int = 512) -> str:
     return value + padding
 
 
+def reserve_message_and_field_value_ids(field_value_count: int) -> tuple[int, list[int]]:
+    """
+    Take a message id and `field_value_count` field value ids from their sequences in one query.
+
+    AES-GCM field values bind their own row id and their message's id into the AAD, so without
+    reserved ids every value has to be flushed before it can be encrypted. With them, a whole
+    submission is encrypted in memory and inserted with one multi-row INSERT per table.
+    """
+    message_id, field_value_ids = db.session.execute(
+        text(
+            "SELECT nextval(pg_get_serial_sequence('messages', 'id')), "
+            "ARRAY(SELECT nextval(pg_get_serial_sequence('field_values', 'id')) "
+            "FROM generate_series(1, :count))"
+        ),
+        {"count": field_value_count},
+    ).one()
+    return message_id, list(field_value_ids)
+
+
+def reserve_message_and_field_value_id_pairs(count: int) -> list[tuple[int, int]]:
+    """Take `count` message ids, each with one field value id, from their sequences in one query."""
+    return [
+        (message_id, field_value_id)
+        for message_id, field_value_id in db.session.execute(
+            text(
+                "SELECT nextval(pg_get_serial_sequence('messages', 'id')), "
+                "nextval(pg_get_serial_sequence('field_values', 'id')) "
+                "FROM generate_series(1, :count)"
+            ),
+            {"count": count},
+        )
+    ]
+
+
 class FieldValue(Model):
     __tablename__ = "field_values"
 
@@ -57,17 +92,24 @@ class FieldValue(Model):
     _value: Mapped[str] = mapped_column(db.Text, nullable=False)
     encrypted: Mapped[bool] = mapped_column(nullable=True)
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         field_definition: "FieldDefinition",
         message: "Message",
         value: str,
         encrypted: bool,
+        *,
+        reserved_id: int | None = None,
     ) -> None:
         self.field_definition = field_definition
         self.message = message
         self.encrypted = encrypted
-        if encrypted_field_write_format() == EncryptedFieldWriteFormat.ENVELOPE_AES_GCM:
+        if reserved_id is not None:
+            # ids from `reserve_message_and_field_value_ids` make the AAD available before flush
+            self.id = reserved_id
+            self.field_definition_id = field_definition.id
+            self.message_id = message.id
+        elif encrypted_field_write_format() == EncryptedFieldWriteFormat.ENVELOPE_AES_GCM:
             self._value = ""
             db.session.add(self)
             db.session.flush()
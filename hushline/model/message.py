@@ -1,14 +1,16 @@
+from collections.abc import Iterable
 from datetime import datetime
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
 from markupsafe import Markup
 from sqlalchemy import Enum as SQLAlchemyEnum
-from sqlalchemy import and_, text
+from sqlalchemy import Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from hushline.crypto import gen_reply_slug
 from hushline.db import db
+from hushline.md import md_to_html
 from hushline.model.enums import MessageStatus
 from hushline.model.message_status_text import MessageStatusText
 
@@ -22,6 +24,14 @@ else:
 
 class Message(Model):
     __tablename__ = "messages"
+    __table_args__ = (
+        Index(
+            "ix_messages_username_id_conversation_id_created_at",
+            "username_id",
+            "conversation_id",
+            "created_at",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, nullable=False, autoincrement=True)
     public_id: Mapped[str] = mapped_column(
@@ -61,20 +71,31 @@ class Message(Model):
             public_id=str(uuid4()),  # type: ignore[call-arg]
         )
 
-    # using a plain property because the mapper/join was too complicated.
-    # a better coder than me should properly configure this in the future.
     @property
-    def status_text(self) -> str | Markup:
-        # Import here to avoid circular imports
-        from hushline.model import User, Username
+    def status_text(self) -> Markup:
+        return Message.resolve_status_texts([self])[self.id]
+
+    @staticmethod
+    def resolve_status_texts(messages: "Iterable[Message]") -> dict[int, Markup]:
+        """
+        Map message ids to their owner's reply text for the message's current status, using a
+        single query for all of the messages' usernames. Each custom text is rendered once.
+        """
+        from hushline.model import Username
 
-        if status_text := db.session.scalars(
-            db.select(MessageStatusText)
-            .join(User, User.id == MessageStatusText.user_id)
-            .join(Username, and_(Username.user_id == User.id, Username.id == self.username_id))
-            .join(Message, and_(Message.username_id == Username.id, Message.id == self.id))
-            .filter(MessageStatusText.status == Message.status)
-        ).one_or_none():
-            return status_text.markdown
-        else:
-            return self.status.default_text
+        messages = list(messages)
+        username_ids = {x.username_id for x in messages}
+        html_by_markdown: dict[str, Markup] = {}
+        rendered: dict[tuple[int, MessageStatus], Markup] = {}
+        if username_ids:
+            for username_id, status, markdown in db.session.execute(
+                db.select(Username.id, MessageStatusText.status, MessageStatusText.markdown)
+                .join(MessageStatusText, MessageStatusText.user_id == Username.user_id)
+                .where(Username.id.in_(username_ids))
+            ):
+                if markdown not in html_by_markdown:
+                    html_by_markdown[markdown] = md_to_html(markdown)
+                rendered[(username_id, status)] = html_by_markdown[markdown]
+        return {
+            x.id: rendered.get((x.username_id, x.status), x.status.default_text) for x in messages
+        }
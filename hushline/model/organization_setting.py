@@ -17,11 +17,12 @@ class OrganizationSetting(Model):
 
     # keys
     BRAND_LOGO = "brand_logo"
+    BRAND_LOGO_VARIANTS = "brand_logo_variants"
     BRAND_NAME = "brand_name"
     BRAND_PRIMARY_COLOR = "brand_primary_color"
     BRAND_PROFILE_HEADER_TEMPLATE = "brand_profile_header_template"
     BRAND_SPLASH_LOGO = "brand_splash_logo"
-    BRAND_SPLASH_LOGO_CACHE_BUSTER = "brand_splash_logo_cache_buster"
+    BRAND_SPLASH_LOGO_VARIANTS = "brand_splash_logo_variants"
     BRAND_SPLASH_SCREEN_ENABLED = "brand_splash_screen_enabled"
     DIRECTORY_HEADING = "directory_heading"
     DIRECTORY_INTRO_TEXT = "directory_intro_text"
@@ -35,9 +36,9 @@ class OrganizationSetting(Model):
     REGISTRATION_ENABLED = "registration_enabled"
     REGISTRATION_CODES_REQUIRED = "registration_codes_required"
 
-    # non-default values
-    BRAND_LOGO_VALUE = "brand/logo.png"
-    BRAND_SPLASH_LOGO_VALUE = "brand/splash-logo.png"
+    # uploads are stored at `<stem>-<content hash>.<format>`, one file per variant
+    BRAND_LOGO_PATH_STEM = "brand/logo"
+    BRAND_SPLASH_LOGO_PATH_STEM = "brand/splash-logo"
 
     _DEFAULT_VALUES: dict[str, Any] = {
         BRAND_NAME: "🤫 Hush Line",
@@ -0,0 +1,161 @@
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any, Sequence
+
+from sqlalchemy import UniqueConstraint, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Mapped, mapped_column
+
+from hushline.db import db
+
+if TYPE_CHECKING:
+    from flask_sqlalchemy.model import Model
+else:
+    Model = db.Model
+
+
+def _utc_now() -> datetime:
+    return datetime.now(UTC)
+
+
+class ProfileLinkVerification(Model):
+    """
+    A profile extra field link waiting to be verified by `flask profile-links worker`.
+
+    There is at most one row per field. Saving the profile again replaces the row, so the worker
+    only applies its result if the row it claimed is still the one in the table. While a row
+    exists the field is shown as pending.
+    """
+
+    __tablename__ = "profile_link_verifications"
+    __table_args__ = (
+        UniqueConstraint(
+            "username_id",
+            "field_index",
+            name="uq_profile_link_verifications_username_id_field_index",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, nullable=False, autoincrement=True)
+    username_id: Mapped[int] = mapped_column(
+        db.ForeignKey("usernames.id", ondelete="CASCADE"), nullable=False
+    )
+    field_index: Mapped[int] = mapped_column(db.SmallInteger, nullable=False)
+    url: Mapped[str] = mapped_column(db.Text, nullable=False)
+    profile_url: Mapped[str] = mapped_column(db.Text, nullable=False)
+    enqueued_at: Mapped[datetime] = mapped_column(
+        db.DateTime(timezone=True),
+        default=_utc_now,
+        server_default=text("NOW()"),
+        nullable=False,
+    )
+    claimed_until: Mapped[datetime | None] = mapped_column(db.DateTime(timezone=True))
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+
+    @classmethod
+    def enqueue(cls, username_id: int, field_index: int, url: str, profile_url: str) -> None:
+        statement = insert(cls).values(
+            username_id=username_id, field_index=field_index, url=url, profile_url=profile_url
+        )
+        db.session.execute(
+            statement.on_conflict_do_update(
+                constraint="uq_profile_link_verifications_username_id_field_index",
+                set_={
+                    "url": statement.excluded.url,
+                    "profile_url": statement.excluded.profile_url,
+                    "enqueued_at": db.func.now(),
+                    "claimed_until": None,
+                },
+            )
+        )
+
+    @classmethod
+    def discard(cls, username_id: int, field_indexes: Sequence[int]) -> None:
+        if field_indexes:
+            db.session.execute(
+                db.delete(cls).where(
+                    cls.username_id == username_id, cls.field_index.in_(field_indexes)
+                )
+            )
+
+    @classmethod
+    def claim_batch(
+        cls, batch_size: int, *, lease: timedelta, now: datetime | None = None
+    ) -> list["ProfileLinkVerification"]:
+        """
+        Lease up to `batch_size` rows to the caller and return them. The caller commits the claim
+        before fetching anything, so profile saves never wait on a worker's network requests.
+        Rows whose lease expired, because a worker died, are claimed again.
+        """
+        now = now or _utc_now()
+        claimable = (
+            db.select(cls.id)
+            .where(db.or_(cls.claimed_until.is_(None), cls.claimed_until < now))
+            .order_by(cls.enqueued_at, cls.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        return list(
+            db.session.scalars(
+                db.update(cls)
+                .where(cls.id.in_(claimable.scalar_subquery()))
+                .values(claimed_until=now + lease)
+                .returning(cls),
+                execution_options={"synchronize_session": False},
+            ).all()
+        )
+
+    def lock_if_unchanged(self) -> bool:
+        """
+        Lock this row for the rest of the transaction if it has not been re-enqueued since it was
+        claimed, so a result is never applied to a link the user changed in the meantime.
+        """
+        cls = type(self)
+        return (
+            db.session.scalar(
+                db.select(cls.id)
+                .where(cls.id == self.id, cls.enqueued_at == self.enqueued_at)
+                .with_for_update()
+            )
+            is not None
+        )
+
+
+class ProfileLinkCheck(Model):
+    """
+    Cached result of checking one linked page for one profile URL.
+
+    Rows are keyed by a hash of the pair, so any number of profiles linking the same page with
+    the same profile URL share a fetch. The page's ETag is kept to revalidate stale results with a
+    conditional request.
+    """
+
+    __tablename__ = "profile_link_checks"
+
+    KEY_LENGTH = 64
+    ETAG_MAX_LENGTH = 255
+
+    key: Mapped[str] = mapped_column(db.String(KEY_LENGTH), primary_key=True)
+    verified: Mapped[bool] = mapped_column(db.Boolean, nullable=False)
+    etag: Mapped[str | None] = mapped_column(db.String(ETAG_MAX_LENGTH))
+    checked_at: Mapped[datetime] = mapped_column(db.DateTime(timezone=True), nullable=False)
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+
+    @classmethod
+    def store(cls, rows: Sequence[dict[str, Any]]) -> None:
+        if not rows:
+            return
+        statement = insert(cls).values(list(rows))
+        db.session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[cls.key],
+                set_={
+                    "verified": statement.excluded.verified,
+                    "etag": statement.excluded.etag,
+                    "checked_at": statement.excluded.checked_at,
+                },
+            )
+        )
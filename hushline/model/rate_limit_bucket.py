@@ -0,0 +1,42 @@
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import DDL, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from hushline.db import db
+
+if TYPE_CHECKING:
+    from flask_sqlalchemy.model import Model
+else:
+    Model = db.Model
+
+
+class RateLimitBucket(Model):
+    """
+    State of one rate limit bucket for the Postgres backend in `hushline.ratelimit`.
+
+    A bucket only stores its theoretical arrival time (`tat`, seconds since the epoch), so each
+    check is a single upsert on the primary key. Rows whose `tat` has passed are empty buckets and
+    can be deleted at any time. Like presence, losing the table on a crash only resets limits, so
+    it is UNLOGGED and checks write no WAL.
+    """
+
+    __tablename__ = "rate_limit_buckets"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    KEY_LENGTH = 255
+
+    key: Mapped[str] = mapped_column(db.String(KEY_LENGTH), primary_key=True)
+    tat: Mapped[float] = mapped_column(db.Double, nullable=False)
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+
+
+# checks only touch tat, which is not indexed, so leaving room on each page lets Postgres apply
+# them as HOT updates in place
+event.listen(
+    RateLimitBucket.__table__,  # type: ignore[attr-defined]
+    "after_create",
+    DDL("ALTER TABLE rate_limit_buckets SET (fillfactor = 50)"),
+)
@@ -1,4 +1,5 @@
 import secrets
+from datetime import datetime
 from typing import TYPE_CHECKING, Any, Optional
 
 from flask import current_app
@@ -66,6 +67,8 @@ class User(Model):
     is_suspended: Mapped[bool] = mapped_column(
         server_default=text("false"), default=False, nullable=False
     )
+    # set when the account is queued for deletion, which logs it out and blocks logins
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(db.DateTime(timezone=True))
     session_id: Mapped[str] = mapped_column(
         db.String(SESSION_ID_MAX_LENGTH),
         nullable=False,
@@ -1,5 +1,6 @@
 import ipaddress
 from dataclasses import dataclass
+from datetime import datetime
 from typing import TYPE_CHECKING, Any, Generator, Optional, Sequence
 from urllib.parse import urlsplit
 
@@ -9,7 +10,7 @@ from sqlalchemy.ext.mutable import MutableList
 from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from hushline.db import db
-from hushline.model import FieldDefinition, FieldType
+from hushline.model import FieldDefinition, FieldType, ProfileLinkVerification
 
 if TYPE_CHECKING:
     from flask_sqlalchemy.model import Model
@@ -116,6 +117,8 @@ class Username(Model):
         server_default=text("false"),
     )
     show_in_directory: Mapped[bool] = mapped_column(default=False)
+    # set when the username is queued for deletion; its profile is no longer served
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(db.DateTime(timezone=True))
     bio: Mapped[Optional[str]] = mapped_column(db.Text)
     embed_enabled: Mapped[bool] = mapped_column(
         db.Boolean,
@@ -154,6 +157,11 @@ class Username(Model):
         back_populates="username",
         order_by="FieldDefinition.sort_order",
     )
+    # read-only: rows are written by `ProfileLinkVerification.enqueue` and the worker
+    profile_link_verifications: Mapped[list["ProfileLinkVerification"]] = relationship(
+        viewonly=True,
+        order_by="ProfileLinkVerification.field_index",
+    )
 
     def __init__(
         self,
@@ -185,6 +193,11 @@ class Username(Model):
         self._display_name = display_name
         self.is_verified = False
 
+    @property
+    def pending_extra_field_verifications(self) -> set[int]:
+        """Indexes of extra fields whose links are queued for verification."""
+        return {verification.field_index for verification in self.profile_link_verifications}
+
     @property
     def extra_fields(self) -> Generator[ExtraField, None, None]:
         for i in range(1, 5):
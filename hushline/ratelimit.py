@@ -0,0 +1,264 @@
+"""
+Rate limiting for embed submissions, chat messages, password reset requests and 2FA guesses.
+
+Every limit is a GCRA (generic cell rate algorithm) bucket: `limit` events are allowed per
+`window_seconds`, and a bucket only stores its theoretical arrival time (TAT), the time at which it
+will be empty again. An event is allowed when it would not push the TAT more than one window into
+the future. This behaves like a sliding window that refills one event every `window / limit`
+seconds, without keeping a row per attempt or deleting expired rows on every check.
+
+`RATE_LIMIT_BACKEND` picks where buckets live:
+
+* `postgres` (default): the UNLOGGED `rate_limit_buckets` table, one upsert per bucket inside the
+  caller's transaction, so a check rolls back with the request that made it.
+* `memory`: a dict in this process. Only correct when a single process serves the app.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Collection, Sequence
+from dataclasses import dataclass
+
+from flask import current_app
+from sqlalchemy.dialects.postgresql import insert
+
+from hushline.config import RateLimitBackendKind
+from hushline.db import db
+from hushline.model import RateLimitBucket
+
+# float TATs accumulate rounding error, so a bucket exactly at its limit must not tip over
+_TAT_TOLERANCE_SECONDS = 1e-6
+_MEMORY_PRUNE_THRESHOLD = 10_000
+_RATE_LIMITER_EXTENSION = "hushline_rate_limiter"
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    Allow `limit` events per `window_seconds` in the bucket `key`. `scope` is reported back when
+    the bucket is full. A limit or window of zero or less disables the bucket.
+    """
+
+    scope: str
+    key: str
+    limit: int
+    window_seconds: float
+
+    @property
+    def enabled(self) -> bool:
+        return self.limit > 0 and self.window_seconds > 0
+
+    @property
+    def interval(self) -> float:
+        return self.window_seconds / self.limit
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    limited_scopes: tuple[str, ...]
+
+    @property
+    def limited(self) -> bool:
+        return bool(self.limited_scopes)
+
+
+def _next_tat(tat: float | None, now: float, limit: RateLimit) -> tuple[bool, float]:
+    """Whether one more event fits in the bucket, and the bucket's TAT if it is recorded."""
+    next_tat = max(now if tat is None else tat, now) + limit.interval
+    return next_tat - now <= limit.window_seconds + _TAT_TOLERANCE_SECONDS, next_tat
+
+
+class RateLimitBackend(ABC):
+    @abstractmethod
+    def hit(
+        self, limits: Sequence[RateLimit], *, now: float, record_when_limited: bool
+    ) -> set[str]:
+        """
+        Record one event in every bucket and return the keys of the buckets that were full.
+        When any bucket is full nothing is recorded, unless `record_when_limited` is set, in which
+        case full buckets are held full for another window.
+        """
+
+    @abstractmethod
+    def peek(self, limits: Sequence[RateLimit], *, now: float) -> set[str]:
+        """Return the keys of the buckets that would reject an event, without recording one."""
+
+    @abstractmethod
+    def prune(self, *, now: float, batch_size: int | None = None) -> int:
+        """Forget up to `batch_size` empty buckets and return how many were removed."""
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    def __init__(self) -> None:
+        self._tats: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def hit(
+        self, limits: Sequence[RateLimit], *, now: float, record_when_limited: bool
+    ) -> set[str]:
+        with self._lock:
+            if len(self._tats) > _MEMORY_PRUNE_THRESHOLD:
+                self._prune(now)
+            next_tats: dict[str, float] = {}
+            limited: set[str] = set()
+            for limit in limits:
+                tat = self._tats.get(limit.key)
+                allowed, next_tat = _next_tat(tat, now, limit)
+                if not allowed:
+                    limited.add(limit.key)
+                    next_tat = max(now if tat is None else tat, now + limit.window_seconds)
+                next_tats[limit.key] = next_tat
+            if not limited or record_when_limited:
+                self._tats.update(next_tats)
+            return limited
+
+    def peek(self, limits: Sequence[RateLimit], *, now: float) -> set[str]:
+        with self._lock:
+            return {
+                limit.key
+                for limit in limits
+                if not _next_tat(self._tats.get(limit.key), now, limit)[0]
+            }
+
+    def prune(self, *, now: float, batch_size: int | None = None) -> int:
+        with self._lock:
+            return self._prune(now, batch_size)
+
+    def _prune(self, now: float, batch_size: int | None = None) -> int:
+        expired = [key for key, tat in self._tats.items() if tat <= now][:batch_size]
+        for key in expired:
+            del self._tats[key]
+        return len(expired)
+
+
+class PostgresRateLimitBackend(RateLimitBackend):
+    """
+    Buckets in `rate_limit_buckets`, checked with one `INSERT ... ON CONFLICT DO UPDATE` each.
+
+    The upsert only updates the row when the event fits, so a returned row means "allowed". The
+    conflicting row stays locked until the caller's transaction ends, which serializes concurrent
+    checks of the same bucket. Buckets are visited in key order so checks never deadlock.
+    """
+
+    def hit(
+        self, limits: Sequence[RateLimit], *, now: float, record_when_limited: bool
+    ) -> set[str]:
+        allowed: list[RateLimit] = []
+        limited: list[RateLimit] = []
+        for limit in sorted(limits, key=lambda limit: limit.key):
+            statement = insert(RateLimitBucket).values(key=limit.key, tat=now + limit.interval)
+            next_tat = db.func.greatest(RateLimitBucket.tat, now) + limit.interval
+            row = db.session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[RateLimitBucket.key],
+                    set_={"tat": next_tat},
+                    where=next_tat - now <= limit.window_seconds + _TAT_TOLERANCE_SECONDS,
+                ).returning(RateLimitBucket.key)
+            ).first()
+            (allowed if row is not None else limited).append(limit)
+
+        if limited and record_when_limited:
+            for limit in limited:
+                db.session.execute(
+                    db.update(RateLimitBucket)
+                    .where(
+                        RateLimitBucket.key == limit.key,
+                        RateLimitBucket.tat < now + limit.window_seconds,
+                    )
+                    .values(tat=now + limit.window_seconds)
+                )
+        elif limited:
+            # the rows are still locked, so handing back the events recorded above is exact
+            for limit in allowed:
+                db.session.execute(
+                    db.update(RateLimitBucket)
+                    .where(RateLimitBucket.key == limit.key)
+                    .values(tat=RateLimitBucket.tat - limit.interval)
+                )
+        return {limit.key for limit in limited}
+
+    def peek(self, limits: Sequence[RateLimit], *, now: float) -> set[str]:
+        tats = dict(
+            db.session.execute(
+                db.select(RateLimitBucket.key, RateLimitBucket.tat).where(
+                    RateLimitBucket.key.in_([limit.key for limit in limits])
+                )
+            )
+            .tuples()
+            .all()
+        )
+        return {limit.key for limit in limits if not _next_tat(tats.get(limit.key), now, limit)[0]}
+
+    def prune(self, *, now: float, batch_size: int | None = None) -> int:
+        # buckets locked by in-flight checks are skipped rather than waited on
+        expired = (
+            db.select(RateLimitBucket.key)
+            .where(RateLimitBucket.tat <= now)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = db.session.execute(
+            db.delete(RateLimitBucket).where(
+                RateLimitBucket.tat <= now, RateLimitBucket.key.in_(expired.scalar_subquery())
+            )
+        )
+        return result.rowcount or 0  # type: ignore[attr-defined]
+
+
+class RateLimiter:
+    def __init__(self, backend: RateLimitBackend) -> None:
+        self.backend = backend
+
+    def hit(
+        self,
+        limits: Collection[RateLimit],
+        *,
+        now: float | None = None,
+        record_when_limited: bool = False,
+    ) -> RateLimitResult:
+        """
+        Count one event against every limit. All-or-nothing: a limited event is not counted
+        against any bucket unless `record_when_limited` is set, for attempts that should keep
+        an attacker locked out for as long as they keep trying.
+        """
+        active = [limit for limit in limits if limit.enabled]
+        if not active:
+            return RateLimitResult(limited_scopes=())
+        limited_keys = self.backend.hit(
+            active,
+            now=time.time() if now is None else now,
+            record_when_limited=record_when_limited,
+        )
+        return RateLimitResult(
+            limited_scopes=tuple(limit.scope for limit in active if limit.key in limited_keys)
+        )
+
+    def peek(self, limits: Collection[RateLimit], *, now: float | None = None) -> RateLimitResult:
+        active = [limit for limit in limits if limit.enabled]
+        if not active:
+            return RateLimitResult(limited_scopes=())
+        limited_keys = self.backend.peek(active, now=time.time() if now is None else now)
+        return RateLimitResult(
+            limited_scopes=tuple(limit.scope for limit in active if limit.key in limited_keys)
+        )
+
+    def prune(self, *, now: float | None = None, batch_size: int | None = None) -> int:
+        return self.backend.prune(now=time.time() if now is None else now, batch_size=batch_size)
+
+
+def _build_backend() -> RateLimitBackend:
+    kind = current_app.config.get("RATE_LIMIT_BACKEND", RateLimitBackendKind.POSTGRES)
+    if isinstance(kind, str):
+        kind = RateLimitBackendKind.parse(kind)
+    if kind == RateLimitBackendKind.MEMORY:
+        return MemoryRateLimitBackend()
+    return PostgresRateLimitBackend()
+
+
+def rate_limiter() -> RateLimiter:
+    """The app's rate limiter, built from `RATE_LIMIT_BACKEND` on first use."""
+    limiter = current_app.extensions.get(_RATE_LIMITER_EXTENSION)
+    if limiter is None:
+        limiter = current_app.extensions[_RATE_LIMITER_EXTENSION] = RateLimiter(_build_backend())
+    return limiter
@@ -20,6 +20,7 @@ from hushline.routes.forms import (  # noqa: F401
 )
 from hushline.routes.inbox import register_inbox_routes
 from hushline.routes.index import register_index_routes
+from hushline.routes.live_updates import register_live_updates_routes
 from hushline.routes.message import register_message_routes
 from hushline.routes.onboarding import register_onboarding_routes
 from hushline.routes.profile import register_profile_routes
@@ -39,6 +40,7 @@ def init_app(app: Flask) -> None:
     register_directory_routes(app)
     register_vision_routes(app)
     register_email_headers_routes(app)
+    register_live_updates_routes(app)
 
     @app.route("/info")
     def server_info() -> Response | str:
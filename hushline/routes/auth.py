@@ -40,7 +40,6 @@ from hushline.model import (
     ChatKey,
     InviteCode,
     OrganizationSetting,
-    PasswordResetAttempt,
     PasswordResetToken,
     User,
     Username,
@@ -50,6 +49,7 @@ from hushline.password_hasher import (
     emit_password_rehash_on_auth_telemetry,
     prepare_password_rehash_on_auth,
 )
+from hushline.ratelimit import RateLimit, rate_limiter
 from hushline.routes.common import validate_captcha
 from hushline.routes.forms import (
     LoginForm,
@@ -164,42 +164,35 @@ def _provision_pending_login_chat_key(user: User) -> None:
 
 
 def _password_reset_rate_limited(identifier_hash: str, ip_hash: str) -> bool:
-    now = _now()
-    window_minutes = int(current_app.config.get("PASSWORD_RESET_RATE_LIMIT_WINDOW_MINUTES", 60))
-    identifier_max = int(current_app.config.get("PASSWORD_RESET_RATE_LIMIT_IDENTIFIER_MAX", 5))
-    ip_max = int(current_app.config.get("PASSWORD_RESET_RATE_LIMIT_IP_MAX", 20))
-    window_start = now - timedelta(minutes=window_minutes)
-
-    identifier_count = db.session.scalar(
-        db.select(db.func.count())
-        .select_from(PasswordResetAttempt)
-        .where(
-            PasswordResetAttempt.identifier_hash == identifier_hash,
-            PasswordResetAttempt.created_at >= window_start,
-        )
-    )
-    ip_count = db.session.scalar(
-        db.select(db.func.count())
-        .select_from(PasswordResetAttempt)
-        .where(
-            PasswordResetAttempt.ip_hash == ip_hash,
-            PasswordResetAttempt.created_at >= window_start,
-        )
-    )
-
-    db.session.add(
-        PasswordResetAttempt(
-            identifier_hash=identifier_hash,
-            ip_hash=ip_hash,
-            created_at=now,
-        )
+    window_seconds = 60 * int(
+        current_app.config.get("PASSWORD_RESET_RATE_LIMIT_WINDOW_MINUTES", 60)
     )
+    limits = [
+        RateLimit(
+            scope="identifier",
+            key=f"password-reset:identifier:{identifier_hash}",
+            limit=int(current_app.config.get("PASSWORD_RESET_RATE_LIMIT_IDENTIFIER_MAX", 5)),
+            window_seconds=window_seconds,
+        ),
+        RateLimit(
+            scope="ip",
+            key=f"password-reset:ip:{ip_hash}",
+            limit=int(current_app.config.get("PASSWORD_RESET_RATE_LIMIT_IP_MAX", 20)),
+            window_seconds=window_seconds,
+        ),
+    ]
+    # limited requests still count, so a client that keeps retrying stays locked out
+    result = rate_limiter().hit(limits, record_when_limited=True)
     db.session.commit()
-    return bool(
-        identifier_count is not None
-        and identifier_count >= identifier_max
-        or ip_count is not None
-        and ip_count >= ip_max
+    return result.limited
+
+
+def _two_factor_rate_limit(user: User) -> RateLimit:
+    return RateLimit(
+        scope="user",
+        key=f"2fa:user:{user.id}",
+        limit=int(current_app.config.get("TWO_FACTOR_RATE_LIMIT_MAX", 5)),
+        window_seconds=int(current_app.config.get("TWO_FACTOR_RATE_LIMIT_WINDOW_SECONDS", 30)),
     )
 
 
@@ -463,6 +456,7 @@ def register_auth_routes(app: Flask) -> None:
                     db.select(Username).where(
                         func.lower(Username._username) == form.username.data.strip().lower(),
                         Username.is_primary.is_(True),
+                        Username.deleted_at.is_(None),
                     )
                 ).one_or_none()
             except MultipleResultsFound:
@@ -634,19 +628,14 @@ def register_auth_routes(app: Flask) -> None:
                 # However, a repeat TOTP code during the same time interval should be disallowed.
                 rate_limit = True
 
-            # If there were 5 failed logins in the last 30 seconds, don't allow another one
-            failed_logins = db.session.scalar(
-                db.select(
-                    db.func.count(AuthenticationLog.id)
-                    .filter(AuthenticationLog.user_id == user.id)
-                    .filter(AuthenticationLog.successful == db.false())
-                    .filter(AuthenticationLog.timestamp > datetime.now() - timedelta(seconds=30))
-                )
-            )
-            if failed_logins is not None and failed_logins >= 5:  # noqa: PLR2004
+            # Every attempt is counted before the code is checked, in one atomic hit, so parallel
+            # guesses cannot get past the limit. Attempts made while limited hold the bucket full
+            # for another window.
+            if rate_limiter().hit([_two_factor_rate_limit(user)], record_when_limited=True).limited:
                 rate_limit = True
 
             if rate_limit:
+                db.session.commit()
                 flash("⏲️ Please wait a moment before trying again.")
                 return render_template("verify_2fa_login.html", form=form), 429
 
@@ -15,8 +15,8 @@ from wtforms.validators import ValidationError
 
 from hushline.content_safety import contains_disallowed_text
 from hushline.db import db
-from hushline.email import create_smtp_config, send_email
-from hushline.model import NotificationRecipient, SMTPEncryption, User, Username
+from hushline.email import SMTPConfig, create_smtp_config, send_email
+from hushline.model import EmailOutbox, NotificationRecipient, SMTPEncryption, User, Username
 
 RecipientEmailBody = str | Callable[[NotificationRecipient], str | None]
 
@@ -153,42 +153,69 @@ def get_ip_address() -> str:
     return ip_address
 
 
+def notification_smtp_config(user: User) -> SMTPConfig | None:
+    """SMTP settings for a user's notification email, or None if the default SMTP is unset."""
+    if user.smtp_server:
+        return create_smtp_config(
+            user.smtp_username,  # type: ignore[arg-type]
+            user.smtp_server,  # type: ignore[arg-type]
+            user.smtp_port,  # type: ignore[arg-type]
+            user.smtp_password,  # type: ignore[arg-type]
+            user.smtp_sender,  # type: ignore[arg-type]
+            encryption=user.smtp_encryption,
+        )
+
+    smtp_username = current_app.config.get("SMTP_USERNAME")
+    smtp_server = current_app.config.get("SMTP_SERVER")
+    smtp_port = current_app.config.get("SMTP_PORT")
+    smtp_password = current_app.config.get("SMTP_PASSWORD")
+    notifications_address = current_app.config.get("NOTIFICATIONS_ADDRESS")
+    if not all([smtp_username, smtp_server, smtp_port, smtp_password, notifications_address]):
+        current_app.logger.warning("Skipping email send: default SMTP is not fully configured")
+        return None
+    return create_smtp_config(
+        smtp_username,
+        smtp_server,
+        smtp_port,
+        smtp_password,
+        notifications_address,
+        encryption=SMTPEncryption[current_app.config["SMTP_ENCRYPTION"]],
+    )
+
+
+def email_outbox_enabled() -> bool:
+    return bool(current_app.config.get("EMAIL_OUTBOX_ENABLED", False))
+
+
+def commit_with_notifications(send: Callable[[], None]) -> None:
+    """
+    Commit the session along with the notification email that `send` sends. Queued email is
+    added before the commit, so it is saved in the same transaction as what it is about; email
+    sent over SMTP goes out only once the commit has succeeded.
+    """
+    if email_outbox_enabled():
+        send()
+        db.session.commit()
+    else:
+        db.session.commit()
+        send()
+
+
 def send_email_to_user_recipients(user: User, subject: str, body: RecipientEmailBody) -> None:
+    """
+    With the outbox enabled, the email is queued for `flask notifications worker` instead of
+    holding the request open for SMTP handshakes and retries. Queued rows are only added to the
+    session, for the caller to commit with whatever the email is about.
+    """
     recipients = user.enabled_notification_recipients
     if not recipients or not user.enable_email_notifications:
         return
 
+    use_outbox = email_outbox_enabled()
     try:
-        if user.smtp_server:
-            smtp_config = create_smtp_config(
-                user.smtp_username,  # type: ignore[arg-type]
-                user.smtp_server,  # type: ignore[arg-type]
-                user.smtp_port,  # type: ignore[arg-type]
-                user.smtp_password,  # type: ignore[arg-type]
-                user.smtp_sender,  # type: ignore[arg-type]
-                encryption=user.smtp_encryption,
-            )
-        else:
-            smtp_username = current_app.config.get("SMTP_USERNAME")
-            smtp_server = current_app.config.get("SMTP_SERVER")
-            smtp_port = current_app.config.get("SMTP_PORT")
-            smtp_password = current_app.config.get("SMTP_PASSWORD")
-            notifications_address = current_app.config.get("NOTIFICATIONS_ADDRESS")
-            if not all(
-                [smtp_username, smtp_server, smtp_port, smtp_password, notifications_address]
-            ):
-                current_app.logger.warning(
-                    "Skipping email send: default SMTP is not fully configured"
-                )
-                return
-            smtp_config = create_smtp_config(
-                smtp_username,
-                smtp_server,
-                smtp_port,
-                smtp_password,
-                notifications_address,
-                encryption=SMTPEncryption[current_app.config["SMTP_ENCRYPTION"]],
-            )
+        smtp_config = notification_smtp_config(user)
+        if smtp_config is None:
+            return
 
         reply_to = current_app.config.get("NOTIFICATIONS_REPLY_TO") or current_app.config.get(
             "NOTIFICATIONS_ADDRESS"
@@ -207,6 +234,18 @@ def send_email_to_user_recipients(user: User, subject: str, body: RecipientEmail
             recipient_body = body(recipient) if callable(body) else body
             if not recipient_body:
                 continue
+            if use_outbox:
+                db.session.add(
+                    EmailOutbox(
+                        user_id=user.id,
+                        to_email=recipient_email,
+                        reply_to=reply_to,
+                        subject=subject,
+                        body=recipient_body,
+                    )
+                )
+                delivered_email_addresses.add(normalized_recipient_email)
+                continue
             try:
                 if send_email(
                     recipient_email,
@@ -1,28 +1,38 @@
+import base64
+import binascii
 from dataclasses import dataclass
 from datetime import datetime
 
 from flask import (
     Flask,
     abort,
+    current_app,
     render_template,
     request,
     session,
 )
+from sqlalchemy import Select, String, and_, literal, or_, union_all
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from werkzeug.wrappers.response import Response
 
 from hushline.auth import authentication_required
 from hushline.db import db
+from hushline.forms import BulkMessageStatusForm
 from hushline.model import (
     Conversation,
-    ConversationMessage,
     ConversationParticipant,
     Message,
     MessageStatus,
     User,
     Username,
 )
+from hushline.routes.live_updates import live_updates_url
 
 VALID_INBOX_TYPE_FILTERS = {"tips", "conversations"}
+INBOX_KIND_CONVERSATION = "conversation"
+INBOX_KIND_MESSAGE = "message"
+_INBOX_PAGE_SIZE = 50
+_INBOX_MAX_PAGE_SIZE = 500
 
 
 @dataclass(frozen=True)
@@ -43,76 +53,191 @@ class InboxItem:
     message: Message | None = None
 
 
-def _conversation_latest_message(conversation: Conversation) -> ConversationMessage | None:
-    if not conversation.messages:
-        return None
+@dataclass(frozen=True)
+class InboxCursor:
+    sort_at: datetime
+    kind: str
+    id: int
+
+    def encode(self) -> str:
+        raw = f"{self.sort_at.isoformat()}|{self.kind}|{self.id}".encode()
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> "InboxCursor":
+        try:
+            raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)).decode("utf-8")
+            sort_at_str, kind, id_str = raw.split("|")
+            sort_at = datetime.fromisoformat(sort_at_str)
+            item_id = int(id_str)
+        except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+            raise ValueError(f"Invalid inbox cursor: {value!r}") from e
+        if kind not in (INBOX_KIND_CONVERSATION, INBOX_KIND_MESSAGE) or sort_at.tzinfo is None:
+            raise ValueError(f"Invalid inbox cursor: {value!r}")
+        return cls(sort_at=sort_at, kind=kind, id=item_id)
 
-    return max(
-        conversation.messages,
-        key=lambda message: (message.created_at, message.id),
+
+def _inbox_conversation_summaries(
+    user: User, conversation_ids: list[int]
+) -> dict[int, InboxConversation]:
+    """Build inbox rows for a page of conversations from their denormalized summaries."""
+    if not conversation_ids:
+        return {}
+
+    other_participant = db.aliased(ConversationParticipant)
+    other_participant_names = (
+        db.select(db.func.array_agg(aggregate_order_by(Username._username, other_participant.id)))
+        .select_from(other_participant)
+        .join(
+            Username,
+            and_(Username.user_id == other_participant.user_id, Username.is_primary.is_(True)),
+        )
+        .where(other_participant.conversation_id == Conversation.id)
+        .where(other_participant.user_id != user.id)
+        .scalar_subquery()
     )
+    rows = db.session.execute(
+        db.select(Conversation, ConversationParticipant, other_participant_names)
+        .join(
+            ConversationParticipant,
+            and_(
+                ConversationParticipant.conversation_id == Conversation.id,
+                ConversationParticipant.user_id == user.id,
+            ),
+        )
+        .where(Conversation.id.in_(conversation_ids))
+    ).all()
+    return {
+        conversation.id: InboxConversation(
+            conversation=conversation,
+            other_participant_names=[f"@{name}" for name in names or []],
+            latest_at=conversation.last_message_at or conversation.created_at,
+            message_count=conversation.message_count,
+            has_unread=participant.has_unread,
+            has_available_copy=(
+                participant.has_usable_public_key and participant.missing_copy_count == 0
+            ),
+        )
+        for conversation, participant, names in rows
+    }
 
 
-def _conversation_latest_at(conversation: Conversation) -> datetime:
-    latest_message = _conversation_latest_message(conversation)
-    return latest_message.created_at if latest_message else conversation.created_at
+def _inbox_page_size() -> int:
+    value = current_app.config.get("INBOX_PAGE_SIZE", _INBOX_PAGE_SIZE)
+    try:
+        page_size = int(value)
+    except (TypeError, ValueError):
+        page_size = _INBOX_PAGE_SIZE
+    return min(max(1, page_size), _INBOX_MAX_PAGE_SIZE)
 
 
-def _participant_has_available_copies(
-    conversation: Conversation,
-    participant: ConversationParticipant,
-) -> bool:
-    return all(
-        any(
-            encrypted_copy.recipient_participant_id == participant.id
-            for encrypted_copy in message.encrypted_copies
+def _inbox_tips_query(
+    user: User, status_filter: MessageStatus | None
+) -> Select[tuple[int, str, datetime]]:
+    query = (
+        db.select(
+            Message.id.label("id"),
+            literal(INBOX_KIND_MESSAGE, String).label("kind"),
+            Message.created_at.label("sort_at"),
         )
-        for message in conversation.messages
+        .join(Username)
+        .where(Username.user_id == user.id)
+        .where(Message.conversation_id.is_(None))
     )
+    if status_filter:
+        query = query.where(Message.status == status_filter)
+    return query
 
 
-def _conversation_has_unread(
-    conversation: Conversation,
-    participant: ConversationParticipant,
-) -> bool:
-    latest_message = _conversation_latest_message(conversation)
-    last_read_message = participant.last_read_message
-    if not latest_message or latest_message.sender_participant_id == participant.id:
-        return False
-    if last_read_message is not None:
-        return (latest_message.created_at, latest_message.id) > (
-            last_read_message.created_at,
-            last_read_message.id,
+def _inbox_conversations_query(user: User) -> Select[tuple[int, str, datetime]]:
+    return (
+        db.select(
+            Conversation.id.label("id"),
+            literal(INBOX_KIND_CONVERSATION, String).label("kind"),
+            db.func.coalesce(Conversation.last_message_at, Conversation.created_at).label(
+                "sort_at"
+            ),
         )
-    return participant.last_read_at is None or latest_message.created_at > participant.last_read_at
+        .join(ConversationParticipant)
+        .where(ConversationParticipant.user_id == user.id)
+        .where(ConversationParticipant.deleted_at.is_(None))
+    )
 
 
-def _inbox_conversation_summary(
-    conversation: Conversation,
+def _inbox_timeline_page(
     user: User,
-) -> InboxConversation | None:
-    participant = conversation.participant_for_user_id(user.id)
-    if participant is None:
-        return None
-
-    other_participant_names = []
-    for thread_participant in conversation.participants:
-        if thread_participant.user_id == user.id:
-            continue
-        username = thread_participant.user.primary_username
-        other_participant_names.append(f"@{username.username}")
-
-    return InboxConversation(
-        conversation=conversation,
-        other_participant_names=other_participant_names,
-        latest_at=_conversation_latest_at(conversation),
-        message_count=len(conversation.messages),
-        has_unread=_conversation_has_unread(conversation, participant),
-        has_available_copy=(
-            participant.has_usable_public_key
-            and _participant_has_available_copies(conversation, participant)
-        ),
+    *,
+    status_filter: MessageStatus | None,
+    type_filter: str | None,
+    cursor: InboxCursor | None,
+    page_size: int,
+) -> tuple[list[InboxItem], InboxCursor | None]:
+    """Return one page of the merged tip/conversation timeline, newest first.
+
+    Rows are ordered by (sort_at DESC, kind ASC, id DESC) so that a cursor taken from
+    the last row of a page identifies exactly where the next page begins, even when
+    items share a timestamp.
+    """
+    sources = []
+    if type_filter in (None, "tips"):
+        sources.append(_inbox_tips_query(user, status_filter))
+    # conversations have no message status, so any status filter hides them
+    if type_filter in (None, "conversations") and status_filter is None:
+        sources.append(_inbox_conversations_query(user))
+    if not sources:
+        return [], None
+
+    timeline = (union_all(*sources) if len(sources) > 1 else sources[0]).subquery("timeline")
+    query = db.select(timeline.c.id, timeline.c.kind, timeline.c.sort_at)
+    if cursor is not None:
+        query = query.where(
+            or_(
+                timeline.c.sort_at < cursor.sort_at,
+                and_(
+                    timeline.c.sort_at == cursor.sort_at,
+                    or_(
+                        timeline.c.kind > cursor.kind,
+                        and_(timeline.c.kind == cursor.kind, timeline.c.id < cursor.id),
+                    ),
+                ),
+            )
+        )
+    rows = db.session.execute(
+        query.order_by(
+            timeline.c.sort_at.desc(), timeline.c.kind.asc(), timeline.c.id.desc()
+        ).limit(page_size + 1)
+    ).all()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last_row = rows[-1]
+        next_cursor = InboxCursor(sort_at=last_row.sort_at, kind=last_row.kind, id=last_row.id)
+
+    message_ids = [row.id for row in rows if row.kind == INBOX_KIND_MESSAGE]
+    conversation_ids = [row.id for row in rows if row.kind == INBOX_KIND_CONVERSATION]
+    messages_by_id = (
+        {
+            message.id: message
+            for message in db.session.scalars(db.select(Message).where(Message.id.in_(message_ids)))
+        }
+        if message_ids
+        else {}
     )
+    conversations_by_id = _inbox_conversation_summaries(user, conversation_ids)
+
+    inbox_items = []
+    for row in rows:
+        if row.kind == INBOX_KIND_MESSAGE:
+            if (message := messages_by_id.get(row.id)) is not None:
+                inbox_items.append(
+                    InboxItem(kind=INBOX_KIND_MESSAGE, sort_at=row.sort_at, message=message)
+                )
+        elif (summary := conversations_by_id.get(row.id)) is not None:
+            inbox_items.append(
+                InboxItem(kind=INBOX_KIND_CONVERSATION, sort_at=row.sort_at, conversation=summary)
+            )
+    return inbox_items, next_cursor
 
 
 def register_inbox_routes(app: Flask) -> None:
@@ -137,16 +262,12 @@ def register_inbox_routes(app: Flask) -> None:
         if type_filter and type_filter not in VALID_INBOX_TYPE_FILTERS:
             abort(400)
 
-        query = (
-            db.select(Message)
-            .join(Username)
-            .filter(Username.user_id == user.id)
-            .filter(Message.conversation_id.is_(None))
-            .order_by(Message.created_at.desc())
-        )
-        if status_filter:
-            query = query.filter(Message.status == status_filter)
-        messages = list(db.session.scalars(query))
+        cursor = None
+        if cursor_str := request.args.get("after"):
+            try:
+                cursor = InboxCursor.decode(cursor_str)
+            except ValueError:
+                abort(400)
 
         status_count_results = db.session.execute(
             db.select(Message.status, db.func.count())
@@ -157,45 +278,31 @@ def register_inbox_routes(app: Flask) -> None:
         ).all()
         status_counts_map = {x[0]: x[1] for x in status_count_results}
         message_statuses = [(x, status_counts_map.get(x, 0)) for x in MessageStatus]
+        total_tips = sum(x[1] for x in message_statuses)
+        total_conversations = (
+            db.session.scalar(
+                db.select(db.func.count(ConversationParticipant.id)).where(
+                    ConversationParticipant.user_id == user.id,
+                    ConversationParticipant.deleted_at.is_(None),
+                )
+            )
+            or 0
+        )
 
-        conversations = [
-            summary
-            for conversation in db.session.scalars(Conversation.for_user_id(user.id))
-            if (summary := _inbox_conversation_summary(conversation, user)) is not None
-        ]
-        conversations.sort(key=lambda conversation: conversation.latest_at, reverse=True)
-        filtered_conversations = (
-            conversations
-            if type_filter in (None, "conversations") and status_filter is None
-            else []
+        inbox_items, next_cursor = _inbox_timeline_page(
+            user,
+            status_filter=status_filter,
+            type_filter=type_filter,
+            cursor=cursor,
+            page_size=_inbox_page_size(),
         )
-        filtered_messages = messages if type_filter in (None, "tips") else []
-        inbox_items = [
-            *[
-                InboxItem(
-                    kind="conversation",
-                    sort_at=conversation.latest_at,
-                    conversation=conversation,
-                )
-                for conversation in filtered_conversations
-            ],
-            *[
-                InboxItem(
-                    kind="message",
-                    sort_at=message.created_at,
-                    message=message,
-                )
-                for message in filtered_messages
-            ],
-        ]
-        inbox_items.sort(key=lambda item: item.sort_at, reverse=True)
-        total_tips = sum(x[1] for x in message_statuses)
-        total_conversations = len(conversations)
 
         return render_template(
             "inbox.html",
             user=user,
             inbox_items=inbox_items,
+            next_cursor=next_cursor.encode() if next_cursor else None,
+            is_first_page=cursor is None,
             status_filter=status_filter,
             type_filter=type_filter,
             total_messages=total_tips,
@@ -203,4 +310,6 @@ def register_inbox_routes(app: Flask) -> None:
             total_inbox_items=total_tips + total_conversations,
             message_statuses=message_statuses,
             user_has_aliases=user_alias_count > 1,
+            live_updates_url=live_updates_url(),
+            bulk_status_form=BulkMessageStatusForm(),
         )
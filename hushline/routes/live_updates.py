@@ -0,0 +1,63 @@
+from collections.abc import Iterator
+
+from flask import Flask, abort, current_app, session, stream_with_context, url_for
+from werkzeug.wrappers.response import Response
+
+from hushline.auth import authentication_required
+from hushline.db import db
+from hushline.live_updates import iter_user_updates
+
+_LIVE_UPDATES_STREAM_SECONDS = 55
+_LIVE_UPDATES_KEEPALIVE_SECONDS = 15
+_LIVE_UPDATES_RETRY_MS = 5000
+
+
+def _live_updates_config(name: str, default: int) -> int:
+    value = current_app.config.get(name, default)
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def live_updates_url() -> str | None:
+    """URL of the update stream for page templates, or None when streaming is disabled."""
+    if not current_app.config.get("LIVE_UPDATES_ENABLED", False):
+        return None
+    return url_for("live_updates")
+
+
+def register_live_updates_routes(app: Flask) -> None:
+    @app.route("/updates")
+    @authentication_required
+    def live_updates() -> Response:
+        # each open stream pins a worker, so this is only safe behind threaded/async workers
+        if not current_app.config.get("LIVE_UPDATES_ENABLED", False):
+            abort(404)
+
+        user_id = session["user_id"]
+        duration_seconds = _live_updates_config(
+            "LIVE_UPDATES_STREAM_SECONDS", _LIVE_UPDATES_STREAM_SECONDS
+        )
+        keepalive_seconds = _live_updates_config(
+            "LIVE_UPDATES_KEEPALIVE_SECONDS", _LIVE_UPDATES_KEEPALIVE_SECONDS
+        )
+
+        def stream() -> Iterator[str]:
+            # streams are short-lived; the browser's EventSource reconnects after `retry`
+            yield f"retry: {_LIVE_UPDATES_RETRY_MS}\n\n"
+            for update in iter_user_updates(
+                user_id,
+                duration_seconds=duration_seconds,
+                keepalive_seconds=keepalive_seconds,
+            ):
+                yield ": keepalive\n\n" if update is None else update.to_sse()
+
+        # the request context, and with it the session, lives as long as the stream does, so give
+        # back the connection authentication used instead of leaving it idle in a transaction
+        db.session.remove()
+        return Response(
+            stream_with_context(stream()),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+        )
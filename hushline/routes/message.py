@@ -1,6 +1,5 @@
 import base64
 import binascii
-import hashlib
 import json
 import re
 import smtplib
@@ -24,6 +23,8 @@ from flask import (
     url_for,
 )
 from flask_wtf.csrf import validate_csrf
+from sqlalchemy import Select, String, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
 from werkzeug.wrappers.response import Response
 from wtforms.validators import ValidationError
 
@@ -32,43 +33,53 @@ from hushline.chat_key_lifecycle import chat_key_fingerprint
 from hushline.crypto import encrypt_message
 from hushline.db import db
 from hushline.forms import (
+    BulkMessagesForm,
+    BulkMessageStatusForm,
     ConversationMessageForm,
     DeleteConversationForm,
     DeleteMessageForm,
     ResendMessageForm,
     UpdateMessageStatusForm,
 )
+from hushline.live_updates import LIVE_UPDATE_CONVERSATION, LIVE_UPDATE_INBOX, notify_users
 from hushline.model import (
-    ChatRateLimitAttempt,
     Conversation,
     ConversationMessage,
     ConversationMessageCopy,
     ConversationParticipant,
+    ConversationPresence,
     FieldValue,
     Message,
+    MessageStatus,
     User,
     Username,
 )
+from hushline.ratelimit import RateLimit, rate_limiter
 from hushline.routes.common import (
+    commit_with_notifications,
     do_send_email,
     notification_email_encryption_target,
     send_email_to_user_recipients,
 )
+from hushline.routes.live_updates import live_updates_url
 
 _CHAT_CIPHERTEXT_MAX_LENGTH = 200_000
 _CHAT_CIPHERTEXT_CONTEXT_VERSION = 2
 _P256_COORDINATE_LENGTH_BYTES = 32
 _P256_RAW_SIGNATURE_LENGTH_BYTES = 64
 _CHAT_ONLY_MESSAGE_PLACEHOLDER = "Stored in encrypted conversation."
+_BULK_MESSAGE_ACTION_MAX = 500
 _CONVERSATION_ACTIVITY_TIMEOUT_SECONDS = 120
 _CONVERSATION_PRESENCE_HEARTBEAT_SECONDS = 60
+_CONVERSATION_PRESENCE_COALESCE_SECONDS = 30
+_CONVERSATION_PAGE_SIZE = 50
+_CONVERSATION_PAGE_SIZE_MAX = 200
 _CONVERSATION_MESSAGE_RATE_LIMIT_PARTICIPANT_WINDOW_SECONDS = 60
 _CONVERSATION_MESSAGE_RATE_LIMIT_PARTICIPANT_MAX = 10
 _CONVERSATION_MESSAGE_RATE_LIMIT_CONVERSATION_WINDOW_SECONDS = 60
 _CONVERSATION_MESSAGE_RATE_LIMIT_CONVERSATION_MAX = 30
 _CONVERSATION_MESSAGE_RATE_LIMIT_USER_WINDOW_SECONDS = 3600
 _CONVERSATION_MESSAGE_RATE_LIMIT_USER_MAX = 200
-_CONVERSATION_MESSAGE_RATE_LIMIT_LOCK_NAMESPACE = "hushline:chat-message-rate-limit"
 _CONVERSATION_NOTIFICATION_BODY = (
     "You have new Hush Line conversation activity. "
     "Log in and unlock your Hush Line chat key to read it."
@@ -90,6 +101,68 @@ def _conversation_latest_message(thread: Conversation) -> ConversationMessage |
     )
 
 
+def _conversation_page_size(requested: int | None = None) -> int:
+    configured = current_app.config.get("CONVERSATION_PAGE_SIZE", _CONVERSATION_PAGE_SIZE)
+    try:
+        page_size = int(configured)
+    except (TypeError, ValueError):
+        page_size = _CONVERSATION_PAGE_SIZE
+    if requested is not None:
+        page_size = requested
+    return min(max(1, page_size), _CONVERSATION_PAGE_SIZE_MAX)
+
+
+def _conversation_message_page(
+    thread: Conversation,
+    participant: ConversationParticipant,
+    *,
+    limit: int,
+    after: int | None = None,
+    before: int | None = None,
+) -> tuple[list[dict[str, Any]], bool]:
+    """
+    One page of the thread as the viewer sees it, oldest first. Without `after` this is the
+    newest page (or the one ending just before `before`). The boolean reports whether more
+    messages exist past the page in the direction it was read.
+    """
+    query = (
+        db.select(
+            ConversationMessage.id,
+            ConversationMessage.sender_participant_id,
+            ConversationMessageCopy.encrypted_payload,
+        )
+        .outerjoin(
+            ConversationMessageCopy,
+            db.and_(
+                ConversationMessageCopy.recipient_participant_id == participant.id,
+                ConversationMessageCopy.conversation_message_id == ConversationMessage.id,
+            ),
+        )
+        .where(ConversationMessage.conversation_id == thread.id)
+        .limit(limit + 1)
+    )
+    if after is not None:
+        query = query.where(ConversationMessage.id > after).order_by(ConversationMessage.id.asc())
+    else:
+        if before is not None:
+            query = query.where(ConversationMessage.id < before)
+        query = query.order_by(ConversationMessage.id.desc())
+
+    rows = db.session.execute(query).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if after is None:
+        rows.reverse()
+    return [
+        {
+            "message_id": message_id,
+            "encrypted_payload": encrypted_payload,
+            "is_own_message": sender_participant_id == participant.id,
+        }
+        for message_id, sender_participant_id, encrypted_payload in rows
+    ], has_more
+
+
 def _conversation_other_participants(
     thread: Conversation, participant: ConversationParticipant
 ) -> list[ConversationParticipant]:
@@ -168,6 +241,18 @@ def _conversation_presence_heartbeat_ms() -> int:
     return max(1, seconds) * 1000
 
 
+def _conversation_presence_coalesce_interval() -> timedelta:
+    """Heartbeats closer together than this are not written. Kept well inside the timeout."""
+    configured_seconds = current_app.config.get(
+        "CONVERSATION_PRESENCE_COALESCE_SECONDS", _CONVERSATION_PRESENCE_COALESCE_SECONDS
+    )
+    try:
+        seconds = int(configured_seconds)
+    except (TypeError, ValueError):
+        seconds = _CONVERSATION_PRESENCE_COALESCE_SECONDS
+    return min(timedelta(seconds=max(0, seconds)), _conversation_activity_timeout() / 4)
+
+
 def _conversation_rate_limit_config(name: str, default: int) -> int:
     value = current_app.config.get(name, default)
     try:
@@ -176,148 +261,118 @@ def _conversation_rate_limit_config(name: str, default: int) -> int:
         return default
 
 
-def _conversation_message_rate_limit_lock_key(scope: str, *values: int) -> int:
-    payload = ":".join(
-        [_CONVERSATION_MESSAGE_RATE_LIMIT_LOCK_NAMESPACE, scope, *(str(value) for value in values)]
-    ).encode("utf-8")
-    return int.from_bytes(hashlib.blake2b(payload, digest_size=8).digest(), "big", signed=True)
-
-
-def _lock_conversation_message_rate_limit_buckets(
-    *,
-    thread: Conversation,
-    participant: ConversationParticipant,
-    user: User,
-) -> None:
-    bind = db.session.get_bind()
-    if bind is None or bind.dialect.name != "postgresql":
-        return
-
-    lock_keys = sorted(
-        {
-            _conversation_message_rate_limit_lock_key("participant", participant.id, thread.id),
-            _conversation_message_rate_limit_lock_key("conversation", thread.id),
-            _conversation_message_rate_limit_lock_key("user", user.id),
-        }
-    )
-    for lock_key in lock_keys:
-        db.session.execute(db.select(db.func.pg_advisory_xact_lock(lock_key)))
-
-
 def _consume_conversation_message_rate_limit(
     *,
     thread: Conversation,
     participant: ConversationParticipant,
     user: User,
 ) -> bool:
-    _lock_conversation_message_rate_limit_buckets(
-        thread=thread,
-        participant=participant,
-        user=user,
-    )
-    windows = {
-        "participant": max(
-            _conversation_rate_limit_config(
-                "CONVERSATION_MESSAGE_RATE_LIMIT_PARTICIPANT_WINDOW_SECONDS",
-                _CONVERSATION_MESSAGE_RATE_LIMIT_PARTICIPANT_WINDOW_SECONDS,
+    """
+    Count one message against the sender, the conversation and the user. With the Postgres
+    backend the buckets are updated in the request transaction, so a message that fails to
+    commit does not use up quota.
+    """
+    limits = [
+        RateLimit(
+            scope="participant",
+            key=f"chat:participant:{participant.id}",
+            limit=_conversation_rate_limit_config(
+                "CONVERSATION_MESSAGE_RATE_LIMIT_PARTICIPANT_MAX",
+                _CONVERSATION_MESSAGE_RATE_LIMIT_PARTICIPANT_MAX,
             ),
-            1,
-        ),
-        "conversation": max(
-            _conversation_rate_limit_config(
-                "CONVERSATION_MESSAGE_RATE_LIMIT_CONVERSATION_WINDOW_SECONDS",
-                _CONVERSATION_MESSAGE_RATE_LIMIT_CONVERSATION_WINDOW_SECONDS,
+            window_seconds=max(
+                _conversation_rate_limit_config(
+                    "CONVERSATION_MESSAGE_RATE_LIMIT_PARTICIPANT_WINDOW_SECONDS",
+                    _CONVERSATION_MESSAGE_RATE_LIMIT_PARTICIPANT_WINDOW_SECONDS,
+                ),
+                1,
             ),
-            1,
         ),
-        "user": max(
-            _conversation_rate_limit_config(
-                "CONVERSATION_MESSAGE_RATE_LIMIT_USER_WINDOW_SECONDS",
-                _CONVERSATION_MESSAGE_RATE_LIMIT_USER_WINDOW_SECONDS,
+        RateLimit(
+            scope="conversation",
+            key=f"chat:conversation:{thread.id}",
+            limit=_conversation_rate_limit_config(
+                "CONVERSATION_MESSAGE_RATE_LIMIT_CONVERSATION_MAX",
+                _CONVERSATION_MESSAGE_RATE_LIMIT_CONVERSATION_MAX,
+            ),
+            window_seconds=max(
+                _conversation_rate_limit_config(
+                    "CONVERSATION_MESSAGE_RATE_LIMIT_CONVERSATION_WINDOW_SECONDS",
+                    _CONVERSATION_MESSAGE_RATE_LIMIT_CONVERSATION_WINDOW_SECONDS,
+                ),
+                1,
             ),
-            1,
-        ),
-    }
-    limits = {
-        "participant": _conversation_rate_limit_config(
-            "CONVERSATION_MESSAGE_RATE_LIMIT_PARTICIPANT_MAX",
-            _CONVERSATION_MESSAGE_RATE_LIMIT_PARTICIPANT_MAX,
-        ),
-        "conversation": _conversation_rate_limit_config(
-            "CONVERSATION_MESSAGE_RATE_LIMIT_CONVERSATION_MAX",
-            _CONVERSATION_MESSAGE_RATE_LIMIT_CONVERSATION_MAX,
         ),
-        "user": _conversation_rate_limit_config(
-            "CONVERSATION_MESSAGE_RATE_LIMIT_USER_MAX",
-            _CONVERSATION_MESSAGE_RATE_LIMIT_USER_MAX,
+        RateLimit(
+            scope="user",
+            key=f"chat:user:{user.id}",
+            limit=_conversation_rate_limit_config(
+                "CONVERSATION_MESSAGE_RATE_LIMIT_USER_MAX",
+                _CONVERSATION_MESSAGE_RATE_LIMIT_USER_MAX,
+            ),
+            window_seconds=max(
+                _conversation_rate_limit_config(
+                    "CONVERSATION_MESSAGE_RATE_LIMIT_USER_WINDOW_SECONDS",
+                    _CONVERSATION_MESSAGE_RATE_LIMIT_USER_WINDOW_SECONDS,
+                ),
+                1,
+            ),
         ),
-    }
-    now = datetime.now(UTC)
-    oldest_window = now - timedelta(seconds=max(windows.values()))
-    db.session.execute(
-        db.delete(ChatRateLimitAttempt).where(ChatRateLimitAttempt.created_at < oldest_window)
-    )
+    ]
+    return rate_limiter().hit(limits).limited
 
-    participant_count = db.session.scalar(
-        db.select(db.func.count())
-        .select_from(ChatRateLimitAttempt)
-        .where(
-            ChatRateLimitAttempt.sender_participant_id == participant.id,
-            ChatRateLimitAttempt.conversation_id == thread.id,
-            ChatRateLimitAttempt.created_at >= now - timedelta(seconds=windows["participant"]),
-        )
-    )
-    conversation_count = db.session.scalar(
-        db.select(db.func.count())
-        .select_from(ChatRateLimitAttempt)
-        .where(
-            ChatRateLimitAttempt.conversation_id == thread.id,
-            ChatRateLimitAttempt.created_at >= now - timedelta(seconds=windows["conversation"]),
-        )
-    )
-    user_count = db.session.scalar(
-        db.select(db.func.count())
-        .select_from(ChatRateLimitAttempt)
-        .where(
-            ChatRateLimitAttempt.user_id == user.id,
-            ChatRateLimitAttempt.created_at >= now - timedelta(seconds=windows["user"]),
-        )
+
+def _mark_conversation_participant_active(
+    participant: ConversationParticipant, now: datetime | None = None
+) -> None:
+    ConversationPresence.mark_active(
+        participant.id,
+        participant.user_id,
+        now=now or datetime.now(UTC),
+        coalesce=_conversation_presence_coalesce_interval(),
     )
-    limited = (
-        (
-            limits["participant"] > 0
-            and participant_count is not None
-            and participant_count >= limits["participant"]
-        )
-        or (
-            limits["conversation"] > 0
-            and conversation_count is not None
-            and conversation_count >= limits["conversation"]
-        )
-        or (limits["user"] > 0 and user_count is not None and user_count >= limits["user"])
+
+
+def _bulk_message_public_ids(form: BulkMessagesForm) -> list[str] | None:
+    if not form.validate_on_submit():
+        if form.message_ids.errors:
+            flash("⛔️ Select at least one message.")
+        else:
+            flash("⛔️ Invalid request. Messages not updated.")
+        return None
+    public_ids = list(dict.fromkeys(form.message_ids.data or []))
+    if len(public_ids) > _BULK_MESSAGE_ACTION_MAX:
+        flash(f"⛔️ Select at most {_BULK_MESSAGE_ACTION_MAX} messages at a time.")
+        return None
+    return public_ids
+
+
+def _owned_message_ids(user_id: int, public_ids: list[str]) -> Select[tuple[int]]:
+    # one array parameter instead of an IN list, so the statement is the same for any selection
+    return db.select(Message.id).where(
+        Message.public_id == any_(bindparam("public_ids", public_ids, type_=ARRAY(String))),
+        Message.username_id.in_(db.select(Username.id).where(Username.user_id == user_id)),
     )
-    if not limited:
-        db.session.add(
-            ChatRateLimitAttempt(
-                conversation_id=thread.id,
-                sender_participant_id=participant.id,
-                user_id=user.id,
-                created_at=now,
-            )
-        )
-    return limited
 
 
-def _as_utc(value: datetime) -> datetime:
-    if value.tzinfo is None:
-        return value.replace(tzinfo=UTC)
-    return value.astimezone(UTC)
+def _set_messages_status(user_id: int, public_ids: list[str], status: MessageStatus) -> int:
+    return db.session.execute(
+        db.update(Message)
+        .where(Message.id.in_(_owned_message_ids(user_id, public_ids)))
+        .values(status=status, status_changed_at=datetime.now(UTC)),
+        execution_options={"synchronize_session": False},
+    ).rowcount
 
 
-def _mark_conversation_participant_active(
-    participant: ConversationParticipant, now: datetime | None = None
-) -> None:
-    participant.last_active_at = now or datetime.now(UTC)
+def _bulk_messages_redirect() -> Response:
+    # the inbox validates its own filters, so pass them through untouched
+    return redirect(
+        url_for("inbox", type=request.args.get("type"), status=request.args.get("status"))
+    )
+
+
+def _message_count_text(count: int) -> str:
+    return f"{count} message" if count == 1 else f"{count} messages"
 
 
 def _message_is_chat_only_placeholder(message: Message) -> bool:
@@ -327,20 +382,10 @@ def _message_is_chat_only_placeholder(message: Message) -> bool:
     )
 
 
-def _conversation_participant_is_active(
-    participant: ConversationParticipant, now: datetime | None = None
-) -> bool:
-    if participant.last_active_at is None:
-        return False
-    active_at = _as_utc(participant.last_active_at)
-    current_time = now or datetime.now(UTC)
-    return current_time - active_at <= _conversation_activity_timeout()
-
-
 def _user_has_active_conversation_session(user: User, now: datetime | None = None) -> bool:
-    return any(
-        participant.user_id == user.id and _conversation_participant_is_active(participant, now=now)
-        for participant in user.conversation_participants
+    current_time = now or datetime.now(UTC)
+    return ConversationPresence.user_is_active(
+        user.id, since=current_time - _conversation_activity_timeout()
     )
 
 
@@ -623,18 +668,20 @@ def register_message_routes(app: Flask) -> None:
             abort(404)
 
         _mark_conversation_participant_active(participant)
-        latest_message = _conversation_latest_message(thread)
         if (
             not _is_conversation_background_refresh()
-            and latest_message
+            and thread.last_message_id is not None
+            and thread.last_message_at is not None
             and (
-                participant.last_read_message_id != latest_message.id
+                participant.last_read_message_id != thread.last_message_id
                 or participant.last_read_at is None
-                or latest_message.created_at > participant.last_read_at
+                or thread.last_message_at > participant.last_read_at
             )
         ):
-            participant.last_read_at = latest_message.created_at
-            participant.last_read_message = latest_message
+            participant.last_read_at = thread.last_message_at
+            participant.last_read_message_id = thread.last_message_id
+            participant.has_unread = False
+            notify_users([user.id], LIVE_UPDATE_INBOX)
         db.session.commit()
 
         other_participants = _conversation_other_participants(thread, participant)
@@ -649,30 +696,9 @@ def register_message_routes(app: Flask) -> None:
             else None
         )
 
-        message_copies = []
-        message_copy_payloads = []
-        for conversation_message in thread.messages:
-            copy = next(
-                (
-                    encrypted_copy
-                    for encrypted_copy in conversation_message.encrypted_copies
-                    if encrypted_copy.recipient_participant_id == participant.id
-                ),
-                None,
-            )
-            message_copies.append(
-                (
-                    conversation_message,
-                    copy,
-                    conversation_message.sender_participant_id == participant.id,
-                )
-            )
-            message_copy_payloads.append(
-                {
-                    "message_id": conversation_message.id,
-                    "encrypted_payload": copy.encrypted_payload if copy else None,
-                }
-            )
+        message_copies, has_older_messages = _conversation_message_page(
+            thread, participant, limit=_conversation_page_size()
+        )
 
         participant_public_keys = [
             {
@@ -735,13 +761,21 @@ def register_message_routes(app: Flask) -> None:
             conversation=thread,
             participant=participant,
             message_copies=message_copies,
-            message_copy_payloads=message_copy_payloads,
+            message_copy_payloads=[
+                {
+                    "message_id": message_copy["message_id"],
+                    "encrypted_payload": message_copy["encrypted_payload"],
+                }
+                for message_copy in message_copies
+            ],
+            has_older_messages=has_older_messages,
             participant_public_keys=participant_public_keys,
             participant_signing_public_keys=participant_signing_public_keys,
             can_compose=can_compose,
             conversation_name=conversation_name or "Conversation",
             conversation_username=conversation_username,
             conversation_presence_interval_ms=_conversation_presence_heartbeat_ms(),
+            live_updates_url=live_updates_url(),
             conversation_message_form=conversation_message_form,
             delete_conversation_form=delete_conversation_form,
         )
@@ -771,6 +805,43 @@ def register_message_routes(app: Flask) -> None:
         db.session.commit()
         return jsonify({"ok": True}), 200
 
+    @app.route("/conversation/<public_id>/messages", methods=["GET"])
+    @authentication_required
+    def conversation_messages(public_id: str) -> tuple[Response, int]:
+        user = db.session.get(User, session["user_id"])
+        if not user:
+            abort(404)
+
+        thread = db.session.scalars(
+            Conversation.for_user_id(user.id).where(Conversation.public_id == public_id)
+        ).one_or_none()
+        if not thread:
+            abort(404)
+
+        participant = thread.participant_for_user_id(user.id)
+        if not participant:
+            abort(404)
+
+        after = request.args.get("after", type=int)
+        before = request.args.get("before", type=int)
+        limit = request.args.get("limit", type=int)
+        if (
+            ("after" in request.args and after is None)
+            or ("before" in request.args and before is None)
+            or ("limit" in request.args and limit is None)
+            or (after is not None and before is not None)
+        ):
+            return jsonify({"error": "Invalid conversation cursor."}), 400
+
+        messages, has_more = _conversation_message_page(
+            thread,
+            participant,
+            limit=_conversation_page_size(limit),
+            after=after,
+            before=before,
+        )
+        return jsonify({"messages": messages, "has_more": has_more}), 200
+
     @app.route("/conversation/<public_id>/messages", methods=["POST"])
     @authentication_required
     def append_conversation_message(public_id: str) -> tuple[Response, int]:
@@ -852,8 +923,14 @@ def register_message_routes(app: Flask) -> None:
             conversation_message.encrypted_copies.append(encrypted_copy)
             encrypted_copy.recipient_participant = recipient_participant
             encrypted_copy.encrypted_payload = encrypted_copies[str(recipient_participant.id)]
-        db.session.commit()
-        _notify_conversation_participants(thread, participant)
+        db.session.flush()
+        thread.record_message(conversation_message)
+        notify_users(
+            [thread_participant.user_id for thread_participant in thread.participants],
+            LIVE_UPDATE_CONVERSATION,
+            conversation=thread.public_id,
+        )
+        commit_with_notifications(lambda: _notify_conversation_participants(thread, participant))
 
         return (
             jsonify(
@@ -900,6 +977,7 @@ def register_message_routes(app: Flask) -> None:
         participant.deleted_at = datetime.now(UTC)
         participant.last_read_at = participant.deleted_at
         participant.last_read_message = _conversation_latest_message(thread)
+        participant.has_unread = False
 
         participant_message_ids = db.select(ConversationMessage.id).where(
             ConversationMessage.sender_participant_id == participant.id
@@ -918,6 +996,8 @@ def register_message_routes(app: Flask) -> None:
         )
 
         db.session.flush()
+        # the other participants just lost their copies of this participant's messages
+        Conversation.refresh_summaries([thread.id])
         if not any(
             thread_participant.deleted_at is None for thread_participant in locked_participants
         ):
@@ -1030,6 +1110,8 @@ def register_message_routes(app: Flask) -> None:
                 do_send_email(user, generic_body)
         else:
             do_send_email(user, generic_body)
+        # saves the email if it was queued
+        db.session.commit()
         flash("📧 Message resent to your email inbox.")
         return redirect(url_for("message", public_id=public_id))
 
@@ -1068,3 +1150,60 @@ def register_message_routes(app: Flask) -> None:
                 )
                 flash("⛔️ Internal server error. Message not updated.")
         return redirect(url_for("message", public_id=public_id))
+
+    @app.route("/messages/bulk/delete", methods=["POST"])
+    @authentication_required
+    def bulk_delete_messages() -> Response:
+        public_ids = _bulk_message_public_ids(BulkMessagesForm())
+        if public_ids is None:
+            return _bulk_messages_redirect()
+
+        owned_message_ids = _owned_message_ids(session["user_id"], public_ids)
+        db.session.execute(
+            db.delete(FieldValue).where(FieldValue.message_id.in_(owned_message_ids)),
+            execution_options={"synchronize_session": False},
+        )
+        deleted = db.session.execute(
+            db.delete(Message).where(Message.id.in_(owned_message_ids)),
+            execution_options={"synchronize_session": False},
+        ).rowcount
+        db.session.commit()
+
+        if deleted:
+            flash(f"🗑️ Deleted {_message_count_text(deleted)}.")
+        else:
+            flash("⛔️ Message not found.")
+        return _bulk_messages_redirect()
+
+    @app.route("/messages/bulk/archive", methods=["POST"])
+    @authentication_required
+    def bulk_archive_messages() -> Response:
+        public_ids = _bulk_message_public_ids(BulkMessagesForm())
+        if public_ids is None:
+            return _bulk_messages_redirect()
+
+        updated = _set_messages_status(session["user_id"], public_ids, MessageStatus.ARCHIVED)
+        db.session.commit()
+
+        if updated:
+            flash(f"👍 Archived {_message_count_text(updated)}.")
+        else:
+            flash("⛔️ Message not found.")
+        return _bulk_messages_redirect()
+
+    @app.route("/messages/bulk/status", methods=["POST"])
+    @authentication_required
+    def bulk_set_message_status() -> Response:
+        form = BulkMessageStatusForm()
+        public_ids = _bulk_message_public_ids(form)
+        if public_ids is None:
+            return _bulk_messages_redirect()
+
+        updated = _set_messages_status(session["user_id"], public_ids, form.status.data)
+        db.session.commit()
+
+        if updated:
+            flash(f"👍 Updated the status of {_message_count_text(updated)}.")
+        else:
+            flash("⛔️ Message not found.")
+        return _bulk_messages_redirect()
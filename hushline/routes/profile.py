@@ -36,6 +36,7 @@ from hushline.embeds import (
     emit_embed_abuse_counter,
 )
 from hushline.external_urls import canonical_external_url
+from hushline.live_updates import LIVE_UPDATE_INBOX, notify_users
 from hushline.model import (
     Conversation,
     ConversationMessage,
@@ -49,9 +50,12 @@ from hushline.model import (
     OrganizationSetting,
     User,
     Username,
+    reserve_message_and_field_value_ids,
 )
 from hushline.routes.common import (
+    RecipientEmailBody,
     do_send_email,
+    email_outbox_enabled,
     format_full_message_email_body,
     format_message_email_fields,
     notification_email_encryption_target,
@@ -63,6 +67,7 @@ from hushline.routes.common import (
 from hushline.routes.forms import DynamicMessageForm
 from hushline.routes.message import _chat_ciphertext_context, _is_chat_ciphertext_envelope
 from hushline.safe_template import safe_render_template
+from hushline.timing import span
 
 EMBED_CAPTCHA_MAX_AGE_SECONDS = 60 * 60
 
@@ -483,8 +488,93 @@ def register_profile_routes(app: Flask) -> None:
         conversation_message.encrypted_copies.append(recipient_copy)
         message.conversation = conversation
         db.session.add(conversation)
+        db.session.flush()
+        conversation.record_message(conversation_message)
         return conversation
 
+    def _submission_notification_body(  # noqa: PLR0913
+        user: User,
+        extracted_fields: list[tuple[str, str]],
+        raw_extracted_fields: list[tuple[str, str]],
+        raw_email_field_data: list[tuple[str, str, str, bool]],
+        *,
+        encrypted_email_body: str,
+        encrypted_email_fields_by_recipient: str,
+    ) -> RecipientEmailBody:
+        plaintext_new_message_body = "You have a new Hush Line message! Please log in to read it."
+        if not user.email_include_message_content:
+            current_app.logger.debug("Sending email with generic body")
+            return plaintext_new_message_body
+
+        notification_encryption_target = notification_email_encryption_target(user)
+        if user.email_encrypt_entire_body:
+            encrypted_email_body = encrypted_email_body.strip()
+            client_body_is_armored = _is_armored_pgp_message(encrypted_email_body)
+            can_trust_client_encrypted_body = client_body_is_armored and isinstance(
+                notification_encryption_target, str
+            )
+            if can_trust_client_encrypted_body:
+                current_app.logger.debug("Sending email with encrypted body")
+                return encrypted_email_body
+
+            fallback_body = format_full_message_email_body(raw_extracted_fields)
+            try:
+                if fallback_body and notification_encryption_target:
+                    with span("notification_encrypt"):
+                        email_body = encrypt_message(fallback_body, notification_encryption_target)
+                    current_app.logger.warning(
+                        "Missing/invalid client encrypted email body; "
+                        "used server-side full-body encryption fallback."
+                    )
+                    return email_body.strip()
+                current_app.logger.debug(
+                    "No fallback email content available; sending generic body."
+                )
+            except (RuntimeError, TypeError, ValueError) as e:
+                current_app.logger.error(
+                    "Failed to encrypt fallback full email body: %s",
+                    str(e),
+                    exc_info=True,
+                )
+            return plaintext_new_message_body
+
+        if len(user.enabled_notification_recipients) > 1:
+            # Keep the existing field-level email behavior
+            # when full-body encryption is disabled.
+            client_fields_by_recipient = _client_encrypted_email_fields_by_recipient(
+                encrypted_email_fields_by_recipient
+            )
+
+            def email_body_for_recipient(recipient: NotificationRecipient) -> str:
+                rendered_fields: list[tuple[str, str]] = []
+                for field_name, label, raw_value, encrypted in raw_email_field_data:
+                    value_for_email = raw_value
+                    if encrypted:
+                        recipient_fields = client_fields_by_recipient.get(recipient.id or -1, {})
+                        client_encrypted_value = recipient_fields.get(field_name)
+                        if client_encrypted_value:
+                            value_for_email = client_encrypted_value
+                        elif raw_value:
+                            current_app.logger.warning(
+                                "Missing recipient field ciphertext; "
+                                "sending generic notification body."
+                            )
+                            return plaintext_new_message_body
+                    rendered_fields.append((label, value_for_email))
+                return format_message_email_fields(rendered_fields)
+
+            current_app.logger.debug("Sending field-level email bodies per notification recipient")
+            return email_body_for_recipient
+
+        current_app.logger.debug("Sending email with unencrypted body")
+        return format_message_email_fields(extracted_fields).strip()
+
+    def _send_submission_notification(user: User, body: RecipientEmailBody) -> None:
+        if callable(body):
+            send_email_to_user_recipients(user, "New Hush Line Message Received", body)
+        else:
+            do_send_email(user, body)
+
     @app.route("/to/<username>", methods=["GET", "POST"])
     def profile(username: str) -> Response | str | tuple[str, int]:
         try:
@@ -497,7 +587,7 @@ def register_profile_routes(app: Flask) -> None:
                 extra={"username": username.lower()},
             )
             abort(404)
-        if not uname:
+        if not uname or uname.deleted_at is not None:
             abort(404)
 
         is_embedded = request.endpoint in {"embed_profile", "embed_profile_legacy"}
@@ -627,7 +717,8 @@ def register_profile_routes(app: Flask) -> None:
                     flash("⛔️ Invalid embed request origin. Please reload.")
                     return _render_profile(400)
 
-                embed_rate_limit_result = check_embed_rate_limit(uname)
+                with span("rate_limit"):
+                    embed_rate_limit_result = check_embed_rate_limit(uname)
                 emit_embed_abuse_counter(
                     EMBED_SUBMISSION_ATTEMPT_COUNTER,
                     profile_hash=embed_rate_limit_result.profile_hash,
@@ -715,7 +806,9 @@ def register_profile_routes(app: Flask) -> None:
                 flash("⛔️ This account is suspended. New messages cannot be sent at this time.")
                 return _render_profile(400)
 
-            if form.validate_on_submit():
+            with span("validate"):
+                form_valid = form.validate_on_submit()
+            if form_valid:
                 if block_reason == "missing_recipient_keys":
                     if embed_rate_limit_result is not None:
                         emit_embed_abuse_counter(
@@ -734,15 +827,16 @@ def register_profile_routes(app: Flask) -> None:
                     return _render_profile(400)
 
                 captcha_answer = form.captcha_answer.data or ""
-                captcha_valid = (
-                    _validate_embed_captcha(
-                        uname,
-                        captcha_answer,
-                        form.embed_captcha_token.data or "",
+                with span("captcha"):
+                    captcha_valid = (
+                        _validate_embed_captcha(
+                            uname,
+                            captcha_answer,
+                            form.embed_captcha_token.data or "",
+                        )
+                        if is_embedded
+                        else validate_captcha(captcha_answer)
                     )
-                    if is_embedded
-                    else validate_captcha(captcha_answer)
-                )
                 if not captcha_valid:
                     if embed_rate_limit_result is not None:
                         emit_embed_abuse_counter(
@@ -767,51 +861,57 @@ def register_profile_routes(app: Flask) -> None:
                     return _render_profile(400)
 
                 # Create a message
+                field_data = list(dynamic_form.field_data())
+                message_id, field_value_ids = reserve_message_and_field_value_ids(len(field_data))
                 message = Message(username_id=uname.id)
+                message.id = message_id
+                message.username = uname
                 db.session.add(message)
-                db.session.flush()
 
                 extracted_fields = []
                 raw_extracted_fields = []
                 raw_email_field_data = []
-                # Add the field values
-                for data in dynamic_form.field_data():
-                    field_name: str = data["name"]  # type: ignore
-                    field_definition: FieldDefinition = data["field"]  # type: ignore
-                    value = (
-                        "Stored in encrypted conversation."
-                        if chat_only_submission
-                        else getattr(form, field_name).data
-                    )
-                    raw_value = "\n".join(value) if isinstance(value, list) else (value or "")
-                    raw_extracted_fields.append((field_definition.label, str(raw_value)))
-                    raw_email_field_data.append(
-                        (
-                            field_name,
-                            field_definition.label,
-                            str(raw_value),
-                            field_definition.encrypted,
+                with span("encrypt"):
+                    # Add the field values
+                    for data, field_value_id in zip(field_data, field_value_ids, strict=True):
+                        field_name: str = data["name"]  # type: ignore
+                        field_definition: FieldDefinition = data["field"]  # type: ignore
+                        value = (
+                            "Stored in encrypted conversation."
+                            if chat_only_submission
+                            else getattr(form, field_name).data
                         )
-                    )
-                    field_value = FieldValue(
-                        field_definition,
-                        message,
-                        value,
-                        False if chat_only_submission else field_definition.encrypted,
-                    )
-                    db.session.add(field_value)
+                        raw_value = "\n".join(value) if isinstance(value, list) else (value or "")
+                        raw_extracted_fields.append((field_definition.label, str(raw_value)))
+                        raw_email_field_data.append(
+                            (
+                                field_name,
+                                field_definition.label,
+                                str(raw_value),
+                                field_definition.encrypted,
+                            )
+                        )
+                        field_value = FieldValue(
+                            field_definition,
+                            message,
+                            value,
+                            False if chat_only_submission else field_definition.encrypted,
+                            reserved_id=field_value_id,
+                        )
+                        db.session.add(field_value)
+                        extracted_fields.append((field_definition.label, field_value.value or ""))
+                with span("db_write"):
                     db.session.flush()
-                    extracted_fields.append((field_definition.label, field_value.value or ""))
 
-                conversation = None
-                if sender:
-                    conversation = _create_initial_conversation(
-                        message=message,
-                        sender=sender,
-                        recipient=uname.user,
-                        encrypted_conversation_copies=encrypted_conversation_copies,
-                        initial_conversation_nonce=owner_guard_nonce,
-                    )
+                    conversation = None
+                    if sender:
+                        conversation = _create_initial_conversation(
+                            message=message,
+                            sender=sender,
+                            recipient=uname.user,
+                            encrypted_conversation_copies=encrypted_conversation_copies,
+                            initial_conversation_nonce=owner_guard_nonce,
+                        )
                 if chat_only_submission and conversation is None:
                     db.session.rollback()
                     flash(
@@ -823,104 +923,34 @@ def register_profile_routes(app: Flask) -> None:
                     )
                     return _render_profile(400)
 
-                db.session.commit()
-
-                plaintext_new_message_body = (
-                    "You have a new Hush Line message! Please log in to read it."
-                )
-                if uname.user.enable_email_notifications:
-                    notification_encryption_target = notification_email_encryption_target(
-                        uname.user
+                notification_body = (
+                    _submission_notification_body(
+                        uname.user,
+                        extracted_fields,
+                        raw_extracted_fields,
+                        raw_email_field_data,
+                        encrypted_email_body=form.encrypted_email_body.data or "",
+                        encrypted_email_fields_by_recipient=(
+                            form.encrypted_email_fields_by_recipient.data or ""
+                        ),
                     )
-                    email_body_sent = False
-                    if uname.user.email_include_message_content:
-                        if uname.user.email_encrypt_entire_body:
-                            encrypted_email_body = (form.encrypted_email_body.data or "").strip()
-                            client_body_is_armored = _is_armored_pgp_message(encrypted_email_body)
-                            can_trust_client_encrypted_body = client_body_is_armored and isinstance(
-                                notification_encryption_target, str
-                            )
-                            if can_trust_client_encrypted_body:
-                                email_body = encrypted_email_body
-                                current_app.logger.debug("Sending email with encrypted body")
-                            else:
-                                fallback_body = format_full_message_email_body(raw_extracted_fields)
-                                try:
-                                    if fallback_body and notification_encryption_target:
-                                        email_body = encrypt_message(
-                                            fallback_body, notification_encryption_target
-                                        )
-                                        current_app.logger.warning(
-                                            "Missing/invalid client encrypted email body; "
-                                            "used server-side full-body encryption fallback."
-                                        )
-                                    else:
-                                        email_body = plaintext_new_message_body
-                                        current_app.logger.debug(
-                                            "No fallback email content available; "
-                                            "sending generic body."
-                                        )
-                                except (RuntimeError, TypeError, ValueError) as e:
-                                    current_app.logger.error(
-                                        "Failed to encrypt fallback full email body: %s",
-                                        str(e),
-                                        exc_info=True,
-                                    )
-                                    email_body = plaintext_new_message_body
-                        elif len(uname.user.enabled_notification_recipients) > 1:
-                            # Keep the existing field-level email behavior
-                            # when full-body encryption is disabled.
-                            client_fields_by_recipient = (
-                                _client_encrypted_email_fields_by_recipient(
-                                    form.encrypted_email_fields_by_recipient.data or ""
-                                )
-                            )
-
-                            def email_body_for_recipient(
-                                recipient: NotificationRecipient,
-                            ) -> str:
-                                rendered_fields: list[tuple[str, str]] = []
-                                for (
-                                    field_name,
-                                    label,
-                                    raw_value,
-                                    encrypted,
-                                ) in raw_email_field_data:
-                                    value_for_email = raw_value
-                                    if encrypted:
-                                        recipient_fields = client_fields_by_recipient.get(
-                                            recipient.id or -1, {}
-                                        )
-                                        client_encrypted_value = recipient_fields.get(field_name)
-                                        if client_encrypted_value:
-                                            value_for_email = client_encrypted_value
-                                        elif raw_value:
-                                            current_app.logger.warning(
-                                                "Missing recipient field ciphertext; "
-                                                "sending generic notification body."
-                                            )
-                                            return plaintext_new_message_body
-                                    rendered_fields.append((label, value_for_email))
-                                return format_message_email_fields(rendered_fields)
-
-                            send_email_to_user_recipients(
-                                uname.user,
-                                "New Hush Line Message Received",
-                                email_body_for_recipient,
-                            )
-                            email_body_sent = True
-                            current_app.logger.debug(
-                                "Sending field-level email bodies per notification recipient"
-                            )
-                        else:
-                            email_body = format_message_email_fields(extracted_fields)
-                            current_app.logger.debug("Sending email with unencrypted body")
-                    else:
-                        email_body = plaintext_new_message_body
-                        current_app.logger.debug("Sending email with generic body")
-
-                    if not email_body_sent:
-                        do_send_email(uname.user, email_body.strip())
+                    if uname.user.enable_email_notifications
+                    else None
+                )
+                # queued email is saved in the message's transaction, so a notification is
+                # neither queued for a message that was not saved nor lost for one that was
+                queue_notification = email_outbox_enabled()
+                if notification_body is not None and queue_notification:
+                    _send_submission_notification(uname.user, notification_body)
+                notify_users(
+                    [uname.user_id, *([sender.id] if conversation is not None and sender else [])],
+                    LIVE_UPDATE_INBOX,
+                )
+                with span("commit"):
+                    db.session.commit()
+                if notification_body is not None and not queue_notification:
+                    with span("email_send"):
+                        _send_submission_notification(uname.user, notification_body)
 
                 if is_embedded:
                     if embed_rate_limit_result is not None:
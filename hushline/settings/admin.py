@@ -45,12 +45,16 @@ def register_admin_routes(bp: Blueprint) -> None:
             )
 
         username_count_query = (
-            db.select(func.count(Username.id)).select_from(Username).outerjoin(User)
+            db.select(func.count(Username.id))
+            .select_from(Username)
+            .outerjoin(User)
+            .where(Username.deleted_at.is_(None))
         )
         username_query = (
             db.select(Username)
             .outerjoin(User)
             .options(joinedload(Username.user))
+            .where(Username.deleted_at.is_(None))
             .order_by(func.lower(Username._username), Username.id)
         )
         if username_filter is not None:
@@ -7,9 +7,10 @@ from flask import (
 from hushline.auth import authentication_required
 from hushline.db import db
 from hushline.model import (
+    DataExportJob,
     User,
 )
-from hushline.settings.forms import DataExportForm
+from hushline.settings.forms import DataExportDownloadForm, DataExportForm
 
 
 def register_advanced_routes(bp: Blueprint) -> None:
@@ -23,4 +24,6 @@ def register_advanced_routes(bp: Blueprint) -> None:
             "settings/advanced.html",
             user=user,
             data_export_form=data_export_form,
+            data_export_job=DataExportJob.latest_for_user(user.id),
+            data_export_download_form=DataExportDownloadForm(),
         )
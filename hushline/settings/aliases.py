@@ -42,6 +42,7 @@ from hushline.settings.forms import (
     NewAliasForm,
     ProfileForm,
 )
+from hushline.user_deletion import account_deletion_queue_enabled, tombstone_username
 
 ProfileForms = tuple[DisplayNameForm, DirectoryVisibilityForm, ProfileForm]
 
@@ -99,7 +100,7 @@ def register_aliases_routes(bp: Blueprint) -> None:
 
         aliases = db.session.scalars(
             db.select(Username)
-            .filter_by(is_primary=False, user_id=user.id)
+            .filter_by(is_primary=False, user_id=user.id, deleted_at=None)
             .order_by(db.func.coalesce(Username._display_name, Username._username))
         ).all()
 
@@ -115,7 +116,7 @@ def register_aliases_routes(bp: Blueprint) -> None:
     async def alias(username_id: int) -> Response | Tuple[str, int]:
         alias = db.session.scalars(
             db.select(Username).filter_by(
-                id=username_id, user_id=session["user_id"], is_primary=False
+                id=username_id, user_id=session["user_id"], is_primary=False, deleted_at=None
             )
         ).one_or_none()
         if not alias:
@@ -166,13 +167,19 @@ def register_aliases_routes(bp: Blueprint) -> None:
 
         alias = db.session.scalars(
             db.select(Username).filter_by(
-                id=username_id, user_id=session["user_id"], is_primary=False
+                id=username_id, user_id=session["user_id"], is_primary=False, deleted_at=None
             )
         ).one_or_none()
         if not alias:
             flash("⛔️ Alias not found.")
             return abort(404)
 
+        if account_deletion_queue_enabled():
+            tombstone_username(alias)
+            db.session.commit()
+            flash("🗑️ Alias deleted successfully.")
+            return redirect(url_for(".aliases"))
+
         with db.session.begin_nested():
             db.session.execute(
                 db.delete(FieldValue).where(
@@ -196,7 +203,7 @@ def register_aliases_routes(bp: Blueprint) -> None:
     def alias_fields(username_id: int) -> Response | Tuple[str, int]:
         alias = db.session.scalars(
             db.select(Username).filter_by(
-                id=username_id, user_id=session["user_id"], is_primary=False
+                id=username_id, user_id=session["user_id"], is_primary=False, deleted_at=None
             )
         ).one_or_none()
         if not alias:
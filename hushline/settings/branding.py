@@ -1,4 +1,3 @@
-from time import time_ns
 from typing import Tuple
 
 from flask import (
@@ -16,6 +15,14 @@ from wtforms import BooleanField, SubmitField
 from wtforms.validators import Optional as OptionalField
 
 from hushline.auth import admin_authentication_required
+from hushline.brand_images import (
+    BRAND_LOGO_BOX,
+    BRAND_LOGO_FALLBACK_BOX,
+    SPLASH_LOGO_BOX,
+    InvalidBrandImageError,
+    brand_image_paths,
+    store_brand_image,
+)
 from hushline.db import db
 from hushline.forms import DisplayNoneButton
 from hushline.model import (
@@ -51,6 +58,18 @@ class ToggleSplashScreenForm(FlaskForm):
     submit = SubmitField("Submit", name="toggle_splash_screen", widget=DisplayNoneButton())
 
 
+def _brand_image_paths(key: str, variants_key: str) -> set[str]:
+    settings = OrganizationSetting.fetch(key, variants_key)
+    return brand_image_paths(settings[key], settings[variants_key])
+
+
+def _delete_replaced_brand_assets(previous: set[str], current: set[str] | None = None) -> None:
+    # uploads never overwrite each other, so the files a setting pointed at before are deleted
+    # once the setting has been committed without them
+    for path in previous - (current or set()):
+        public_store.delete(path)
+
+
 def register_branding_routes(bp: Blueprint) -> None:
     @bp.route("/branding", methods=["GET", "POST"])
     @admin_authentication_required
@@ -141,13 +160,32 @@ def register_branding_routes(bp: Blueprint) -> None:
                 and update_brand_logo_form.validate()
             ):
                 if logo := update_brand_logo_form.logo.data:
-                    public_store.put(OrganizationSetting.BRAND_LOGO_VALUE, logo)
-                    OrganizationSetting.upsert(
-                        key=OrganizationSetting.BRAND_LOGO,
-                        value=OrganizationSetting.BRAND_LOGO_VALUE,
+                    previous = _brand_image_paths(
+                        OrganizationSetting.BRAND_LOGO, OrganizationSetting.BRAND_LOGO_VARIANTS
                     )
-                    db.session.commit()
-                    flash("👍 Brand logo updated successfully.")
+                    try:
+                        image = store_brand_image(
+                            logo,
+                            OrganizationSetting.BRAND_LOGO_PATH_STEM,
+                            BRAND_LOGO_BOX,
+                            BRAND_LOGO_FALLBACK_BOX,
+                            keep=previous,
+                        )
+                    except InvalidBrandImageError as e:
+                        update_brand_logo_form.logo.errors.append(str(e))
+                        status_code = 400
+                    else:
+                        OrganizationSetting.upsert(
+                            key=OrganizationSetting.BRAND_LOGO, value=image.path
+                        )
+                        OrganizationSetting.upsert(
+                            key=OrganizationSetting.BRAND_LOGO_VARIANTS, value=image.variants
+                        )
+                        db.session.commit()
+                        _delete_replaced_brand_assets(
+                            previous, brand_image_paths(image.path, image.variants)
+                        )
+                        flash("👍 Brand logo updated successfully.")
                 else:
                     update_brand_logo_form.logo.errors.append("This field is required.")
                     status_code = 400
@@ -155,6 +193,9 @@ def register_branding_routes(bp: Blueprint) -> None:
                 delete_brand_logo_form.submit.name in request.form
                 and delete_brand_logo_form.validate()
             ):
+                previous = _brand_image_paths(
+                    OrganizationSetting.BRAND_LOGO, OrganizationSetting.BRAND_LOGO_VARIANTS
+                )
                 row_count = db.session.execute(
                     db.delete(OrganizationSetting).where(
                         OrganizationSetting.key == OrganizationSetting.BRAND_LOGO
@@ -167,26 +208,47 @@ def register_branding_routes(bp: Blueprint) -> None:
                     )
                     db.session.rollback()
                     abort(503)
+                db.session.execute(
+                    db.delete(OrganizationSetting).where(
+                        OrganizationSetting.key == OrganizationSetting.BRAND_LOGO_VARIANTS
+                    )
+                )
                 db.session.commit()
-                public_store.delete(OrganizationSetting.BRAND_LOGO_VALUE)
+                _delete_replaced_brand_assets(previous)
                 flash("👍 Brand logo deleted.")
             elif (
                 update_splash_logo_form.submit.name in request.form
                 and update_splash_logo_form.validate()
             ):
                 if logo := update_splash_logo_form.logo.data:
-                    public_store.put(OrganizationSetting.BRAND_SPLASH_LOGO_VALUE, logo)
-                    OrganizationSetting.upsert(
-                        key=OrganizationSetting.BRAND_SPLASH_LOGO,
-                        value=OrganizationSetting.BRAND_SPLASH_LOGO_VALUE,
-                    )
-                    OrganizationSetting.upsert(
-                        key=OrganizationSetting.BRAND_SPLASH_LOGO_CACHE_BUSTER,
-                        value=str(time_ns()),
+                    previous = _brand_image_paths(
+                        OrganizationSetting.BRAND_SPLASH_LOGO,
+                        OrganizationSetting.BRAND_SPLASH_LOGO_VARIANTS,
                     )
-                    session["skip_first_load_splash_seen_mark"] = True
-                    db.session.commit()
-                    flash("👍 Splash logo updated successfully.")
+                    try:
+                        image = store_brand_image(
+                            logo,
+                            OrganizationSetting.BRAND_SPLASH_LOGO_PATH_STEM,
+                            SPLASH_LOGO_BOX,
+                            keep=previous,
+                        )
+                    except InvalidBrandImageError as e:
+                        update_splash_logo_form.logo.errors.append(str(e))
+                        status_code = 400
+                    else:
+                        OrganizationSetting.upsert(
+                            key=OrganizationSetting.BRAND_SPLASH_LOGO, value=image.path
+                        )
+                        OrganizationSetting.upsert(
+                            key=OrganizationSetting.BRAND_SPLASH_LOGO_VARIANTS,
+                            value=image.variants,
+                        )
+                        session["skip_first_load_splash_seen_mark"] = True
+                        db.session.commit()
+                        _delete_replaced_brand_assets(
+                            previous, brand_image_paths(image.path, image.variants)
+                        )
+                        flash("👍 Splash logo updated successfully.")
                 else:
                     update_splash_logo_form.logo.errors.append("This field is required.")
                     status_code = 400
@@ -194,24 +256,29 @@ def register_branding_routes(bp: Blueprint) -> None:
                 delete_splash_logo_form.submit.name in request.form
                 and delete_splash_logo_form.validate()
             ):
-                splash_logo_setting_keys = [
+                previous = _brand_image_paths(
                     OrganizationSetting.BRAND_SPLASH_LOGO,
-                    OrganizationSetting.BRAND_SPLASH_LOGO_CACHE_BUSTER,
-                ]
+                    OrganizationSetting.BRAND_SPLASH_LOGO_VARIANTS,
+                )
                 row_count = db.session.execute(
                     db.delete(OrganizationSetting).where(
-                        OrganizationSetting.key.in_(splash_logo_setting_keys)
+                        OrganizationSetting.key == OrganizationSetting.BRAND_SPLASH_LOGO
                     )
                 ).rowcount
-                if row_count > len(splash_logo_setting_keys):
+                if row_count > 1:
                     current_app.logger.error(
-                        "Would have deleted multiple rows for OrganizationSetting keys="
-                        + ", ".join(splash_logo_setting_keys)
+                        "Would have deleted multiple rows for OrganizationSetting key="
+                        + OrganizationSetting.BRAND_SPLASH_LOGO
                     )
                     db.session.rollback()
                     abort(503)
+                db.session.execute(
+                    db.delete(OrganizationSetting).where(
+                        OrganizationSetting.key == OrganizationSetting.BRAND_SPLASH_LOGO_VARIANTS
+                    )
+                )
                 db.session.commit()
-                public_store.delete(OrganizationSetting.BRAND_SPLASH_LOGO_VALUE)
+                _delete_replaced_brand_assets(previous)
                 flash("👍 Splash logo deleted.")
             elif (
                 toggle_splash_screen_form.submit.name in request.form
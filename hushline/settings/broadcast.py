@@ -1,10 +1,12 @@
 import json
+from collections.abc import Iterator
 from dataclasses import dataclass
 from typing import cast
 from uuid import UUID
 
 from flask import (
     Blueprint,
+    current_app,
     flash,
     jsonify,
     redirect,
@@ -14,13 +16,14 @@ from flask import (
     url_for,
 )
 from flask_wtf import FlaskForm
-from sqlalchemy import and_, exists, or_, text
+from sqlalchemy import and_, exists, insert, or_, text
 from sqlalchemy.orm import selectinload
 from sqlalchemy.sql.elements import ColumnElement
 from werkzeug.wrappers.response import Response
 from wtforms import BooleanField, HiddenField, SubmitField
 
 from hushline.auth import admin_authentication_required
+from hushline.crypto import pgp_key_fingerprint
 from hushline.db import db
 from hushline.forms import Button
 from hushline.model import (
@@ -31,8 +34,10 @@ from hushline.model import (
     Message,
     NotificationRecipient,
     User,
+    Username,
+    reserve_message_and_field_value_id_pairs,
 )
-from hushline.routes.common import do_send_email
+from hushline.routes.common import commit_with_notifications, do_send_email
 
 BROADCAST_SEND_SUBMIT = "send_broadcast"
 BROADCAST_CHUNK_FIELD = "broadcast_chunk"
@@ -42,6 +47,12 @@ BROADCAST_FINAL_CHUNK_FIELD = "broadcast_final_chunk"
 BROADCAST_ID_FIELD = "broadcast_id"
 ADMIN_BROADCAST_START_LOCK_CLASS_ID = 37002
 ADMIN_BROADCAST_START_LOCK_OBJECT_ID = 2307
+BROADCAST_NOTIFICATION_QUEUE_ENABLED = "BROADCAST_NOTIFICATION_QUEUE_ENABLED"
+BROADCAST_NOTIFICATION_BODY = "You have a new Hush Line message! Please log in to read it."
+BROADCAST_AUDIENCE_PAGE_SIZE = 100
+BROADCAST_AUDIENCE_MAX_PAGE_SIZE = 500
+_AUDIENCE_YIELD_PER = 100
+_RECIPIENT_INSERT_CHUNK_SIZE = 1000
 
 
 class AdminBroadcastForm(FlaskForm):
@@ -53,43 +64,18 @@ class AdminBroadcastForm(FlaskForm):
     send = SubmitField("Submit Messages", name=BROADCAST_SEND_SUBMIT, widget=Button())
 
 
+@dataclass(frozen=True)
+class BroadcastAudienceMember:
+    user_id: int
+    public_keys: tuple[str, ...]
+    notification_email_count: int
+
+
 @dataclass(frozen=True)
 class BroadcastAudience:
-    target_users: list[User]
-
-    @property
-    def encrypted_submission_users(self) -> list[User]:
-        return [
-            user
-            for user in self.target_users
-            if user.primary_username is not None
-            and user.message_encryption_target
-            and _message_field_for(user) is not None
-        ]
-
-    @property
-    def notification_email_count(self) -> int:
-        return sum(_unique_enabled_email_count(user) for user in self.encrypted_submission_users)
-
-    @property
-    def encryption_recipients(self) -> list[dict[str, object]]:
-        recipients: list[dict[str, object]] = []
-        for user in self.encrypted_submission_users:
-            username = user.primary_username
-            if username is None:
-                continue
-            username.create_default_field_defs()
-            keys = user.message_recipient_keys
-            if not keys:
-                continue
-            recipients.append(
-                {
-                    "user_id": user.id,
-                    "username_id": username.id,
-                    "public_keys": keys,
-                }
-            )
-        return recipients
+    target_user_count: int
+    encrypted_submission_user_ids: list[int]
+    notification_email_count: int
 
 
 @dataclass(frozen=True)
@@ -144,28 +130,88 @@ def _audience_predicate() -> ColumnElement[bool]:
     return and_(User.is_suspended.is_(False), or_(has_pgp_key, has_recipient_pgp_key))
 
 
-def _load_audience() -> BroadcastAudience:
-    users = list(
-        db.session.scalars(
-            db.select(User)
-            .where(_audience_predicate())
-            .options(
-                selectinload(User.notification_recipients),
-                selectinload(User.primary_username),
-            )
-            .order_by(User.id)
-        ).all()
+def _iter_audience_users(
+    *,
+    after_user_id: int = 0,
+    limit: int | None = None,
+    where: ColumnElement[bool] | None = None,
+) -> Iterator[User]:
+    """
+    Stream audience users in id order from a server-side cursor. Recipients and message fields
+    are loaded per batch of `_AUDIENCE_YIELD_PER` users, and nothing holds on to a user once the
+    caller moves past it, so memory does not grow with the audience.
+    """
+    statement = (
+        db.select(User)
+        .where(_audience_predicate(), User.id > after_user_id)
+        .options(
+            selectinload(User.notification_recipients),
+            selectinload(User.primary_username).selectinload(Username.message_fields),
+        )
+        .order_by(User.id)
+        .execution_options(yield_per=_AUDIENCE_YIELD_PER)
+    )
+    if where is not None:
+        statement = statement.where(where)
+    if limit is not None:
+        statement = statement.limit(limit)
+    yield from db.session.scalars(statement)
+
+
+def _has_message_field(user: User) -> bool:
+    username = user.primary_username
+    if username is None:
+        return False
+    # usernames without fields get the defaults, including an enabled message field, on submission
+    fields = username.message_fields
+    return not fields or any(field.enabled for field in fields)
+
+
+def _audience_member(user: User) -> BroadcastAudienceMember | None:
+    if not _has_message_field(user):
+        return None
+    keys = user.message_recipient_keys
+    if not keys:
+        return None
+    return BroadcastAudienceMember(
+        user_id=user.id,
+        public_keys=tuple(keys),
+        notification_email_count=_unique_enabled_email_count(user),
+    )
+
+
+def _load_audience(user_ids: set[int] | None = None) -> BroadcastAudience:
+    if user_ids is not None and not user_ids:
+        return BroadcastAudience(
+            target_user_count=0, encrypted_submission_user_ids=[], notification_email_count=0
+        )
+    target_user_count = 0
+    encrypted_submission_user_ids: list[int] = []
+    notification_email_count = 0
+    for user in _iter_audience_users(where=None if user_ids is None else User.id.in_(user_ids)):
+        target_user_count += 1
+        member = _audience_member(user)
+        if member is not None:
+            encrypted_submission_user_ids.append(member.user_id)
+            notification_email_count += member.notification_email_count
+    return BroadcastAudience(
+        target_user_count=target_user_count,
+        encrypted_submission_user_ids=encrypted_submission_user_ids,
+        notification_email_count=notification_email_count,
     )
-    return BroadcastAudience(target_users=users)
 
 
 def _load_pending_audience(pending_user_ids: set[int]) -> BroadcastAudience:
-    if not pending_user_ids:
-        return BroadcastAudience(target_users=[])
-    users = list(
+    return _load_audience(pending_user_ids)
+
+
+def _load_submission_users(user_ids: set[int]) -> list[User]:
+    if not user_ids:
+        return []
+    return list(
         db.session.scalars(
             db.select(User)
-            .where(_audience_predicate(), User.id.in_(pending_user_ids))
+            .where(_audience_predicate(), User.id.in_(user_ids))
             .options(
                 selectinload(User.notification_recipients),
                 selectinload(User.primary_username),
@@ -173,7 +219,17 @@ def _load_pending_audience(pending_user_ids: set[int]) -> BroadcastAudience:
             .order_by(User.id)
         ).all()
     )
-    return BroadcastAudience(target_users=users)
+
+
+def _pending_broadcast_user_ids(public_id: str) -> ColumnElement[bool]:
+    return User.id.in_(
+        db.select(AdminBroadcastRecipient.user_id)
+        .join(AdminBroadcast)
+        .where(
+            AdminBroadcast.public_id == public_id,
+            AdminBroadcastRecipient.status == AdminBroadcastRecipient.STATUS_PENDING,
+        )
+    )
 
 
 def _load_active_broadcast() -> AdminBroadcast | None:
@@ -207,14 +263,15 @@ def _create_broadcast(
         broadcast.public_id = public_id
     db.session.add(broadcast)
     db.session.flush()
-    for user_id in sorted(expected_user_ids):
-        db.session.add(
-            AdminBroadcastRecipient(
-                broadcast_id=broadcast.id,
-                user_id=user_id,
-            )
+    user_ids = sorted(expected_user_ids)
+    for start in range(0, len(user_ids), _RECIPIENT_INSERT_CHUNK_SIZE):
+        db.session.execute(
+            insert(AdminBroadcastRecipient),
+            [
+                {"broadcast_id": broadcast.id, "user_id": user_id}
+                for user_id in user_ids[start : start + _RECIPIENT_INSERT_CHUNK_SIZE]
+            ],
         )
-    db.session.flush()
     db.session.refresh(broadcast, ["recipients"])
     return broadcast
 
@@ -418,25 +475,32 @@ def _message_field_for(user: User) -> FieldDefinition | None:
     username = user.primary_username
     if username is None:
         return None
-    username.create_default_field_defs()
     enabled_fields = [field for field in username.message_fields if field.enabled]
     message_fields = [field for field in enabled_fields if field.label.casefold() == "message"]
     return (message_fields or enabled_fields)[-1] if enabled_fields else None
 
 
+def _notification_queue_enabled() -> bool:
+    return bool(current_app.config.get(BROADCAST_NOTIFICATION_QUEUE_ENABLED, False))
+
+
 def _submit_encrypted_broadcast_messages(
     users: list[User],
     encrypted_payloads: dict[int, str],
     broadcast: AdminBroadcast | None = None,
 ) -> int:
-    submitted_count = 0
-    submitted_notification_user_ids: list[int] = []
+    # creating the default fields commits, which would release the recipient locks taken below
+    for user in users:
+        if user.primary_username is not None:
+            user.primary_username.create_default_field_defs()
+
     pending_recipients_by_user_id: dict[int, AdminBroadcastRecipient] = {}
     if broadcast is not None:
         pending_recipients_by_user_id = _lock_pending_broadcast_recipients(
             broadcast,
             {user.id for user in users},
         )
+    submissions: list[tuple[User, FieldDefinition, str]] = []
     for user in users:
         if broadcast is not None and user.id not in pending_recipients_by_user_id:
             continue
@@ -446,27 +510,49 @@ def _submit_encrypted_broadcast_messages(
         if not encrypted_payload or field_definition is None or username is None:
             msg = "Encrypted broadcast target became ineligible before submission."
             raise ValueError(msg)
-
-        message = Message(username_id=username.id)
+        submissions.append((user, field_definition, encrypted_payload))
+
+    # with reserved ids, every message and field value of the chunk goes out in one flush
+    reserved_ids = reserve_message_and_field_value_id_pairs(len(submissions)) if submissions else []
+    submitted_recipients: list[AdminBroadcastRecipient] = []
+    for (user, field_definition, encrypted_payload), (message_id, field_value_id) in zip(
+        submissions, reserved_ids, strict=True
+    ):
+        message = Message(username_id=field_definition.username_id)
+        message.id = message_id
         db.session.add(message)
-        db.session.flush()
-        db.session.add(FieldValue(field_definition, message, encrypted_payload, True))
+        db.session.add(
+            FieldValue(
+                field_definition,
+                message,
+                encrypted_payload,
+                True,
+                reserved_id=field_value_id,
+            )
+        )
         if broadcast is not None:
-            pending_recipients_by_user_id[user.id].mark_submitted(message)
-        submitted_count += 1
-        submitted_notification_user_ids.append(user.id)
+            recipient = pending_recipients_by_user_id[user.id]
+            recipient.mark_submitted(message)
+            submitted_recipients.append(recipient)
+
+    # queued notifications are sent by `flask broadcasts worker` instead of this request
+    notify_now = bool(submissions) and (broadcast is None or not _notification_queue_enabled())
+    if notify_now:
+        for recipient in submitted_recipients:
+            recipient.mark_notified()
 
     if broadcast is not None:
         broadcast.mark_updated()
         broadcast.mark_completed_if_done()
 
-    if submitted_count:
-        db.session.commit()
-        _send_broadcast_notification_emails(tuple(submitted_notification_user_ids))
-    elif broadcast is not None:
-        db.session.commit()
+    def notify() -> None:
+        if notify_now:
+            _send_broadcast_notification_emails(tuple(user.id for user, _, _ in submissions))
 
-    return submitted_count
+    if submissions or broadcast is not None:
+        commit_with_notifications(notify)
+
+    return len(submissions)
 
 
 def _record_broadcast_failures(
@@ -483,7 +569,6 @@ def _record_broadcast_failures(
 
 
 def _send_broadcast_notification_emails(user_ids: tuple[int, ...]) -> None:
-    notification_body = "You have a new Hush Line message! Please log in to read it."
     users = list(
         db.session.scalars(
             db.select(User)
@@ -493,7 +578,36 @@ def _send_broadcast_notification_emails(user_ids: tuple[int, ...]) -> None:
         ).all()
     )
     for user in users:
-        do_send_email(user, notification_body)
+        do_send_email(user, BROADCAST_NOTIFICATION_BODY)
+
+
+def send_queued_broadcast_notifications(batch_size: int) -> int:
+    """
+    Send notification email for up to `batch_size` submitted broadcast messages and return how
+    many recipients were claimed.
+    """
+    user_ids = AdminBroadcastRecipient.claim_notifications(batch_size)
+
+    def notify() -> None:
+        if user_ids:
+            _send_broadcast_notification_emails(tuple(user_ids))
+
+    commit_with_notifications(notify)
+    return len(user_ids)
+
+
+def _is_later_broadcast_chunk() -> bool:
+    """Whether the request submits a chunk of a broadcast run that an earlier chunk created."""
+    if (
+        request.method != "POST"
+        or request.form.get(BROADCAST_CHUNK_FIELD) != "1"
+        or BROADCAST_SEND_SUBMIT not in request.form
+    ):
+        return False
+    public_id = _normalized_broadcast_public_id(request.form.get(BROADCAST_ID_FIELD, ""))
+    return bool(public_id) and bool(
+        db.session.scalar(db.select(exists().where(AdminBroadcast.public_id == public_id)))
+    )
 
 
 def _json_broadcast_error(message: str) -> tuple[Response, int]:
@@ -501,13 +615,65 @@ def _json_broadcast_error(message: str) -> tuple[Response, int]:
 
 
 def register_broadcast_routes(bp: Blueprint) -> None:
+    @bp.route("/broadcasts/audience")
+    @admin_authentication_required
+    def broadcast_audience() -> Response | tuple[Response, int]:
+        """
+        A page of the broadcast audience as `[user_id, [[fingerprint, armored_key], ...]]` rows,
+        starting after the `after` user id. `next_after` is null on the last page.
+        """
+        after_user_id = request.args.get("after", 0, type=int)
+        limit = min(
+            max(request.args.get("limit", BROADCAST_AUDIENCE_PAGE_SIZE, type=int), 1),
+            BROADCAST_AUDIENCE_MAX_PAGE_SIZE,
+        )
+        raw_broadcast_public_id = request.args.get("broadcast_id", "")
+        broadcast_public_id = _normalized_broadcast_public_id(raw_broadcast_public_id)
+        if raw_broadcast_public_id and not broadcast_public_id:
+            return _json_broadcast_error("Broadcast run id is invalid.")
+
+        recipients: list[list[object]] = []
+        scanned = 0
+        last_user_id = None
+        for audience_user in _iter_audience_users(
+            after_user_id=after_user_id,
+            limit=limit,
+            where=(
+                _pending_broadcast_user_ids(broadcast_public_id) if broadcast_public_id else None
+            ),
+        ):
+            scanned += 1
+            last_user_id = audience_user.id
+            member = _audience_member(audience_user)
+            if member is not None:
+                recipients.append(
+                    [
+                        member.user_id,
+                        [[pgp_key_fingerprint(key), key] for key in member.public_keys],
+                    ]
+                )
+        return jsonify(
+            {
+                "recipients": recipients,
+                "next_after": last_user_id if scanned == limit else None,
+            }
+        )
+
     @bp.route("/broadcasts", methods=["GET", "POST"])
     @admin_authentication_required
     def broadcasts() -> tuple[str, int] | tuple[Response, int] | Response:
         user = db.session.scalars(db.select(User).filter_by(id=session["user_id"])).one()
         form = AdminBroadcastForm()
         status_code = 200
-        audience = _load_audience()
+        encrypted_payloads = _encrypted_payloads_by_user(form.encrypted_payloads.data or "")
+        failed_user_ids = _encryption_failure_user_ids(form.encryption_failures.data or "")
+        if _is_later_broadcast_chunk():
+            # the run's recipients were fixed from the whole audience by its first chunk, so a
+            # later chunk only checks that its own recipients are still eligible; every chunk
+            # gets a JSON response, so this partial audience is never rendered
+            audience = _load_audience(set(encrypted_payloads) | failed_user_ids)
+        else:
+            audience = _load_audience()
 
         if request.method == "POST":
             chunked_broadcast = request.form.get(BROADCAST_CHUNK_FIELD) == "1"
@@ -522,7 +688,7 @@ def register_broadcast_routes(bp: Blueprint) -> None:
                             "Confirm before submitting these encrypted messages."
                         )
                         status_code = 400
-                    elif not audience.encrypted_submission_users and not (
+                    elif not audience.encrypted_submission_user_ids and not (
                         chunked_broadcast and request.form.get(BROADCAST_ID_FIELD, "")
                     ):
                         if chunked_broadcast:
@@ -535,15 +701,7 @@ def register_broadcast_routes(bp: Blueprint) -> None:
                         )
                         status_code = 400
                     else:
-                        encrypted_payloads = _encrypted_payloads_by_user(
-                            form.encrypted_payloads.data or ""
-                        )
-                        failed_user_ids = _encryption_failure_user_ids(
-                            form.encryption_failures.data or ""
-                        )
-                        eligible_user_ids = {
-                            user.id for user in audience.encrypted_submission_users
-                        }
+                        eligible_user_ids = set(audience.encrypted_submission_user_ids)
                         expected_user_ids = eligible_user_ids
                         submitted_user_ids = set(encrypted_payloads)
                         expected_chunk_user_ids = _user_ids_from_json(
@@ -700,6 +858,9 @@ def register_broadcast_routes(bp: Blueprint) -> None:
                                         "broadcast_id": completed_broadcast.public_id,
                                         "broadcast_complete": True,
                                         "pending_count": 0,
+                                        "notification_pending_count": (
+                                            completed_broadcast.notification_pending_count
+                                        ),
                                         "submitted_count": len(
                                             submitted_user_ids & submitted_broadcast_user_ids
                                         ),
@@ -714,11 +875,9 @@ def register_broadcast_routes(bp: Blueprint) -> None:
                                     expected_user_ids,
                                     broadcast_public_id,
                                 )
-                            submitted_users = [
-                                user
-                                for user in audience.encrypted_submission_users
-                                if user.id in submitted_user_ids_to_create
-                            ]
+                            submitted_users = _load_submission_users(
+                                submitted_user_ids_to_create & eligible_user_ids
+                            )
                             try:
                                 submitted_count = _submit_encrypted_broadcast_messages(
                                     submitted_users,
@@ -748,7 +907,6 @@ def register_broadcast_routes(bp: Blueprint) -> None:
                                     form=form,
                                     audience=audience,
                                     active_broadcast_state=None,
-                                    encryption_recipients=audience.encryption_recipients,
                                 ), status_code
                             skipped_count = len(failed_user_ids)
                             if chunked_broadcast:
@@ -769,6 +927,9 @@ def register_broadcast_routes(bp: Blueprint) -> None:
                                         "broadcast_id": active_broadcast.public_id,
                                         "broadcast_complete": active_broadcast.pending_count == 0,
                                         "pending_count": active_broadcast.pending_count,
+                                        "notification_pending_count": (
+                                            active_broadcast.notification_pending_count
+                                        ),
                                         "submitted_count": len(
                                             submitted_user_ids & submitted_broadcast_user_ids
                                         ),
@@ -800,7 +961,7 @@ def register_broadcast_routes(bp: Blueprint) -> None:
         active_broadcast_state = _broadcast_state(_load_active_broadcast())
         if active_broadcast_state is not None:
             audience = _load_pending_audience(active_broadcast_state.pending_user_ids)
-            renderable_pending_user_ids = {user.id for user in audience.encrypted_submission_users}
+            renderable_pending_user_ids = set(audience.encrypted_submission_user_ids)
             ineligible_pending_user_ids = (
                 active_broadcast_state.pending_user_ids - renderable_pending_user_ids
             )
@@ -823,5 +984,4 @@ def register_broadcast_routes(bp: Blueprint) -> None:
             form=form,
             audience=audience,
             active_broadcast_state=active_broadcast_state,
-            encryption_recipients=audience.encryption_recipients,
         ), status_code
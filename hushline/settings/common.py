@@ -3,13 +3,17 @@ import ipaddress
 import json
 import socket
 import urllib.parse
+from collections.abc import Collection
 from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from hashlib import sha256
 from hmac import compare_digest as bytes_are_equal
-from typing import Optional
+from http import HTTPStatus
+from typing import Optional, TypeGuard
 
 import aiohttp
 from aiohttp.abc import AbstractResolver, ResolveResult
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from flask import (
     abort,
     current_app,
@@ -39,6 +43,8 @@ from hushline.model import (
     FieldDefinition,
     FieldType,
     FieldValue,
+    ProfileLinkCheck,
+    ProfileLinkVerification,
     User,
     Username,
 )
@@ -56,6 +62,10 @@ from hushline.settings.forms import (
 )
 from hushline.utils import redirect_to_self
 
+PROFILE_LINK_VERIFICATION_QUEUE_ENABLED = "PROFILE_LINK_VERIFICATION_QUEUE_ENABLED"
+_PROFILE_LINK_CACHE_SECONDS = 24 * 60 * 60
+_VERIFICATION_TIMEOUT_SECONDS = 5
+
 
 def form_error() -> None:
     flash("⛔️ Your submitted form could not be processed.")
@@ -215,7 +225,7 @@ async def _is_safe_verification_url(url_to_verify: str) -> bool:
 
 
 async def _fetch_verification_html(safe_url: _SafeVerificationUrl) -> str:
-    timeout = aiohttp.ClientTimeout(total=5)
+    timeout = aiohttp.ClientTimeout(total=_VERIFICATION_TIMEOUT_SECONDS)
 
     if safe_url.resolved_addresses is None:
         async with (
@@ -256,16 +266,214 @@ async def verify_url(username: Username, i: int, url_to_verify: str, profile_url
         return
 
     current_app.logger.debug(f"Successfully fetched URL {url_to_verify!r}")
-    soup = BeautifulSoup(html_content, "html.parser")
+    if _verification_page_links_profile(html_content, profile_url):
+        setattr(username, f"extra_field_verified{i}", True)
+        current_app.logger.debug(f"Verified URL {url_to_verify!r}")
+    else:
+        current_app.logger.debug(f"Failed to verify URL {url_to_verify!r}")
+
+
+def _verification_page_links_profile(html_content: str, profile_url: str) -> bool:
+    # only links matter, so skip building a tree for the rest of the page
+    soup = BeautifulSoup(html_content, "html.parser", parse_only=SoupStrainer("a"))
     for link in soup.find_all("a"):
-        href = link.get("href")
-        rel = link.get("rel", [])
-        if href == profile_url and "me" in rel:
-            setattr(username, f"extra_field_verified{i}", True)
-            current_app.logger.debug(f"Verified URL {url_to_verify!r}")
-            break
+        if link.get("href") == profile_url and "me" in link.get("rel", []):
+            return True
+    return False
+
 
-    current_app.logger.debug(f"Failed to verify URL {url_to_verify!r}")
+class _PinnedVerificationResolver(AbstractResolver):
+    """
+    Resolver for a verification session shared by many URLs. Hostnames resolve only to the
+    addresses `_resolve_safe_verification_url` checked for them, so pooled connections are pinned
+    the same way as single fetches.
+    """
+
+    def __init__(self, *, allow_unpinned: bool = False) -> None:
+        self._addresses: dict[str, tuple[ResolveResult, ...]] = {}
+        self._unpinned_resolver = aiohttp.DefaultResolver() if allow_unpinned else None
+
+    def pin(self, safe_url: _SafeVerificationUrl) -> None:
+        if safe_url.resolved_addresses is not None:
+            self._addresses[safe_url.hostname.lower().rstrip(".")] = safe_url.resolved_addresses
+
+    async def resolve(
+        self,
+        host: str,
+        port: int = 0,
+        family: socket.AddressFamily = socket.AF_INET,
+    ) -> list[ResolveResult]:
+        addresses = self._addresses.get(host.lower().rstrip("."))
+        if addresses is not None:
+            return [ResolveResult(**{**address, "port": port}) for address in addresses]
+        if self._unpinned_resolver is not None:
+            return await self._unpinned_resolver.resolve(host, port, family)
+        raise OSError(f"URL verification resolver refused unexpected host: {host!r}")
+
+    async def close(self) -> None:
+        if self._unpinned_resolver is not None:
+            await self._unpinned_resolver.close()
+
+
+@dataclass(frozen=True)
+class _VerificationPage:
+    # None when the page is unchanged since the ETag that was sent
+    html: str | None
+    etag: str | None
+
+
+async def _fetch_verification_page(
+    session: aiohttp.ClientSession, safe_url: _SafeVerificationUrl, etag: str | None
+) -> _VerificationPage:
+    async with session.get(
+        safe_url.url,
+        timeout=aiohttp.ClientTimeout(total=_VERIFICATION_TIMEOUT_SECONDS),
+        allow_redirects=False,
+        headers={"If-None-Match": etag} if etag else None,
+    ) as response:
+        if etag and response.status == HTTPStatus.NOT_MODIFIED:
+            return _VerificationPage(None, etag)
+        response.raise_for_status()
+        return _VerificationPage(await response.text(), response.headers.get("ETag"))
+
+
+def profile_link_check_key(url: str, profile_url: str) -> str:
+    return sha256(f"{url}\0{profile_url}".encode()).hexdigest()
+
+
+def _profile_link_cache_max_age() -> timedelta:
+    value = current_app.config.get("PROFILE_LINK_CACHE_SECONDS", _PROFILE_LINK_CACHE_SECONDS)
+    try:
+        return timedelta(seconds=max(0, int(value)))
+    except (TypeError, ValueError):
+        return timedelta(seconds=_PROFILE_LINK_CACHE_SECONDS)
+
+
+def _profile_link_checks(keys: Collection[str]) -> dict[str, ProfileLinkCheck]:
+    return {
+        row.key: row
+        for row in db.session.scalars(
+            db.select(ProfileLinkCheck).where(ProfileLinkCheck.key.in_(keys))
+        )
+    }
+
+
+def cached_profile_link_results(links: Collection[tuple[str, str]]) -> dict[tuple[str, str], bool]:
+    """Cached verification results for the `(url, profile_url)` pairs that are still fresh."""
+    keys = {link: profile_link_check_key(*link) for link in links}
+    checks = _profile_link_checks(keys.values())
+    cutoff = datetime.now(UTC) - _profile_link_cache_max_age()
+    return {
+        link: check.verified
+        for link, key in keys.items()
+        if (check := checks.get(key)) is not None and check.checked_at > cutoff
+    }
+
+
+async def verify_profile_links(
+    links: Collection[tuple[str, str]], *, concurrency: int
+) -> dict[tuple[str, str], bool]:
+    """
+    Check whether each `(url, profile_url)` page links back to the profile with `rel="me"`.
+
+    Fresh cached results are used as is and stale ones are revalidated with their ETag. All
+    fetches share one connection pool with at most `concurrency` requests in flight. Successful
+    checks are written to the cache in the current transaction; failed fetches are not cached.
+    """
+    now = datetime.now(UTC)
+    keys = {link: profile_link_check_key(*link) for link in links}
+    checks = _profile_link_checks(keys.values())
+    cutoff = now - _profile_link_cache_max_age()
+    results: dict[tuple[str, str], bool] = {}
+    stored: dict[str, dict[str, object]] = {}
+
+    stale = []
+    for link, key in keys.items():
+        check = checks.get(key)
+        if check is not None and check.checked_at > cutoff:
+            results[link] = check.verified
+        else:
+            stale.append(link)
+    if not stale:
+        return results
+
+    semaphore = asyncio.Semaphore(concurrency)
+    resolver = _PinnedVerificationResolver(allow_unpinned=current_app.config["TESTING"])
+
+    async def _check(session: aiohttp.ClientSession, link: tuple[str, str]) -> None:
+        url, profile_url = link
+        check = checks.get(keys[link])
+        results[link] = False
+        async with semaphore:
+            safe_url = await _resolve_safe_verification_url(url)
+            if safe_url is None:
+                return
+            resolver.pin(safe_url)
+            try:
+                page = await _fetch_verification_page(
+                    session, safe_url, check.etag if check is not None else None
+                )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                current_app.logger.warning(f"Error fetching URL {url!r} for verification: {e}")
+                return
+
+        if page.html is None and check is not None:
+            verified = check.verified
+        else:
+            verified = _verification_page_links_profile(page.html or "", profile_url)
+        results[link] = verified
+        etag = (
+            page.etag if page.etag and len(page.etag) <= ProfileLinkCheck.ETAG_MAX_LENGTH else None
+        )
+        stored[keys[link]] = {
+            "key": keys[link],
+            "verified": verified,
+            "etag": etag,
+            "checked_at": now,
+        }
+
+    connector = aiohttp.TCPConnector(resolver=resolver, use_dns_cache=False, limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        outcomes = await asyncio.gather(
+            *(_check(session, link) for link in stale), return_exceptions=True
+        )
+    for outcome in outcomes:
+        if isinstance(outcome, Exception):
+            current_app.logger.warning(f"Exception raised verifying URL: {outcome}")
+
+    ProfileLinkCheck.store(list(stored.values()))
+    return results
+
+
+def is_verifiable_profile_link(value: str | None) -> TypeGuard[str]:
+    """Only links that start with "https://" are verified."""
+    if not value:
+        return False
+    return value.startswith("https://") or (
+        current_app.config["TESTING"] and value.startswith("http://")
+    )
+
+
+def _queue_profile_link_verifications(
+    username: Username, links: dict[int, str], profile_url: str
+) -> bool:
+    """
+    Apply fresh cached results and queue the remaining links for `flask profile-links worker`.
+    Returns whether any link was queued.
+    """
+    if not links:
+        return False
+    cached = cached_profile_link_results([(url, profile_url) for url in links.values()])
+    queued = False
+    for i, url in links.items():
+        verified = cached.get((url, profile_url))
+        if verified is None:
+            ProfileLinkVerification.enqueue(username.id, i, url, profile_url)
+            queued = True
+        else:
+            setattr(username, f"extra_field_verified{i}", verified)
+            ProfileLinkVerification.discard(username.id, [i])
+    return queued
 
 
 async def handle_update_bio(username: Username, form: ProfileForm) -> Response:
@@ -301,7 +509,9 @@ async def handle_update_bio(username: Username, form: ProfileForm) -> Response:
         username=username._username,
     )
 
+    queue_enabled = bool(current_app.config.get(PROFILE_LINK_VERIFICATION_QUEUE_ENABLED, False))
     tasks = []
+    queued_links: dict[int, str] = {}
     for i in range(1, 5):
         # always unverify all fields first
         setattr(username, f"extra_field_verified{i}", False)
@@ -314,11 +524,10 @@ async def handle_update_bio(username: Username, form: ProfileForm) -> Response:
         value = (getattr(value_field, "data") or "").strip() or None
         setattr(username, f"extra_field_value{i}", value)
 
-        # Verify the URL only if it starts with "https://"
-        if value and (
-            value.startswith("https://")
-            or (current_app.config["TESTING"] and value.startswith("http://"))
-        ):
+        if is_verifiable_profile_link(value):
+            if queue_enabled:
+                queued_links[i] = value
+                continue
             task = verify_url(username, i, value, profile_url)
             tasks.append(task)
 
@@ -331,8 +540,14 @@ async def handle_update_bio(username: Username, form: ProfileForm) -> Response:
                 else:
                     current_app.logger.warning(f"Exception raised verifying URL: {result}")
 
+    ProfileLinkVerification.discard(username.id, [i for i in range(1, 5) if i not in queued_links])
+    queued = _queue_profile_link_verifications(username, queued_links, profile_url)
+
     db.session.commit()
-    flash("👍 Bio and fields updated successfully.")
+    if queued:
+        flash("👍 Bio and fields updated successfully. Links will be verified shortly.")
+    else:
+        flash("👍 Bio and fields updated successfully.")
     return redirect_to_self()
 
 
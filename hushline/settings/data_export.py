@@ -1,18 +1,34 @@
 import csv
 import io
+import tempfile
 import zipfile
-from datetime import UTC, datetime
-from typing import Iterable
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime, timedelta
+from http import HTTPStatus
+from typing import cast
 
-from flask import Blueprint, abort, flash, redirect, send_file, session, url_for
+from flask import (
+    Blueprint,
+    Response,
+    abort,
+    current_app,
+    flash,
+    has_app_context,
+    redirect,
+    session,
+    url_for,
+)
 from flask.typing import ResponseReturnValue
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Table
+from sqlalchemy.sql.elements import ColumnElement
+from werkzeug.wrappers.response import Response as BaseResponse
 
 from hushline.auth import authentication_required
 from hushline.crypto import encrypt_bytes
 from hushline.db import db
 from hushline.model import (
     AuthenticationLog,
+    DataExportJob,
     FieldDefinition,
     FieldValue,
     Message,
@@ -20,18 +36,43 @@ from hushline.model import (
     User,
     Username,
 )
-from hushline.settings.forms import DataExportForm
+from hushline.routes.common import commit_with_notifications, send_email_to_user_recipients
+from hushline.settings.forms import DataExportDownloadForm, DataExportForm
+from hushline.storage import private_store
 
+DATA_EXPORT_JOBS_ENABLED = "DATA_EXPORT_JOBS_ENABLED"
+DATA_EXPORT_READY_SUBJECT = "Your Hush Line data export is ready"
+DATA_EXPORT_READY_BODY = (
+    "Your Hush Line data export is ready. Log in and go to Settings > Advanced to download it."
+)
 
-def _write_csv(
-    table_name: str, columns: Iterable[str], rows: list[dict[str, object]]
-) -> tuple[str, str]:
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=list(columns))
-    writer.writeheader()
-    for row in rows:
-        writer.writerow(row)
-    return f"db/{table_name}.csv", output.getvalue()
+# rows fetched from the server-side cursor, and CSV rows written to the archive, at a time
+_EXPORT_YIELD_PER = 500
+# archives for encrypted exports spill from memory to disk past this size
+_EXPORT_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+_EXPORT_RESPONSE_CHUNK_SIZE = 64 * 1024
+# long enough to build a large export, after which a crashed worker's jobs are claimed again
+_EXPORT_JOB_CLAIM_LEASE = timedelta(minutes=30)
+_EXPORT_JOB_RETENTION = timedelta(days=1)
+_EXPORT_DOWNLOAD_TOKEN_TTL = timedelta(hours=1)
+
+
+class _ZipSink(io.RawIOBase):
+    """Write-only stream that keeps what `zipfile` writes until it is drained."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:  # type: ignore[override]
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> Iterator[bytes]:
+        chunks, self._chunks = self._chunks, []
+        yield from chunks
 
 
 def _slugify(value: str) -> str:
@@ -40,187 +81,228 @@ def _slugify(value: str) -> str:
     return cleaned or "field"
 
 
-def _fetch_rows(user_id: int) -> dict[str, list[dict[str, object]]]:
-    usernames_rows: list[dict[str, object]] = [
-        dict(row)
-        for row in db.session.execute(
-            db.select(Username.__table__).where(  # type: ignore[attr-defined]
-                Username.__table__.c.user_id == user_id  # type: ignore[attr-defined]
-            )
-        )
-        .mappings()
-        .all()
-    ]
-    username_ids = [row["id"] for row in usernames_rows]
-
-    messages_rows: list[dict[str, object]] = []
-    if username_ids:
-        messages_rows = [
-            dict(row)
-            for row in db.session.execute(
-                db.select(Message.__table__).where(  # type: ignore[attr-defined]
-                    Message.__table__.c.username_id.in_(  # type: ignore[attr-defined]
-                        username_ids
-                    )
-                )
-            )
-            .mappings()
-            .all()
-        ]
-    message_ids = [row["id"] for row in messages_rows]
-
-    field_def_rows: list[dict[str, object]] = []
-    if username_ids:
-        field_def_rows = [
-            dict(row)
-            for row in db.session.execute(
-                db.select(FieldDefinition.__table__).where(  # type: ignore[attr-defined]
-                    FieldDefinition.__table__.c.username_id.in_(  # type: ignore[attr-defined]
-                        username_ids
-                    )
-                )
-            )
-            .mappings()
-            .all()
-        ]
-    field_values_rows: list[dict[str, object]] = []
-    if message_ids:
-        field_values_rows = [
-            dict(row)
-            for row in db.session.execute(
-                db.select(FieldValue.__table__).where(  # type: ignore[attr-defined]
-                    FieldValue.__table__.c.message_id.in_(  # type: ignore[attr-defined]
-                        message_ids
-                    )
-                )
-            )
-            .mappings()
-            .all()
-        ]
-
-    status_text_rows: list[dict[str, object]] = [
-        dict(row)
-        for row in db.session.execute(
-            db.select(MessageStatusText.__table__).where(  # type: ignore[attr-defined]
-                MessageStatusText.__table__.c.user_id == user_id  # type: ignore[attr-defined]
-            )
-        )
-        .mappings()
-        .all()
-    ]
-
-    auth_log_rows: list[dict[str, object]] = [
-        dict(row)
-        for row in db.session.execute(
-            db.select(AuthenticationLog.__table__).where(  # type: ignore[attr-defined]
-                AuthenticationLog.__table__.c.user_id == user_id  # type: ignore[attr-defined]
-            )
-        )
-        .mappings()
-        .all()
-    ]
-
-    user_rows: list[dict[str, object]] = [
-        dict(row)
-        for row in db.session.execute(
-            db.select(User.__table__).where(  # type: ignore[attr-defined]
-                User.__table__.c.id == user_id  # type: ignore[attr-defined]
-            )
-        )
-        .mappings()
-        .all()
-    ]
-
-    return {
-        "usernames": usernames_rows,
-        "messages": messages_rows,
-        "field_definitions": field_def_rows,
-        "field_values": field_values_rows,
-        "message_status_text": status_text_rows,
-        "authentication_logs": auth_log_rows,
-        "users": user_rows,
-    }
+def _table(model: type[db.Model]) -> Table:  # type: ignore[name-defined]
+    return model.__table__
 
 
-def _write_csv_bundle(rows: dict[str, list[dict[str, object]]]) -> list[tuple[str, str]]:
+def _export_tables(user_id: int) -> list[tuple[str, Table, ColumnElement[bool]]]:
+    usernames = _table(Username)
+    messages = _table(Message)
+    username_ids = db.select(usernames.c.id).where(usernames.c.user_id == user_id)
+    message_ids = db.select(messages.c.id).where(messages.c.username_id.in_(username_ids))
     return [
-        _write_csv(
-            "users",
-            User.__table__.columns.keys(),  # type: ignore[attr-defined]
-            rows["users"],
-        ),
-        _write_csv(
-            "usernames",
-            Username.__table__.columns.keys(),  # type: ignore[attr-defined]
-            rows["usernames"],
-        ),
-        _write_csv(
-            "messages",
-            Message.__table__.columns.keys(),  # type: ignore[attr-defined]
-            rows["messages"],
-        ),
-        _write_csv(
+        ("users", _table(User), _table(User).c.id == user_id),
+        ("usernames", usernames, usernames.c.user_id == user_id),
+        ("messages", messages, messages.c.username_id.in_(username_ids)),
+        (
             "field_definitions",
-            FieldDefinition.__table__.columns.keys(),  # type: ignore[attr-defined]
-            rows["field_definitions"],
-        ),
-        _write_csv(
-            "field_values",
-            FieldValue.__table__.columns.keys(),  # type: ignore[attr-defined]
-            rows["field_values"],
+            _table(FieldDefinition),
+            _table(FieldDefinition).c.username_id.in_(username_ids),
         ),
-        _write_csv(
+        ("field_values", _table(FieldValue), _table(FieldValue).c.message_id.in_(message_ids)),
+        (
             "message_status_text",
-            MessageStatusText.__table__.columns.keys(),  # type: ignore[attr-defined]
-            rows["message_status_text"],
+            _table(MessageStatusText),
+            _table(MessageStatusText).c.user_id == user_id,
         ),
-        _write_csv(
+        (
             "authentication_logs",
-            AuthenticationLog.__table__.columns.keys(),  # type: ignore[attr-defined]
-            rows["authentication_logs"],
+            _table(AuthenticationLog),
+            _table(AuthenticationLog).c.user_id == user_id,
         ),
     ]
 
 
-def _write_pgp_messages(zip_file: zipfile.ZipFile, username_ids: list[int]) -> None:
-    if not username_ids:
-        return
-    messages = db.session.scalars(
-        db.select(Message)
-        .where(Message.username_id.in_(username_ids))
-        .options(selectinload(Message.field_values).selectinload(FieldValue.field_definition))
-    ).all()
-    for message in messages:
-        for field_value in message.field_values:
-            if not field_value.encrypted:
-                continue
-            value = field_value.value
-            if not value or not value.startswith("-----BEGIN PGP MESSAGE-----"):
-                continue
-            label = field_value.field_definition.label if field_value.field_definition else "field"
-            label_slug = _slugify(label)
-            public_id = message.public_id or f"message-{message.id}"
-            filename = f"pgp_messages/{public_id}-{label_slug}-{field_value.id}.asc"
+def _write_csv(
+    zip_file: zipfile.ZipFile, sink: _ZipSink, table_name: str, table: Table, where: ColumnElement
+) -> Iterator[bytes]:
+    result = db.session.execute(
+        db.select(table)
+        .where(where)
+        .order_by(*table.primary_key.columns)
+        .execution_options(yield_per=_EXPORT_YIELD_PER)
+    ).mappings()
+    text = io.StringIO()
+    writer = csv.DictWriter(text, fieldnames=table.columns.keys())
+    writer.writeheader()
+    with zip_file.open(f"db/{table_name}.csv", "w") as member:
+        for rows in result.partitions():
+            writer.writerows(rows)
+            member.write(text.getvalue().encode("utf-8"))
+            text.seek(0)
+            text.truncate()
+            yield from sink.drain()
+        member.write(text.getvalue().encode("utf-8"))
+
+
+def _pgp_message_values(user_id: int) -> Iterable[tuple[str, str]]:
+    rows = db.session.execute(
+        db.select(FieldValue, Message.public_id, FieldDefinition.label)
+        .join(Message, FieldValue.message_id == Message.id)
+        .join(Username, Message.username_id == Username.id)
+        .outerjoin(FieldDefinition, FieldValue.field_definition_id == FieldDefinition.id)
+        .where(Username.user_id == user_id, FieldValue.encrypted.is_(True))
+        .order_by(FieldValue.id)
+        .execution_options(yield_per=_EXPORT_YIELD_PER)
+    )
+    for field_value, public_id, label in rows:
+        value = field_value.value
+        if not value or not value.startswith("-----BEGIN PGP MESSAGE-----"):
+            continue
+        message_slug = public_id or f"message-{field_value.message_id}"
+        filename = f"pgp_messages/{message_slug}-{_slugify(label or 'field')}-{field_value.id}.asc"
+        yield filename, value
+
+
+def iter_export_zip(user_id: int) -> Iterator[bytes]:
+    """
+    Yield a ZIP archive of the user's data as it is written.
+
+    Rows come from server-side cursors a batch at a time and go straight into deflated archive
+    members, which `zipfile` writes with data descriptors since the output is not seekable, so
+    memory use does not depend on how much data the user has.
+    """
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
+        for table_name, table, where in _export_tables(user_id):
+            yield from _write_csv(zip_file, sink, table_name, table, where)
+        for filename, value in _pgp_message_values(user_id):
             zip_file.writestr(filename, value)
+            yield from sink.drain()
+    yield from sink.drain()
 
 
-def _build_zip(user_id: int) -> bytes:
-    rows = _fetch_rows(user_id)
-    username_ids: list[int] = []
-    for row in rows["usernames"]:
-        value = row.get("id")
-        if isinstance(value, int):
-            username_ids.append(value)
+def _encrypt_export(user_id: int, pgp_key: str) -> bytes | None:
+    with tempfile.SpooledTemporaryFile(max_size=_EXPORT_SPOOL_MAX_SIZE) as archive:
+        for chunk in iter_export_zip(user_id):
+            archive.write(chunk)
+        archive.seek(0)
+        # pysequoia only encrypts whole buffers, so the archive is read back once here
+        return encrypt_bytes(archive.read(), pgp_key)
 
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
-        csv_files = _write_csv_bundle(rows)
-        for filename, content in csv_files:
-            zip_file.writestr(filename, content)
-        _write_pgp_messages(zip_file, username_ids)
 
-    zip_buffer.seek(0)
-    return zip_buffer.getvalue()
+def _iter_chunks(data: bytes) -> Iterator[bytes]:
+    view = memoryview(data)
+    for start in range(0, len(view), _EXPORT_RESPONSE_CHUNK_SIZE):
+        yield bytes(view[start : start + _EXPORT_RESPONSE_CHUNK_SIZE])
+
+
+def _in_app_context(body: Iterator[bytes]) -> Iterator[bytes]:
+    # servers send the body after the request context is gone, so the generator sets up its own
+    # app context when there is none, and only once it is iterated, so a response that is never
+    # sent leaves no context behind
+    app = current_app._get_current_object()  # type: ignore[attr-defined]
+
+    def generate() -> Iterator[bytes]:
+        if has_app_context():
+            yield from body
+            return
+        with app.app_context():
+            yield from body
+
+    return generate()
+
+
+def export_download_name(user: User | None, *, encrypted: bool) -> str:
+    timestamp = datetime.now(UTC).strftime("%Y%m%d%H%M%S")
+    username_slug = user.primary_username.username if user else "user"
+    suffix = "zip.asc" if encrypted else "zip"
+    return f"hushline-data-{username_slug}-{timestamp}.{suffix}"
+
+
+def _export_jobs_enabled() -> bool:
+    return bool(current_app.config.get(DATA_EXPORT_JOBS_ENABLED, False))
+
+
+def _run_data_export_job(job_id: int) -> None:
+    job = db.session.get(DataExportJob, job_id)
+    user = db.session.get(User, job.user_id) if job is not None and job.is_pending else None
+    if job is None or user is None:
+        db.session.rollback()
+        return
+
+    path = job.storage_path
+    try:
+        encrypted = _encrypt_export(user.id, user.pgp_key) if user.pgp_key else None
+        if encrypted:
+            private_store.put(path, io.BytesIO(encrypted))
+    except Exception as e:
+        # the job is marked failed rather than left pending, or every lease would retry it
+        current_app.logger.error(
+            "Failed to build data export %s: %s", job_id, type(e).__name__, exc_info=True
+        )
+        db.session.rollback()
+        encrypted = None
+
+    job = DataExportJob.lock_pending(job_id)
+    if job is None:
+        # the account was deleted while its export was being built
+        db.session.rollback()
+        if encrypted:
+            private_store.discard([path])
+        return
+    if encrypted:
+        job.mark_ready(len(encrypted), retention=_EXPORT_JOB_RETENTION)
+        commit_with_notifications(
+            lambda: send_email_to_user_recipients(
+                user, DATA_EXPORT_READY_SUBJECT, DATA_EXPORT_READY_BODY
+            )
+        )
+    else:
+        job.mark_failed(retention=_EXPORT_JOB_RETENTION)
+        db.session.commit()
+
+
+def run_data_export_jobs(batch_size: int) -> int:
+    """
+    Build up to `batch_size` queued exports and return how many were claimed.
+
+    Claims are committed before any export is built. Each finished archive is stored before its
+    job is locked and marked ready, so no lock is held while an export is written.
+    """
+    job_ids = [
+        job.id for job in DataExportJob.claim_batch(batch_size, lease=_EXPORT_JOB_CLAIM_LEASE)
+    ]
+    db.session.commit()
+    for job_id in job_ids:
+        _run_data_export_job(job_id)
+    return len(job_ids)
+
+
+def purge_expired_data_exports(batch_size: int) -> int:
+    """Delete up to `batch_size` expired jobs and their archives, and return how many."""
+    jobs = DataExportJob.claim_expired(batch_size)
+    for job in jobs:
+        if job.is_ready:
+            private_store.delete(job.storage_path)
+        db.session.delete(job)
+    db.session.commit()
+    return len(jobs)
+
+
+def _sends_final_byte(response: BaseResponse) -> bool:
+    if response.status_code == HTTPStatus.OK:
+        return True
+    content_range = response.content_range
+    return (
+        response.status_code == HTTPStatus.PARTIAL_CONTENT
+        and content_range.stop is not None
+        and content_range.stop == content_range.length
+    )
+
+
+def _mark_downloaded_when_sent(body: Iterable[bytes], job_id: int) -> Iterator[bytes]:
+    # a client that disconnects closes this generator before the end, which keeps the token
+    # valid for a Range request that resumes the download
+    try:
+        yield from body
+        job = db.session.get(DataExportJob, job_id)
+        if job is not None:
+            job.mark_downloaded()
+            db.session.commit()
+    finally:
+        if close := getattr(body, "close", None):
+            close()
 
 
 def register_data_export_routes(bp: Blueprint) -> None:
@@ -233,25 +315,70 @@ def register_data_export_routes(bp: Blueprint) -> None:
         user_id = session["user_id"]
         user = db.session.get(User, user_id)
 
-        export_bytes = _build_zip(user_id)
         encrypt_export = form.encrypt_export.data
         if encrypt_export:
             if not user or not user.pgp_key:
                 flash("⛔️ Add a PGP key to encrypt your export.")
                 return redirect(url_for("settings.encryption"))
-            encrypted = encrypt_bytes(export_bytes, user.pgp_key)
+            if _export_jobs_enabled():
+                if DataExportJob.pending_for_user(user_id) is None:
+                    db.session.add(DataExportJob(user_id=user_id))
+                    db.session.commit()
+                flash("📦 Your export is being prepared. We'll email you when it's ready.")
+                return redirect(url_for("settings.advanced"))
+            encrypted = _encrypt_export(user_id, user.pgp_key)
             if not encrypted:
                 flash("⛔️ Failed to encrypt export. Please try again.")
                 return redirect(url_for("settings.advanced"))
-            export_bytes = encrypted
-
-        timestamp = datetime.now(UTC).strftime("%Y%m%d%H%M%S")
-        username_slug = user.primary_username.username if user else "user"
-        suffix = "zip.asc" if encrypt_export else "zip"
-        download_name = f"hushline-data-{username_slug}-{timestamp}.{suffix}"
-        return send_file(
-            io.BytesIO(export_bytes),
+            body = _iter_chunks(encrypted)
+        else:
+            body = _in_app_context(iter_export_zip(user_id))
+
+        response = Response(
+            body,
             mimetype="application/pgp-encrypted" if encrypt_export else "application/zip",
-            as_attachment=True,
-            download_name=download_name,
         )
+        response.headers.set(
+            "Content-Disposition",
+            "attachment",
+            filename=export_download_name(user, encrypted=bool(encrypt_export)),
+        )
+        return response
+
+    @bp.route("/data-export/<public_id>/download", methods=["POST"])
+    @authentication_required
+    def data_export_download_token(public_id: str) -> ResponseReturnValue:
+        form = DataExportDownloadForm()
+        if not form.validate_on_submit():
+            abort(400)
+        job = DataExportJob.ready_for_user(public_id, session["user_id"])
+        if job is None:
+            flash("⛔️ This export has expired. Please request a new one.")
+            return redirect(url_for("settings.advanced"))
+        token = job.issue_download_token(ttl=_EXPORT_DOWNLOAD_TOKEN_TTL)
+        db.session.commit()
+        return redirect(url_for("settings.data_export_download", token=token))
+
+    @bp.route("/data-export/download/<token>")
+    @authentication_required
+    def data_export_download(token: str) -> ResponseReturnValue:
+        user_id = session["user_id"]
+        job = DataExportJob.for_download_token(token, user_id)
+        if job is None:
+            abort(404)
+
+        response = private_store.serve(
+            job.storage_path,
+            export_download_name(db.session.get(User, user_id), encrypted=True),
+        )
+        if response.status_code == HTTPStatus.FOUND:
+            # object storage serves the download, and Range requests, from a presigned URL
+            job.mark_downloaded()
+            db.session.commit()
+        elif _sends_final_byte(response):
+            response.response = _in_app_context(
+                _mark_downloaded_when_sent(cast(Iterable[bytes], response.response), job.id)
+            )
+            response.direct_passthrough = False
+        response.headers["Cache-Control"] = "no-store"
+        return response
@@ -11,11 +11,14 @@ from werkzeug.wrappers.response import Response
 from hushline.auth import authentication_required
 from hushline.db import db
 from hushline.model import User
+from hushline.storage import private_store
 from hushline.user_deletion import (
+    account_deletion_queue_enabled,
     delete_user_and_related,
     has_deletion_blocking_stripe_invoice,
     has_deletion_blocking_stripe_invoice_event,
     has_deletion_blocking_stripe_subscription_event,
+    tombstone_user,
 )
 
 
@@ -23,6 +26,8 @@ def register_delete_account_routes(bp: Blueprint) -> None:
     @bp.route("/delete-account", methods=["POST"])
     @authentication_required
     def delete_account() -> Response | str:
+        queued = account_deletion_queue_enabled()
+        export_archives: list[str] = []
         with db.session.begin_nested():
             user = db.session.get(User, session["user_id"])
             if user:
@@ -61,12 +66,19 @@ def register_delete_account_routes(bp: Blueprint) -> None:
                     )
                     return abort(400)
 
-                delete_user_and_related(user)
+                if queued:
+                    tombstone_user(user)
+                else:
+                    export_archives = delete_user_and_related(user)
             else:
                 flash("🫥 User not found. Please log in again.")
                 return redirect(url_for("login"))
 
         db.session.commit()
+        private_store.discard(export_archives)
         session.clear()
-        flash("🔥 Your account and all related information have been deleted.")
+        if queued:
+            flash("🔥 Your account has been deleted. Its related information is being erased.")
+        else:
+            flash("🔥 Your account and all related information have been deleted.")
         return redirect(url_for("index"))
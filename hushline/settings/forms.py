@@ -89,6 +89,10 @@ class DataExportForm(FlaskForm):
     submit = SubmitField("Download My Data", name="download_data", widget=Button())
 
 
+class DataExportDownloadForm(FlaskForm):
+    submit = SubmitField("Download Export", name="download_export", widget=Button())
+
+
 class SMTPSettingsForm(FlaskForm):
     class Meta:
         csrf = False
@@ -413,7 +417,8 @@ class UpdateBrandLogoForm(FlaskForm):
         "Logo (.png only)",
         validators=[
             FileAllowed(["png"], "Only PNG files are allowed"),
-            FileSize(256 * 1000),  # 256 KB
+            # uploads are downsized before they are stored
+            FileSize(4 * 1000 * 1000),  # 4 MB
         ],
     )
     submit = SubmitField("Update Logo", name="update_logo", widget=Button())
@@ -428,7 +433,8 @@ class UpdateSplashLogoForm(FlaskForm):
         "Splash Logo (.png only)",
         validators=[
             FileAllowed(["png"], "Only PNG files are allowed"),
-            FileSize(256 * 1000),  # 256 KB
+            # uploads are downsized before they are stored
+            FileSize(4 * 1000 * 1000),  # 4 MB
         ],
     )
     submit = SubmitField("Update Splash Logo", name="update_splash_logo", widget=Button())
@@ -7,7 +7,9 @@ from sqlalchemy import distinct, func
 
 from hushline.auth import admin_authentication_required
 from hushline.db import db
+from hushline.md import markdown_cache
 from hushline.model import ChatKey, User
+from hushline.timing import latency_histograms, timing_enabled
 
 
 def _percentage(count: int, total: int) -> float:
@@ -47,4 +49,6 @@ def register_metrics_routes(bp: Blueprint) -> None:
             two_fa_percentage=_percentage(two_fa_count, user_count),
             pgp_key_percentage=_percentage(pgp_key_count, user_count),
             chat_key_percentage=_percentage(chat_key_count, user_count),
+            latency_histograms=latency_histograms().snapshot() if timing_enabled() else [],
+            markdown_cache=markdown_cache.stats(),
         )
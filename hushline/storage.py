@@ -1,27 +1,60 @@
 import contextlib
+import hashlib
 import mimetypes
 import os
+import re
 import shutil
 from io import IOBase
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 import boto3
 from botocore.config import Config as BotoConfig
 from flask import Blueprint, Flask, abort, current_app, redirect, request, send_from_directory
 from werkzeug.wrappers.response import Response
 
+# a year, the longest lifetime caches honour
+IMMUTABLE_MAX_AGE = 31536000
+_CONTENT_ADDRESSED_NAME_RE = re.compile(r"-(?P<digest>[0-9a-f]{64})\.[a-z0-9]+$")
+
+
+def content_addressed_path(stem: str, readable: IOBase, suffix: str) -> str:
+    """
+    Return `<stem>-<sha256 of the content><suffix>`. A new upload always gets a new path, so
+    whatever is stored there can be cached forever.
+    """
+    readable.seek(0)
+    digest = hashlib.sha256()
+    while chunk := readable.read(64 * 1024):
+        digest.update(chunk)
+    readable.seek(0)
+    return f"{stem}-{digest.hexdigest()}{suffix}"
+
+
+def content_hash(path: str) -> Optional[str]:
+    """The content hash in a path from `content_addressed_path`, if it is one."""
+    if match := _CONTENT_ADDRESSED_NAME_RE.search(path):
+        return match.group("digest")
+    return None
+
 
 def create_blueprint() -> Blueprint:
     bp = Blueprint("storage", __name__, url_prefix="/assets")
 
     @bp.route("/public/<path:path>")
     def public(path: str) -> Response:
-        return public_store.serve(path)
+        return public_store.serve(path, etag=content_hash(path))
 
     return bp
 
 
+def _mark_immutable(response: Response) -> Response:
+    response.cache_control.public = True
+    response.cache_control.max_age = IMMUTABLE_MAX_AGE
+    response.cache_control.immutable = True
+    return response
+
+
 class StorageBase:
     __NAME_BASE = "BLOB_STORAGE"
 
@@ -42,13 +75,19 @@ class StorageBase:
 
 
 class StorageDriver(StorageBase):
-    def put(self, path: str, readable: IOBase) -> None:
+    def put(self, path: str, readable: IOBase, immutable: bool = False) -> None:
         raise NotImplementedError
 
     def delete(self, path: str) -> None:
         raise NotImplementedError
 
-    def serve(self, path: str) -> Response:
+    def serve(
+        self, path: str, download_name: Optional[str] = None, etag: Optional[str] = None
+    ) -> Response:
+        """
+        Serve the blob at `path`. An `etag` marks the blob as immutable: it is sent as a strong
+        ETag and the response may be cached for `IMMUTABLE_MAX_AGE`.
+        """
         raise NotImplementedError
 
 
@@ -114,7 +153,7 @@ class FsDriver(StorageDriver):
             raise ValueError(f"Path {full_path!r} was not absolute")
         return full_path
 
-    def put(self, path: str, readable: IOBase) -> None:
+    def put(self, path: str, readable: IOBase, immutable: bool = False) -> None:
         readable.seek(0)
         full_path = self.__full_path(path)
         # TODO check and set permissions
@@ -127,9 +166,21 @@ class FsDriver(StorageDriver):
         with contextlib.suppress(FileNotFoundError):
             os.remove(full_path)
 
-    def serve(self, path: str) -> Response:
+    def serve(
+        self, path: str, download_name: Optional[str] = None, etag: Optional[str] = None
+    ) -> Response:
         self.__reject_windows_device_path_segments(path)
-        return send_from_directory(self.__root, path)
+        # conditional responses, so Range requests resume downloads
+        response = send_from_directory(
+            self.__root,
+            path,
+            as_attachment=download_name is not None,
+            download_name=download_name,
+            etag=etag or True,
+        )
+        if etag:
+            _mark_immutable(response)
+        return response
 
 
 class S3Driver(StorageDriver):
@@ -164,19 +215,25 @@ class S3Driver(StorageDriver):
         (typ, _) = mimetypes.guess_type(path)
         return typ or "binary/octet-stream"
 
-    def put(self, path: str, readable: IOBase) -> None:
+    def put(self, path: str, readable: IOBase, immutable: bool = False) -> None:
+        params: dict[str, str] = {}
+        if immutable:
+            params["CacheControl"] = f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
         self._client.put_object(
             Bucket=self.__bucket,
             Key=path,
             Body=readable,
             ContentType=self.mime_type(path),
             ACL="public-read" if self._is_public else "private",
+            **params,
         )
 
     def delete(self, path: str) -> None:
         self._client.delete_object(Bucket=self.__bucket, Key=path)
 
-    def serve(self, path: str) -> Response:
+    def serve(
+        self, path: str, download_name: Optional[str] = None, etag: Optional[str] = None
+    ) -> Response:
         if self._is_public:
             url = (
                 self.__cdn_endpoint
@@ -186,15 +243,22 @@ class S3Driver(StorageDriver):
             if request.query_string:
                 url += "?" + request.query_string.decode("utf-8")
         else:
+            params = {
+                "Bucket": self.__bucket,
+                "Key": path,
+            }
+            if download_name is not None:
+                params["ResponseContentDisposition"] = f'attachment; filename="{download_name}"'
             url = self._client.generate_presigned_url(
                 ClientMethod="get_object",
-                Params={
-                    "Bucket": self.__bucket,
-                    "Key": path,
-                },
+                Params=params,
                 ExpiresIn=3600,
             )
-        return redirect(url)
+        response = redirect(url)
+        if etag and self._is_public:
+            # the CDN sends the object's own Cache-Control, set when it was put
+            _mark_immutable(response)
+        return response
 
 
 class BlobStorage(StorageBase):
@@ -230,14 +294,40 @@ class BlobStorage(StorageBase):
         current_app.logger.error("No storage driver was configured")
         abort(503)  # noqa: RET503
 
-    def put(self, path: str, readable: IOBase) -> None:
-        return self._driver.put(path, readable)
+    def put(self, path: str, readable: IOBase, immutable: bool = False) -> None:
+        return self._driver.put(path, readable, immutable)
+
+    def put_content_addressed(self, stem: str, readable: IOBase, suffix: str) -> str:
+        """Store `readable` at its `content_addressed_path` and return the path."""
+        path = content_addressed_path(stem, readable, suffix)
+        self._driver.put(path, readable, immutable=True)
+        return path
 
     def delete(self, path: str) -> None:
         return self._driver.delete(path)
 
-    def serve(self, path: str) -> Response:
-        return self._driver.serve(path)
+    def is_configured(self, app: Optional[Flask] = None) -> bool:
+        return (app or current_app).extensions[self._ext_name()] is not None
+
+    def discard(self, paths: Iterable[str]) -> None:
+        """
+        Delete `paths`, logging instead of raising if the storage fails, and doing nothing if no
+        driver is configured. For files that nothing refers to anymore.
+        """
+        if not self.is_configured():
+            return
+        for path in paths:
+            try:
+                self.delete(path)
+            except Exception:
+                current_app.logger.warning("Failed to delete a stored file", exc_info=True)
+
+    def serve(
+        self, path: str, download_name: Optional[str] = None, etag: Optional[str] = None
+    ) -> Response:
+        return self._driver.serve(path, download_name, etag)
 
 
 public_store = BlobStorage("PUBLIC", is_public=True)
+# never exposed by a route of its own; views check access before calling `serve`
+private_store = BlobStorage("PRIVATE")
@@ -0,0 +1,137 @@
+"""
+Opt-in latency spans for hot request paths.
+
+With `REQUEST_TIMING_ENABLED` set, `span("name")` blocks time a phase of the current request and
+record it into per-process histograms that admins see on the metrics page. Admin requests also
+get the spans back in a `Server-Timing` response header. Only the fixed span names and durations
+are recorded, never request content, usernames or ids.
+"""
+
+import bisect
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from flask import Flask, current_app, g, has_request_context
+from werkzeug.wrappers.response import Response
+
+from hushline.auth import get_session_user
+
+REQUEST_TIMING_ENABLED = "REQUEST_TIMING_ENABLED"
+
+# upper bounds in milliseconds, the last bucket counts everything slower
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_HISTOGRAMS_EXTENSION = "hushline_latency_histograms"
+
+
+@dataclass(frozen=True)
+class HistogramSnapshot:
+    name: str
+    count: int
+    total_ms: float
+    bucket_counts: tuple[int, ...]
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    @property
+    def max_bound_ms(self) -> int:
+        return HISTOGRAM_BUCKETS_MS[-1]
+
+    def quantile_ms(self, quantile: float) -> float | None:
+        """Upper bound of the bucket holding `quantile`, or None if it is past the last bound."""
+        if not self.count:
+            return 0.0
+        rank = quantile * self.count
+        seen = 0
+        for bound, count in zip(HISTOGRAM_BUCKETS_MS, self.bucket_counts, strict=False):
+            seen += count
+            if seen >= rank:
+                return float(bound)
+        return None
+
+
+class LatencyHistograms:
+    """Fixed-bucket histograms keyed by span name, shared by all threads of a process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._buckets: dict[str, list[int]] = {}
+        self._totals: dict[str, float] = {}
+
+    def observe(self, name: str, duration_ms: float) -> None:
+        index = bisect.bisect_left(HISTOGRAM_BUCKETS_MS, duration_ms)
+        with self._lock:
+            buckets = self._buckets.get(name)
+            if buckets is None:
+                buckets = self._buckets[name] = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+                self._totals[name] = 0.0
+            buckets[index] += 1
+            self._totals[name] += duration_ms
+
+    def snapshot(self) -> list[HistogramSnapshot]:
+        with self._lock:
+            return [
+                HistogramSnapshot(
+                    name=name,
+                    count=sum(buckets),
+                    total_ms=self._totals[name],
+                    bucket_counts=tuple(buckets),
+                )
+                for name, buckets in sorted(self._buckets.items())
+            ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+            self._totals.clear()
+
+
+def latency_histograms() -> LatencyHistograms:
+    histograms = current_app.extensions.get(_HISTOGRAMS_EXTENSION)
+    if histograms is None:
+        histograms = current_app.extensions[_HISTOGRAMS_EXTENSION] = LatencyHistograms()
+    return histograms
+
+
+def timing_enabled() -> bool:
+    return bool(current_app.config.get(REQUEST_TIMING_ENABLED, False))
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the enclosed block as `name`. Does nothing unless request timing is enabled."""
+    if not timing_enabled():
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+        latency_histograms().observe(name, duration_ms)
+        if has_request_context():
+            spans: list[tuple[str, float]] = g.setdefault("timing_spans", [])
+            spans.append((name, duration_ms))
+
+
+def server_timing_header(spans: list[tuple[str, float]]) -> str:
+    return ", ".join(f"{name};dur={duration_ms:.1f}" for name, duration_ms in spans)
+
+
+def init_app(app: Flask) -> None:
+    @app.after_request
+    def add_server_timing_header(response: Response) -> Response:
+        spans = g.get("timing_spans")
+        if not spans:
+            return response
+
+        user = get_session_user()
+        if user is not None and user.is_admin:
+            response.headers["Server-Timing"] = server_timing_header(spans)
+        return response
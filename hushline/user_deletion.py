@@ -1,10 +1,17 @@
 import json
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
 
+from flask import current_app
 from sqlalchemy import or_
 
-from hushline.db import db
+from hushline.db import db, delete_batch
 from hushline.model import (
     AuthenticationLog,
+    Conversation,
+    ConversationParticipant,
+    DataExportJob,
+    DeletionJob,
     FieldDefinition,
     FieldValue,
     Message,
@@ -17,6 +24,7 @@ from hushline.model import (
     User,
     Username,
 )
+from hushline.storage import private_store
 
 DELETION_BLOCKING_STRIPE_INVOICE_STATUSES = {
     StripeInvoiceStatusEnum.DRAFT,
@@ -37,6 +45,11 @@ DELETION_BLOCKING_STRIPE_SUBSCRIPTION_EVENT_TYPES = {
 }
 REDACTED_STRIPE_EVENT_DATA = "{}"
 
+ACCOUNT_DELETION_QUEUE_ENABLED = "ACCOUNT_DELETION_QUEUE_ENABLED"
+DELETION_JOB_MAX_ATTEMPTS = 5
+_DELETION_JOB_RETRY_BASE_DELAY = timedelta(seconds=30)
+_DELETION_JOB_RETRY_MAX_DELAY = timedelta(hours=1)
+
 
 def stripe_invoice_counts_by_user_ids(user_ids: set[int]) -> dict[int, int]:
     if not user_ids:
@@ -272,7 +285,12 @@ def _redact_processed_stripe_subscription_events(
             event.event_data = REDACTED_STRIPE_EVENT_DATA
 
 
-def delete_user_and_related(user: User) -> None:
+def delete_user_and_related(user: User) -> list[str]:
+    """
+    Delete `user` and everything related to it, and return the paths of the user's data export
+    archives. Callers pass those to `private_store.discard` once the deletion is committed, so
+    the blob storage can neither block nor undo a deletion.
+    """
     # Delete field values and definitions
     usernames = db.session.scalars(db.select(Username).filter_by(user_id=user.id)).all()
     username_ids = [username.id for username in usernames]
@@ -283,6 +301,9 @@ def delete_user_and_related(user: User) -> None:
     stripe_subscription_ids = (
         {user.stripe_subscription_id} if user.stripe_subscription_id else set()
     )
+    conversation_ids = db.session.scalars(
+        db.select(ConversationParticipant.conversation_id).filter_by(user_id=user.id)
+    ).all()
 
     # Delete all FieldValue entries related to the user's usernames
     db.session.execute(
@@ -307,6 +328,13 @@ def delete_user_and_related(user: User) -> None:
     db.session.execute(db.delete(MessageStatusText).filter_by(user_id=user.id))
     db.session.execute(db.delete(AuthenticationLog).filter_by(user_id=user.id))
     db.session.execute(db.delete(NotificationRecipient).filter_by(user_id=user.id))
+    # job rows go with the user by cascade, but their archives live in blob storage
+    export_archives = [
+        job.storage_path
+        for job in db.session.scalars(
+            db.select(DataExportJob).filter_by(user_id=user.id, status=DataExportJob.STATUS_READY)
+        )
+    ]
     _redact_processed_stripe_invoice_events(stripe_invoice_ids)
     _redact_processed_stripe_subscription_events(stripe_customer_ids, stripe_subscription_ids)
     db.session.execute(db.delete(StripeInvoice).filter_by(user_id=user.id))
@@ -315,6 +343,12 @@ def delete_user_and_related(user: User) -> None:
     db.session.execute(db.delete(Username).filter_by(user_id=user.id))
     db.session.delete(user)
 
+    # The user's participants and sent chat messages are removed by cascade, which leaves the
+    # other participants' inbox summaries stale.
+    db.session.flush()
+    Conversation.refresh_summaries(conversation_ids)
+    return export_archives
+
 
 def delete_username_and_related(username: Username) -> None:
     # Delete field values and definitions for this username
@@ -332,3 +366,136 @@ def delete_username_and_related(username: Username) -> None:
 
     # Delete the username itself
     db.session.delete(username)
+
+
+def account_deletion_queue_enabled() -> bool:
+    return bool(current_app.config.get(ACCOUNT_DELETION_QUEUE_ENABLED, False))
+
+
+def tombstone_user(user: User) -> DeletionJob:
+    """
+    Queue the account for deletion by `flask deletions worker`.
+
+    The account is logged out everywhere, can no longer log in, and its profiles are no longer
+    served, so the caller can commit right away however much data the account holds.
+    """
+    now = datetime.now(UTC)
+    user.deleted_at = now
+    user.is_suspended = True
+    user.session_id = User.new_session_id()
+    db.session.execute(
+        db.update(Username)
+        .where(Username.user_id == user.id)
+        .values(deleted_at=now, show_in_directory=False)
+    )
+    # exports that were not built yet would only be thrown away with the account
+    db.session.execute(
+        db.delete(DataExportJob).filter_by(user_id=user.id, status=DataExportJob.STATUS_PENDING)
+    )
+    job = DeletionJob(user_id=user.id)
+    db.session.add(job)
+    return job
+
+
+def tombstone_username(username: Username) -> DeletionJob:
+    """Queue one username for deletion by `flask deletions worker` and stop serving its profile."""
+    username.deleted_at = datetime.now(UTC)
+    username.show_in_directory = False
+    job = DeletionJob(user_id=username.user_id, username_id=username.id)
+    db.session.add(job)
+    return job
+
+
+def _deletion_batches(job: DeletionJob) -> list[Callable[[int], int]]:
+    """
+    One function per table holding the bulk of an account's data, in foreign key order. Each
+    deletes a batch of the job's rows and returns the row count.
+    """
+    if job.username_id is None:
+        username_ids = db.select(Username.id).where(Username.user_id == job.user_id)
+    else:
+        username_ids = db.select(Username.id).where(Username.id == job.username_id)
+    field_definition_ids = db.select(FieldDefinition.id).where(
+        FieldDefinition.username_id.in_(username_ids)
+    )
+
+    batches: list[Callable[[int], int]] = [
+        lambda batch_size: delete_batch(
+            FieldValue, FieldValue.field_definition_id.in_(field_definition_ids), batch_size
+        ),
+        lambda batch_size: delete_batch(Message, Message.username_id.in_(username_ids), batch_size),
+        lambda batch_size: delete_batch(
+            FieldDefinition, FieldDefinition.username_id.in_(username_ids), batch_size
+        ),
+    ]
+    if job.username_id is None:
+        batches += [
+            lambda batch_size: delete_batch(
+                MessageStatusText, MessageStatusText.user_id == job.user_id, batch_size
+            ),
+            lambda batch_size: delete_batch(
+                AuthenticationLog, AuthenticationLog.user_id == job.user_id, batch_size
+            ),
+        ]
+    return batches
+
+
+def _finish_deletion_job(job: DeletionJob) -> list[str]:
+    """Delete the job's account or username, and return the export archives to discard."""
+    export_archives: list[str] = []
+    if job.username_id is None:
+        user = db.session.get(User, job.user_id)
+        if user is not None:
+            export_archives = delete_user_and_related(user)
+    else:
+        username = db.session.get(Username, job.username_id)
+        if username is not None:
+            delete_username_and_related(username)
+    job.mark_done()
+    return export_archives
+
+
+def _deletion_job_retry_delay(attempts: int) -> timedelta:
+    return min(_DELETION_JOB_RETRY_BASE_DELAY * 2**attempts, _DELETION_JOB_RETRY_MAX_DELAY)
+
+
+def run_deletion_batch(batch_size: int) -> bool:
+    """
+    Delete one batch of rows for the next due deletion job and return whether a job was due.
+
+    Each call is one short transaction. Once no batch deletes anything, the remaining rows and
+    the account or username itself are deleted and the job is marked done. Failed batches are
+    retried with backoff, and the job is marked failed after `DELETION_JOB_MAX_ATTEMPTS`.
+    """
+    job = DeletionJob.claim_next()
+    if job is None:
+        db.session.rollback()
+        return False
+
+    job_id, attempts = job.id, job.attempts
+    try:
+        export_archives: list[str] = []
+        for delete_batch_for_job in _deletion_batches(job):
+            if count := delete_batch_for_job(batch_size):
+                job.record_progress(count)
+                break
+        else:
+            export_archives = _finish_deletion_job(job)
+        db.session.commit()
+        private_store.discard(export_archives)
+    except Exception as e:
+        # anything the final step touches can fail, not only the database, and a failure that
+        # escaped here would be retried with no backoff and no limit
+        db.session.rollback()
+        current_app.logger.warning(
+            "Deletion job %s failed: %s", job_id, type(e).__name__, exc_info=True
+        )
+        job = db.session.get(DeletionJob, job_id, with_for_update=True)
+        if job is not None:
+            error = type(e).__name__
+            if attempts + 1 >= DELETION_JOB_MAX_ATTEMPTS:
+                job.mark_failed(error)
+            else:
+                job.mark_retry(error, delay=_deletion_job_retry_delay(attempts))
+            db.session.commit()
+    return True
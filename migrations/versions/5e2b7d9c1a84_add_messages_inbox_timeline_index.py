@@ -0,0 +1,32 @@
+"""add messages inbox timeline index
+
+Revision ID: 5e2b7d9c1a84
+Revises: 9c8f0a1d2b3c
+Create Date: 2026-07-01 00:00:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "5e2b7d9c1a84"
+down_revision = "9c8f0a1d2b3c"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_messages_username_id_conversation_id_created_at",
+        "messages",
+        ["username_id", "conversation_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_messages_username_id_conversation_id_created_at",
+        table_name="messages",
+    )
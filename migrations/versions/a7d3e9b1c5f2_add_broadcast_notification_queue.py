@@ -0,0 +1,44 @@
+"""add broadcast notification queue
+
+Revision ID: a7d3e9b1c5f2
+Revises: f4c8a2d6b9e1
+Create Date: 2026-08-02 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a7d3e9b1c5f2"
+down_revision = "f4c8a2d6b9e1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "admin_broadcast_recipients",
+        sa.Column("notified_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    # messages submitted before the queue existed were notified inline
+    op.execute(
+        "UPDATE admin_broadcast_recipients SET notified_at = updated_at WHERE status = 'submitted'"
+    )
+    op.create_index(
+        "ix_admin_broadcast_recipients_notification_pending",
+        "admin_broadcast_recipients",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'submitted' AND notified_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_admin_broadcast_recipients_notification_pending",
+        table_name="admin_broadcast_recipients",
+        postgresql_where=sa.text("status = 'submitted' AND notified_at IS NULL"),
+    )
+    op.drop_column("admin_broadcast_recipients", "notified_at")
@@ -0,0 +1,119 @@
+"""add conversation inbox summary
+
+Revision ID: b4e1c7a9d3f2
+Revises: 5e2b7d9c1a84
+Create Date: 2026-07-08 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b4e1c7a9d3f2"
+down_revision = "5e2b7d9c1a84"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("conversations", sa.Column("last_message_id", sa.Integer(), nullable=True))
+    op.add_column(
+        "conversations",
+        sa.Column("last_message_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "conversations",
+        sa.Column("message_count", sa.Integer(), server_default=sa.text("0"), nullable=False),
+    )
+    op.create_index(
+        op.f("ix_conversations_last_message_id"),
+        "conversations",
+        ["last_message_id"],
+        unique=False,
+    )
+    op.create_foreign_key(
+        op.f("fk_conversations_last_message_id_conversation_messages"),
+        "conversations",
+        "conversation_messages",
+        ["last_message_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    op.add_column(
+        "conversation_participants",
+        sa.Column("has_unread", sa.Boolean(), server_default=sa.text("false"), nullable=False),
+    )
+    op.add_column(
+        "conversation_participants",
+        sa.Column("missing_copy_count", sa.Integer(), server_default=sa.text("0"), nullable=False),
+    )
+
+    op.execute(
+        """
+        UPDATE conversations AS c
+        SET last_message_id = latest.id,
+            last_message_at = latest.created_at,
+            message_count = latest.message_count
+        FROM (
+            SELECT DISTINCT ON (conversation_id)
+                conversation_id,
+                id,
+                created_at,
+                count(*) OVER (PARTITION BY conversation_id) AS message_count
+            FROM conversation_messages
+            ORDER BY conversation_id, created_at DESC, id DESC
+        ) AS latest
+        WHERE latest.conversation_id = c.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE conversation_participants AS p
+        SET missing_copy_count = (
+                SELECT count(*)
+                FROM conversation_messages AS m
+                WHERE m.conversation_id = p.conversation_id
+                  AND NOT EXISTS (
+                      SELECT 1
+                      FROM conversation_message_copies AS mc
+                      WHERE mc.conversation_message_id = m.id
+                        AND mc.recipient_participant_id = p.id
+                  )
+            ),
+            has_unread = EXISTS (
+                SELECT 1
+                FROM conversations AS c
+                JOIN conversation_messages AS latest ON latest.id = c.last_message_id
+                LEFT JOIN conversation_messages AS last_read
+                    ON last_read.id = p.last_read_message_id
+                WHERE c.id = p.conversation_id
+                  AND latest.sender_participant_id <> p.id
+                  AND (
+                      (
+                          last_read.id IS NOT NULL
+                          AND (latest.created_at, latest.id) > (last_read.created_at, last_read.id)
+                      )
+                      OR (
+                          last_read.id IS NULL
+                          AND (p.last_read_at IS NULL OR latest.created_at > p.last_read_at)
+                      )
+                  )
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("conversation_participants", "missing_copy_count")
+    op.drop_column("conversation_participants", "has_unread")
+    op.drop_constraint(
+        op.f("fk_conversations_last_message_id_conversation_messages"),
+        "conversations",
+        type_="foreignkey",
+    )
+    op.drop_index(op.f("ix_conversations_last_message_id"), table_name="conversations")
+    op.drop_column("conversations", "message_count")
+    op.drop_column("conversations", "last_message_at")
+    op.drop_column("conversations", "last_message_id")
@@ -0,0 +1,75 @@
+"""add data export jobs
+
+Revision ID: c2e6a8d4f1b3
+Revises: a7d3e9b1c5f2
+Create Date: 2026-08-09 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c2e6a8d4f1b3"
+down_revision = "a7d3e9b1c5f2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "data_export_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("public_id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=32), server_default="pending", nullable=False),
+        sa.Column(
+            "enqueued_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("NOW()"),
+            nullable=False,
+        ),
+        sa.Column("claimed_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=True),
+        sa.Column("download_token_hash", sa.String(length=64), nullable=True),
+        sa.Column("download_token_expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("downloaded_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            name=op.f("fk_data_export_jobs_user_id_users"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_data_export_jobs")),
+        sa.UniqueConstraint("public_id", name=op.f("uq_data_export_jobs_public_id")),
+        sa.UniqueConstraint(
+            "download_token_hash", name=op.f("uq_data_export_jobs_download_token_hash")
+        ),
+    )
+    op.create_index(
+        op.f("ix_data_export_jobs_user_id"), "data_export_jobs", ["user_id"], unique=False
+    )
+    op.create_index(
+        "ix_data_export_jobs_expires_at", "data_export_jobs", ["expires_at"], unique=False
+    )
+    op.create_index(
+        "ix_data_export_jobs_pending_enqueued_at",
+        "data_export_jobs",
+        ["enqueued_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_data_export_jobs_pending_enqueued_at",
+        table_name="data_export_jobs",
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+    op.drop_index("ix_data_export_jobs_expires_at", table_name="data_export_jobs")
+    op.drop_index(op.f("ix_data_export_jobs_user_id"), table_name="data_export_jobs")
+    op.drop_table("data_export_jobs")
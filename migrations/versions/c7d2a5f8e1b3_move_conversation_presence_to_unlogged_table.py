@@ -0,0 +1,73 @@
+"""move conversation presence to unlogged table
+
+Revision ID: c7d2a5f8e1b3
+Revises: b4e1c7a9d3f2
+Create Date: 2026-07-15 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c7d2a5f8e1b3"
+down_revision = "b4e1c7a9d3f2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "conversation_presence",
+        sa.Column("participant_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("last_active_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["participant_id"],
+            ["conversation_participants.id"],
+            name=op.f("fk_conversation_presence_participant_id_conversation_participants"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            name=op.f("fk_conversation_presence_user_id_users"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("participant_id", name=op.f("pk_conversation_presence")),
+        prefixes=["UNLOGGED"],
+    )
+    op.execute("ALTER TABLE conversation_presence SET (fillfactor = 50)")
+    op.create_index(
+        op.f("ix_conversation_presence_user_id"),
+        "conversation_presence",
+        ["user_id"],
+        unique=False,
+    )
+    op.execute(
+        """
+        INSERT INTO conversation_presence (participant_id, user_id, last_active_at)
+        SELECT id, user_id, last_active_at
+        FROM conversation_participants
+        WHERE last_active_at IS NOT NULL
+        """
+    )
+    op.drop_column("conversation_participants", "last_active_at")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "conversation_participants",
+        sa.Column("last_active_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.execute(
+        """
+        UPDATE conversation_participants
+        SET last_active_at = conversation_presence.last_active_at
+        FROM conversation_presence
+        WHERE conversation_presence.participant_id = conversation_participants.id
+        """
+    )
+    op.drop_index(op.f("ix_conversation_presence_user_id"), table_name="conversation_presence")
+    op.drop_table("conversation_presence")
@@ -0,0 +1,74 @@
+"""add deletion jobs
+
+Revision ID: d8b2f6a4c9e7
+Revises: c2e6a8d4f1b3
+Create Date: 2026-08-16 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d8b2f6a4c9e7"
+down_revision = "c2e6a8d4f1b3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("users", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True))
+
+    with op.batch_alter_table("usernames", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True))
+
+    op.create_table(
+        "deletion_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("username_id", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(length=32), server_default="pending", nullable=False),
+        sa.Column("rows_deleted", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+        sa.Column("attempts", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column(
+            "next_attempt_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("NOW()"),
+            nullable=False,
+        ),
+        sa.Column("last_error", sa.String(length=255), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("NOW()"),
+            nullable=False,
+        ),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_deletion_jobs")),
+    )
+    op.create_index(op.f("ix_deletion_jobs_user_id"), "deletion_jobs", ["user_id"], unique=False)
+    op.create_index(
+        "ix_deletion_jobs_pending_next_attempt_at",
+        "deletion_jobs",
+        ["next_attempt_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_deletion_jobs_pending_next_attempt_at",
+        table_name="deletion_jobs",
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+    op.drop_index(op.f("ix_deletion_jobs_user_id"), table_name="deletion_jobs")
+    op.drop_table("deletion_jobs")
+
+    with op.batch_alter_table("usernames", schema=None) as batch_op:
+        batch_op.drop_column("deleted_at")
+
+    with op.batch_alter_table("users", schema=None) as batch_op:
+        batch_op.drop_column("deleted_at")
@@ -0,0 +1,29 @@
+"""drop splash logo cache buster
+
+Revision ID: e4c1a7b9d2f6
+Revises: d8b2f6a4c9e7
+Create Date: 2026-08-23 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e4c1a7b9d2f6"
+down_revision = "d8b2f6a4c9e7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # brand logos are now stored at content-addressed paths, which change with every upload
+    op.execute(
+        sa.text("DELETE FROM organization_settings WHERE key = 'brand_splash_logo_cache_buster'")
+    )
+
+
+def downgrade() -> None:
+    # without a cache buster the splash logo URL is used as is, which is what the old code does
+    pass
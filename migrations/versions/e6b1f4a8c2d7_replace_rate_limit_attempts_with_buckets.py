@@ -0,0 +1,120 @@
+"""replace rate limit attempts with buckets
+
+Revision ID: e6b1f4a8c2d7
+Revises: d3a9f6b2c4e8
+Create Date: 2026-07-24 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e6b1f4a8c2d7"
+down_revision = "d3a9f6b2c4e8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rate_limit_buckets",
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.Column("tat", sa.Double(), nullable=False),
+        sa.PrimaryKeyConstraint("key", name=op.f("pk_rate_limit_buckets")),
+        prefixes=["UNLOGGED"],
+    )
+    op.execute("ALTER TABLE rate_limit_buckets SET (fillfactor = 50)")
+
+    # attempts in flight are dropped rather than converted; limits start empty after upgrading
+    op.drop_table("embed_rate_limit_attempts")
+    op.drop_table("chat_rate_limit_attempts")
+    op.drop_table("password_reset_attempts")
+
+
+def downgrade() -> None:
+    op.create_table(
+        "password_reset_attempts",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("identifier_hash", sa.String(length=64), nullable=False),
+        sa.Column("ip_hash", sa.String(length=64), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "idx_password_reset_attempts_identifier_created",
+        "password_reset_attempts",
+        ["identifier_hash", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_password_reset_attempts_ip_created",
+        "password_reset_attempts",
+        ["ip_hash", "created_at"],
+        unique=False,
+    )
+
+    op.create_table(
+        "chat_rate_limit_attempts",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("conversation_id", sa.Integer(), nullable=False),
+        sa.Column("sender_participant_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["conversation_id"], ["conversations.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["sender_participant_id"],
+            ["conversation_participants.id"],
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "idx_chat_rate_limit_attempts_sender_conversation_created",
+        "chat_rate_limit_attempts",
+        ["sender_participant_id", "conversation_id", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_chat_rate_limit_attempts_user_created",
+        "chat_rate_limit_attempts",
+        ["user_id", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_chat_rate_limit_attempts_conversation_created",
+        "chat_rate_limit_attempts",
+        ["conversation_id", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_chat_rate_limit_attempts_created",
+        "chat_rate_limit_attempts",
+        ["created_at"],
+        unique=False,
+    )
+
+    op.create_table(
+        "embed_rate_limit_attempts",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("scope", sa.String(length=20), nullable=False),
+        sa.Column("bucket_hash", sa.String(length=64), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "idx_embed_rate_limit_attempts_scope_bucket_created",
+        "embed_rate_limit_attempts",
+        ["scope", "bucket_hash", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_embed_rate_limit_attempts_created",
+        "embed_rate_limit_attempts",
+        ["created_at"],
+        unique=False,
+    )
+
+    op.drop_table("rate_limit_buckets")
@@ -0,0 +1,60 @@
+"""add profile link verification queue
+
+Revision ID: f4c8a2d6b9e1
+Revises: e6b1f4a8c2d7
+Create Date: 2026-07-26 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "f4c8a2d6b9e1"
+down_revision = "e6b1f4a8c2d7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "profile_link_verifications",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("username_id", sa.Integer(), nullable=False),
+        sa.Column("field_index", sa.SmallInteger(), nullable=False),
+        sa.Column("url", sa.Text(), nullable=False),
+        sa.Column("profile_url", sa.Text(), nullable=False),
+        sa.Column(
+            "enqueued_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("NOW()"),
+            nullable=False,
+        ),
+        sa.Column("claimed_until", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["username_id"],
+            ["usernames.id"],
+            name=op.f("fk_profile_link_verifications_username_id_usernames"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_profile_link_verifications")),
+        sa.UniqueConstraint(
+            "username_id",
+            "field_index",
+            name="uq_profile_link_verifications_username_id_field_index",
+        ),
+    )
+    op.create_table(
+        "profile_link_checks",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("verified", sa.Boolean(), nullable=False),
+        sa.Column("etag", sa.String(length=255), nullable=True),
+        sa.Column("checked_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("key", name=op.f("pk_profile_link_checks")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("profile_link_checks")
+    op.drop_table("profile_link_verifications")
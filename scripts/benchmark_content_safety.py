@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Compare the compiled content filter with better-profanity on usernames and bios."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+from collections.abc import Callable
+
+from better_profanity import Profanity
+
+from hushline.content_safety import _profanity_engine
+
+_USERNAME_PARTS = (
+    "alice",
+    "bob",
+    "newsdesk",
+    "tips",
+    "investigates",
+    "legal",
+    "press",
+    "whistle",
+    "city",
+    "hall",
+    "2024",
+    "01",
+)
+_BIO_WORDS = (
+    "Investigative",
+    "journalist",
+    "covering",
+    "labor,",
+    "housing",
+    "and",
+    "public",
+    "records.",
+    "Send",
+    "me",
+    "tips",
+    "securely",
+    "via",
+    "Signal:",
+    "alice.01",
+    "or",
+    "https://example.com/contact",
+    "—",
+    "I",
+    "read",
+    "everything.",
+    "Former",
+    "assistant",
+    "editor",
+    "at",
+    "the",
+    "Daily",
+    "Herald",
+    "(2015-2022).",
+    "PGP",
+    "fingerprint",
+    "on",
+    "my",
+    "website.",
+)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the content filter against better-profanity.",
+    )
+    parser.add_argument("--samples", type=int, default=200, help="Inputs of each kind.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs per engine.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for generated inputs.")
+    return parser.parse_args()
+
+
+def _usernames(rng: random.Random, count: int) -> list[str]:
+    separators = ("", "_", ".", "-")
+    return [
+        rng.choice(separators).join(rng.sample(_USERNAME_PARTS, rng.randint(1, 3)))
+        for _ in range(count)
+    ]
+
+
+def _bios(rng: random.Random, count: int) -> list[str]:
+    return [" ".join(rng.choices(_BIO_WORDS, k=rng.randint(10, 60))) for _ in range(count)]
+
+
+def _best_seconds(check: Callable[[str], bool], inputs: list[str], repeat: int) -> float:
+    def run() -> None:
+        for text in inputs:
+            check(text)
+
+    return min(timeit.repeat(run, number=1, repeat=repeat))
+
+
+def main() -> int:
+    args = _parse_args()
+    rng = random.Random(args.seed)  # noqa: S311
+
+    start = timeit.default_timer()
+    reference = Profanity()
+    reference.load_censor_words()
+    reference_setup = timeit.default_timer() - start
+
+    _profanity_engine.cache_clear()
+    start = timeit.default_timer()
+    engine = _profanity_engine()
+    engine_setup = timeit.default_timer() - start
+    if engine is None:
+        print("better-profanity is not installed")
+        return 1
+
+    print(
+        f"setup: better-profanity {reference_setup * 1000:.1f} ms, "
+        f"compiled {engine_setup * 1000:.1f} ms"
+    )
+    for kind, inputs in (
+        ("usernames", _usernames(rng, args.samples)),
+        ("bios", _bios(rng, args.samples)),
+    ):
+        disagreements = sum(
+            reference.contains_profanity(text) != engine.contains_profanity(text) for text in inputs
+        )
+        before = _best_seconds(reference.contains_profanity, inputs, args.repeat)
+        after = _best_seconds(engine.contains_profanity, inputs, args.repeat)
+        print(
+            f"{kind}: better-profanity {before / len(inputs) * 1e6:.0f} us/check, "
+            f"compiled {after / len(inputs) * 1e6:.0f} us/check "
+            f"({before / after:.1f}x), {disagreements} disagreement(s)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
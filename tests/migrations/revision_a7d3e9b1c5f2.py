@@ -0,0 +1,90 @@
+from sqlalchemy import text
+
+from hushline.db import db
+
+BROADCAST_ID = 9811
+USER_IDS = (9811, 9812, 9813)
+NEW_INDEX = "ix_admin_broadcast_recipients_notification_pending"
+
+
+def _insert_broadcast_recipients() -> None:
+    for user_id in USER_IDS:
+        db.session.execute(
+            text(
+                """
+                INSERT INTO users (id, is_admin, is_suspended, password_hash, session_id)
+                VALUES (:user_id, false, false, '$scrypt$', :session_id)
+                """
+            ),
+            {"user_id": user_id, "session_id": f"session-{user_id}"},
+        )
+    db.session.execute(
+        text(
+            """
+            INSERT INTO admin_broadcasts (id, public_id, status)
+            VALUES (:broadcast_id, '00000000-0000-0000-0000-000000009811', 'in_progress')
+            """
+        ),
+        {"broadcast_id": BROADCAST_ID},
+    )
+    for user_id, status in zip(USER_IDS, ("submitted", "skipped", "pending"), strict=True):
+        db.session.execute(
+            text(
+                """
+                INSERT INTO admin_broadcast_recipients (broadcast_id, user_id, status)
+                VALUES (:broadcast_id, :user_id, :status)
+                """
+            ),
+            {"broadcast_id": BROADCAST_ID, "user_id": user_id, "status": status},
+        )
+    db.session.commit()
+
+
+def _index_exists() -> bool:
+    return bool(
+        db.session.scalar(
+            text("SELECT to_regclass(:name) IS NOT NULL"), {"name": f"public.{NEW_INDEX}"}
+        )
+    )
+
+
+class UpgradeTester:
+    def load_data(self) -> None:
+        _insert_broadcast_recipients()
+
+    def check_upgrade(self) -> None:
+        rows = db.session.execute(
+            text(
+                """
+                SELECT status, notified_at IS NOT NULL
+                FROM admin_broadcast_recipients
+                WHERE broadcast_id = :broadcast_id
+                ORDER BY user_id
+                """
+            ),
+            {"broadcast_id": BROADCAST_ID},
+        ).all()
+        assert [tuple(row) for row in rows] == [
+            ("submitted", True),
+            ("skipped", False),
+            ("pending", False),
+        ]
+        assert _index_exists()
+
+
+class DowngradeTester:
+    def load_data(self) -> None:
+        _insert_broadcast_recipients()
+
+    def check_downgrade(self) -> None:
+        columns = db.session.scalars(
+            text(
+                """
+                SELECT column_name
+                FROM information_schema.columns
+                WHERE table_name = 'admin_broadcast_recipients'
+                """
+            )
+        ).all()
+        assert "notified_at" not in columns
+        assert not _index_exists()
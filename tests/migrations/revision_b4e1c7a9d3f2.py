@@ -0,0 +1,147 @@
+from sqlalchemy import text
+
+from hushline.db import db
+
+
+def _insert_conversation_data() -> None:
+    db.session.execute(
+        text(
+            """
+            INSERT INTO users (
+                id,
+                is_admin,
+                is_suspended,
+                password_hash,
+                session_id
+            )
+            VALUES
+                (1, false, false, '$scrypt$', 'session-1'),
+                (2, false, false, '$scrypt$', 'session-2')
+            """
+        )
+    )
+    db.session.execute(
+        text(
+            """
+            INSERT INTO conversations (id, public_id)
+            VALUES (1, 'conversation-1'), (2, 'conversation-2')
+            """
+        )
+    )
+    db.session.execute(
+        text(
+            """
+            INSERT INTO conversation_participants (
+                id,
+                conversation_id,
+                user_id
+            )
+            VALUES (1, 1, 1), (2, 1, 2), (3, 2, 1), (4, 2, 2)
+            """
+        )
+    )
+    db.session.execute(
+        text(
+            """
+            INSERT INTO conversation_messages (
+                id,
+                conversation_id,
+                sender_participant_id,
+                created_at
+            )
+            VALUES
+                (1, 1, 1, '2026-01-01 00:00:00+00'),
+                (2, 1, 2, '2026-01-02 00:00:00+00')
+            """
+        )
+    )
+    db.session.execute(
+        text(
+            """
+            INSERT INTO conversation_message_copies (
+                id,
+                conversation_message_id,
+                recipient_participant_id,
+                encrypted_payload
+            )
+            VALUES (1, 1, 1, 'copy-1-1'), (2, 1, 2, 'copy-1-2'), (3, 2, 2, 'copy-2-2')
+            """
+        )
+    )
+    db.session.execute(
+        text(
+            """
+            UPDATE conversation_participants
+            SET last_read_message_id = 1
+            WHERE id = 1
+            """
+        )
+    )
+    db.session.commit()
+
+
+class UpgradeTester:
+    def load_data(self) -> None:
+        _insert_conversation_data()
+
+    def check_upgrade(self) -> None:
+        conversations = db.session.execute(
+            text(
+                """
+                SELECT id, last_message_id, message_count
+                FROM conversations
+                ORDER BY id
+                """
+            )
+        ).all()
+        assert conversations == [(1, 2, 2), (2, None, 0)]
+
+        participants = db.session.execute(
+            text(
+                """
+                SELECT id, has_unread, missing_copy_count
+                FROM conversation_participants
+                ORDER BY id
+                """
+            )
+        ).all()
+        assert participants == [
+            (1, True, 1),
+            (2, False, 0),
+            (3, False, 0),
+            (4, False, 0),
+        ]
+
+
+class DowngradeTester:
+    def load_data(self) -> None:
+        _insert_conversation_data()
+
+    def check_downgrade(self) -> None:
+        assert db.session.scalar(text("SELECT count(*) FROM conversation_messages")) == 2
+        assert (
+            db.session.scalar(
+                text(
+                    """
+                    SELECT count(*)
+                    FROM information_schema.columns
+                    WHERE table_schema = 'public'
+                      AND (
+                          (
+                              table_name = 'conversations'
+                              AND column_name IN (
+                                  'last_message_id',
+                                  'last_message_at',
+                                  'message_count'
+                              )
+                          )
+                          OR (
+                              table_name = 'conversation_participants'
+                              AND column_name IN ('has_unread', 'missing_copy_count')
+                          )
+                      )
+                    """
+                )
+            )
+            == 0
+        )
@@ -0,0 +1,61 @@
+from sqlalchemy import text
+
+from hushline.db import db
+
+USER_ID = 9821
+NEW_INDEX = "ix_data_export_jobs_pending_enqueued_at"
+
+
+def _insert_user() -> None:
+    db.session.execute(
+        text(
+            """
+            INSERT INTO users (id, is_admin, is_suspended, password_hash, session_id)
+            VALUES (:user_id, false, false, '$scrypt$', :session_id)
+            """
+        ),
+        {"user_id": USER_ID, "session_id": f"session-{USER_ID}"},
+    )
+    db.session.commit()
+
+
+def _index_exists() -> bool:
+    return bool(
+        db.session.scalar(
+            text("SELECT to_regclass(:name) IS NOT NULL"), {"name": f"public.{NEW_INDEX}"}
+        )
+    )
+
+
+class UpgradeTester:
+    def load_data(self) -> None:
+        _insert_user()
+
+    def check_upgrade(self) -> None:
+        db.session.execute(
+            text(
+                """
+                INSERT INTO data_export_jobs (public_id, user_id)
+                VALUES ('00000000-0000-0000-0000-000000009821', :user_id)
+                """
+            ),
+            {"user_id": USER_ID},
+        )
+        row = db.session.execute(
+            text("SELECT status, enqueued_at IS NOT NULL, expires_at FROM data_export_jobs")
+        ).one()
+        assert tuple(row) == ("pending", True, None)
+        assert _index_exists()
+
+        db.session.execute(text("DELETE FROM users WHERE id = :user_id"), {"user_id": USER_ID})
+        assert db.session.scalar(text("SELECT count(*) FROM data_export_jobs")) == 0
+        db.session.rollback()
+
+
+class DowngradeTester:
+    def load_data(self) -> None:
+        _insert_user()
+
+    def check_downgrade(self) -> None:
+        assert db.session.scalar(text("SELECT to_regclass('public.data_export_jobs')")) is None
+        assert not _index_exists()
@@ -0,0 +1,114 @@
+from sqlalchemy import text
+
+from hushline.db import db
+
+
+def _insert_participants() -> None:
+    db.session.execute(
+        text(
+            """
+            INSERT INTO users (
+                id,
+                is_admin,
+                is_suspended,
+                password_hash,
+                session_id
+            )
+            VALUES
+                (1, false, false, '$scrypt$', 'session-1'),
+                (2, false, false, '$scrypt$', 'session-2')
+            """
+        )
+    )
+    db.session.execute(
+        text("INSERT INTO conversations (id, public_id) VALUES (1, 'conversation-1')")
+    )
+    db.session.execute(
+        text(
+            """
+            INSERT INTO conversation_participants (id, conversation_id, user_id)
+            VALUES (1, 1, 1), (2, 1, 2)
+            """
+        )
+    )
+
+
+class UpgradeTester:
+    def load_data(self) -> None:
+        _insert_participants()
+        db.session.execute(
+            text(
+                """
+                UPDATE conversation_participants
+                SET last_active_at = '2026-01-01 00:00:00+00'
+                WHERE id = 2
+                """
+            )
+        )
+        db.session.commit()
+
+    def check_upgrade(self) -> None:
+        presence = db.session.execute(
+            text(
+                """
+                SELECT participant_id, user_id, last_active_at = '2026-01-01 00:00:00+00'
+                FROM conversation_presence
+                ORDER BY participant_id
+                """
+            )
+        ).all()
+        assert presence == [(2, 2, True)]
+
+        assert (
+            db.session.scalar(
+                text(
+                    """
+                    SELECT relpersistence
+                    FROM pg_class
+                    WHERE relname = 'conversation_presence'
+                    """
+                )
+            )
+            == "u"
+        )
+        assert (
+            db.session.scalar(
+                text(
+                    """
+                    SELECT count(*)
+                    FROM information_schema.columns
+                    WHERE table_schema = 'public'
+                      AND table_name = 'conversation_participants'
+                      AND column_name = 'last_active_at'
+                    """
+                )
+            )
+            == 0
+        )
+
+
+class DowngradeTester:
+    def load_data(self) -> None:
+        _insert_participants()
+        db.session.execute(
+            text(
+                """
+                INSERT INTO conversation_presence (participant_id, user_id, last_active_at)
+                VALUES (1, 1, '2026-01-01 00:00:00+00')
+                """
+            )
+        )
+        db.session.commit()
+
+    def check_downgrade(self) -> None:
+        participants = db.session.execute(
+            text(
+                """
+                SELECT id, last_active_at = '2026-01-01 00:00:00+00'
+                FROM conversation_participants
+                ORDER BY id
+                """
+            )
+        ).all()
+        assert participants == [(1, True), (2, None)]
+        assert db.session.scalar(text("SELECT to_regclass('public.conversation_presence')")) is None
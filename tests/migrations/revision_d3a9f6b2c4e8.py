@@ -0,0 +1,55 @@
+from sqlalchemy import text
+
+from hushline.db import db
+
+
+def _insert_user() -> None:
+    db.session.execute(
+        text(
+            """
+            INSERT INTO users (id, is_admin, is_suspended, password_hash, session_id)
+            VALUES (1, false, false, '$scrypt$', 'session-1')
+            """
+        )
+    )
+
+
+class UpgradeTester:
+    def load_data(self) -> None:
+        _insert_user()
+        db.session.commit()
+
+    def check_upgrade(self) -> None:
+        db.session.execute(
+            text(
+                """
+                INSERT INTO email_outbox (user_id, to_email, subject, body)
+                VALUES (1, 'user@example.com', 'Subject', 'body')
+                """
+            )
+        )
+        row = db.session.execute(
+            text("SELECT status, attempts, next_attempt_at IS NOT NULL FROM email_outbox")
+        ).one()
+        assert tuple(row) == ("pending", 0, True)
+
+        db.session.execute(text("DELETE FROM users WHERE id = 1"))
+        assert db.session.scalar(text("SELECT count(*) FROM email_outbox")) == 0
+        db.session.rollback()
+
+
+class DowngradeTester:
+    def load_data(self) -> None:
+        _insert_user()
+        db.session.execute(
+            text(
+                """
+                INSERT INTO email_outbox (user_id, to_email, subject, body)
+                VALUES (1, 'user@example.com', 'Subject', 'body')
+                """
+            )
+        )
+        db.session.commit()
+
+    def check_downgrade(self) -> None:
+        assert db.session.scalar(text("SELECT to_regclass('public.email_outbox')")) is None
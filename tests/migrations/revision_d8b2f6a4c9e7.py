@@ -0,0 +1,79 @@
+from sqlalchemy import text
+
+from hushline.db import db
+
+USER_ID = 9822
+NEW_INDEX = "ix_deletion_jobs_pending_next_attempt_at"
+
+
+def _insert_user() -> None:
+    db.session.execute(
+        text(
+            """
+            INSERT INTO users (id, is_admin, is_suspended, password_hash, session_id)
+            VALUES (:user_id, false, false, '$scrypt$', :session_id)
+            """
+        ),
+        {"user_id": USER_ID, "session_id": f"session-{USER_ID}"},
+    )
+    db.session.commit()
+
+
+def _columns(table: str) -> set[str]:
+    return set(
+        db.session.scalars(
+            text("SELECT column_name FROM information_schema.columns WHERE table_name = :table"),
+            {"table": table},
+        ).all()
+    )
+
+
+def _index_exists() -> bool:
+    return bool(
+        db.session.scalar(
+            text("SELECT to_regclass(:name) IS NOT NULL"), {"name": f"public.{NEW_INDEX}"}
+        )
+    )
+
+
+class UpgradeTester:
+    def load_data(self) -> None:
+        _insert_user()
+
+    def check_upgrade(self) -> None:
+        assert "deleted_at" in _columns("users")
+        assert "deleted_at" in _columns("usernames")
+        assert (
+            db.session.scalar(
+                text("SELECT deleted_at FROM users WHERE id = :user_id"), {"user_id": USER_ID}
+            )
+            is None
+        )
+
+        db.session.execute(
+            text("INSERT INTO deletion_jobs (user_id) VALUES (:user_id)"), {"user_id": USER_ID}
+        )
+        db.session.execute(text("DELETE FROM users WHERE id = :user_id"), {"user_id": USER_ID})
+        row = db.session.execute(
+            text(
+                """
+                SELECT user_id, username_id, status, rows_deleted, attempts,
+                       next_attempt_at IS NOT NULL
+                FROM deletion_jobs
+                """
+            )
+        ).one()
+        assert tuple(row) == (USER_ID, None, "pending", 0, 0, True)
+        assert _index_exists()
+        db.session.rollback()
+
+
+class DowngradeTester:
+    def load_data(self) -> None:
+        _insert_user()
+
+    def check_downgrade(self) -> None:
+        assert db.session.scalar(text("SELECT to_regclass('public.deletion_jobs')")) is None
+        assert not _index_exists()
+        assert "deleted_at" not in _columns("users")
+        assert "deleted_at" not in _columns("usernames")
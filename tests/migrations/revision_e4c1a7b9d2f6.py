@@ -0,0 +1,41 @@
+import json
+
+from sqlalchemy import text
+
+from hushline.db import db
+
+SPLASH_LOGO_PATH = "brand/splash-logo.png"
+
+
+def _settings() -> dict[str, object]:
+    return dict(
+        db.session.execute(text("SELECT key, value FROM organization_settings")).tuples().all()
+    )
+
+
+class UpgradeTester:
+    def load_data(self) -> None:
+        db.session.execute(
+            text(
+                """
+                INSERT INTO organization_settings (key, value)
+                VALUES ('brand_splash_logo', :path), ('brand_splash_logo_cache_buster', :buster)
+                ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value
+                """
+            ),
+            {"path": json.dumps(SPLASH_LOGO_PATH), "buster": json.dumps("12345")},
+        )
+        db.session.commit()
+
+    def check_upgrade(self) -> None:
+        settings = _settings()
+        assert "brand_splash_logo_cache_buster" not in settings
+        assert settings["brand_splash_logo"] == SPLASH_LOGO_PATH
+
+
+class DowngradeTester:
+    def load_data(self) -> None:
+        pass
+
+    def check_downgrade(self) -> None:
+        assert "brand_splash_logo_cache_buster" not in _settings()
@@ -0,0 +1,51 @@
+from sqlalchemy import text
+
+from hushline.db import db
+
+_ATTEMPT_TABLES = (
+    "embed_rate_limit_attempts",
+    "chat_rate_limit_attempts",
+    "password_reset_attempts",
+)
+
+
+class UpgradeTester:
+    def load_data(self) -> None:
+        db.session.execute(
+            text(
+                """
+                INSERT INTO password_reset_attempts (identifier_hash, ip_hash, created_at)
+                VALUES ('identifier', 'ip', NOW())
+                """
+            )
+        )
+        db.session.commit()
+
+    def check_upgrade(self) -> None:
+        for table_name in _ATTEMPT_TABLES:
+            assert db.session.scalar(text(f"SELECT to_regclass('public.{table_name}')")) is None
+
+        assert (
+            db.session.scalar(
+                text("SELECT relpersistence FROM pg_class WHERE relname = 'rate_limit_buckets'")
+            )
+            == "u"
+        )
+        db.session.execute(
+            text("INSERT INTO rate_limit_buckets (key, tat) VALUES ('chat:user:1', 1000.5)")
+        )
+        assert db.session.scalar(text("SELECT tat FROM rate_limit_buckets")) == 1000.5
+        db.session.rollback()
+
+
+class DowngradeTester:
+    def load_data(self) -> None:
+        db.session.execute(
+            text("INSERT INTO rate_limit_buckets (key, tat) VALUES ('chat:user:1', 1000.5)")
+        )
+        db.session.commit()
+
+    def check_downgrade(self) -> None:
+        assert db.session.scalar(text("SELECT to_regclass('public.rate_limit_buckets')")) is None
+        for table_name in _ATTEMPT_TABLES:
+            assert db.session.scalar(text(f"SELECT count(*) FROM {table_name}")) == 0
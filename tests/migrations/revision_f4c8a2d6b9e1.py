@@ -0,0 +1,78 @@
+from sqlalchemy import text
+
+from hushline.db import db
+
+
+def _insert_username() -> None:
+    db.session.execute(
+        text(
+            """
+            INSERT INTO users (id, is_admin, is_suspended, password_hash, session_id)
+            VALUES (1, false, false, '$scrypt$', 'session-1')
+            """
+        )
+    )
+    db.session.execute(
+        text(
+            """
+            INSERT INTO usernames (
+                id, user_id, username, is_primary, is_verified, show_in_directory
+            )
+            VALUES (1, 1, 'testuser', true, false, false)
+            """
+        )
+    )
+
+
+def _enqueue(url: str) -> None:
+    db.session.execute(
+        text(
+            """
+            INSERT INTO profile_link_verifications (username_id, field_index, url, profile_url)
+            VALUES (1, 1, :url, 'https://hushline.example/to/testuser')
+            ON CONFLICT (username_id, field_index) DO UPDATE SET url = excluded.url
+            """
+        ),
+        {"url": url},
+    )
+
+
+class UpgradeTester:
+    def load_data(self) -> None:
+        _insert_username()
+        db.session.commit()
+
+    def check_upgrade(self) -> None:
+        _enqueue("https://example.com/a")
+        _enqueue("https://example.com/b")
+        row = db.session.execute(
+            text(
+                "SELECT url, enqueued_at IS NOT NULL, claimed_until FROM profile_link_verifications"
+            )
+        ).one()
+        assert tuple(row) == ("https://example.com/b", True, None)
+
+        db.session.execute(
+            text(
+                """
+                INSERT INTO profile_link_checks (key, verified, etag, checked_at)
+                VALUES (:key, true, '"v1"', NOW())
+                """
+            ),
+            {"key": "a" * 64},
+        )
+
+        db.session.execute(text("DELETE FROM usernames WHERE id = 1"))
+        assert db.session.scalar(text("SELECT count(*) FROM profile_link_verifications")) == 0
+        db.session.rollback()
+
+
+class DowngradeTester:
+    def load_data(self) -> None:
+        _insert_username()
+        _enqueue("https://example.com/a")
+        db.session.commit()
+
+    def check_downgrade(self) -> None:
+        for table_name in ("profile_link_verifications", "profile_link_checks"):
+            assert db.session.scalar(text(f"SELECT to_regclass('public.{table_name}')")) is None
@@ -251,27 +251,30 @@ test("admin broadcasts encrypt usable recipients and report malformed keys befor
     .poll(() => page.evaluate(() => window.isSecureContext))
     .toBe(true);
 
-  const { failedRecipientId, mixedRecipientId } = await page.evaluate(() => {
-    const script = document.getElementById("broadcastEncryptionRecipients");
-    const recipients = JSON.parse(script.textContent || "[]");
-    if (recipients.length < 2) {
-      throw new Error(
-        "Admin broadcast E2EE test requires at least two recipients.",
+  let failedRecipientId;
+  let mixedRecipientId;
+  await page.route("**/settings/broadcasts/audience?*", async (route) => {
+    const response = await route.fetch();
+    const audiencePage = await response.json();
+    const recipients = audiencePage.recipients;
+    if (failedRecipientId === undefined) {
+      if (recipients.length < 2) {
+        throw new Error(
+          "Admin broadcast E2EE test requires at least two recipients.",
+        );
+      }
+      const fallbackKey = recipients[1][1].find(
+        ([, key]) => typeof key === "string" && key.trim(),
       );
+      if (!fallbackKey) {
+        throw new Error("Admin broadcast E2EE test requires a fallback key.");
+      }
+      recipients[0][1] = [[null, "not armored pgp"], fallbackKey];
+      recipients[1][1] = [[null, "not armored pgp"]];
+      mixedRecipientId = recipients[0][0];
+      failedRecipientId = recipients[1][0];
     }
-    const fallbackKey = recipients[1].public_keys.find(
-      (key) => typeof key === "string" && key.trim(),
-    );
-    if (!fallbackKey) {
-      throw new Error("Admin broadcast E2EE test requires a fallback key.");
-    }
-    recipients[0].public_keys = ["not armored pgp", fallbackKey];
-    recipients[1].public_keys = ["not armored pgp"];
-    script.textContent = JSON.stringify(recipients);
-    return {
-      failedRecipientId: recipients[1].user_id,
-      mixedRecipientId: recipients[0].user_id,
-    };
+    await route.fulfill({ response, json: audiencePage });
   });
 
   await page.fill("#broadcast_plaintext", broadcastPlaintext);
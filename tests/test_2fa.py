@@ -10,7 +10,7 @@ from werkzeug.security import generate_password_hash
 
 from hushline.config import PASSWORD_HASH_REHASH_ON_AUTH_ENABLED
 from hushline.db import db
-from hushline.model import User
+from hushline.model import RateLimitBucket, User
 from hushline.password_hasher import PINNED_WERKZEUG_SCRYPT_METHOD
 
 TOTP_SECRET = "KBOVHCCELV67CYGOQ2QYU5SCNYVAREMH"
@@ -274,3 +274,33 @@ def test_limit_invalid_2fa_guesses(client: FlaskClient, user: User, user_passwor
     )
     assert invalid_2fa_response.status_code == 429
     assert "Please wait a moment before trying again" in invalid_2fa_response.text
+
+
+@pytest.mark.usefixtures("_2fa_user")
+def test_2fa_guess_is_counted_before_the_code_is_checked(
+    client: FlaskClient, user: User, user_password: str
+) -> None:
+    login_response = client.post(
+        url_for("login"),
+        data={"username": user.primary_username.username, "password": user_password},
+        follow_redirects=True,
+    )
+    assert login_response.status_code == 200
+
+    counted_before_verify: list[bool] = []
+
+    def verify(*args: object, **kwargs: object) -> bool:
+        bucket = db.session.get(RateLimitBucket, f"2fa:user:{user.id}")
+        counted_before_verify.append(bucket is not None)
+        return False
+
+    with patch.object(pyotp.TOTP, "verify", verify):
+        response = client.post(
+            url_for("verify_2fa_login"),
+            data={"verification_code": "000000"},
+            follow_redirects=True,
+        )
+
+    assert response.status_code == 401
+    # a concurrent guess would have waited on this bucket instead of reading it unchanged
+    assert counted_before_verify == [True]
@@ -46,6 +46,8 @@ def _make_inbox_conversation(
     conversation_message.encrypted_copies.append(other_copy)
     db.session.add(conversation)
     db.session.commit()
+    Conversation.refresh_summaries([conversation.id])
+    db.session.commit()
     return conversation
 
 
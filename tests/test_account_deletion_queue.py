@@ -0,0 +1,186 @@
+import json
+import os
+from datetime import UTC, datetime
+from typing import Callable
+from unittest.mock import patch
+
+import pytest
+from flask import Flask, url_for
+from flask.testing import FlaskClient
+from pytest_mock import MockFixture
+from sqlalchemy.exc import OperationalError
+
+from hushline.db import db
+from hushline.model import AuthenticationLog, DeletionJob, Message, User, Username
+from hushline.user_deletion import (
+    ACCOUNT_DELETION_QUEUE_ENABLED,
+    DELETION_JOB_MAX_ATTEMPTS,
+    run_deletion_batch,
+    tombstone_user,
+    tombstone_username,
+)
+
+
+@pytest.fixture()
+def env_var_modifier() -> Callable[[MockFixture], None]:
+    def modifier(mocker: MockFixture) -> None:
+        mocker.patch.dict(os.environ, {ACCOUNT_DELETION_QUEUE_ENABLED: "true"})
+
+    return modifier
+
+
+def _add_messages(username: Username, count: int) -> None:
+    db.session.add_all(Message(username_id=username.id) for _ in range(count))
+    db.session.commit()
+
+
+def _run_until_idle(batch_size: int) -> int:
+    calls = 0
+    while run_deletion_batch(batch_size):
+        calls += 1
+    return calls
+
+
+def _job() -> DeletionJob:
+    return db.session.scalars(db.select(DeletionJob)).one()
+
+
+@pytest.mark.usefixtures("_authenticated_user")
+def test_delete_account_tombstones_and_logs_out(client: FlaskClient, user: User) -> None:
+    _add_messages(user.primary_username, 3)
+
+    response = client.post(url_for("settings.delete_account"), follow_redirects=True)
+    assert response.status_code == 200
+    assert "is being erased" in response.text
+
+    db.session.refresh(user)
+    assert user.deleted_at is not None
+    assert user.primary_username.deleted_at is not None
+    assert not user.primary_username.show_in_directory
+    assert _job().user_id == user.id
+
+    profile_url = url_for("profile", username=user.primary_username.username)
+    assert client.get(profile_url).status_code == 404
+    assert client.get(url_for("settings.profile")).status_code == 302
+
+
+def test_tombstoned_user_cannot_log_in(client: FlaskClient, user: User, user_password: str) -> None:
+    tombstone_user(user)
+    db.session.commit()
+
+    response = client.post(
+        url_for("login"),
+        data={"username": user.primary_username.username, "password": user_password},
+        follow_redirects=True,
+    )
+    assert "Invalid username or password" in response.text
+
+
+def test_worker_deletes_account_in_batches(user: User, user_alias: Username) -> None:
+    _add_messages(user.primary_username, 3)
+    _add_messages(user_alias, 2)
+    db.session.add(AuthenticationLog(user_id=user.id, successful=True))
+    db.session.commit()
+    user_id = user.id
+    tombstone_user(user)
+    db.session.commit()
+
+    assert _run_until_idle(2) > 3
+
+    job = _job()
+    assert job.status == DeletionJob.STATUS_DONE
+    assert job.completed_at is not None
+    assert job.rows_deleted >= 6
+    assert db.session.get(User, user_id) is None
+    assert db.session.scalars(db.select(Message)).first() is None
+    assert db.session.scalars(db.select(Username).filter_by(user_id=user_id)).first() is None
+
+
+def test_worker_deletes_only_the_tombstoned_username(user: User, user_alias: Username) -> None:
+    _add_messages(user.primary_username, 1)
+    _add_messages(user_alias, 2)
+    alias_id = user_alias.id
+    tombstone_username(user_alias)
+    db.session.commit()
+
+    _run_until_idle(1)
+
+    assert _job().status == DeletionJob.STATUS_DONE
+    assert db.session.get(Username, alias_id) is None
+    assert db.session.get(User, user.id) is not None
+    assert [m.username_id for m in db.session.scalars(db.select(Message))] == [
+        user.primary_username.id
+    ]
+
+
+def test_worker_retries_then_fails(user: User) -> None:
+    tombstone_user(user)
+    db.session.commit()
+
+    with patch(
+        "hushline.user_deletion.delete_batch",
+        side_effect=OperationalError("DELETE", {}, Exception("deadlock detected")),
+    ):
+        for attempt in range(1, DELETION_JOB_MAX_ATTEMPTS + 1):
+            job = _job()
+            job.next_attempt_at = datetime.now(UTC)
+            db.session.commit()
+            assert run_deletion_batch(10)
+            db.session.refresh(job)
+            assert job.attempts == attempt
+            assert job.last_error == "OperationalError"
+
+    assert job.status == DeletionJob.STATUS_FAILED
+    assert db.session.get(User, user.id) is not None
+    assert not run_deletion_batch(10)
+
+
+def test_worker_retries_when_the_final_step_fails(user: User) -> None:
+    user_id = user.id
+    tombstone_user(user)
+    db.session.commit()
+
+    with patch(
+        "hushline.user_deletion._redact_processed_stripe_subscription_events",
+        side_effect=json.JSONDecodeError("Expecting value", "", 0),
+    ):
+        assert _run_until_idle(10) >= 1
+
+    job = _job()
+    assert job.status == DeletionJob.STATUS_PENDING
+    assert job.attempts == 1
+    assert job.last_error == "JSONDecodeError"
+    assert job.next_attempt_at is not None
+    assert job.next_attempt_at > datetime.now(UTC)
+    assert db.session.get(User, user_id) is not None
+
+
+@pytest.mark.usefixtures("_authenticated_admin_user")
+def test_admin_delete_username_tombstones(client: FlaskClient, user_alias: Username) -> None:
+    response = client.post(url_for("admin.delete_username", username_id=user_alias.id))
+    assert response.status_code == 302
+
+    db.session.refresh(user_alias)
+    assert user_alias.deleted_at is not None
+    assert _job().username_id == user_alias.id
+
+
+def test_deletions_cli(app: Flask, user: User) -> None:
+    tombstone_user(user)
+    db.session.commit()
+    job = _job()
+    job.status = DeletionJob.STATUS_FAILED
+    db.session.commit()
+
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=["deletions", "status"])
+    assert result.exit_code == 0, result.output
+    assert f"{job.id}\tfailed\tuser {user.id}" in result.output
+
+    result = runner.invoke(args=["deletions", "retry", str(job.id)])
+    assert result.exit_code == 0, result.output
+
+    result = runner.invoke(args=["deletions", "worker", "--once"])
+    assert result.exit_code == 0, result.output
+    db.session.refresh(job)
+    assert job.status == DeletionJob.STATUS_DONE
@@ -4,8 +4,10 @@ from uuid import uuid4
 
 import pytest
 from bs4 import BeautifulSoup
-from flask import url_for
+from flask import Flask, url_for
 from flask.testing import FlaskClient
+from pytest_mock import MockFixture
+from sqlalchemy import event
 
 from hushline.db import db
 from hushline.model import AdminBroadcast, AdminBroadcastRecipient, ChatKey, Message, User, Username
@@ -574,8 +576,12 @@ def test_broadcasts_refresh_resumes_interrupted_chunk_for_pending_recipients(
     assert "1 pending" in refresh_text
     assert soup.select_one("#broadcast_id")["value"] == broadcast.public_id
     assert json.loads(soup.select_one("#broadcast_expected_user_ids")["value"]) == [user2.id]
-    recipients = json.loads(soup.select_one("#broadcastEncryptionRecipients").text)
-    assert [recipient["user_id"] for recipient in recipients] == [user2.id]
+    form = soup.select_one("form[data-admin-broadcast-form='true']")
+    assert form["data-audience-broadcast-id"] == broadcast.public_id
+    audience = client.get(
+        url_for("settings.broadcast_audience", broadcast_id=broadcast.public_id)
+    ).get_json()
+    assert [user_id for user_id, _ in audience["recipients"]] == [user2.id]
     send_notifications.assert_called_once_with((user.id,))
 
 
@@ -693,6 +699,55 @@ def test_broadcasts_continues_same_page_chunk_with_original_audience(
     send_notifications.assert_any_call((user2.id,))
 
 
+@pytest.mark.usefixtures("_authenticated_admin_user")
+def test_broadcasts_later_chunks_load_only_their_own_recipients(
+    client: FlaskClient,
+    user: User,
+    user2: User,
+    mocker: MockFixture,
+) -> None:
+    user.pgp_key = "-----BEGIN PGP PUBLIC KEY BLOCK-----\nkey\n-----END PGP PUBLIC KEY BLOCK-----"
+    user2.pgp_key = "-----BEGIN PGP PUBLIC KEY BLOCK-----\nkey\n-----END PGP PUBLIC KEY BLOCK-----"
+    db.session.commit()
+    mocker.patch("hushline.settings.broadcast._send_broadcast_notification_emails")
+    load_audience = mocker.spy(broadcast_settings, "_load_audience")
+    expected_user_ids = [user.id, user2.id]
+
+    first = client.post(
+        url_for("settings.broadcasts"),
+        data={
+            "broadcast_chunk": "1",
+            "broadcast_completed_user_ids": json.dumps([user.id]),
+            "broadcast_expected_user_ids": json.dumps(expected_user_ids),
+            "broadcast_final_chunk": "0",
+            "encrypted_payloads": json.dumps({str(user.id): ARMORED_BROADCAST}),
+            "confirm_send": "y",
+            "send_broadcast": "Send Broadcast",
+        },
+    )
+    assert first.status_code == 200
+    load_audience.assert_called_once_with()
+    load_audience.reset_mock()
+
+    response = client.post(
+        url_for("settings.broadcasts"),
+        data={
+            "broadcast_chunk": "1",
+            "broadcast_completed_user_ids": json.dumps(expected_user_ids),
+            "broadcast_expected_user_ids": json.dumps(expected_user_ids),
+            "broadcast_final_chunk": "1",
+            "broadcast_id": first.get_json()["broadcast_id"],
+            "encrypted_payloads": json.dumps({str(user2.id): ARMORED_BROADCAST}),
+            "confirm_send": "y",
+            "send_broadcast": "Send Broadcast",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.get_json()["broadcast_complete"] is True
+    load_audience.assert_called_once_with({user2.id})
+
+
 @pytest.mark.usefixtures("_authenticated_admin_user")
 def test_broadcasts_replays_committed_chunk_without_duplicate_messages(
     client: FlaskClient,
@@ -1144,3 +1199,215 @@ def test_broadcasts_send_rejects_disabled_message_fields(
     assert "No eligible encrypted message recipients match this audience." in response.text
     send_email.assert_not_called()
     assert db.session.scalar(db.select(db.func.count(Message.id))) == 0
+
+
+def _post_final_chunk(client: FlaskClient, users: list[User]) -> dict[str, object]:
+    user_ids = [user.id for user in users]
+    response = client.post(
+        url_for("settings.broadcasts"),
+        data={
+            "broadcast_chunk": "1",
+            "broadcast_completed_user_ids": json.dumps(user_ids),
+            "broadcast_expected_user_ids": json.dumps(user_ids),
+            "broadcast_final_chunk": "1",
+            "encrypted_payloads": json.dumps(
+                {str(user_id): ARMORED_BROADCAST for user_id in user_ids}
+            ),
+            "confirm_send": "y",
+            "send_broadcast": "Send Broadcast",
+        },
+    )
+    assert response.status_code == 200, response.text
+    payload = response.get_json()
+    assert isinstance(payload, dict)
+    return payload
+
+
+@pytest.mark.usefixtures("_authenticated_admin_user")
+def test_broadcasts_insert_chunk_messages_in_one_statement(
+    app: Flask,
+    client: FlaskClient,
+    user: User,
+    user2: User,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    for target in (user, user2):
+        target.pgp_key = (
+            "-----BEGIN PGP PUBLIC KEY BLOCK-----\nkey\n-----END PGP PUBLIC KEY BLOCK-----"
+        )
+    db.session.commit()
+    monkeypatch.setattr(
+        "hushline.settings.broadcast._send_broadcast_notification_emails", MagicMock()
+    )
+    statements: list[str] = []
+
+    def _record(*args: object) -> None:
+        statements.append(str(args[2]))
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        payload = _post_final_chunk(client, [user, user2])
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+
+    assert payload["submitted_count"] == 2
+    for table in ("admin_broadcast_recipients", "messages", "field_values"):
+        assert len([s for s in statements if s.startswith(f"INSERT INTO {table}")]) == 1
+    messages = db.session.scalars(db.select(Message).order_by(Message.id)).all()
+    assert [message.field_values[0].value for message in messages] == [ARMORED_BROADCAST] * 2
+
+
+@pytest.mark.usefixtures("_authenticated_admin_user")
+def test_broadcasts_create_default_fields_before_locking_recipients(
+    client: FlaskClient,
+    user_password: str,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    target = User(password=user_password)
+    target.onboarding_complete = True
+    target.tier_id = 1
+    db.session.add(target)
+    db.session.flush()
+    db.session.add(Username(user_id=target.id, _username="broadcast-fieldless", is_primary=True))
+    target.pgp_key = "-----BEGIN PGP PUBLIC KEY BLOCK-----\nkey\n-----END PGP PUBLIC KEY BLOCK-----"
+    db.session.commit()
+    assert target.primary_username.message_fields == []
+    monkeypatch.setattr(
+        "hushline.settings.broadcast._send_broadcast_notification_emails", MagicMock()
+    )
+    events: list[str] = []
+
+    def _record_statement(*args: object) -> None:
+        events.append(str(args[2]))
+
+    def _record_commit(*args: object) -> None:
+        events.append("COMMIT")
+
+    event.listen(db.engine, "before_cursor_execute", _record_statement)
+    event.listen(db.engine, "commit", _record_commit)
+    try:
+        payload = _post_final_chunk(client, [target])
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record_statement)
+        event.remove(db.engine, "commit", _record_commit)
+
+    assert payload["submitted_count"] == 1
+    lock = next(
+        i
+        for i, statement in enumerate(events)
+        if "FROM admin_broadcast_recipients" in statement and "FOR UPDATE" in statement
+    )
+    commit = events.index("COMMIT", lock)
+    assert any(statement.startswith("INSERT INTO messages") for statement in events[lock:commit])
+    assert [field.label for field in target.primary_username.message_fields] == [
+        "Contact Method",
+        "Message",
+    ]
+
+
+@pytest.mark.usefixtures("_authenticated_admin_user")
+def test_broadcasts_queue_notifications_for_the_worker(
+    app: Flask,
+    client: FlaskClient,
+    user: User,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    app.config[broadcast_settings.BROADCAST_NOTIFICATION_QUEUE_ENABLED] = True
+    user.pgp_key = "-----BEGIN PGP PUBLIC KEY BLOCK-----\nkey\n-----END PGP PUBLIC KEY BLOCK-----"
+    _enable_notification_email(user, "primary@example.com")
+    db.session.commit()
+    send_email = MagicMock()
+    monkeypatch.setattr("hushline.settings.broadcast.do_send_email", send_email)
+
+    payload = _post_final_chunk(client, [user])
+
+    assert payload["broadcast_complete"] is True
+    assert payload["notification_pending_count"] == 1
+    send_email.assert_not_called()
+
+    result = app.test_cli_runner().invoke(args=["broadcasts", "worker", "--once"])
+
+    assert result.exit_code == 0, result.output
+    send_email.assert_called_once_with(user, broadcast_settings.BROADCAST_NOTIFICATION_BODY)
+    recipient = db.session.scalars(db.select(AdminBroadcastRecipient)).one()
+    db.session.refresh(recipient)
+    assert recipient.notified_at is not None
+    assert broadcast_settings.send_queued_broadcast_notifications(10) == 0
+
+
+@pytest.mark.usefixtures("_authenticated_admin_user")
+def test_broadcasts_mark_inline_notifications_sent(
+    client: FlaskClient,
+    user: User,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    user.pgp_key = "-----BEGIN PGP PUBLIC KEY BLOCK-----\nkey\n-----END PGP PUBLIC KEY BLOCK-----"
+    db.session.commit()
+    send_notifications = MagicMock()
+    monkeypatch.setattr(
+        "hushline.settings.broadcast._send_broadcast_notification_emails",
+        send_notifications,
+    )
+
+    payload = _post_final_chunk(client, [user])
+
+    assert payload["notification_pending_count"] == 0
+    send_notifications.assert_called_once_with((user.id,))
+    assert broadcast_settings.send_queued_broadcast_notifications(10) == 0
+
+
+@pytest.mark.usefixtures("_authenticated_user")
+def test_broadcast_audience_requires_admin(client: FlaskClient) -> None:
+    response = client.get(url_for("settings.broadcast_audience"))
+
+    assert response.status_code == 403
+
+
+@pytest.mark.usefixtures("_authenticated_admin_user")
+def test_broadcast_audience_pages_by_user_id(
+    client: FlaskClient,
+    user: User,
+    user2: User,
+) -> None:
+    for target in (user, user2):
+        target.pgp_key = (
+            "-----BEGIN PGP PUBLIC KEY BLOCK-----\nkey\n-----END PGP PUBLIC KEY BLOCK-----"
+        )
+    db.session.commit()
+    first_id, second_id = sorted([user.id, user2.id])
+
+    first = client.get(url_for("settings.broadcast_audience", limit=1)).get_json()
+    second = client.get(
+        url_for("settings.broadcast_audience", limit=1, after=first["next_after"])
+    ).get_json()
+    last = client.get(
+        url_for("settings.broadcast_audience", limit=1, after=second["next_after"])
+    ).get_json()
+
+    assert first == {"recipients": [[first_id, [[None, user.pgp_key]]]], "next_after": first_id}
+    assert second["recipients"][0][0] == second_id
+    assert second["next_after"] == second_id
+    assert last == {"recipients": [], "next_after": None}
+
+
+@pytest.mark.usefixtures("_authenticated_admin_user", "_pgp_user")
+def test_broadcast_audience_includes_key_fingerprints(client: FlaskClient, user: User) -> None:
+    response = client.get(url_for("settings.broadcast_audience"))
+
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert payload["next_after"] is None
+    [(user_id, [(fingerprint, key)])] = payload["recipients"]
+    assert user_id == user.id
+    assert key == user.pgp_key
+    assert fingerprint is not None
+    assert len(fingerprint) == 40
+    assert fingerprint == fingerprint.upper()
+
+
+@pytest.mark.usefixtures("_authenticated_admin_user")
+def test_broadcast_audience_rejects_invalid_broadcast_id(client: FlaskClient) -> None:
+    response = client.get(url_for("settings.broadcast_audience", broadcast_id="not-a-uuid"))
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Broadcast run id is invalid."}
@@ -0,0 +1,192 @@
+import time
+from hashlib import sha256
+from io import BytesIO
+from unittest.mock import MagicMock
+
+import pytest
+from PIL import Image, ImageFile, PngImagePlugin
+from pytest_mock import MockFixture
+
+from hushline.brand_images import (
+    BRAND_LOGO_BOX,
+    BRAND_LOGO_FALLBACK_BOX,
+    MAX_SOURCE_PIXELS,
+    SPLASH_LOGO_BOX,
+    InvalidBrandImageError,
+    brand_image_paths,
+    picture_sources,
+    store_brand_image,
+)
+
+
+def _png(size: tuple[int, int], mode: str = "RGB", **save_kwargs: object) -> BytesIO:
+    buffer = BytesIO()
+    Image.new(mode, size, "white").save(buffer, "PNG", **save_kwargs)
+    buffer.seek(0)
+    return buffer
+
+
+@pytest.fixture()
+def stored(mocker: MockFixture) -> dict[str, bytes]:
+    files: dict[str, bytes] = {}
+
+    def put_content_addressed(stem: str, readable: BytesIO, suffix: str) -> str:
+        data = readable.read()
+        path = f"{stem}-{sha256(data).hexdigest()}{suffix}"
+        files[path] = data
+        return path
+
+    store = mocker.patch("hushline.brand_images.public_store", spec=["put_content_addressed"])
+    store.put_content_addressed.side_effect = put_content_addressed
+    return files
+
+
+def _open(data: bytes) -> Image.Image:
+    image = Image.open(BytesIO(data))
+    image.load()
+    return image
+
+
+def test_variants_are_downsized_to_the_box(stored: dict[str, bytes]) -> None:
+    image = store_brand_image(_png((1000, 300)), "brand/logo", BRAND_LOGO_BOX)
+
+    sizes = {
+        (variant["type"], variant["density"]): _open(stored[variant["path"]]).size
+        for variant in image.variants
+    }
+    assert sizes[("image/png", 1)] == (80, 24)
+    assert sizes[("image/png", 2)] == (160, 48)
+    assert sizes[("image/webp", 1)] == (80, 24)
+    assert sizes[("image/webp", 2)] == (160, 48)
+    # the fallback is the largest PNG variant
+    assert image.path in {v["path"] for v in image.variants if v["type"] == "image/png"}
+    assert _open(stored[image.path]).size == (160, 48)
+
+
+def test_fallback_is_sized_for_its_own_box(stored: dict[str, bytes]) -> None:
+    image = store_brand_image(
+        _png((1000, 300)), "brand/logo", BRAND_LOGO_BOX, BRAND_LOGO_FALLBACK_BOX
+    )
+
+    assert _open(stored[image.path]).size == (416, 125)
+    assert max(_open(stored[v["path"]]).size for v in image.variants) == (160, 48)
+
+
+def test_small_images_are_not_upscaled(stored: dict[str, bytes]) -> None:
+    image = store_brand_image(_png((100, 50)), "brand/splash-logo", SPLASH_LOGO_BOX)
+
+    assert {variant["density"] for variant in image.variants} == {1}
+    assert _open(stored[image.path]).size == (100, 50)
+
+
+def test_metadata_is_stripped(stored: dict[str, bytes]) -> None:
+    info = PngImagePlugin.PngInfo()
+    info.add_text("Author", "Jane Doe")
+    upload = _png((400, 400), "RGBA", pnginfo=info, icc_profile=b"not really a profile")
+
+    image = store_brand_image(upload, "brand/logo", BRAND_LOGO_BOX)
+
+    for variant in image.variants:
+        data = stored[variant["path"]]
+        assert b"Jane Doe" not in data
+        decoded = _open(data)
+        assert "icc_profile" not in decoded.info
+        assert "Author" not in decoded.info
+        assert decoded.mode in ("RGBA", "RGB")
+
+
+@pytest.mark.parametrize(
+    "upload",
+    [
+        BytesIO(b"not an image"),
+        BytesIO(_png((10, 10)).getvalue()[:-20]),
+    ],
+)
+def test_invalid_images_are_rejected(stored: dict[str, bytes], upload: BytesIO) -> None:
+    with pytest.raises(InvalidBrandImageError, match="not a valid PNG"):
+        store_brand_image(upload, "brand/logo", BRAND_LOGO_BOX)
+    assert not stored
+
+
+def test_other_formats_are_rejected(stored: dict[str, bytes]) -> None:
+    upload = BytesIO()
+    Image.new("RGB", (10, 10)).save(upload, "GIF")
+
+    with pytest.raises(InvalidBrandImageError):
+        store_brand_image(upload, "brand/logo", BRAND_LOGO_BOX)
+
+
+def test_huge_images_are_rejected_before_decoding(
+    stored: dict[str, bytes], mocker: MockFixture
+) -> None:
+    side = int(MAX_SOURCE_PIXELS**0.5) + 1
+    upload = _png((side, side), "1")
+    load = mocker.patch.object(ImageFile.ImageFile, "load")
+
+    with pytest.raises(InvalidBrandImageError, match="at most"):
+        store_brand_image(upload, "brand/logo", BRAND_LOGO_BOX)
+    load.assert_not_called()
+    assert not stored
+
+
+def test_failed_store_deletes_the_variants_already_stored(mocker: MockFixture) -> None:
+    puts: list[str] = []
+
+    def put_content_addressed(stem: str, readable: BytesIO, suffix: str) -> str:
+        if len(puts) == 2:
+            raise OSError("storage is unavailable")
+        puts.append(f"{stem}-{len(puts)}")
+        return puts[-1]
+
+    store = mocker.patch(
+        "hushline.brand_images.public_store", spec=["put_content_addressed", "discard"]
+    )
+    store.put_content_addressed.side_effect = put_content_addressed
+
+    with pytest.raises(OSError, match="unavailable"):
+        # the current logo can share a path with the new one, and must survive the failure
+        store_brand_image(_png((1000, 300)), "brand/logo", BRAND_LOGO_BOX, keep={"brand/logo-0"})
+
+    assert puts == ["brand/logo-0", "brand/logo-1"]
+    store.discard.assert_called_once_with({"brand/logo-1"})
+
+
+def test_largest_upload_is_stored_quickly(stored: dict[str, bytes]) -> None:
+    side = int(MAX_SOURCE_PIXELS**0.5)
+    upload = BytesIO()
+    Image.effect_noise((side, side), 64).convert("RGB").save(upload, "PNG", compress_level=1)
+
+    started = time.perf_counter()
+    image = store_brand_image(upload, "brand/logo", BRAND_LOGO_BOX, BRAND_LOGO_FALLBACK_BOX)
+    elapsed = time.perf_counter() - started
+
+    # the request waits for this, so it has to stay well within a request timeout
+    assert elapsed < 5
+    assert _open(stored[image.path]).size == (416, 416)
+
+
+def test_picture_sources() -> None:
+    variants = [
+        {"path": "logo-2.png", "type": "image/png", "density": 2},
+        {"path": "logo-1.png", "type": "image/png", "density": 1},
+        {"path": "logo-1.webp", "type": "image/webp", "density": 1},
+    ]
+    url_for_path = MagicMock(side_effect=lambda path: f"/assets/public/{path}")
+
+    assert picture_sources(variants, url_for_path) == [
+        {"type": "image/webp", "srcset": "/assets/public/logo-1.webp 1x"},
+        {
+            "type": "image/png",
+            "srcset": "/assets/public/logo-1.png 1x, /assets/public/logo-2.png 2x",
+        },
+    ]
+    assert picture_sources(None, url_for_path) == []
+
+
+def test_brand_image_paths() -> None:
+    variants = [{"path": "logo-1.webp", "type": "image/webp", "density": 1}]
+
+    assert brand_image_paths("logo.png", variants) == {"logo.png", "logo-1.webp"}
+    # logos uploaded before variants were stored
+    assert brand_image_paths("logo.png", None) == {"logo.png"}
+    assert brand_image_paths(None, None) == set()
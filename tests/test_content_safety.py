@@ -52,24 +52,92 @@ def test_contains_disallowed_text_returns_false_when_engine_missing(
     assert content_safety.contains_disallowed_text("blocked-token") is False
 
 
-def test_profanity_engine_loads_library_wordlist(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_profanity_engine_compiles_library_wordlist(monkeypatch: pytest.MonkeyPatch) -> None:
     content_safety._profanity_engine.cache_clear()
     content_safety._log_missing_library_once.cache_clear()
 
     class _FakeProfanity:
-        def __init__(self) -> None:
-            self.loaded = False
+        CHARS_MAPPING = {"s": ("s", "$")}
 
-        def load_censor_words(self) -> None:
-            self.loaded = True
+    monkeypatch.setattr(content_safety, "profanity", _FakeProfanity())
+    monkeypatch.setattr(content_safety, "read_wordlist", lambda path: iter(["blockedword"]))
 
-        @staticmethod
-        def contains_profanity(text: str) -> bool:
-            return "blocked-token" in text
+    engine = content_safety._profanity_engine()
+    content_safety._profanity_engine.cache_clear()
 
-    fake_profanity = _FakeProfanity()
-    monkeypatch.setattr(content_safety, "profanity", fake_profanity)
+    assert isinstance(engine, content_safety.CensorMatcher)
+    assert engine.contains_profanity("a blockedword here") is True
+    assert engine.contains_profanity("a blocked$word here") is False
+    assert engine.contains_profanity("blockedwords") is False
+
+
+def _matcher(*words: str) -> content_safety.CensorMatcher:
+    return content_safety.CensorMatcher(
+        words,
+        char_map={"a": ("a", "@", "*", "4"), "s": ("s", "$", "*"), "i": ("i", "*", "l", "1")},
+        word_chars="abcdefghijklmnopqrstuvwxyz0123456789@$*_",
+    )
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("ass", True),
+        ("what an A$$ move", True),
+        ("@**", True),
+        ("class assessment", False),
+        ("assassin", False),
+        ("2 girls 1 cup", True),
+        ("2-girls-1-cup", False),
+        ("2 girls, 1 cup", False),
+        ("hand job", True),
+        ("hand.job", True),
+        ("hand jobs", False),
+        ("", False),
+    ],
+)
+def test_censor_matcher_matches_whole_words(text: str, expected: bool) -> None:
+    matcher = _matcher("ass", "2 girls 1 cup", "handjob")
+    assert matcher.contains_profanity(text) is expected
+
+
+def test_allowlist_pattern_is_compiled_once_per_value() -> None:
+    content_safety._allowlist_pattern.cache_clear()
+
+    pattern = content_safety._allowlist_pattern(" Scunthorpe, , scunthorpe united ")
+
+    assert pattern is content_safety._allowlist_pattern(" Scunthorpe, , scunthorpe united ")
+    assert content_safety._allowlist_pattern(" , ") is None
+    assert pattern is not None
+    stripped = content_safety._strip_allowlisted_terms("visit scunthorpe united", pattern)
+    assert "scunthorpe" not in stripped
+    assert content_safety._strip_allowlisted_terms("scunthorpes", pattern) == "scunthorpes"
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Investigative journalist covering city hall",
+        "Send me tips about the s.h.i.t show at the council",
+        "f-u-c-k this",
+        "Former a$$istant editor, now freelance",
+        "b1tch please",
+        "Shitake mushroom enthusiast",
+        "Cocktail reviews and assessments",
+        "two girls one cup 2 girls 1 cup",
+        "DM me on Signal: alice.01",
+        "sh*t happens, but tips are welcome",
+        "hand job hand-job handjob",
+        "WTF is going on at city hall?!",
+    ],
+)
+def test_profanity_engine_agrees_with_better_profanity(text: str) -> None:
+    better_profanity = pytest.importorskip("better_profanity")
+    reference = better_profanity.Profanity()
+    reference.load_censor_words()
 
+    content_safety._profanity_engine.cache_clear()
     engine = content_safety._profanity_engine()
-    assert engine is fake_profanity
-    assert fake_profanity.loaded is True
+
+    assert engine is not None
+    assert engine.contains_profanity(text) is reference.contains_profanity(text)
@@ -1,9 +1,11 @@
 import base64
 import json
 import re
+import time
 from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch
 
+import psycopg
 import pytest
 from bs4 import BeautifulSoup
 from cryptography.hazmat.primitives import hashes
@@ -12,22 +14,25 @@ from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature
 from flask import Flask, url_for
 from flask.testing import FlaskClient
 from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
 
 from hushline.db import db
+from hushline.live_updates import LIVE_UPDATE_CONVERSATION, LIVE_UPDATES_CHANNEL, LiveUpdate
 from hushline.model import (
     ChatKey,
-    ChatRateLimitAttempt,
     Conversation,
     ConversationMessage,
     ConversationMessageCopy,
     ConversationParticipant,
+    ConversationPresence,
     FieldValue,
     Message,
     NotificationRecipient,
+    RateLimitBucket,
     User,
 )
 from hushline.routes.message import (
-    _as_utc,
     _canonical_chat_signature_payload,
     _chat_ciphertext_context,
     _chat_ciphertext_context_is_bound,
@@ -253,9 +258,15 @@ def _make_conversation(
         )
     db.session.add(conversation)
     db.session.commit()
+    _refresh_summary(conversation)
     return conversation
 
 
+def _refresh_summary(conversation: Conversation) -> None:
+    Conversation.refresh_summaries([conversation.id])
+    db.session.commit()
+
+
 def _copies_for(conversation: Conversation, label: str) -> dict[str, str]:
     return {
         str(participant.id): _ciphertext(f"{label}-{participant.id}")
@@ -313,6 +324,12 @@ def _reply_copies_for(conversation: Conversation, sender: User, label: str) -> d
     return _bound_copies_for(conversation, _participant_for(conversation, sender), label)
 
 
+def _mark_active(participant: ConversationParticipant, active_at: datetime) -> None:
+    ConversationPresence.mark_active(
+        participant.id, participant.user_id, now=active_at, coalesce=timedelta(0)
+    )
+
+
 def _participant_for(conversation: Conversation, user: User) -> ConversationParticipant:
     participant = conversation.participant_for_user_id(user.id)
     assert participant is not None
@@ -322,6 +339,7 @@ def _participant_for(conversation: Conversation, user: User) -> ConversationPart
 def _set_initial_message_created_at(conversation: Conversation, created_at: datetime) -> None:
     conversation.messages[0].created_at = created_at
     db.session.commit()
+    _refresh_summary(conversation)
 
 
 def _add_conversation_message(
@@ -343,6 +361,7 @@ def _add_conversation_message(
         encrypted_copy.encrypted_payload = _ciphertext(f"{label}-{recipient_participant.id}")
         db.session.add(encrypted_copy)
     db.session.commit()
+    _refresh_summary(conversation)
     return conversation_message
 
 
@@ -354,12 +373,6 @@ def test_conversation_timing_helpers_fall_back_to_safe_defaults(app: Flask) -> N
     assert _conversation_presence_heartbeat_ms() == 60_000
 
 
-def test_as_utc_treats_naive_datetimes_as_utc() -> None:
-    naive_datetime = datetime(2026, 1, 1, 12, 0)
-
-    assert _as_utc(naive_datetime) == datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
-
-
 @pytest.mark.parametrize(
     "value",
     [
@@ -928,6 +941,197 @@ def test_conversation_view_hides_message_metadata_from_page_payload(
     assert '<time datetime="' not in response.text
 
 
+def test_conversation_view_renders_only_latest_page(
+    app: Flask,
+    client: FlaskClient,
+    user: User,
+    user2: User,
+) -> None:
+    app.config["CONVERSATION_PAGE_SIZE"] = 2
+    conversation = _make_conversation(user, user2)
+    sender_participant = _participant_for(conversation, user)
+    message_ids = [conversation.messages[0].id]
+    for index in range(2):
+        message_ids.append(
+            _add_conversation_message(
+                conversation,
+                sender_participant,
+                created_at=datetime.now(timezone.utc) + timedelta(minutes=index + 1),
+                label=f"page-{index}",
+            ).id
+        )
+    _authenticate_as(client, user2)
+
+    response = client.get(url_for("conversation", public_id=conversation.public_id))
+
+    assert response.status_code == 200
+    rendered_ids = [
+        int(message_id)
+        for message_id in re.findall(r'data-conversation-message-id="(\d+)"', response.text)
+    ]
+    assert rendered_ids == message_ids[1:]
+    load_older_match = re.search(r'id="conversation-load-older"[^>]*>', response.text)
+    assert load_older_match is not None
+    assert "hidden" not in load_older_match.group(0)
+    participant = _participant_for(conversation, user2)
+    db.session.refresh(participant)
+    assert participant.last_read_message_id == message_ids[-1]
+
+
+def test_conversation_messages_returns_viewer_copies_after_cursor(
+    client: FlaskClient,
+    user: User,
+    user2: User,
+) -> None:
+    conversation = _make_conversation(user, user2)
+    sender_participant = _participant_for(conversation, user)
+    recipient_participant = _participant_for(conversation, user2)
+    initial_message_id = conversation.messages[0].id
+    newer_message = _add_conversation_message(
+        conversation,
+        sender_participant,
+        created_at=datetime(2026, 2, 1, 12, 0, tzinfo=timezone.utc),
+        label="delta",
+    )
+    _authenticate_as(client, user2)
+
+    response = client.get(
+        url_for(
+            "conversation_messages",
+            public_id=conversation.public_id,
+            after=initial_message_id,
+        )
+    )
+
+    assert response.status_code == 200
+    assert response.json == {
+        "messages": [
+            {
+                "message_id": newer_message.id,
+                "encrypted_payload": _ciphertext(f"delta-{recipient_participant.id}"),
+                "is_own_message": False,
+            }
+        ],
+        "has_more": False,
+    }
+    participant = _participant_for(conversation, user2)
+    db.session.refresh(participant)
+    assert participant.last_read_message_id is None
+
+
+def test_conversation_messages_pages_backwards_through_history(
+    client: FlaskClient,
+    user: User,
+    user2: User,
+) -> None:
+    conversation = _make_conversation(user, user2)
+    sender_participant = _participant_for(conversation, user)
+    message_ids = [conversation.messages[0].id]
+    for index in range(3):
+        message_ids.append(
+            _add_conversation_message(
+                conversation,
+                sender_participant,
+                created_at=datetime(2026, 2, 1, 12, index, tzinfo=timezone.utc),
+                label=f"history-{index}",
+            ).id
+        )
+    _authenticate_as(client, user)
+
+    response = client.get(
+        url_for(
+            "conversation_messages",
+            public_id=conversation.public_id,
+            before=message_ids[-1],
+            limit=2,
+        )
+    )
+
+    assert response.status_code == 200
+    assert response.json is not None
+    assert [message["message_id"] for message in response.json["messages"]] == message_ids[1:3]
+    assert all(message["is_own_message"] for message in response.json["messages"])
+    assert response.json["has_more"] is True
+
+    response = client.get(
+        url_for(
+            "conversation_messages",
+            public_id=conversation.public_id,
+            before=message_ids[1],
+            limit=2,
+        )
+    )
+
+    assert response.status_code == 200
+    assert response.json is not None
+    assert [message["message_id"] for message in response.json["messages"]] == message_ids[:1]
+    assert response.json["has_more"] is False
+
+
+def test_conversation_messages_marks_missing_copies_as_deleted(
+    client: FlaskClient,
+    user: User,
+    user2: User,
+) -> None:
+    conversation = _make_conversation(user, user2, include_initial_copy=False)
+    _authenticate_as(client, user2)
+
+    response = client.get(
+        url_for("conversation_messages", public_id=conversation.public_id, after=0)
+    )
+
+    assert response.status_code == 200
+    assert response.json is not None
+    assert response.json["messages"] == [
+        {
+            "message_id": conversation.messages[0].id,
+            "encrypted_payload": None,
+            "is_own_message": False,
+        }
+    ]
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        {"after": "x"},
+        {"before": "1.5"},
+        {"limit": "all"},
+        {"after": "1", "before": "2"},
+    ],
+)
+def test_conversation_messages_rejects_invalid_cursors(
+    client: FlaskClient,
+    user: User,
+    user2: User,
+    query: dict[str, str],
+) -> None:
+    conversation = _make_conversation(user, user2)
+    _authenticate_as(client, user)
+
+    response = client.get(
+        url_for("conversation_messages", public_id=conversation.public_id),
+        query_string=query,
+    )
+
+    assert response.status_code == 400
+    assert response.json == {"error": "Invalid conversation cursor."}
+
+
+def test_conversation_messages_requires_participant(
+    client: FlaskClient,
+    user: User,
+    user2: User,
+    admin_user: User,
+) -> None:
+    conversation = _make_conversation(user, user2)
+    _authenticate_as(client, admin_user)
+
+    response = client.get(url_for("conversation_messages", public_id=conversation.public_id))
+
+    assert response.status_code == 404
+
+
 def test_conversation_view_marks_participant_active(
     client: FlaskClient,
     user: User,
@@ -940,8 +1144,7 @@ def test_conversation_view_marks_participant_active(
     response = client.get(url_for("conversation", public_id=conversation.public_id))
 
     assert response.status_code == 200
-    db.session.refresh(participant)
-    assert participant.last_active_at is not None
+    assert ConversationPresence.last_active_at_for(participant.id) is not None
 
 
 def test_conversation_presence_requires_participant(
@@ -957,8 +1160,7 @@ def test_conversation_presence_requires_participant(
     response = client.post(url_for("conversation_presence", public_id=conversation.public_id))
 
     assert response.status_code == 404
-    db.session.refresh(participant)
-    assert participant.last_active_at is None
+    assert ConversationPresence.last_active_at_for(participant.id) is None
 
 
 def test_conversation_presence_heartbeat_marks_participant_active(
@@ -973,8 +1175,7 @@ def test_conversation_presence_heartbeat_marks_participant_active(
     response = client.post(url_for("conversation_presence", public_id=conversation.public_id))
 
     assert response.status_code == 200
-    db.session.refresh(participant)
-    assert participant.last_active_at is not None
+    assert ConversationPresence.last_active_at_for(participant.id) is not None
 
 
 def test_conversation_presence_accepts_rendered_csrf_token(
@@ -1001,8 +1202,7 @@ def test_conversation_presence_accepts_rendered_csrf_token(
         app.config["WTF_CSRF_ENABLED"] = prior_setting
 
     assert response.status_code == 200
-    db.session.refresh(participant)
-    assert participant.last_active_at is not None
+    assert ConversationPresence.last_active_at_for(participant.id) is not None
 
 
 def test_conversation_presence_requires_csrf_when_enabled(
@@ -1461,10 +1661,15 @@ def test_append_conversation_message_rate_limits_participant_without_persistence
         .join(ConversationMessage)
         .where(ConversationMessage.conversation_id == conversation.id)
     )
-    attempt_count = db.session.scalar(db.select(db.func.count()).select_from(ChatRateLimitAttempt))
+    bucket_tats = dict(
+        db.session.execute(db.select(RateLimitBucket.key, RateLimitBucket.tat)).tuples().all()
+    )
     assert message_count == 2
     assert copy_count == 4
-    assert attempt_count == 1
+    # only the first message was counted, so each bucket is at most one refill interval ahead
+    now = time.time()
+    assert 0 < bucket_tats[f"chat:conversation:{conversation.id}"] - now <= 60 / 20
+    assert 0 < bucket_tats[f"chat:user:{user.id}"] - now <= 3600 / 20
     mock_send_email_to_user_recipients.assert_not_called()
 
 
@@ -1569,11 +1774,7 @@ def test_append_conversation_message_rate_limit_resets_after_window(
         url_for("append_conversation_message", public_id=conversation.public_id),
         json={"encrypted_copies": _reply_copies_for(conversation, user, "old-window")},
     )
-    db.session.execute(
-        db.update(ChatRateLimitAttempt).values(
-            created_at=datetime.now(timezone.utc) - timedelta(seconds=5)
-        )
-    )
+    db.session.execute(db.update(RateLimitBucket).values(tat=RateLimitBucket.tat - 5))
     db.session.commit()
     second_response = client.post(
         url_for("append_conversation_message", public_id=conversation.public_id),
@@ -1612,18 +1813,14 @@ def test_append_conversation_message_invalid_payload_does_not_burn_send_quota(
 
     assert invalid_response.status_code == 400
     assert corrected_response.status_code == 201
-    attempt_count = db.session.scalar(db.select(db.func.count()).select_from(ChatRateLimitAttempt))
-    assert attempt_count == 1
+    bucket_count = db.session.scalar(db.select(db.func.count()).select_from(RateLimitBucket))
+    assert bucket_count == 3
 
 
-def test_chat_rate_limit_reservation_takes_postgres_advisory_locks(
+def test_chat_rate_limit_reservation_locks_buckets_until_commit(
     user: User,
     user2: User,
 ) -> None:
-    bind = db.session.get_bind()
-    if bind is None or bind.dialect.name != "postgresql":
-        pytest.skip("PostgreSQL advisory locks are only available with the PostgreSQL dialect.")
-
     _add_reply_capable_chat_keys(user, user2)
     conversation = _make_conversation(user, user2)
     participant = conversation.participant_for_user_id(user.id)
@@ -1635,18 +1832,19 @@ def test_chat_rate_limit_reservation_takes_postgres_advisory_locks(
         user=user,
     )
 
-    advisory_lock_count = db.session.scalar(
-        text(
-            "SELECT count(*) "
-            "FROM pg_locks "
-            "WHERE locktype = 'advisory' "
-            "AND pid = pg_backend_pid() "
-            "AND granted"
-        )
-    )
     assert not limited
-    assert advisory_lock_count is not None
-    assert advisory_lock_count >= 3
+    with db.engine.connect() as other_request:
+        other_request.execute(text("SET lock_timeout = '100ms'"))
+        with pytest.raises(OperationalError):
+            other_request.execute(
+                text(
+                    "INSERT INTO rate_limit_buckets (key, tat) VALUES (:key, 0) "
+                    "ON CONFLICT (key) DO NOTHING"
+                ),
+                {"key": f"chat:user:{user.id}"},
+            )
+        other_request.rollback()
+    db.session.rollback()
 
 
 def test_append_conversation_message_rejects_unsigned_legacy_envelopes(
@@ -1941,7 +2139,7 @@ def test_append_conversation_message_suppresses_notification_for_active_recipien
     )
     conversation = _make_conversation(user, user2)
     recipient_participant = _participant_for(conversation, user2)
-    recipient_participant.last_active_at = datetime.now(timezone.utc)
+    _mark_active(recipient_participant, datetime.now(timezone.utc))
     db.session.commit()
     _authenticate_as(client, user)
 
@@ -1971,7 +2169,7 @@ def test_append_conversation_message_suppresses_notification_for_active_recipien
     target_conversation = _make_conversation(user, user2)
     active_conversation = _make_conversation(user, user2)
     active_participant = _participant_for(active_conversation, user2)
-    active_participant.last_active_at = datetime.now(timezone.utc)
+    _mark_active(active_participant, datetime.now(timezone.utc))
     db.session.commit()
     _authenticate_as(client, user)
 
@@ -2000,7 +2198,7 @@ def test_append_conversation_message_notifies_after_stale_recipient_activity(
     )
     conversation = _make_conversation(user, user2)
     recipient_participant = _participant_for(conversation, user2)
-    recipient_participant.last_active_at = datetime.now(timezone.utc) - timedelta(minutes=10)
+    _mark_active(recipient_participant, datetime.now(timezone.utc) - timedelta(minutes=10))
     db.session.commit()
     _authenticate_as(client, user)
 
@@ -2014,6 +2212,135 @@ def test_append_conversation_message_notifies_after_stale_recipient_activity(
     assert mock_send_email_to_user_recipients.call_args.args[0].id == user2.id
 
 
+def test_append_conversation_message_updates_inbox_summary(
+    client: FlaskClient,
+    user: User,
+    user2: User,
+) -> None:
+    _add_reply_capable_chat_keys(user, user2)
+    conversation = _make_conversation(user, user2)
+    sender_participant = _participant_for(conversation, user)
+    recipient_participant = _participant_for(conversation, user2)
+    _authenticate_as(client, user2)
+    client.get(url_for("conversation", public_id=conversation.public_id))
+    _authenticate_as(client, user)
+
+    response = client.post(
+        url_for("append_conversation_message", public_id=conversation.public_id),
+        json={"encrypted_copies": _reply_copies_for(conversation, user, "summary")},
+    )
+
+    assert response.status_code == 201
+    db.session.refresh(conversation)
+    db.session.refresh(sender_participant)
+    db.session.refresh(recipient_participant)
+    latest_message = db.session.get(ConversationMessage, response.get_json()["message_id"])
+    assert latest_message is not None
+    assert conversation.message_count == 2
+    assert conversation.last_message_id == latest_message.id
+    assert conversation.last_message_at == latest_message.created_at
+    assert sender_participant.has_unread is False
+    assert recipient_participant.has_unread is True
+    assert sender_participant.missing_copy_count == 0
+    assert recipient_participant.missing_copy_count == 0
+
+
+def test_concurrent_appends_keep_inbox_summary_counters(user: User, user2: User) -> None:
+    conversation = _make_conversation(user, user2)
+    conversation_id = conversation.id
+    sender_id = _participant_for(conversation, user).id
+    recipient_id = _participant_for(conversation, user2).id
+    db.session.commit()
+
+    first, second = Session(db.engine), Session(db.engine)
+    try:
+        # both requests load the summary before either appends, as with two concurrent replies
+        threads = [session.get(Conversation, conversation_id) for session in (first, second)]
+        messages: list[int] = []
+        for session, thread in zip((first, second), threads):
+            assert thread is not None
+            assert thread.message_count == 1
+            sender = session.get(ConversationParticipant, sender_id)
+            assert sender is not None
+            conversation_message = ConversationMessage()
+            conversation_message.conversation = thread
+            conversation_message.sender_participant = sender
+            # only the sender's copy, so the recipient is missing one copy per append
+            encrypted_copy = ConversationMessageCopy()
+            encrypted_copy.recipient_participant = sender
+            encrypted_copy.encrypted_payload = _ciphertext(f"concurrent-{len(messages)}")
+            conversation_message.encrypted_copies.append(encrypted_copy)
+            session.add(conversation_message)
+            session.flush()
+            messages.append(conversation_message.id)
+
+        for session, thread, message_id in zip((first, second), threads, messages):
+            appended = session.get(ConversationMessage, message_id)
+            assert thread is not None
+            assert appended is not None
+            thread.record_message(appended)
+            session.commit()
+    finally:
+        first.close()
+        second.close()
+
+    db.session.expire_all()
+    summary = db.session.get(Conversation, conversation_id)
+    assert summary is not None
+    assert summary.message_count == 3
+    assert summary.last_message_id == max(messages)
+    recipient = db.session.get(ConversationParticipant, recipient_id)
+    assert recipient is not None
+    assert recipient.missing_copy_count == 2
+
+
+def test_append_conversation_message_notifies_participants(
+    client: FlaskClient,
+    user: User,
+    user2: User,
+) -> None:
+    _add_reply_capable_chat_keys(user, user2)
+    conversation = _make_conversation(user, user2)
+    _authenticate_as(client, user)
+    conninfo = db.engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+    with psycopg.connect(conninfo, autocommit=True) as listener:
+        listener.execute(f"LISTEN {LIVE_UPDATES_CHANNEL}")
+        response = client.post(
+            url_for("append_conversation_message", public_id=conversation.public_id),
+            json={"encrypted_copies": _reply_copies_for(conversation, user, "live-update")},
+        )
+        payloads = [notify.payload for notify in listener.notifies(timeout=1)]
+
+    assert response.status_code == 201
+    assert [LiveUpdate.from_payload(payload) for payload in payloads] == [
+        LiveUpdate(
+            event=LIVE_UPDATE_CONVERSATION,
+            user_ids=frozenset({user.id, user2.id}),
+            conversation=conversation.public_id,
+        )
+    ]
+
+
+def test_delete_conversation_counts_missing_copies_for_remaining_participant(
+    client: FlaskClient,
+    user: User,
+    user2: User,
+) -> None:
+    conversation = _make_conversation(user, user2)
+    remaining_participant = _participant_for(conversation, user2)
+    _authenticate_as(client, user)
+
+    response = client.post(
+        url_for("delete_conversation", public_id=conversation.public_id),
+        follow_redirects=False,
+    )
+
+    assert response.status_code == 302
+    db.session.refresh(remaining_participant)
+    assert remaining_participant.missing_copy_count == 1
+
+
 @patch("hushline.routes.message.send_email_to_user_recipients")
 def test_append_conversation_message_does_not_notify_sender(
     mock_send_email_to_user_recipients: MagicMock,
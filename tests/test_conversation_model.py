@@ -1,4 +1,4 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from flask import Flask
 
@@ -8,6 +8,7 @@ from hushline.model import (
     ConversationMessage,
     ConversationMessageCopy,
     ConversationParticipant,
+    ConversationPresence,
     Message,
     User,
 )
@@ -150,20 +151,56 @@ def test_participant_read_state_and_key_defaults(app: Flask, user: User, user2:
 
     assert participant.has_usable_public_key is True
     assert participant.last_read_at is None
-    assert participant.last_active_at is None
     assert participant2.has_usable_public_key is False
     assert participant2.last_read_at is None
-    assert participant2.last_active_at is None
 
     read_at = datetime.now(timezone.utc)
-    active_at = datetime.now(timezone.utc)
     participant2.last_read_at = read_at
-    participant2.last_active_at = active_at
     db.session.add(conversation)
     db.session.commit()
 
     assert participant2.last_read_at == read_at
-    assert participant2.last_active_at == active_at
+
+
+def test_presence_heartbeats_coalesce_within_window(app: Flask, user: User, user2: User) -> None:
+    _, participant, _ = _make_conversation(user, user2)
+    first_at = datetime.now(timezone.utc)
+    coalesce = timedelta(seconds=30)
+
+    ConversationPresence.mark_active(participant.id, user.id, now=first_at, coalesce=coalesce)
+    ConversationPresence.mark_active(
+        participant.id, user.id, now=first_at + timedelta(seconds=10), coalesce=coalesce
+    )
+    db.session.commit()
+
+    assert ConversationPresence.last_active_at_for(participant.id) == first_at
+
+    later_at = first_at + timedelta(seconds=31)
+    ConversationPresence.mark_active(participant.id, user.id, now=later_at, coalesce=coalesce)
+    db.session.commit()
+
+    assert ConversationPresence.last_active_at_for(participant.id) == later_at
+
+
+def test_presence_answers_user_activity_without_participant_rows(
+    app: Flask, user: User, user2: User
+) -> None:
+    _, participant, _ = _make_conversation(user, user2)
+    active_at = datetime.now(timezone.utc)
+    ConversationPresence.mark_active(participant.id, user.id, now=active_at, coalesce=timedelta(0))
+    db.session.commit()
+
+    assert ConversationPresence.user_is_active(user.id, since=active_at - timedelta(minutes=2))
+    assert not ConversationPresence.user_is_active(user.id, since=active_at + timedelta(seconds=1))
+    assert not ConversationPresence.user_is_active(user2.id, since=active_at - timedelta(minutes=2))
+    assert (
+        db.session.scalar(
+            db.select(db.text("relpersistence"))
+            .select_from(db.text("pg_class"))
+            .where(db.text("relname = 'conversation_presence'"))
+        )
+        == "u"
+    )
 
 
 def test_initial_message_can_link_to_conversation(
@@ -28,7 +28,7 @@ from hushline.model import (
 )
 from hushline.premium import create_products_and_prices
 from hushline.secure_session import EncryptedSessionInterface
-from hushline.settings.data_export import _build_zip, _write_pgp_messages
+from hushline.settings.data_export import _pgp_message_values, iter_export_zip
 from hushline.settings.forms import EmailForwardingForm, SetHomepageUsernameForm
 from hushline.settings.notifications import handle_email_forwarding_form
 from hushline.utils import if_not_none, parse_bool
@@ -160,7 +160,9 @@ def test_send_email_decodes_bytes_and_returns_false_when_no_attempts(app: Flask)
         password=smtp_secret,
         sender="sender@example.com",
     )
-    with app.app_context(), patch("hushline.email.is_safe_smtp_host", return_value=True):
+    with app.app_context(), patch(
+        "hushline.email.resolve_safe_smtp_host", return_value=("203.0.113.10",)
+    ):
         app.config["SMTP_SEND_ATTEMPTS"] = 0
         assert email_mod.send_email("to@example.com", "subject", b"bytes body", cfg) is False  # type: ignore[arg-type]
 
@@ -235,7 +237,7 @@ def test_data_export_encrypt_failure_redirects_to_advanced(client) -> None:  # t
     assert response.location == url_for("settings.advanced", _external=False)
 
 
-def test_build_zip_skips_non_pgp_and_unencrypted_values(app: Flask, user: User) -> None:
+def test_export_zip_skips_non_pgp_and_unencrypted_values(app: Flask, user: User) -> None:
     with app.app_context():
         attached_user = db.session.get(User, user.id)
         assert attached_user is not None
@@ -255,7 +257,7 @@ def test_build_zip_skips_non_pgp_and_unencrypted_values(app: Flask, user: User)
         fv._value = encrypt_field("definitely not pgp") or ""
         db.session.commit()
 
-        payload = _build_zip(user.id)
+        payload = b"".join(iter_export_zip(user.id))
         import io
         import zipfile
 
@@ -263,20 +265,12 @@ def test_build_zip_skips_non_pgp_and_unencrypted_values(app: Flask, user: User)
             assert not [n for n in zip_file.namelist() if n.startswith("pgp_messages/")]
 
 
-def test_write_pgp_messages_handles_empty_username_ids() -> None:
-    import io
-    import zipfile
-
-    buffer = io.BytesIO()
-    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
-        _write_pgp_messages(zip_file, [])
-        assert zip_file.namelist() == []
-
+def test_pgp_message_values_handles_unknown_user(app: Flask) -> None:
+    with app.app_context():
+        assert list(_pgp_message_values(-1)) == []
 
-def test_write_pgp_messages_skips_unencrypted_field_values(app: Flask, user: User) -> None:
-    import io
-    import zipfile
 
+def test_pgp_message_values_skips_unencrypted_field_values(app: Flask, user: User) -> None:
     with app.app_context():
         attached_user = db.session.get(User, user.id)
         assert attached_user is not None
@@ -290,10 +284,7 @@ def test_write_pgp_messages_skips_unencrypted_field_values(app: Flask, user: Use
         db.session.add(fv)
         db.session.commit()
 
-        buffer = io.BytesIO()
-        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
-            _write_pgp_messages(zip_file, [attached_user.primary_username.id])
-            assert not [name for name in zip_file.namelist() if name.startswith("pgp_messages/")]
+        assert list(_pgp_message_values(user.id)) == []
 
 
 def test_user_alias_mode_edge_cases(app: Flask, user: User) -> None:
@@ -1,13 +1,15 @@
 import csv
 import io
+import threading
 import zipfile
 
 import pytest
-from flask import url_for
+from flask import Flask, url_for
 from flask.testing import FlaskClient
 
 from hushline.db import db
 from hushline.model import FieldValue, Message, User
+from hushline.settings.data_export import _in_app_context, iter_export_zip
 
 
 def _read_csv_from_zip(zip_file: zipfile.ZipFile, name: str) -> list[dict[str, str]]:
@@ -93,3 +95,43 @@ def test_data_export_only_includes_current_user(
         message_username_ids = {row.get("username_id") for row in messages}
         assert str(user.primary_username.id) in message_username_ids
         assert str(user2.primary_username.id) not in message_username_ids
+
+
+@pytest.mark.usefixtures("_authenticated_user")
+def test_data_export_streams_rows_in_batches(
+    client: FlaskClient, user: User, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("hushline.settings.data_export._EXPORT_YIELD_PER", 2)
+    messages = [Message(username_id=user.primary_username.id) for _ in range(5)]
+    db.session.add_all(messages)
+    db.session.commit()
+
+    response = client.post(
+        url_for("settings.data_export"), data={"encrypt_export": "false"}, buffered=False
+    )
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert "attachment" in response.headers["Content-Disposition"]
+    chunks = list(response.iter_encoded())
+    assert len(chunks) > 1
+
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zip_file:
+        assert zip_file.testzip() is None
+        rows = _read_csv_from_zip(zip_file, "db/messages.csv")
+    assert [row["id"] for row in rows] == [str(message.id) for message in messages]
+
+
+def test_data_export_body_can_be_sent_without_a_context(app: Flask, user: User) -> None:
+    with app.test_request_context():
+        body = _in_app_context(iter_export_zip(user.id))
+
+    # threads start without the test's app context, like a server sending the body after the
+    # request has been torn down
+    chunks: list[bytes] = []
+    thread = threading.Thread(target=lambda: chunks.extend(body))
+    thread.start()
+    thread.join()
+
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zip_file:
+        users = _read_csv_from_zip(zip_file, "db/users.csv")
+    assert [row["id"] for row in users] == [str(user.id)]
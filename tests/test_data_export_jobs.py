@@ -0,0 +1,263 @@
+import os
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Callable
+from unittest.mock import patch
+
+import pytest
+from _pytest._py.path import LocalPath
+from flask import Flask, url_for
+from flask.testing import FlaskClient
+from pytest_mock import MockFixture
+
+from hushline import create_app
+from hushline.db import db
+from hushline.model import DataExportJob, User
+from hushline.settings.data_export import (
+    DATA_EXPORT_JOBS_ENABLED,
+    DATA_EXPORT_READY_SUBJECT,
+    purge_expired_data_exports,
+    run_data_export_jobs,
+)
+from hushline.storage import private_store
+from hushline.user_deletion import delete_user_and_related
+
+
+@pytest.fixture()
+def private_root(tmpdir: LocalPath) -> Path:
+    return Path(str(tmpdir)) / "private"
+
+
+@pytest.fixture()
+def env_var_modifier(private_root: Path) -> Callable[[MockFixture], None]:
+    def modifier(mocker: MockFixture) -> None:
+        mocker.patch.dict(
+            os.environ,
+            {
+                "BLOB_STORAGE_PRIVATE_DRIVER": "file-system",
+                "BLOB_STORAGE_PRIVATE_FS_ROOT": str(private_root),
+                DATA_EXPORT_JOBS_ENABLED: "true",
+            },
+        )
+
+    return modifier
+
+
+def _build_ready_job(user: User) -> DataExportJob:
+    db.session.add(DataExportJob(user_id=user.id))
+    db.session.commit()
+    with patch("hushline.settings.data_export.send_email_to_user_recipients"):
+        assert run_data_export_jobs(5) == 1
+    job = db.session.scalars(db.select(DataExportJob).filter_by(user_id=user.id)).one()
+    assert job.is_ready
+    return job
+
+
+def _download_url(client: FlaskClient, job: DataExportJob) -> str:
+    response = client.post(url_for("settings.data_export_download_token", public_id=job.public_id))
+    assert response.status_code == 302
+    return response.location
+
+
+@pytest.mark.usefixtures("_authenticated_user", "_pgp_user")
+def test_encrypted_export_is_queued_once(client: FlaskClient, user: User) -> None:
+    for _ in range(2):
+        response = client.post(url_for("settings.data_export"), data={"encrypt_export": "y"})
+        assert response.status_code == 302
+        assert response.location == url_for("settings.advanced", _external=False)
+
+    jobs = db.session.scalars(db.select(DataExportJob).filter_by(user_id=user.id)).all()
+    assert [job.status for job in jobs] == [DataExportJob.STATUS_PENDING]
+
+    response = client.get(url_for("settings.advanced"))
+    assert "Your encrypted export is being prepared" in response.text
+
+
+@pytest.mark.usefixtures("_authenticated_user", "_pgp_user")
+def test_unencrypted_export_is_still_streamed(client: FlaskClient, user: User) -> None:
+    response = client.post(url_for("settings.data_export"), data={"encrypt_export": "false"})
+    assert response.status_code == 200
+    assert response.mimetype == "application/zip"
+    assert db.session.scalars(db.select(DataExportJob)).first() is None
+
+
+@pytest.mark.usefixtures("_pgp_user")
+def test_worker_stores_encrypted_archive_and_notifies(user: User, private_root: Path) -> None:
+    db.session.add(DataExportJob(user_id=user.id))
+    db.session.commit()
+
+    with patch("hushline.settings.data_export.send_email_to_user_recipients") as send:
+        assert run_data_export_jobs(5) == 1
+        assert run_data_export_jobs(5) == 0
+
+    job = db.session.scalars(db.select(DataExportJob).filter_by(user_id=user.id)).one()
+    assert job.is_ready
+    assert job.expires_at is not None
+    assert job.expires_at > datetime.now(UTC)
+    archive = private_root / job.storage_path
+    assert archive.read_bytes().startswith(b"-----BEGIN PGP MESSAGE-----")
+    assert job.size_bytes == archive.stat().st_size
+    send.assert_called_once()
+    assert send.call_args.args[1] == DATA_EXPORT_READY_SUBJECT
+
+
+def test_worker_fails_jobs_without_a_pgp_key(user: User, private_root: Path) -> None:
+    db.session.add(DataExportJob(user_id=user.id))
+    db.session.commit()
+
+    assert run_data_export_jobs(5) == 1
+
+    job = db.session.scalars(db.select(DataExportJob).filter_by(user_id=user.id)).one()
+    assert job.is_failed
+    assert not private_root.exists()
+
+
+@pytest.mark.usefixtures("_authenticated_user", "_pgp_user")
+def test_download_resumes_with_range_until_sent_in_full(
+    client: FlaskClient, user: User, private_root: Path
+) -> None:
+    job = _build_ready_job(user)
+    content = (private_root / job.storage_path).read_bytes()
+
+    response = client.get(url_for("settings.advanced"))
+    assert "Your encrypted export is ready" in response.text
+
+    download_url = _download_url(client, job)
+    first = client.get(download_url, headers={"Range": "bytes=0-99"})
+    assert first.status_code == 206
+    assert first.headers["Cache-Control"] == "no-store"
+    assert "attachment" in first.headers["Content-Disposition"]
+    db.session.refresh(job)
+    assert job.downloaded_at is None
+
+    rest = client.get(download_url, headers={"Range": "bytes=100-"})
+    assert rest.status_code == 206
+    assert first.data + rest.data == content
+    db.session.refresh(job)
+    assert job.downloaded_at is not None
+
+    assert client.get(download_url).status_code == 404
+
+
+@pytest.mark.usefixtures("_authenticated_user", "_pgp_user")
+def test_download_token_is_replaced_and_scoped_to_its_user(
+    client: FlaskClient, user: User, user2: User
+) -> None:
+    job = _build_ready_job(user)
+    stale_url = _download_url(client, job)
+    download_url = _download_url(client, job)
+    assert client.get(stale_url).status_code == 404
+
+    job.user_id = user2.id
+    db.session.commit()
+    assert client.get(download_url).status_code == 404
+
+
+@pytest.mark.usefixtures("_authenticated_user", "_pgp_user")
+def test_expired_exports_cannot_be_downloaded_and_are_purged(
+    client: FlaskClient, user: User, private_root: Path
+) -> None:
+    job = _build_ready_job(user)
+    download_url = _download_url(client, job)
+    archive = private_root / job.storage_path
+
+    job.expires_at = datetime.now(UTC) - timedelta(seconds=1)
+    db.session.commit()
+    assert client.get(download_url).status_code == 404
+    response = client.post(url_for("settings.data_export_download_token", public_id=job.public_id))
+    assert response.location == url_for("settings.advanced", _external=False)
+
+    assert purge_expired_data_exports(10) == 1
+    assert not archive.exists()
+    assert db.session.scalars(db.select(DataExportJob)).first() is None
+
+
+@pytest.mark.usefixtures("_pgp_user")
+def test_deleting_a_user_deletes_their_export_archives(user: User, private_root: Path) -> None:
+    job = _build_ready_job(user)
+    archive = private_root / job.storage_path
+    assert archive.exists()
+
+    export_archives = delete_user_and_related(user)
+    db.session.commit()
+    assert archive.exists()
+    private_store.discard(export_archives)
+
+    assert not archive.exists()
+    assert db.session.scalars(db.select(DataExportJob)).first() is None
+
+
+@pytest.mark.usefixtures("_authenticated_user", "_pgp_user")
+def test_account_deletion_survives_blob_storage_failures(
+    client: FlaskClient, user: User, private_root: Path, mocker: MockFixture
+) -> None:
+    job = _build_ready_job(user)
+    archive = private_root / job.storage_path
+    mocker.patch.object(private_store, "delete", side_effect=OSError("storage is down"))
+
+    response = client.post(url_for("settings.delete_account"))
+
+    assert response.status_code == 302
+    assert db.session.get(User, user.id) is None
+    assert archive.exists()
+
+
+@pytest.mark.usefixtures("_authenticated_user", "_pgp_user")
+def test_account_deletion_without_a_private_store(
+    app: Flask, client: FlaskClient, user: User, mocker: MockFixture
+) -> None:
+    _build_ready_job(user)
+    mocker.patch.dict(app.extensions, {"BLOB_STORAGE_PRIVATE": None})
+
+    response = client.post(url_for("settings.delete_account"))
+
+    assert response.status_code == 302
+    assert db.session.get(User, user.id) is None
+
+
+@pytest.mark.usefixtures("_pgp_user")
+def test_worker_fails_jobs_it_cannot_store(
+    user: User, private_root: Path, mocker: MockFixture
+) -> None:
+    db.session.add(DataExportJob(user_id=user.id))
+    db.session.commit()
+    mocker.patch.object(private_store, "put", side_effect=OSError("storage is down"))
+
+    with patch("hushline.settings.data_export.send_email_to_user_recipients") as send:
+        assert run_data_export_jobs(5) == 1
+        assert run_data_export_jobs(5) == 0
+
+    job = db.session.scalars(db.select(DataExportJob).filter_by(user_id=user.id)).one()
+    assert job.is_failed
+    send.assert_not_called()
+
+
+def test_export_jobs_are_disabled_without_a_private_store(app: Flask, mocker: MockFixture) -> None:
+    mocker.patch.dict(os.environ, {"BLOB_STORAGE_PRIVATE_DRIVER": ""})
+    error = mocker.patch.object(app.logger, "error")
+
+    other_app = create_app()
+
+    assert not other_app.config[DATA_EXPORT_JOBS_ENABLED]
+    error.assert_called_once()
+
+
+def test_worker_command_requires_a_private_store(app: Flask, mocker: MockFixture) -> None:
+    mocker.patch.dict(app.extensions, {"BLOB_STORAGE_PRIVATE": None})
+
+    result = app.test_cli_runner().invoke(args=["data-exports", "worker", "--once"])
+
+    assert result.exit_code != 0
+    assert "BLOB_STORAGE_PRIVATE_DRIVER" in result.output
+
+
+@pytest.mark.usefixtures("_pgp_user")
+def test_worker_command_builds_queued_exports(app: Flask, user: User) -> None:
+    db.session.add(DataExportJob(user_id=user.id))
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["data-exports", "worker", "--once"])
+
+    assert result.exit_code == 0, result.output
+    job = db.session.scalars(db.select(DataExportJob).filter_by(user_id=user.id)).one()
+    assert job.is_ready
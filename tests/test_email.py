@@ -10,6 +10,8 @@ from flask import Flask
 import hushline.email as email_mod
 from hushline.model import SMTPEncryption
 
+_SMTP_ADDRESSES = ("203.0.113.10",)
+
 
 def test_create_smtp_config_variants() -> None:
     cfg_ssl = email_mod.create_smtp_config(
@@ -116,7 +118,7 @@ def test_send_email_rejects_unsafe_host(app: Flask) -> None:
         "sender@example.com",
         encryption=SMTPEncryption.StartTLS,
     )
-    with app.app_context(), patch("hushline.email.is_safe_smtp_host", return_value=False):
+    with app.app_context(), patch("hushline.email.resolve_safe_smtp_host", return_value=None):
         assert email_mod.send_email("to@example.com", "subject", "body", cfg) is False
 
 
@@ -129,7 +131,9 @@ def test_send_email_returns_false_when_config_invalid(app: Flask) -> None:
         "sender@example.com",
         encryption=SMTPEncryption.StartTLS,
     )
-    with app.app_context(), patch("hushline.email.is_safe_smtp_host", return_value=True):
+    with app.app_context(), patch(
+        "hushline.email.resolve_safe_smtp_host", return_value=_SMTP_ADDRESSES
+    ):
         assert email_mod.send_email("to@example.com", "subject", "body", cfg) is False
 
 
@@ -176,7 +180,7 @@ def test_send_email_success_and_retry(app: Flask) -> None:
 
     with (
         app.app_context(),
-        patch("hushline.email.is_safe_smtp_host", return_value=True),
+        patch("hushline.email.resolve_safe_smtp_host", return_value=_SMTP_ADDRESSES),
         patch("hushline.email.time.sleep") as sleep_mock,
     ):
         app.config["SMTP_SEND_ATTEMPTS"] = 2
@@ -191,7 +195,7 @@ def test_send_email_returns_false_when_final_login_attempt_fails(app: Flask) ->
 
     with (
         app.app_context(),
-        patch("hushline.email.is_safe_smtp_host", return_value=True),
+        patch("hushline.email.resolve_safe_smtp_host", return_value=_SMTP_ADDRESSES),
         patch("hushline.email.time.sleep") as sleep_mock,
     ):
         app.config["SMTP_SEND_ATTEMPTS"] = 1
@@ -208,7 +212,7 @@ def test_send_email_does_not_retry_after_message_submission_attempt(app: Flask)
 
     with (
         app.app_context(),
-        patch("hushline.email.is_safe_smtp_host", return_value=True),
+        patch("hushline.email.resolve_safe_smtp_host", return_value=_SMTP_ADDRESSES),
         patch("hushline.email.time.sleep") as sleep_mock,
     ):
         app.config["SMTP_SEND_ATTEMPTS"] = 3
@@ -224,7 +228,9 @@ def test_send_email_recipient_refusal_returns_false(app: Flask) -> None:
     smtp_server.send_message.return_value = {"to@example.com": (550, "refused")}
     cfg = _DummyConfig(smtp_server=smtp_server)
 
-    with app.app_context(), patch("hushline.email.is_safe_smtp_host", return_value=True):
+    with app.app_context(), patch(
+        "hushline.email.resolve_safe_smtp_host", return_value=_SMTP_ADDRESSES
+    ):
         app.config["SMTP_SEND_ATTEMPTS"] = 1
         assert email_mod.send_email("to@example.com", "subject", "body", cfg) is False
 
@@ -233,7 +239,9 @@ def test_send_email_returns_false_when_attempts_disabled(app: Flask) -> None:
     smtp_server = MagicMock()
     cfg = _DummyConfig(smtp_server=smtp_server)
 
-    with app.app_context(), patch("hushline.email.is_safe_smtp_host", return_value=True):
+    with app.app_context(), patch(
+        "hushline.email.resolve_safe_smtp_host", return_value=_SMTP_ADDRESSES
+    ):
         app.config["SMTP_SEND_ATTEMPTS"] = 0
         assert email_mod.send_email("to@example.com", "subject", "body", cfg) is False
 
@@ -245,7 +253,9 @@ def test_send_email_sets_reply_to_header(app: Flask) -> None:
     smtp_server.send_message.return_value = {}
     cfg = _DummyConfig(smtp_server=smtp_server)
 
-    with app.app_context(), patch("hushline.email.is_safe_smtp_host", return_value=True):
+    with app.app_context(), patch(
+        "hushline.email.resolve_safe_smtp_host", return_value=_SMTP_ADDRESSES
+    ):
         app.config["SMTP_SEND_ATTEMPTS"] = 1
         assert (
             email_mod.send_email(
@@ -268,7 +278,9 @@ def test_send_email_uses_single_part_plain_text_body() -> None:
     cfg = _DummyConfig(smtp_server=smtp_server)
     app = Flask(__name__)
 
-    with app.app_context(), patch("hushline.email.is_safe_smtp_host", return_value=True):
+    with app.app_context(), patch(
+        "hushline.email.resolve_safe_smtp_host", return_value=_SMTP_ADDRESSES
+    ):
         app.config["SMTP_SEND_ATTEMPTS"] = 1
         assert email_mod.send_email("to@example.com", "subject", "body", cfg) is True
 
@@ -289,7 +301,9 @@ def test_send_email_keeps_inline_pgp_body_as_top_level_text() -> None:
         "-----END PGP MESSAGE-----"
     )
 
-    with app.app_context(), patch("hushline.email.is_safe_smtp_host", return_value=True):
+    with app.app_context(), patch(
+        "hushline.email.resolve_safe_smtp_host", return_value=_SMTP_ADDRESSES
+    ):
         app.config["SMTP_SEND_ATTEMPTS"] = 1
         assert email_mod.send_email("to@example.com", "subject", armored_body, cfg) is True
 
@@ -298,3 +312,252 @@ def test_send_email_keeps_inline_pgp_body_as_top_level_text() -> None:
     assert sent_message.is_multipart() is False
     assert sent_message["Content-Transfer-Encoding"] == "7bit"
     assert sent_message.get_payload() == armored_body
+
+
+class _CountingLoginConfig(_DummyConfig):
+    def __init__(self, *, password: str | None = None) -> None:
+        super().__init__(smtp_server=MagicMock())
+        if password is not None:
+            self.password = password
+        self.servers: list[MagicMock] = []
+
+    @contextmanager
+    def smtp_login(self, timeout: int = 10) -> Generator[smtplib.SMTP, None, None]:
+        _ = timeout
+        server = MagicMock()
+        server.noop.return_value = (250, b"OK")
+        server.send_message.return_value = {}
+        self.servers.append(server)
+        try:
+            yield cast(smtplib.SMTP, server)
+        finally:
+            server.quit()
+
+
+def _send(cfg: email_mod.SMTPConfig) -> bool:
+    return email_mod.send_email("to@example.com", "subject", "body", cfg)
+
+
+def test_send_email_reuses_pooled_connection(app: Flask) -> None:
+    cfg = _CountingLoginConfig()
+
+    with app.app_context(), patch(
+        "hushline.email.resolve_safe_smtp_host", return_value=_SMTP_ADDRESSES
+    ):
+        assert _send(cfg) is True
+        assert _send(cfg) is True
+
+    assert len(cfg.servers) == 1
+    server = cfg.servers[0]
+    assert server.send_message.call_count == 2
+    server.noop.assert_called_once_with()
+    server.quit.assert_not_called()
+
+
+def test_send_email_pool_replaces_connection_failing_noop(app: Flask) -> None:
+    cfg = _CountingLoginConfig()
+
+    with app.app_context(), patch(
+        "hushline.email.resolve_safe_smtp_host", return_value=_SMTP_ADDRESSES
+    ):
+        assert _send(cfg) is True
+        cfg.servers[0].noop.side_effect = smtplib.SMTPServerDisconnected("idle timeout")
+        assert _send(cfg) is True
+
+    assert len(cfg.servers) == 2
+    cfg.servers[0].quit.assert_called_once_with()
+    cfg.servers[0].send_message.assert_called_once()
+    cfg.servers[1].send_message.assert_called_once()
+
+
+def test_send_email_pool_expires_idle_connections(app: Flask) -> None:
+    cfg = _CountingLoginConfig()
+    app.config["SMTP_POOL_IDLE_SECONDS"] = 30
+
+    with (
+        app.app_context(),
+        patch("hushline.email.resolve_safe_smtp_host", return_value=_SMTP_ADDRESSES),
+        patch("hushline.email.time.monotonic", side_effect=[100.0, 100.0, 200.0, 200.0]),
+    ):
+        assert _send(cfg) is True
+        assert _send(cfg) is True
+
+    assert len(cfg.servers) == 2
+    cfg.servers[0].noop.assert_not_called()
+    cfg.servers[0].quit.assert_called_once_with()
+
+
+def test_send_email_pool_retires_connection_after_max_messages(app: Flask) -> None:
+    cfg = _CountingLoginConfig()
+    app.config["SMTP_POOL_MAX_MESSAGES"] = 2
+
+    with app.app_context(), patch(
+        "hushline.email.resolve_safe_smtp_host", return_value=_SMTP_ADDRESSES
+    ):
+        for _ in range(3):
+            assert _send(cfg) is True
+
+    assert [server.send_message.call_count for server in cfg.servers] == [2, 1]
+    cfg.servers[0].quit.assert_called_once_with()
+
+
+def test_send_email_pool_does_not_share_connections_across_credentials(app: Flask) -> None:
+    cfg = _CountingLoginConfig(password="right-pass")  # noqa: S106
+    other_cfg = _CountingLoginConfig(password="wrong-pass")  # noqa: S106
+
+    with app.app_context(), patch(
+        "hushline.email.resolve_safe_smtp_host", return_value=_SMTP_ADDRESSES
+    ):
+        assert _send(cfg) is True
+        assert _send(other_cfg) is True
+
+    assert len(cfg.servers) == 1
+    assert len(other_cfg.servers) == 1
+
+
+def test_send_email_pool_discards_connection_after_failed_submission(app: Flask) -> None:
+    cfg = _CountingLoginConfig()
+
+    with (
+        app.app_context(),
+        patch("hushline.email.resolve_safe_smtp_host", return_value=_SMTP_ADDRESSES),
+        patch("hushline.email.time.sleep") as sleep_mock,
+    ):
+        app.config["SMTP_SEND_ATTEMPTS"] = 3
+        assert _send(cfg) is True
+        cfg.servers[0].send_message.side_effect = smtplib.SMTPServerDisconnected("after DATA")
+        assert _send(cfg) is False
+        assert _send(cfg) is True
+
+    sleep_mock.assert_not_called()
+    assert len(cfg.servers) == 2
+    assert cfg.servers[0].send_message.call_count == 2
+    cfg.servers[0].quit.assert_called_once_with()
+
+
+def _resolution_counters(logger_info: MagicMock) -> list[str]:
+    return [
+        call.kwargs["extra"]["counter_name"]
+        for call in logger_info.call_args_list
+        if call.kwargs.get("extra", {}).get("event") == email_mod.SMTP_HOST_RESOLUTION_COUNTER_EVENT
+    ]
+
+
+def test_resolve_safe_smtp_host_caches_validated_addresses(app: Flask) -> None:
+    addrinfo = [
+        (0, 0, 0, "", ("8.8.8.8", 0)),
+        (0, 0, 0, "", ("8.8.8.8", 0)),
+        (0, 0, 0, "", ("2001:4860:4860::8888", 0, 0, 0)),
+    ]
+
+    with (
+        app.app_context(),
+        patch("hushline.email.socket.getaddrinfo", return_value=addrinfo) as getaddrinfo,
+        patch.object(app.logger, "info") as logger_info,
+    ):
+        assert email_mod.resolve_safe_smtp_host("SMTP.example.com") == (
+            "8.8.8.8",
+            "2001:4860:4860::8888",
+        )
+        assert email_mod.resolve_safe_smtp_host("smtp.example.com") == (
+            "8.8.8.8",
+            "2001:4860:4860::8888",
+        )
+
+    getaddrinfo.assert_called_once()
+    assert _resolution_counters(logger_info) == [
+        email_mod.SMTP_HOST_RESOLUTION_CACHE_MISS_COUNTER,
+        email_mod.SMTP_HOST_RESOLUTION_CACHE_HIT_COUNTER,
+    ]
+
+
+def test_resolve_safe_smtp_host_cache_expires(app: Flask) -> None:
+    app.config["SMTP_HOST_CACHE_TTL_SECONDS"] = 60
+    now = [100.0]
+
+    with (
+        app.app_context(),
+        patch(
+            "hushline.email.socket.getaddrinfo",
+            return_value=[(0, 0, 0, "", ("8.8.8.8", 0))],
+        ) as getaddrinfo,
+        patch("hushline.email.time.monotonic", side_effect=lambda: now[0]),
+    ):
+        for seconds in (100.0, 159.0, 161.0):
+            now[0] = seconds
+            assert email_mod.resolve_safe_smtp_host("smtp.example.com") == ("8.8.8.8",)
+
+    assert getaddrinfo.call_count == 2
+
+
+def test_resolve_safe_smtp_host_does_not_cache_unsafe_hosts(app: Flask) -> None:
+    with (
+        app.app_context(),
+        patch(
+            "hushline.email.socket.getaddrinfo",
+            side_effect=[
+                [(0, 0, 0, "", ("10.0.0.5", 0))],
+                [(0, 0, 0, "", ("8.8.8.8", 0))],
+            ],
+        ),
+    ):
+        assert email_mod.resolve_safe_smtp_host("smtp.example.com") is None
+        assert email_mod.resolve_safe_smtp_host("smtp.example.com") == ("8.8.8.8",)
+
+
+def test_send_email_pins_connection_to_validated_addresses(app: Flask) -> None:
+    cfg = email_mod.create_smtp_config(
+        "u",
+        "smtp.example.com",
+        587,
+        "p",
+        "sender@example.com",
+        encryption=SMTPEncryption.StartTLS,
+    )
+    server = MagicMock()
+    server.send_message.return_value = {}
+    smtp_context = MagicMock()
+    smtp_context.__enter__.return_value = server
+    smtp_context.__exit__.return_value = None
+
+    with (
+        app.app_context(),
+        patch("hushline.email.resolve_safe_smtp_host", return_value=_SMTP_ADDRESSES),
+        patch("hushline.email._PinnedSMTP", return_value=smtp_context) as pinned_smtp,
+        patch("hushline.email.smtplib.SMTP") as smtp,
+    ):
+        assert email_mod.send_email("to@example.com", "subject", "body", cfg) is True
+
+    pinned_smtp.assert_called_once_with(
+        "smtp.example.com", 587, timeout=10, addresses=_SMTP_ADDRESSES
+    )
+    smtp.assert_not_called()
+
+
+def test_pinned_smtp_connects_only_to_validated_addresses() -> None:
+    client = email_mod._PinnedSMTP("", 0, timeout=5, addresses=("203.0.113.10", "203.0.113.11"))
+    sock = MagicMock()
+
+    with patch(
+        "hushline.email.socket.create_connection",
+        side_effect=[OSError("unreachable"), sock],
+    ) as create_connection:
+        assert client._get_socket("smtp.example.com", 587, 5) is sock
+
+    assert [call.args[0] for call in create_connection.call_args_list] == [
+        ("203.0.113.10", 587),
+        ("203.0.113.11", 587),
+    ]
+
+
+def test_pinned_smtp_ssl_verifies_certificate_for_hostname() -> None:
+    client = email_mod._PinnedSMTP_SSL("", 0, timeout=5, addresses=_SMTP_ADDRESSES)
+    client._host = "smtp.example.com"  # type: ignore[attr-defined]
+    client.context = MagicMock()
+    sock = MagicMock()
+
+    with patch("hushline.email.socket.create_connection", return_value=sock) as create_connection:
+        client._get_socket("smtp.example.com", 465, 5)
+
+    create_connection.assert_called_once_with(("203.0.113.10", 465), 5, None)
+    client.context.wrap_socket.assert_called_once_with(sock, server_hostname="smtp.example.com")
@@ -1,5 +1,6 @@
 import io
 import json
+import threading
 import zipfile
 from datetime import UTC, datetime
 
@@ -65,6 +66,25 @@ class _RaisingResolver:
         raise self._exc
 
 
+class _BarrierResolver:
+    """Answers only once `parties` lookups are in flight at the same time."""
+
+    def __init__(self, parties: int) -> None:
+        self._barrier = threading.Barrier(parties, timeout=5)
+        self.timeout = 0.0
+        self.lifetime = 0.0
+
+    def resolve(self, qname: str, rdtype: str) -> list[_FakeTXTRecord]:
+        self._barrier.wait()
+        return [_FakeTXTRecord("v=DKIM1; k=rsa; p=MIIB12345")]
+
+
+@pytest.fixture(autouse=True)
+def _clear_email_header_caches() -> None:
+    email_headers._dkim_key_cache.clear()
+    email_headers._report_cache.clear()
+
+
 def test_analyze_raw_email_headers_extracts_auth_results_and_dkim_key(
     mocker: MockFixture,
 ) -> None:
@@ -309,6 +329,77 @@ def test_analyze_raw_email_headers_caps_unique_dkim_key_lookups(
     )
 
 
+def test_analyze_raw_email_headers_looks_up_dkim_keys_concurrently(
+    mocker: MockFixture,
+) -> None:
+    mocker.patch("hushline.email_headers.dns.resolver.Resolver", return_value=_BarrierResolver(3))
+    raw_headers = "From: Alerts <alerts@example.org>\n" + "".join(
+        "DKIM-Signature: v=1; a=rsa-sha256; d=example.org; " f"s=selector{index}; bh=abc=; b=def=\n"
+        for index in range(3)
+    )
+
+    report = analyze_raw_email_headers(raw_headers)
+
+    assert [lookup["selector"] for lookup in report["dkim_key_lookups"]] == [
+        "selector0",
+        "selector1",
+        "selector2",
+    ]
+    assert all(lookup["status"] == "found" for lookup in report["dkim_key_lookups"])
+
+
+def test_analyze_raw_email_headers_reuses_cached_dkim_keys(mocker: MockFixture) -> None:
+    resolver = _CountingResolver()
+    resolver_factory = mocker.patch(
+        "hushline.email_headers.dns.resolver.Resolver", return_value=resolver
+    )
+    raw_headers = (
+        "From: Alerts <alerts@example.org>\n"
+        "DKIM-Signature: v=1; a=rsa-sha256; d=example.org; s=selector1; bh=abc=; b=def=\n"
+    )
+
+    analyze_raw_email_headers(raw_headers)
+    report = analyze_raw_email_headers(raw_headers.replace("selector1", "SELECTOR1"))
+
+    resolver_factory.assert_called_once_with()
+    assert resolver.queries == [("selector1._domainkey.example.org", "TXT")]
+    assert report["dkim_key_lookups"][0]["query_name"] == "SELECTOR1._domainkey.example.org"
+    assert report["dkim_key_lookups"][0]["has_public_key"] is True
+
+
+def test_analyze_raw_email_headers_does_not_cache_failed_dkim_lookups(
+    mocker: MockFixture,
+) -> None:
+    resolver_factory = mocker.patch(
+        "hushline.email_headers.dns.resolver.Resolver",
+        return_value=_RaisingResolver(dns.exception.Timeout()),
+    )
+    raw_headers = (
+        "From: Alerts <alerts@example.org>\n"
+        "DKIM-Signature: v=1; a=rsa-sha256; d=example.org; s=selector1; bh=abc=; b=def=\n"
+    )
+
+    analyze_raw_email_headers(raw_headers)
+    analyze_raw_email_headers(raw_headers)
+
+    assert resolver_factory.call_count == 2
+
+
+def test_create_evidence_zip_reuses_the_shown_report(mocker: MockFixture) -> None:
+    mocker.patch("hushline.email_headers.dns.resolver.Resolver", return_value=_FakeResolver())
+    raw_headers = (
+        "From: Alerts <alerts@example.org>\n"
+        "DKIM-Signature: v=1; a=rsa-sha256; d=example.org; s=selector1; bh=abc=; b=def=\n"
+    )
+    shown = analyze_raw_email_headers(raw_headers)
+    analyze = mocker.patch.object(email_headers, "_analyze_raw_email_headers")
+
+    archive = zipfile.ZipFile(io.BytesIO(create_evidence_zip(raw_headers)))
+
+    analyze.assert_not_called()
+    assert json.loads(archive.read("report.json")) == json.loads(json.dumps(shown))
+
+
 def test_analyze_raw_email_headers_warns_on_unparseable_from_and_incomplete_dkim() -> None:
     raw_headers = (
         "From: not-an-address\n"
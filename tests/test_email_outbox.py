@@ -0,0 +1,223 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from flask import Flask, url_for
+from flask.testing import FlaskClient
+from helpers import get_profile_submission_data
+from sqlalchemy import text
+
+from hushline.cli_notifications import deliver_email_outbox, email_outbox_retry_delay
+from hushline.db import db
+from hushline.model import EmailOutbox, NotificationRecipient, User
+from hushline.routes import common as routes_common
+
+
+@pytest.fixture()
+def _default_smtp(app: Flask) -> None:
+    app.config["SMTP_USERNAME"] = "default-user"
+    app.config["SMTP_SERVER"] = "smtp.default.example"
+    app.config["SMTP_PORT"] = 587
+    app.config["SMTP_PASSWORD"] = "default-pass"
+    app.config["NOTIFICATIONS_ADDRESS"] = "notify@example.com"
+    app.config["NOTIFICATIONS_REPLY_TO"] = "reply@example.com"
+    app.config["SMTP_ENCRYPTION"] = "StartTLS"
+
+
+def _queue_email(user: User, **kwargs: object) -> EmailOutbox:
+    row = EmailOutbox(
+        user_id=user.id,
+        to_email="primary@example.com",
+        subject="New Hush Line Message Received",
+        body="-----BEGIN PGP MESSAGE-----",
+        **kwargs,
+    )
+    db.session.add(row)
+    db.session.commit()
+    return row
+
+
+@pytest.mark.usefixtures("_default_smtp")
+def test_send_email_to_user_recipients_queues_outbox_rows(
+    app: Flask, user: User, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    app.config["EMAIL_OUTBOX_ENABLED"] = True
+    user.enable_email_notifications = True
+    user.email = "primary@example.com"
+    user.smtp_server = None
+    user.notification_recipients.append(NotificationRecipient(position=1, enabled=True))
+    user.notification_recipients[-1].email = "PRIMARY@example.com"
+    user.notification_recipients.append(NotificationRecipient(position=2, enabled=True))
+    user.notification_recipients[-1].email = "secondary@example.com"
+    db.session.commit()
+    send_email = MagicMock()
+    monkeypatch.setattr("hushline.routes.common.send_email", send_email)
+
+    routes_common.send_email_to_user_recipients(
+        user, "Subject", lambda recipient: f"body for {recipient.email}"
+    )
+    db.session.commit()
+
+    send_email.assert_not_called()
+    db.session.expire_all()
+    rows = db.session.scalars(db.select(EmailOutbox).order_by(EmailOutbox.id)).all()
+    assert [(row.to_email, row.body, row.status) for row in rows] == [
+        ("primary@example.com", "body for primary@example.com", EmailOutbox.STATUS_PENDING),
+        ("secondary@example.com", "body for secondary@example.com", EmailOutbox.STATUS_PENDING),
+    ]
+    assert {row.reply_to for row in rows} == {"reply@example.com"}
+
+
+def test_email_outbox_body_is_encrypted_at_rest(user: User) -> None:
+    row = EmailOutbox(
+        user_id=user.id,
+        to_email="primary@example.com",
+        subject="New Hush Line Message Received",
+        body="Contact method\n\nI prefer Signal.",
+    )
+    db.session.add(row)
+    db.session.commit()
+
+    stored = db.session.scalar(text("SELECT body FROM email_outbox WHERE id = :id"), {"id": row.id})
+    assert "Signal" not in stored
+    db.session.expire_all()
+    assert row.body == "Contact method\n\nI prefer Signal."
+
+
+@pytest.mark.usefixtures("_default_smtp", "_pgp_user")
+def test_submission_notification_is_queued_with_the_message(
+    app: Flask, client: FlaskClient, user: User, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    app.config["EMAIL_OUTBOX_ENABLED"] = True
+    user.enable_email_notifications = True
+    user.email_include_message_content = False
+    user.email = "primary@example.com"
+    user.smtp_server = None
+    db.session.commit()
+    send_email = MagicMock()
+    monkeypatch.setattr("hushline.routes.common.send_email", send_email)
+    username = user.primary_username.username
+
+    response = client.post(
+        url_for("profile", username=username),
+        data={
+            "field_0": "I prefer Signal.",
+            "field_1": "This is a secret test message.",
+            **get_profile_submission_data(client, username),
+        },
+    )
+
+    assert response.status_code == 302, response.text
+    send_email.assert_not_called()
+    message_xmin = db.session.scalar(text("SELECT xmin::text FROM messages"))
+    outbox_xmin = db.session.scalar(text("SELECT xmin::text FROM email_outbox"))
+    assert outbox_xmin == message_xmin
+
+
+def test_send_email_to_user_recipients_skips_outbox_without_smtp(app: Flask, user: User) -> None:
+    app.config["EMAIL_OUTBOX_ENABLED"] = True
+    app.config["SMTP_SERVER"] = None
+    user.enable_email_notifications = True
+    user.email = "primary@example.com"
+    user.smtp_server = None
+    db.session.commit()
+
+    routes_common.send_email_to_user_recipients(user, "Subject", "body")
+
+    assert db.session.scalar(db.select(db.func.count(EmailOutbox.id))) == 0
+
+
+@pytest.mark.usefixtures("_default_smtp")
+def test_notifications_worker_sends_and_clears_body(
+    app: Flask, user: User, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    row = _queue_email(user, reply_to="reply@example.com")
+    send_email = MagicMock(return_value=True)
+    monkeypatch.setattr("hushline.cli_notifications.send_email", send_email)
+
+    result = app.test_cli_runner().invoke(args=["notifications", "worker", "--once"])
+
+    assert result.exit_code == 0, result.output
+    send_email.assert_called_once()
+    assert send_email.call_args.args[:3] == (
+        "primary@example.com",
+        "New Hush Line Message Received",
+        "-----BEGIN PGP MESSAGE-----",
+    )
+    assert send_email.call_args.args[4] == "reply@example.com"
+    assert send_email.call_args.kwargs == {"attempts": 1}
+    db.session.refresh(row)
+    assert row.status == EmailOutbox.STATUS_SENT
+    assert row.attempts == 1
+    assert row.sent_at is not None
+    assert row.body is None
+
+
+@pytest.mark.usefixtures("_default_smtp")
+def test_notifications_worker_backs_off_then_gives_up(
+    app: Flask, user: User, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    app.config["EMAIL_OUTBOX_MAX_ATTEMPTS"] = 2
+    row = _queue_email(user)
+    send_email = MagicMock(return_value=False)
+    monkeypatch.setattr("hushline.cli_notifications.send_email", send_email)
+
+    assert deliver_email_outbox(10) == 1
+    db.session.refresh(row)
+    assert row.status == EmailOutbox.STATUS_PENDING
+    assert row.attempts == 1
+    assert row.last_error == "SMTP delivery failed"
+    assert row.next_attempt_at > datetime.now(UTC) + timedelta(seconds=20)
+    assert row.body is not None
+
+    # not due yet, so nothing is claimed
+    assert deliver_email_outbox(10) == 0
+
+    row.next_attempt_at = datetime.now(UTC) - timedelta(seconds=1)
+    db.session.commit()
+    assert deliver_email_outbox(10) == 1
+    db.session.refresh(row)
+    assert row.status == EmailOutbox.STATUS_FAILED
+    assert row.attempts == 2
+    assert row.body is None
+    assert send_email.call_count == 2
+
+
+def test_notifications_worker_fails_rows_without_smtp(app: Flask, user: User) -> None:
+    app.config["SMTP_SERVER"] = None
+    user.smtp_server = None
+    db.session.commit()
+    row = _queue_email(user)
+
+    assert deliver_email_outbox(10) == 1
+
+    db.session.refresh(row)
+    assert row.status == EmailOutbox.STATUS_FAILED
+    assert row.last_error == "SMTP is not configured"
+
+
+def test_email_outbox_claim_skips_rows_locked_by_another_worker(user: User) -> None:
+    locked = _queue_email(user)
+    available = _queue_email(user)
+
+    with db.engine.connect() as other_worker:
+        other_worker.execute(
+            text("SELECT id FROM email_outbox WHERE id = :id FOR UPDATE"), {"id": locked.id}
+        )
+        claimed = EmailOutbox.claim_next()
+        assert claimed is not None
+        assert claimed.id == available.id
+        db.session.rollback()
+        other_worker.rollback()
+
+
+def test_email_outbox_retry_delay_is_exponential_and_capped(app: Flask) -> None:
+    app.config["EMAIL_OUTBOX_RETRY_BASE_SECONDS"] = 10
+    app.config["EMAIL_OUTBOX_RETRY_MAX_SECONDS"] = 60
+
+    assert [email_outbox_retry_delay(attempts).total_seconds() for attempts in (1, 2, 3, 4)] == [
+        10,
+        20,
+        40,
+        60,
+    ]
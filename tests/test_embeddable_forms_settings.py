@@ -1,5 +1,4 @@
 import json
-from datetime import datetime
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -12,12 +11,12 @@ from werkzeug.test import TestResponse
 from hushline.db import db
 from hushline.embeds import check_embed_rate_limit
 from hushline.model import (
-    EmbedRateLimitAttempt,
     FieldDefinition,
     FieldType,
     Message,
     NotificationRecipient,
     OrganizationSetting,
+    RateLimitBucket,
     StripeSubscriptionStatusEnum,
     User,
     Username,
@@ -615,17 +614,13 @@ def test_embed_profile_rate_limit_does_not_record_limited_attempts(app: Flask, u
 
     assert first_result.limited is False
     assert limited_result.limited is True
-    attempts = db.session.scalars(db.select(EmbedRateLimitAttempt)).all()
-    assert len(attempts) == 3
-    assert ("profile", first_result.profile_hash) in {
-        (attempt.scope, attempt.bucket_hash) for attempt in attempts
-    }
-    assert ("source", first_result.source_bucket_hash) in {
-        (attempt.scope, attempt.bucket_hash) for attempt in attempts
-    }
-    assert ("source", limited_result.source_bucket_hash) not in {
-        (attempt.scope, attempt.bucket_hash) for attempt in attempts
-    }
+    bucket_tats = dict(
+        db.session.execute(db.select(RateLimitBucket.key, RateLimitBucket.tat)).tuples().all()
+    )
+    assert bucket_tats[f"embed:profile:{first_result.profile_hash}"] == 1600.0
+    assert bucket_tats[f"embed:source:{first_result.source_bucket_hash}"] == 1030.0
+    # the limited submission left the second source's bucket empty
+    assert bucket_tats.get(f"embed:source:{limited_result.source_bucket_hash}", 0) <= 1001.0
 
 
 def test_embed_profile_rate_limit_persists_outside_flask_extension_state(
@@ -681,38 +676,22 @@ def test_embed_profile_rate_limit_handles_unknown_source_and_deployment_scope(
     assert limited_result.source_bucket_hash == first_result.source_bucket_hash
 
 
-def test_embed_profile_rate_limit_evicts_stale_global_state(app: Flask, user: User) -> None:
+def test_embed_profile_rate_limit_allows_again_after_window(app: Flask, user: User) -> None:
     app.config["EMBED_RATE_LIMIT_WINDOW_SECONDS"] = 10
-    app.config["EMBED_RATE_LIMIT_PROFILE_MAX"] = 20
+    app.config["EMBED_RATE_LIMIT_PROFILE_MAX"] = 2
     app.config["EMBED_RATE_LIMIT_SOURCE_MAX"] = 20
     app.config["EMBED_RATE_LIMIT_DEPLOYMENT_MAX"] = 20
-    db.session.add(
-        EmbedRateLimitAttempt(
-            scope="profile",
-            bucket_hash="stale",
-            created_at=datetime.fromtimestamp(980.0),
-        )
-    )
-    db.session.add(
-        EmbedRateLimitAttempt(
-            scope="source",
-            bucket_hash="active",
-            created_at=datetime.fromtimestamp(995.0),
-        )
-    )
-    db.session.commit()
 
-    with (
-        app.test_request_context(environ_base={"REMOTE_ADDR": "203.0.113.10"}),
-        patch("hushline.embeds.time.time", return_value=1000.0),
-    ):
-        check_embed_rate_limit(user.primary_username)
+    results = []
+    for now in (1000.0, 1001.0, 1002.0, 1006.0, 1007.0):
+        with (
+            app.test_request_context(environ_base={"REMOTE_ADDR": "203.0.113.10"}),
+            patch("hushline.embeds.time.time", return_value=now),
+        ):
+            results.append(check_embed_rate_limit(user.primary_username).limited)
 
-    attempts = db.session.scalars(db.select(EmbedRateLimitAttempt)).all()
-    assert ("profile", "stale") not in {
-        (attempt.scope, attempt.bucket_hash) for attempt in attempts
-    }
-    assert ("source", "active") in {(attempt.scope, attempt.bucket_hash) for attempt in attempts}
+    # two submissions per 10 seconds refill one every 5 seconds
+    assert results == [False, False, True, False, True]
 
 
 def test_embed_profile_submission_requires_embed_form_token(
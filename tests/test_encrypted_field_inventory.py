@@ -29,6 +29,7 @@ from hushline.crypto import (
 )
 from hushline.db import db
 from hushline.model import (
+    EmailOutbox,
     FieldDefinition,
     FieldType,
     FieldValue,
@@ -48,6 +49,8 @@ LONG_PGP_BLOCK = (
     "-----BEGIN PGP PUBLIC KEY BLOCK-----\n\n" f"{'a' * 512}\n" "-----END PGP PUBLIC KEY BLOCK-----"
 )
 LONG_PGP_CIPHERTEXT = "-----BEGIN PGP MESSAGE-----\n\n" f"{'b' * 512}\n" "-----END PGP MESSAGE-----"
+EMAIL_OUTBOX_BODY = "You have a new Hush Line message."
+LONG_EMAIL_OUTBOX_BODY = LONG_PGP_CIPHERTEXT * 8
 TEST_AES_GCM_WRITE_APPROVAL = "test maintainer approval for AES-GCM encrypted-field writes"
 
 
@@ -103,6 +106,7 @@ ENCRYPTED_FIELD_INVENTORY = (
         "pgp_key",
     ),
     EncryptedField("FieldValue", FieldValue, "field_values", "_value", "_value", "value"),
+    EncryptedField("EmailOutbox", EmailOutbox, "email_outbox", "body", "_body", "body"),
 )
 
 USER_LEGACY_VALUES = {
@@ -215,6 +219,9 @@ def _object_for_field(field: EncryptedField, user: User) -> Any:
         return NotificationRecipient(user_id=user.id)
     if field.model is FieldValue:
         return _make_encrypted_field_value(user)
+    if field.model is EmailOutbox:
+        assert user.id is not None
+        return EmailOutbox(user_id=user.id, to_email="outbox@example.com", subject="Outbox")
     raise AssertionError(f"Unhandled encrypted field inventory entry: {field.id}")
 
 
@@ -225,6 +232,8 @@ def _plaintext_for_field(field: EncryptedField) -> str:
         return NOTIFICATION_RECIPIENT_LEGACY_VALUES[field.property_name]
     if field.model is FieldValue:
         return PGP_CIPHERTEXT
+    if field.model is EmailOutbox:
+        return EMAIL_OUTBOX_BODY
     raise AssertionError(f"Unhandled encrypted field inventory entry: {field.id}")
 
 
@@ -235,6 +244,8 @@ def _long_plaintext_for_field(field: EncryptedField) -> str:
         return NOTIFICATION_RECIPIENT_LONG_VALUES[field.property_name]
     if field.model is FieldValue:
         return LONG_PGP_CIPHERTEXT
+    if field.model is EmailOutbox:
+        return LONG_EMAIL_OUTBOX_BODY
     raise AssertionError(f"Unhandled encrypted field inventory entry: {field.id}")
 
 
@@ -258,6 +269,8 @@ def _aead_aad_values(field: EncryptedField, obj: Any) -> dict[str, int]:
             "field_value_id": obj.id,
             "message_id": obj.message_id,
         }
+    if field.model is EmailOutbox:
+        return {"email_outbox_id": obj.id, "user_id": obj.user_id}
     raise AssertionError(f"Unhandled encrypted field inventory entry: {field.id}")
 
 
@@ -508,7 +508,8 @@ def test_conversation_polling_does_not_mark_messages_read() -> None:
     static_js = (ROOT / "hushline/static/js/chat-key-lifecycle.js").read_text(encoding="utf-8")
 
     for bundle in (js, static_js):
-        assert '"X-Hushline-Conversation-Refresh": "true"' in bundle
+        assert "fetch(window.location.href" not in bundle
+        assert "root.dataset.messagesUrl" in bundle
     assert "encryptedCopies[String(participantKey.participant_id)]" in js
     assert "encryptedCopies[String(participantKey.participant_id)]" in static_js
     assert "body: JSON.stringify(plaintext" not in js
@@ -521,39 +522,44 @@ def test_conversation_replies_and_polling_update_thread_in_place() -> None:
     js = (ROOT / "assets/js/chat-key-lifecycle.js").read_text(encoding="utf-8")
     static_js = (ROOT / "hushline/static/js/chat-key-lifecycle.js").read_text(encoding="utf-8")
 
-    assert "refreshConversationMessages({ force: true, scroll: true })" in js
-    assert 'cache: "no-store"' in js
-    assert "await refreshConversationMessages({ force: true });" in js
-    assert "bindConversationPolling(root);" in js
-    assert "window.setInterval(refreshIfVisible, intervalMs);" in js
-    assert "thread.replaceChildren(" in js
-    assert "await decryptConversationMessages(nextDocument);" in js
-    assert "const previousScrollTop = thread.scrollTop;" in js
-    assert "thread.scrollTop = shouldScroll ? thread.scrollHeight : previousScrollTop;" in js
-    assert js.index("await decryptConversationMessages(nextDocument);") < js.index(
-        "thread.replaceChildren("
-    )
-    assert 'scrollConversationThreadToLatest("smooth")' not in js
-    assert "currentCopies.textContent = nextCopies.textContent;" in js
-    assert "conversationMessagesSignature(nextDocument)" in js
-    assert 'getElementById("conversationMessageCopies")?.textContent' in js
-    assert "window.location.reload()" not in js
-    assert "thread.scrollTo({" in js
-    assert "top: thread.scrollHeight" in js
-
-    assert "refreshConversationMessages({ force: true, scroll: true })" in static_js
-    assert 'cache: "no-store"' in static_js
-    assert "await refreshConversationMessages({ force: true });" in static_js
-    assert "bindConversationPolling(root);" in static_js
-    assert "window.setInterval(refreshIfVisible, intervalMs);" in static_js
-    assert "thread.replaceChildren(" in static_js
-    assert "await decryptConversationMessages(nextDocument);" in static_js
-    assert "previousScrollTop" in static_js
-    assert 'scrollConversationThreadToLatest("smooth")' not in static_js
-    assert 'getElementById("conversationMessageCopies")?.textContent' in static_js
-    assert "window.location.reload()" not in static_js
-    assert "thread.scrollTo({" in static_js
-    assert "scrollHeight" in static_js
+    for bundle in (js, static_js):
+        assert "refreshConversationMessages({ scroll: true })" in bundle
+        assert 'cache: "no-store"' in bundle
+        assert "await refreshConversationMessages();" in bundle
+        assert "bindConversationPolling(root);" in bundle
+        assert "let after = messageIds[messageIds.length - 1] || 0;" in bundle
+        assert "before: messageIds[0]" in bundle
+        assert "await decryptConversationMessages(fragment, copies);" in bundle
+        assert "thread.append(fragment);" in bundle
+        assert "button.after(fragment);" in bundle
+        assert "const previousScrollTop = thread.scrollTop;" in bundle
+        assert (
+            "thread.scrollTop = shouldScroll ? thread.scrollHeight : previousScrollTop;" in bundle
+        )
+        assert bundle.index("await decryptConversationMessages(fragment, copies);") < bundle.index(
+            "thread.append(fragment);"
+        )
+        assert "storeConversationMessageCopies(copies);" in bundle
+        assert 'jsonFromScript("conversationMessageCopies", [])' in bundle
+        assert 'scrollConversationThreadToLatest("smooth")' not in bundle
+        assert "window.location.reload()" not in bundle
+        assert "thread.scrollTo({" in bundle
+        assert "top: thread.scrollHeight" in bundle
+
+
+def test_conversation_refreshes_are_serialized_and_skip_rendered_messages() -> None:
+    js = (ROOT / "assets/js/chat-key-lifecycle.js").read_text(encoding="utf-8")
+    static_js = (ROOT / "hushline/static/js/chat-key-lifecycle.js").read_text(encoding="utf-8")
+
+    for bundle in (js, static_js):
+        # polling, live updates, sending and unlocking all share one queue
+        assert "isRefreshing" not in bundle
+        assert "conversationRefreshQueued = conversationRefreshTail" in bundle
+        assert "conversationRefreshTail = conversationRefreshQueued;" in bundle
+        assert bundle.count("appendNewConversationMessages(") == 2
+        assert "const renderedIds = new Set(conversationMessageIds());" in bundle
+        assert "!renderedIds.has(String(message.message_id))" in bundle
+        assert "after = page.messages[page.messages.length - 1].message_id;" in bundle
 
 
 def test_conversation_composer_enter_sends_shift_enter_keeps_newline() -> None:
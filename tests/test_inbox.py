@@ -1,9 +1,13 @@
+import base64
+import html
 import json
-from datetime import datetime, timezone
+import re
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from urllib.parse import urlsplit
 
 import pytest
-from flask import url_for
+from flask import Flask, url_for
 from flask.testing import FlaskClient
 from helpers import get_profile_submission_data
 
@@ -13,13 +17,15 @@ from hushline.db import db
 from hushline.model import (
     ChatKey,
     Conversation,
+    ConversationParticipant,
     FieldValue,
     Message,
     MessageStatus,
     User,
     Username,
 )
-from hushline.routes.inbox import _conversation_latest_message, _inbox_conversation_summary
+from hushline.routes.inbox import InboxCursor, _inbox_conversation_summaries
+from hushline.routes.message import _conversation_latest_message
 
 MSG_CONTACT_METHOD = "I prefer Signal."
 MSG_CONTENT = "This is a test message."
@@ -119,12 +125,12 @@ def test_conversation_latest_message_returns_none_for_empty_thread() -> None:
     assert _conversation_latest_message(Conversation()) is None
 
 
-def test_inbox_conversation_summary_returns_none_for_non_participant(user: User) -> None:
+def test_inbox_conversation_summaries_skip_non_participant(user: User) -> None:
     conversation = Conversation()
     db.session.add(conversation)
     db.session.commit()
 
-    assert _inbox_conversation_summary(conversation, user) is None
+    assert _inbox_conversation_summaries(user, [conversation.id]) == {}
 
 
 @pytest.mark.usefixtures("_authenticated_user")
@@ -195,6 +201,160 @@ def test_cannot_delete_other_user_message(
     )  # Ensure message was not deleted
 
 
+def _add_tip(username: Username, *, status: MessageStatus = MessageStatus.PENDING) -> Message:
+    message = Message(username_id=username.id)
+    message.status = status
+    db.session.add(message)
+    db.session.flush()
+    for field_def in username.message_fields:
+        db.session.add(FieldValue(field_def, message, "test_value", False))
+    db.session.commit()
+    return message
+
+
+def _other_user_username(user_password: str) -> Username:
+    other_user = User(password=user_password)
+    db.session.add(other_user)
+    db.session.flush()
+    other_username = Username(user_id=other_user.id, _username="otheruser", is_primary=True)
+    db.session.add(other_username)
+    db.session.commit()
+    return other_username
+
+
+@pytest.mark.usefixtures("_authenticated_user")
+def test_inbox_renders_bulk_actions_for_tips(client: FlaskClient, user: User) -> None:
+    message = _add_tip(user.primary_username)
+
+    response = client.get(url_for("inbox"))
+
+    assert response.status_code == 200
+    assert f'action="{url_for("bulk_set_message_status")}"' in response.text
+    assert f'formaction="{url_for("bulk_archive_messages")}"' in response.text
+    assert f'formaction="{url_for("bulk_delete_messages")}"' in response.text
+    assert f'value="{message.public_id}"' in response.text
+    assert 'form="inbox-bulk-form"' in response.text
+
+
+@pytest.mark.usefixtures("_authenticated_user")
+def test_bulk_delete_removes_only_own_messages_and_field_values(
+    client: FlaskClient, user: User, user_alias: Username, user_password: str
+) -> None:
+    own_messages = [_add_tip(user.primary_username), _add_tip(user_alias)]
+    kept_message = _add_tip(user.primary_username)
+    other_message = _add_tip(_other_user_username(user_password))
+    own_message_ids = [message.id for message in own_messages]
+
+    response = client.post(
+        url_for("bulk_delete_messages", type="tips"),
+        data={
+            "message_ids": [
+                *(message.public_id for message in own_messages),
+                other_message.public_id,
+                "missing-public-id",
+            ]
+        },
+        follow_redirects=False,
+    )
+
+    assert response.status_code == 302
+    assert response.headers["Location"] == url_for("inbox", type="tips")
+    db.session.expire_all()
+    assert db.session.scalars(db.select(Message).where(Message.id.in_(own_message_ids))).all() == []
+    assert (
+        db.session.scalar(
+            db.select(db.func.count(FieldValue.id)).where(
+                FieldValue.message_id.in_(own_message_ids)
+            )
+        )
+        == 0
+    )
+    assert db.session.get(Message, kept_message.id) is not None
+    assert db.session.get(Message, other_message.id) is not None
+    with client.session_transaction() as session:
+        assert ["message", "🗑️ Deleted 2 messages."] in session["_flashes"]
+
+
+@pytest.mark.usefixtures("_authenticated_user")
+def test_bulk_archive_and_status_update_own_messages(
+    client: FlaskClient, user: User, user_password: str
+) -> None:
+    own_messages = [_add_tip(user.primary_username), _add_tip(user.primary_username)]
+    other_message = _add_tip(_other_user_username(user_password))
+    public_ids = [message.public_id for message in [*own_messages, other_message]]
+
+    response = client.post(
+        url_for("bulk_archive_messages"),
+        data={"message_ids": public_ids},
+        follow_redirects=True,
+    )
+
+    assert response.status_code == 200
+    assert "Archived 2 messages." in response.text
+    for message in [*own_messages, other_message]:
+        db.session.refresh(message)
+    assert [message.status for message in own_messages] == [MessageStatus.ARCHIVED] * 2
+    assert all(message.status_changed_at is not None for message in own_messages)
+    assert other_message.status == MessageStatus.PENDING
+
+    response = client.post(
+        url_for("bulk_set_message_status", status="archived"),
+        data={"message_ids": public_ids[:1], "status": MessageStatus.ACCEPTED.name},
+        follow_redirects=False,
+    )
+
+    assert response.status_code == 302
+    assert response.headers["Location"] == url_for("inbox", status="archived")
+    db.session.refresh(own_messages[0])
+    db.session.refresh(own_messages[1])
+    assert own_messages[0].status == MessageStatus.ACCEPTED
+    assert own_messages[1].status == MessageStatus.ARCHIVED
+
+
+@pytest.mark.usefixtures("_authenticated_user")
+def test_bulk_actions_require_a_selection(client: FlaskClient, user: User) -> None:
+    message = _add_tip(user.primary_username)
+
+    for endpoint in ("bulk_delete_messages", "bulk_archive_messages"):
+        response = client.post(url_for(endpoint), data={}, follow_redirects=True)
+        assert response.status_code == 200
+        assert "Select at least one message." in response.text
+
+    response = client.post(
+        url_for("bulk_set_message_status"),
+        data={"message_ids": [message.public_id]},
+        follow_redirects=True,
+    )
+    assert response.status_code == 200
+    assert "Invalid request. Messages not updated." in response.text
+    db.session.refresh(message)
+    assert message.status == MessageStatus.PENDING
+
+
+@pytest.mark.usefixtures("_authenticated_user")
+def test_bulk_actions_reject_oversized_selections(client: FlaskClient, user: User) -> None:
+    message = _add_tip(user.primary_username)
+
+    response = client.post(
+        url_for("bulk_delete_messages"),
+        data={"message_ids": [message.public_id, *(f"missing-{i}" for i in range(500))]},
+        follow_redirects=True,
+    )
+
+    assert response.status_code == 200
+    assert "Select at most 500 messages at a time." in response.text
+    assert db.session.get(Message, message.id) is not None
+
+
+def test_bulk_actions_require_authentication(client: FlaskClient) -> None:
+    response = client.post(
+        url_for("bulk_delete_messages"), data={"message_ids": ["x"]}, follow_redirects=False
+    )
+
+    assert response.status_code == 302
+    assert response.headers["Location"].endswith(url_for("login"))
+
+
 @pytest.mark.usefixtures("_authenticated_user")
 def test_filter_on_status(client: FlaskClient, user: User, user_alias: Username) -> None:
     messages = []
@@ -284,6 +444,8 @@ def test_inbox_lists_conversation_for_sender_and_recipient_after_submission(
     newer_tip.created_at = newer_tip_at
     db.session.add(newer_tip)
     db.session.commit()
+    Conversation.refresh_summaries([message.conversation.id])
+    db.session.commit()
 
     conversation_url = url_for("conversation", public_id=message.conversation.public_id)
     message_url = url_for("message", public_id=message.public_id)
@@ -364,3 +526,84 @@ def test_inbox_missing_user_row_returns_not_found(
 
     response = client.get(url_for("inbox"), follow_redirects=False)
     assert response.status_code == 404
+
+
+def _inbox_page_hrefs(response_text: str) -> list[str]:
+    return re.findall(r'href="(/(?:message|conversation)/[^"]+)"', response_text)
+
+
+def _inbox_next_page_url(response_text: str) -> str | None:
+    match = re.search(r'href="([^"]*after=[^"]+)"\s*>Older</a>', response_text)
+    return html.unescape(match.group(1)) if match else None
+
+
+@pytest.mark.usefixtures("_authenticated_user")
+def test_inbox_paginates_merged_timeline_with_cursor(
+    app: Flask, client: FlaskClient, user: User, user2: User
+) -> None:
+    app.config["INBOX_PAGE_SIZE"] = 2
+    shared_at = datetime(2026, 1, 1, 12, tzinfo=timezone.utc)
+    tips = []
+    for offset in (0, 0, 0, -1, -2):
+        tip = Message(username_id=user.primary_username.id)
+        tip.created_at = shared_at + timedelta(minutes=offset)
+        db.session.add(tip)
+        tips.append(tip)
+
+    conversation = Conversation()
+    conversation.created_at = shared_at
+    db.session.add(conversation)
+    db.session.flush()
+    for participant_user in (user, user2):
+        participant = ConversationParticipant()
+        participant.conversation = conversation
+        participant.user = participant_user
+        db.session.add(participant)
+    db.session.commit()
+
+    expected = [
+        url_for("conversation", public_id=conversation.public_id),
+        *[
+            url_for("message", public_id=tip.public_id)
+            for tip in sorted(tips, key=lambda tip: (tip.created_at, tip.id), reverse=True)
+        ],
+    ]
+
+    seen: list[str] = []
+    next_url: str | None = url_for("inbox")
+    pages = 0
+    while next_url:
+        response = client.get(next_url)
+        assert response.status_code == 200
+        assert '<span class="badge">6</span>' in response.text
+        page_hrefs = _inbox_page_hrefs(response.text)
+        assert len(page_hrefs) <= 2
+        seen.extend(page_hrefs)
+        next_url = _inbox_next_page_url(response.text)
+        pages += 1
+
+    assert pages == 3
+    assert seen == [urlsplit(href).path for href in expected]
+
+    tips_only = client.get(url_for("inbox", type="tips"))
+    assert len(_inbox_page_hrefs(tips_only.text)) == 2
+    assert url_for("conversation", public_id=conversation.public_id) not in tips_only.text
+
+
+@pytest.mark.usefixtures("_authenticated_user")
+def test_inbox_invalid_cursor_returns_bad_request(client: FlaskClient) -> None:
+    unknown_kind = base64.urlsafe_b64encode(b"2026-01-01T00:00:00+00:00|tip|1").decode()
+    naive_timestamp = base64.urlsafe_b64encode(b"2026-01-01T00:00:00|message|1").decode()
+    for cursor in ("not-a-cursor", unknown_kind, naive_timestamp):
+        response = client.get(url_for("inbox", after=cursor), follow_redirects=False)
+        assert response.status_code == 400
+
+
+def test_inbox_cursor_round_trips() -> None:
+    cursor = InboxCursor(
+        sort_at=datetime(2026, 1, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+        kind="message",
+        id=42,
+    )
+
+    assert InboxCursor.decode(cursor.encode()) == cursor
@@ -0,0 +1,167 @@
+import json
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import psycopg
+import pytest
+from flask import Flask, url_for
+from flask.testing import FlaskClient
+from helpers import get_profile_submission_data
+from sqlalchemy import Engine, func, select
+
+from hushline.db import db
+from hushline.live_updates import (
+    LIVE_UPDATE_CONVERSATION,
+    LIVE_UPDATE_INBOX,
+    LIVE_UPDATES_CHANNEL,
+    LiveUpdate,
+)
+from hushline.model import User
+
+
+@contextmanager
+def _listening() -> Iterator[psycopg.Connection]:
+    conninfo = db.engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+    with psycopg.connect(conninfo, autocommit=True) as connection:
+        connection.execute(f"LISTEN {LIVE_UPDATES_CHANNEL}")
+        yield connection
+
+
+def _received_updates(connection: psycopg.Connection) -> list[LiveUpdate]:
+    updates = []
+    for notify in connection.notifies(timeout=1):
+        update = LiveUpdate.from_payload(notify.payload)
+        assert update is not None
+        updates.append(update)
+    return updates
+
+
+def _notify_later(engine: Engine, update: LiveUpdate, delay_seconds: float) -> threading.Thread:
+    def notify() -> None:
+        time.sleep(delay_seconds)
+        with engine.connect() as connection:
+            connection.execute(select(func.pg_notify(LIVE_UPDATES_CHANNEL, update.to_payload())))
+            connection.commit()
+
+    thread = threading.Thread(target=notify)
+    thread.start()
+    return thread
+
+
+def test_live_update_payload_round_trips() -> None:
+    update = LiveUpdate(
+        event=LIVE_UPDATE_CONVERSATION, user_ids=frozenset({2, 1}), conversation="abc"
+    )
+
+    assert LiveUpdate.from_payload(update.to_payload()) == update
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        "not json",
+        json.dumps({"event": "unknown", "user_ids": [1]}),
+        json.dumps({"event": LIVE_UPDATE_INBOX}),
+        json.dumps({"event": LIVE_UPDATE_INBOX, "user_ids": ["x"]}),
+        json.dumps({"event": LIVE_UPDATE_INBOX, "user_ids": [1], "conversation": 7}),
+    ],
+)
+def test_live_update_rejects_malformed_payloads(payload: str) -> None:
+    assert LiveUpdate.from_payload(payload) is None
+
+
+def test_live_update_sse_omits_recipient_ids() -> None:
+    update = LiveUpdate(
+        event=LIVE_UPDATE_CONVERSATION, user_ids=frozenset({1, 2}), conversation="abc"
+    )
+
+    assert update.to_sse() == 'event: conversation\ndata: {"conversation": "abc"}\n\n'
+
+
+@pytest.mark.usefixtures("_authenticated_user")
+def test_live_updates_stream_is_disabled_by_default(client: FlaskClient) -> None:
+    response = client.get(url_for("live_updates"))
+
+    assert response.status_code == 404
+
+
+def test_live_updates_stream_requires_authentication(app: Flask, client: FlaskClient) -> None:
+    app.config["LIVE_UPDATES_ENABLED"] = True
+
+    response = client.get(url_for("live_updates"))
+
+    assert response.status_code == 302
+
+
+@pytest.mark.usefixtures("_authenticated_user")
+def test_live_updates_stream_delivers_only_own_updates(
+    app: Flask, client: FlaskClient, user: User, user2: User
+) -> None:
+    app.config["LIVE_UPDATES_ENABLED"] = True
+    app.config["LIVE_UPDATES_STREAM_SECONDS"] = 2
+    app.config["LIVE_UPDATES_KEEPALIVE_SECONDS"] = 1
+    threads = [
+        _notify_later(
+            db.engine,
+            LiveUpdate(event=LIVE_UPDATE_INBOX, user_ids=frozenset({user2.id})),
+            0.5,
+        ),
+        _notify_later(
+            db.engine,
+            LiveUpdate(
+                event=LIVE_UPDATE_CONVERSATION,
+                user_ids=frozenset({user.id, user2.id}),
+                conversation="shared",
+            ),
+            0.6,
+        ),
+    ]
+
+    response = client.get(url_for("live_updates"))
+    body = response.get_data(as_text=True)
+    for thread in threads:
+        thread.join()
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    assert response.headers["Cache-Control"] == "no-store"
+    assert body.startswith("retry: 5000\n\n")
+    assert 'event: conversation\ndata: {"conversation": "shared"}\n\n' in body
+    assert "event: inbox" not in body
+
+
+@pytest.mark.usefixtures("_authenticated_user")
+def test_live_updates_stream_holds_no_pooled_connections(app: Flask, client: FlaskClient) -> None:
+    app.config["LIVE_UPDATES_ENABLED"] = True
+    app.config["LIVE_UPDATES_STREAM_SECONDS"] = 2
+    app.config["LIVE_UPDATES_KEEPALIVE_SECONDS"] = 1
+    db.session.remove()
+    checked_out = db.engine.pool.checkedout()  # type: ignore[attr-defined]
+
+    response = client.get(url_for("live_updates"), buffered=False)
+    chunks = iter(response.response)
+    assert next(chunks) == b"retry: 5000\n\n"
+    # the stream is now listening and waiting for its first keepalive
+    assert next(chunks) == b": keepalive\n\n"
+    assert db.engine.pool.checkedout() == checked_out  # type: ignore[attr-defined]
+    response.close()
+
+
+@pytest.mark.usefixtures("_pgp_user")
+def test_profile_submission_notifies_recipient(client: FlaskClient, user: User) -> None:
+    with _listening() as listener:
+        response = client.post(
+            url_for("profile", username=user.primary_username.username),
+            data={
+                "field_0": "Signal",
+                "field_1": "Hello",
+                **get_profile_submission_data(client, user.primary_username.username),
+            },
+            follow_redirects=False,
+        )
+        updates = _received_updates(listener)
+
+    assert response.status_code == 302
+    assert updates == [LiveUpdate(event=LIVE_UPDATE_INBOX, user_ids=frozenset({user.id}))]
@@ -0,0 +1,96 @@
+import time
+from datetime import UTC, datetime, timedelta
+
+from flask import Flask
+
+from hushline.cli_maintenance import prune_expired_rows
+from hushline.db import db
+from hushline.model import (
+    AuthenticationLog,
+    EmailOutbox,
+    InitialConversationNonce,
+    PasswordResetToken,
+    RateLimitBucket,
+    User,
+)
+
+
+def _count(model: type) -> int:
+    return db.session.scalar(db.select(db.func.count()).select_from(model)) or 0
+
+
+def test_maintenance_prune_deletes_only_expired_rows(app: Flask, user: User, user2: User) -> None:
+    now = time.time()
+    db.session.add_all(
+        [
+            RateLimitBucket(key="test:empty", tat=now - 1),
+            RateLimitBucket(key="test:full", tat=now + 600),
+        ]
+    )
+    expired_token, _ = PasswordResetToken.create_for_user(user.id, ttl=timedelta(minutes=-1))
+    active_token, _ = PasswordResetToken.create_for_user(user.id, ttl=timedelta(minutes=30))
+    db.session.add_all([expired_token, active_token])
+    db.session.add_all(
+        [
+            InitialConversationNonce(
+                nonce_hash="a" * 64,
+                sender_user_id=user.id,
+                recipient_user_id=user2.id,
+                created_at=datetime.now(UTC) - timedelta(days=8),
+            ),
+            InitialConversationNonce(
+                nonce_hash="b" * 64, sender_user_id=user.id, recipient_user_id=user2.id
+            ),
+        ]
+    )
+    old_log = AuthenticationLog(user_id=user.id, successful=False)
+    old_log.timestamp = datetime.now() - timedelta(days=31)
+    db.session.add_all([old_log, AuthenticationLog(user_id=user.id, successful=True)])
+    old_created_at = datetime.now(UTC) - timedelta(days=8)
+    db.session.add_all(
+        [
+            EmailOutbox(
+                user_id=user.id,
+                to_email="sent@example.com",
+                subject="Subject",
+                status=EmailOutbox.STATUS_SENT,
+                created_at=old_created_at,
+            ),
+            EmailOutbox(
+                user_id=user.id,
+                to_email="pending@example.com",
+                subject="Subject",
+                created_at=old_created_at,
+            ),
+        ]
+    )
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["maintenance", "prune"])
+
+    assert result.exit_code == 0, result.output
+    assert "rate_limit_buckets: 1" in result.output
+    db.session.expire_all()
+    assert db.session.scalars(db.select(RateLimitBucket.key)).all() == ["test:full"]
+    assert db.session.scalars(db.select(PasswordResetToken.id)).all() == [active_token.id]
+    assert db.session.scalars(db.select(InitialConversationNonce.nonce_hash)).all() == ["b" * 64]
+    assert db.session.scalars(db.select(AuthenticationLog.successful)).all() == [True]
+    assert db.session.scalars(db.select(EmailOutbox.to_email)).all() == ["pending@example.com"]
+
+
+def test_maintenance_prune_works_in_batches(app: Flask) -> None:
+    db.session.add_all([RateLimitBucket(key=f"test:{i}", tat=1000.0) for i in range(5)])
+    db.session.commit()
+
+    assert prune_expired_rows(batch_size=2, max_seconds=60)["rate_limit_buckets"] == 5
+    assert _count(RateLimitBucket) == 0
+
+
+def test_maintenance_prune_stops_at_time_limit(app: Flask) -> None:
+    db.session.add(RateLimitBucket(key="test:empty", tat=1000.0))
+    db.session.commit()
+
+    deleted = prune_expired_rows(batch_size=10, max_seconds=0)
+
+    assert set(deleted.values()) == {0}
+    assert _count(RateLimitBucket) == 1
@@ -1,6 +1,9 @@
+import pytest
+from flask import url_for
+from flask.testing import FlaskClient
 from markupsafe import Markup
 
-from hushline.md import md_to_html
+from hushline.md import MarkdownCache, markdown_cache, md_to_html
 
 
 def test_md_to_html_returns_markup_input_unchanged() -> None:
@@ -15,3 +18,60 @@ def test_md_to_html_sanitizes_disallowed_tags_and_keeps_links() -> None:
     assert isinstance(rendered, Markup)
     assert '<a href="https://example.org">' in str(rendered)
     assert "<script>" not in str(rendered)
+
+
+def test_md_to_html_reuses_rendered_html() -> None:
+    markdown_cache.clear()
+
+    first = md_to_html("**Tips** welcome")
+    second = md_to_html("**Tips** welcome")
+
+    assert second is first
+    stats = markdown_cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+    assert stats.hit_rate == 0.5
+
+
+def test_markdown_cache_evicts_least_recently_used_over_budget() -> None:
+    cache = MarkdownCache(max_bytes=100)
+    cache.put("a", Markup("a" * 25))
+    cache.put("b", Markup("b" * 25))
+    cache.put("c", Markup("c" * 25))
+    assert cache.get("a") is not None
+
+    cache.put("d", Markup("d" * 20))
+    cache.put("e", Markup("e" * 20))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    stats = cache.stats()
+    assert (stats.entries, stats.size_bytes, stats.evictions) == (4, 90, 1)
+
+
+def test_markdown_cache_skips_documents_over_a_quarter_of_the_budget() -> None:
+    cache = MarkdownCache(max_bytes=40)
+
+    cache.put("big", Markup("x" * 11))
+
+    assert cache.get("big") is None
+    assert cache.stats().entries == 0
+
+
+def test_markdown_cache_budget_counts_encoded_bytes() -> None:
+    cache = MarkdownCache(max_bytes=200)
+
+    # 10 characters, 40 bytes in UTF-8
+    cache.put("emoji", Markup("🔒" * 10))
+    # 20 characters, but 60 bytes, over a quarter of the budget
+    cache.put("kanji", Markup("秘密" * 10))
+
+    assert cache.stats().size_bytes == 40
+    assert cache.get("kanji") is None
+
+
+@pytest.mark.usefixtures("_authenticated_admin_user")
+def test_metrics_page_shows_markdown_cache(client: FlaskClient) -> None:
+    response = client.get(url_for("settings.metrics"))
+
+    assert response.status_code == 200
+    assert "Markdown Cache" in response.text
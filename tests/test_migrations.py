@@ -37,6 +37,7 @@ SKIPPABLE_REVISIONS = [
     "7b9c2d1e4f60",  # simple add/drop on columns, no data migrated
     "a4c8f2d9e713",  # simple table create/drop, no data migrated
     "e3b7c1a9d2f4",  # simple add/drop on columns, no data migrated
+    "5e2b7d9c1a84",  # simple index create/drop, no data migrated
 ]
 DISALLOWED_DOWNGRADES = [
     "4a53667aff6e",  # downgrading is disabled to prevent accidental data loss
@@ -209,12 +210,13 @@ def test_encrypted_field_preflight_tracks_widening_migration_readiness(
     assert "schema is not envelope-ready" in pre_migration_result.output
 
     db.session.close()
-    command.upgrade(cfg, "b2039e7c0a1d")
+    # later migrations add tables of their own encrypted-field contracts, such as email_outbox
+    command.upgrade(cfg, "head")
 
     post_migration_result = runner.invoke(args=["encrypted-field", "preflight"])
 
     assert post_migration_result.exit_code == 0
-    assert "Current Alembic revision: b2039e7c0a1d" in post_migration_result.output
+    assert f"Current Alembic revision: {ALL_REVISIONS[-1]}" in post_migration_result.output
     for table_name, column_name in crypto.ENCRYPTED_FIELD_ENVELOPE_READY_COLUMNS:
         assert f"({table_name}.{column_name}): ready (unbounded)" in (post_migration_result.output)
     assert "Encrypted-field preflight readiness: ready" in post_migration_result.output
@@ -9,10 +9,18 @@ from flask import Flask, url_for
 from flask.testing import FlaskClient
 from helpers import get_profile_submission_data
 from itsdangerous import BadData, SignatureExpired, URLSafeTimedSerializer
+from sqlalchemy import event
 from sqlalchemy.exc import MultipleResultsFound
 from werkzeug.exceptions import NotFound
 
 from hushline.chat_key_lifecycle import chat_key_fingerprint
+from hushline.config import (
+    ENCRYPTED_FIELD_AES_GCM_WRITE_APPROVAL,
+    ENCRYPTED_FIELD_AES_GCM_WRITES_ENABLED,
+    ENCRYPTED_FIELD_WRITE_FORMAT,
+    EncryptedFieldWriteFormat,
+)
+from hushline.crypto import ENCRYPTED_FIELD_ENVELOPE_PREFIX
 from hushline.db import db
 from hushline.model import (
     AccountCategory,
@@ -342,6 +350,44 @@ def test_profile_submit_message(client: FlaskClient, user: User) -> None:
     assert pgp_message_sig in response.text, response.text
 
 
+@pytest.mark.usefixtures("_pgp_user")
+def test_profile_submit_message_inserts_aes_gcm_field_values_in_one_statement(
+    app: Flask, client: FlaskClient, user: User
+) -> None:
+    app.config[ENCRYPTED_FIELD_WRITE_FORMAT] = EncryptedFieldWriteFormat.ENVELOPE_AES_GCM
+    app.config[ENCRYPTED_FIELD_AES_GCM_WRITES_ENABLED] = True
+    app.config[ENCRYPTED_FIELD_AES_GCM_WRITE_APPROVAL] = "test approval"
+    data = {
+        "field_0": msg_contact_method,
+        "field_1": msg_content,
+        **get_profile_submission_data(client, user.primary_username.username),
+    }
+    statements: list[str] = []
+
+    def _record(*args: object) -> None:
+        statements.append(str(args[2]))
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        response = client.post(
+            url_for("profile", username=user.primary_username.username), data=data
+        )
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+
+    assert response.status_code == 302, response.text
+    field_value_inserts = [s for s in statements if s.startswith("INSERT INTO field_values")]
+    assert len(field_value_inserts) == 1
+    assert len([s for s in statements if s.startswith("INSERT INTO messages")]) == 1
+    message = db.session.scalars(
+        db.select(Message).filter_by(username_id=user.primary_username.id)
+    ).one()
+    assert len(message.field_values) == 2
+    for field_value in message.field_values:
+        assert field_value._value.startswith(ENCRYPTED_FIELD_ENVELOPE_PREFIX)
+        assert pgp_message_sig in (field_value.value or "")
+
+
 @pytest.mark.usefixtures("_pgp_user")
 def test_anonymous_profile_submit_message_keeps_reply_success_flow(
     client: FlaskClient, user: User
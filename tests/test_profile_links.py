@@ -0,0 +1,274 @@
+import socket
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+from aiohttp.abc import ResolveResult
+from flask import Flask, get_flashed_messages
+from flask.testing import FlaskClient
+from sqlalchemy import event
+
+from hushline.cli_profile_links import run_profile_link_verifications
+from hushline.db import db
+from hushline.external_urls import canonical_external_url
+from hushline.model import ProfileLinkCheck, ProfileLinkVerification, User, Username
+from hushline.settings.common import (
+    PROFILE_LINK_VERIFICATION_QUEUE_ENABLED,
+    _PinnedVerificationResolver,
+    _SafeVerificationUrl,
+    _VerificationPage,
+    handle_update_bio,
+    profile_link_check_key,
+)
+from hushline.settings.forms import ProfileForm
+
+_LINK = "https://example.com/me"
+_PROFILE_URL = "https://hushline.example/to/alice"
+
+
+def _page_linking(profile_url: str, etag: str | None = None) -> _VerificationPage:
+    return _VerificationPage(f'<html><a href="{profile_url}" rel="me">me</a></html>', etag)
+
+
+def _enqueue(username: Username, url: str = _LINK) -> None:
+    username.extra_field_label1 = "site"
+    username.extra_field_value1 = url
+    ProfileLinkVerification.enqueue(username.id, 1, url, _PROFILE_URL)
+    db.session.commit()
+
+
+def _queued(username: Username) -> list[ProfileLinkVerification]:
+    return list(
+        db.session.scalars(db.select(ProfileLinkVerification).filter_by(username_id=username.id))
+    )
+
+
+async def _update_bio(app: Flask, username: Username, url: str) -> list[str]:
+    with app.test_request_context("/settings/profile", method="POST"):
+        form = ProfileForm()
+        form.bio.data = "bio"
+        form.extra_field_label1.data = "site"
+        form.extra_field_value1.data = url
+        for i in range(2, 5):
+            getattr(form, f"extra_field_value{i}").data = ""
+            getattr(form, f"extra_field_label{i}").data = ""
+        with patch(
+            "hushline.settings.common.verify_url",
+            side_effect=AssertionError("links must not be fetched inline"),
+        ):
+            await handle_update_bio(username, form)
+        return [str(message) for message in get_flashed_messages()]
+
+
+@pytest.mark.asyncio()
+async def test_handle_update_bio_queues_links_when_enabled(app: Flask, user: User) -> None:
+    app.config[PROFILE_LINK_VERIFICATION_QUEUE_ENABLED] = True
+    username = user.primary_username
+    username.extra_field_verified1 = True
+    db.session.commit()
+
+    messages = await _update_bio(app, username, _LINK)
+
+    assert messages == ["👍 Bio and fields updated successfully. Links will be verified shortly."]
+    assert username.extra_field_verified1 is False
+    assert [(job.field_index, job.url) for job in _queued(username)] == [(1, _LINK)]
+    assert username.pending_extra_field_verifications == {1}
+
+
+def test_pending_extra_field_verifications_are_loaded_once(user: User) -> None:
+    username = user.primary_username
+    ProfileLinkVerification.enqueue(username.id, 2, _LINK, _PROFILE_URL)
+    ProfileLinkVerification.enqueue(username.id, 4, _LINK, _PROFILE_URL)
+    db.session.commit()
+    statements: list[str] = []
+
+    def _record(*args: object) -> None:
+        statements.append(str(args[2]))
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        for _ in range(3):
+            assert username.pending_extra_field_verifications == {2, 4}
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+
+    assert len([s for s in statements if "FROM profile_link_verifications" in s]) == 1
+
+
+@pytest.mark.asyncio()
+async def test_handle_update_bio_uses_fresh_cached_result(app: Flask, user: User) -> None:
+    app.config[PROFILE_LINK_VERIFICATION_QUEUE_ENABLED] = True
+    username = user.primary_username
+    with app.test_request_context():
+        profile_url = canonical_external_url("profile", username=username._username)
+    ProfileLinkCheck.store(
+        [
+            {
+                "key": profile_link_check_key(_LINK, profile_url),
+                "verified": True,
+                "etag": None,
+                "checked_at": datetime.now(UTC),
+            }
+        ]
+    )
+    db.session.commit()
+
+    messages = await _update_bio(app, username, _LINK)
+
+    assert messages == ["👍 Bio and fields updated successfully."]
+    assert username.extra_field_verified1 is True
+    assert _queued(username) == []
+
+
+@pytest.mark.asyncio()
+async def test_handle_update_bio_drops_queued_link_when_field_is_cleared(
+    app: Flask, user: User
+) -> None:
+    app.config[PROFILE_LINK_VERIFICATION_QUEUE_ENABLED] = True
+    username = user.primary_username
+    _enqueue(username)
+
+    await _update_bio(app, username, "")
+
+    assert _queued(username) == []
+
+
+def test_worker_verifies_queued_links_and_caches_results(app: Flask, user: User) -> None:
+    username = user.primary_username
+    _enqueue(username)
+    fetched_etags: list[str | None] = []
+
+    async def _fetch(
+        session: aiohttp.ClientSession, safe_url: _SafeVerificationUrl, etag: str | None
+    ) -> _VerificationPage:
+        fetched_etags.append(etag)
+        return _page_linking(_PROFILE_URL, etag='"v1"')
+
+    with patch("hushline.settings.common._fetch_verification_page", side_effect=_fetch):
+        assert run_profile_link_verifications(batch_size=10, concurrency=2) == 1
+
+    db.session.refresh(username)
+    assert username.extra_field_verified1 is True
+    assert _queued(username) == []
+    check = db.session.get(ProfileLinkCheck, profile_link_check_key(_LINK, _PROFILE_URL))
+    assert check is not None
+    assert (check.verified, check.etag) == (True, '"v1"')
+    assert fetched_etags == [None]
+
+
+def test_worker_revalidates_stale_results_with_etag(app: Flask, user: User) -> None:
+    username = user.primary_username
+    _enqueue(username)
+    key = profile_link_check_key(_LINK, _PROFILE_URL)
+    stale_at = datetime.now(UTC) - timedelta(days=2)
+    db.session.add(ProfileLinkCheck(key=key, verified=True, etag='"v1"', checked_at=stale_at))
+    db.session.commit()
+    fetched_etags: list[str | None] = []
+
+    async def _fetch(
+        session: aiohttp.ClientSession, safe_url: _SafeVerificationUrl, etag: str | None
+    ) -> _VerificationPage:
+        fetched_etags.append(etag)
+        return _VerificationPage(None, etag)
+
+    with patch("hushline.settings.common._fetch_verification_page", side_effect=_fetch):
+        run_profile_link_verifications(batch_size=10, concurrency=2)
+
+    db.session.refresh(username)
+    assert username.extra_field_verified1 is True
+    assert fetched_etags == ['"v1"']
+    check = db.session.get(ProfileLinkCheck, key)
+    assert check is not None
+    db.session.refresh(check)
+    assert check.checked_at > stale_at
+
+
+def test_worker_does_not_cache_failed_fetches(app: Flask, user: User) -> None:
+    username = user.primary_username
+    _enqueue(username)
+
+    with patch(
+        "hushline.settings.common._fetch_verification_page",
+        side_effect=aiohttp.ClientError("boom"),
+    ):
+        run_profile_link_verifications(batch_size=10, concurrency=2)
+
+    db.session.refresh(username)
+    assert username.extra_field_verified1 is False
+    assert _queued(username) == []
+    assert db.session.scalars(db.select(ProfileLinkCheck)).all() == []
+
+
+def test_worker_skips_links_changed_while_checking(app: Flask, user: User) -> None:
+    username = user.primary_username
+    _enqueue(username)
+
+    async def _fetch(
+        session: aiohttp.ClientSession, safe_url: _SafeVerificationUrl, etag: str | None
+    ) -> _VerificationPage:
+        # the user saves a different link while the old one is being fetched
+        _enqueue(username, "https://example.com/other")
+        return _page_linking(_PROFILE_URL)
+
+    with patch("hushline.settings.common._fetch_verification_page", side_effect=_fetch):
+        run_profile_link_verifications(batch_size=10, concurrency=2)
+
+    db.session.refresh(username)
+    assert username.extra_field_verified1 is False
+    assert [job.url for job in _queued(username)] == ["https://example.com/other"]
+
+
+def test_claimed_links_are_not_claimed_again_until_the_lease_expires(
+    app: Flask, user: User
+) -> None:
+    _enqueue(user.primary_username)
+    lease = timedelta(minutes=5)
+
+    assert len(ProfileLinkVerification.claim_batch(10, lease=lease)) == 1
+    db.session.commit()
+    assert ProfileLinkVerification.claim_batch(10, lease=lease) == []
+    later = datetime.now(UTC) + lease + timedelta(seconds=1)
+    assert len(ProfileLinkVerification.claim_batch(10, lease=lease, now=later)) == 1
+
+
+def test_reverify_command_queues_verifiable_links(app: Flask, user: User) -> None:
+    username = user.primary_username
+    username.extra_field_value1 = _LINK
+    username.extra_field_value2 = "signal.user.01"
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["profile-links", "reverify"])
+
+    assert result.exit_code == 0, result.output
+    assert "Queued 1 profile link(s)" in result.output
+    assert [(job.field_index, job.url) for job in _queued(username)] == [(1, _LINK)]
+
+
+@pytest.mark.usefixtures("_authenticated_user")
+def test_profile_settings_show_pending_verification(client: FlaskClient, user: User) -> None:
+    _enqueue(user.primary_username)
+
+    response = client.get("/settings/profile")
+
+    assert response.status_code == 200
+    assert "Verification pending" in response.text
+
+
+@pytest.mark.asyncio()
+async def test_pinned_resolver_only_resolves_pinned_hosts() -> None:
+    address = ResolveResult(
+        hostname="example.com",
+        host="93.184.216.34",
+        port=443,
+        family=socket.AF_INET,
+        proto=socket.IPPROTO_TCP,
+        flags=0,
+    )
+    resolver = _PinnedVerificationResolver()
+    resolver.pin(_SafeVerificationUrl(_LINK, "example.com", (address,)))
+
+    assert [r["host"] for r in await resolver.resolve("EXAMPLE.com.", 8443)] == ["93.184.216.34"]
+    assert (await resolver.resolve("example.com", 8443))[0]["port"] == 8443
+    with pytest.raises(OSError, match="unexpected host"):
+        await resolver.resolve("attacker.example", 443)
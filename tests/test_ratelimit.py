@@ -0,0 +1,107 @@
+from unittest.mock import patch
+
+import pytest
+from flask import Flask
+
+from hushline.config import ConfigParseError, RateLimitBackendKind, load_config
+from hushline.db import db
+from hushline.model import RateLimitBucket
+from hushline.ratelimit import (
+    MemoryRateLimitBackend,
+    PostgresRateLimitBackend,
+    RateLimit,
+    RateLimiter,
+    rate_limiter,
+)
+
+_PROFILE = RateLimit(scope="profile", key="test:profile", limit=2, window_seconds=10)
+_SOURCE = RateLimit(scope="source", key="test:source", limit=1, window_seconds=10)
+
+
+@pytest.fixture(params=["memory", "postgres"])
+def limiter(request: pytest.FixtureRequest, app: Flask) -> RateLimiter:
+    if request.param == "memory":
+        return RateLimiter(MemoryRateLimitBackend())
+    return RateLimiter(PostgresRateLimitBackend())
+
+
+def test_rate_limiter_refills_one_event_per_interval(limiter: RateLimiter) -> None:
+    results = [limiter.hit([_PROFILE], now=now).limited for now in (100, 101, 102, 105, 106)]
+
+    assert results == [False, False, True, False, True]
+
+
+def test_rate_limiter_does_not_count_limited_events(limiter: RateLimiter) -> None:
+    assert not limiter.hit([_PROFILE, _SOURCE], now=100).limited
+
+    result = limiter.hit([_PROFILE, _SOURCE], now=101)
+
+    assert result.limited_scopes == ("source",)
+    # the profile bucket was not charged for the rejected event, so one more still fits
+    assert not limiter.hit([_PROFILE], now=101).limited
+    assert limiter.hit([_PROFILE], now=101).limited
+
+
+def test_rate_limiter_keeps_counting_when_asked(limiter: RateLimiter) -> None:
+    limiter.hit([_SOURCE], now=100, record_when_limited=True)
+    limiter.hit([_SOURCE], now=105, record_when_limited=True)
+
+    # the limited event at 105 held the bucket full until 115
+    assert limiter.peek([_SOURCE], now=112).limited
+    assert not limiter.peek([_SOURCE], now=115).limited
+
+
+def test_rate_limiter_peek_does_not_record(limiter: RateLimiter) -> None:
+    for _ in range(3):
+        assert not limiter.peek([_SOURCE], now=100).limited
+
+    assert not limiter.hit([_SOURCE], now=100).limited
+    assert limiter.peek([_SOURCE], now=100).limited
+
+
+def test_rate_limiter_ignores_disabled_limits(limiter: RateLimiter) -> None:
+    disabled = RateLimit(scope="off", key="test:off", limit=0, window_seconds=10)
+
+    assert not any(limiter.hit([disabled], now=100).limited for _ in range(5))
+
+
+def test_rate_limiter_prunes_empty_buckets(limiter: RateLimiter) -> None:
+    limiter.hit([_PROFILE], now=100)
+    limiter.hit([_SOURCE], now=100)
+
+    assert limiter.prune(now=106) == 1
+    assert limiter.hit([_SOURCE], now=106).limited
+
+
+def test_postgres_rate_limiter_refunds_buckets_of_limited_events(app: Flask) -> None:
+    limiter = RateLimiter(PostgresRateLimitBackend())
+
+    for now in range(100, 105):
+        limiter.hit([_PROFILE, _SOURCE], now=now)
+    db.session.commit()
+
+    tats = dict(
+        db.session.execute(db.select(RateLimitBucket.key, RateLimitBucket.tat)).tuples().all()
+    )
+    # only the event at 100 fit in both buckets
+    assert tats == {"test:profile": pytest.approx(105), "test:source": pytest.approx(110)}
+
+
+def test_rate_limiter_is_built_once_per_app(app: Flask) -> None:
+    app.config["RATE_LIMIT_BACKEND"] = RateLimitBackendKind.MEMORY
+
+    with patch("hushline.ratelimit.MemoryRateLimitBackend", wraps=MemoryRateLimitBackend) as cls:
+        assert rate_limiter() is rate_limiter()
+
+    cls.assert_called_once_with()
+    assert isinstance(rate_limiter().backend, MemoryRateLimitBackend)
+
+
+def test_load_config_parses_rate_limit_backend() -> None:
+    assert load_config({})["RATE_LIMIT_BACKEND"] == RateLimitBackendKind.POSTGRES
+    assert (
+        load_config({"RATE_LIMIT_BACKEND": "memory"})["RATE_LIMIT_BACKEND"]
+        == RateLimitBackendKind.MEMORY
+    )
+    with pytest.raises(ConfigParseError):
+        load_config({"RATE_LIMIT_BACKEND": "memcached"})
@@ -5,6 +5,7 @@ import pytest
 from bs4 import BeautifulSoup
 from flask import Flask, url_for
 from flask.testing import FlaskClient
+from sqlalchemy import event
 
 from hushline.db import db
 from hushline.model import Message, MessageStatus, MessageStatusText, User
@@ -51,6 +52,44 @@ def test_custom_replies(client: FlaskClient, user: User, message: Message) -> No
         assert status.default_text not in resp.text
 
 
+def test_resolve_status_texts_uses_one_query(user: User) -> None:
+    custom_text = "We are *reviewing* this."
+    db.session.add(
+        MessageStatusText(
+            user_id=user.id,  # type: ignore[call-arg]
+            status=MessageStatus.ACCEPTED,  # type: ignore[call-arg]
+            markdown=custom_text,  # type: ignore[call-arg]
+        )
+    )
+    messages = []
+    for status in [MessageStatus.ACCEPTED, MessageStatus.PENDING] * 5:
+        msg = Message(username_id=user.primary_username.id)
+        msg.status = status
+        messages.append(msg)
+    db.session.add_all(messages)
+    db.session.commit()
+    # load attributes up front so only the status text lookup is counted
+    message_keys = [(x.id, x.username_id, x.status) for x in messages]
+
+    statements: list[str] = []
+
+    def _count(*args: object) -> None:
+        statements.append(str(args[2]))
+
+    event.listen(db.engine, "before_cursor_execute", _count)
+    try:
+        status_texts = Message.resolve_status_texts(messages)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _count)
+
+    assert len(statements) == 1
+    for message_id, _, status in message_keys:
+        if status == MessageStatus.ACCEPTED:
+            assert status_texts[message_id] == "<p>We are <em>reviewing</em> this.</p>"
+        else:
+            assert status_texts[message_id] == MessageStatus.PENDING.default_text
+
+
 @pytest.mark.usefixtures("_authenticated_user")
 def test_set_custom_replies(client: FlaskClient, user: User) -> None:
     text = str(uuid4())
@@ -76,7 +76,8 @@ def test_csp_script_src_elem_disallows_inline_scripts(client: FlaskClient) -> No
 
 def test_custom_splash_logo_keeps_csp_enforced(client: FlaskClient) -> None:
     OrganizationSetting.upsert(
-        OrganizationSetting.BRAND_SPLASH_LOGO, OrganizationSetting.BRAND_SPLASH_LOGO_VALUE
+        OrganizationSetting.BRAND_SPLASH_LOGO,
+        f"{OrganizationSetting.BRAND_SPLASH_LOGO_PATH_STEM}-{'0' * 64}.png",
     )
 
     response = client.get(url_for("register"), follow_redirects=True)
@@ -1,6 +1,7 @@
 import json
 from base64 import b64decode
 from datetime import UTC, datetime
+from hashlib import sha256
 from io import BytesIO
 from unittest.mock import ANY, MagicMock, patch
 from uuid import uuid4
@@ -10,6 +11,7 @@ import requests
 from bs4 import BeautifulSoup
 from flask import Flask, url_for
 from flask.testing import FlaskClient
+from PIL import Image
 from werkzeug.security import generate_password_hash
 
 from hushline.config import PASSWORD_HASH_WRITE_USE_WERKZEUG_SCRYPT, AliasMode, FieldsMode
@@ -71,6 +73,20 @@ ONE_PIXEL_WHITE_PNG = b64decode(
 )
 
 
+def _png(size: tuple[int, int] = (1, 1), color: str = "white") -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", size, color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _brand_asset_paths(key: str, variants_key: str) -> set[str]:
+    path = OrganizationSetting.fetch_one(key)
+    variants = OrganizationSetting.fetch_one(variants_key)
+    assert isinstance(path, str)
+    assert variants
+    return {path} | {v["path"] for v in variants}
+
+
 def test_user_account_category_persists(user: User) -> None:
     user.account_category = AccountCategory.NONPROFIT.value
     db.session.commit()
@@ -2737,8 +2753,7 @@ def test_update_brand_app_name(client: FlaskClient, admin: User) -> None:
 
 @pytest.mark.usefixtures("_authenticated_admin")
 def test_update_brand_logo(client: FlaskClient, admin: User) -> None:
-    # 1x1 pixel white png
-    png = ONE_PIXEL_WHITE_PNG
+    png = _png((1000, 300))
 
     resp = client.post(
         url_for("settings.branding"),
@@ -2752,24 +2767,35 @@ def test_update_brand_logo(client: FlaskClient, admin: User) -> None:
     assert resp.status_code == 200
     assert "Brand logo updated successfully" in resp.text
 
+    logo_path = OrganizationSetting.fetch_one(OrganizationSetting.BRAND_LOGO)
+    assert logo_path.startswith(f"{OrganizationSetting.BRAND_LOGO_PATH_STEM}-")
+    assert logo_path.endswith(".png")
+    logo_url = url_for("storage.public", path=logo_path)
+
     soup = BeautifulSoup(resp.text, "html.parser")
-    imgs = soup.select("header img")
+    imgs = soup.select("header picture img")
     assert imgs  # sensibility check
-    logo_url = url_for("storage.public", path=OrganizationSetting.BRAND_LOGO_VALUE)
     for img in imgs:
         if img.attrs.get("src") == logo_url:
             break
     else:
         pytest.fail("Brand logo not updated in header <img>")
-
-    setting = db.session.get(OrganizationSetting, OrganizationSetting.BRAND_LOGO)
-    assert setting is not None
-    assert setting.value == OrganizationSetting.BRAND_LOGO_VALUE
-
-    # check the file got uploaded and is accessible
+    source_types = [source["type"] for source in soup.select("header picture source")]
+    assert "image/webp" in source_types
+    assert source_types[-1] == "image/png"
+
+    # check the files got uploaded and are accessible
+    paths = _brand_asset_paths(
+        OrganizationSetting.BRAND_LOGO, OrganizationSetting.BRAND_LOGO_VARIANTS
+    )
+    for path in paths:
+        resp = client.get(url_for("storage.public", path=path), follow_redirects=True)
+        assert resp.status_code == 200
+        assert sha256(resp.data).hexdigest() in path
     resp = client.get(logo_url, follow_redirects=True)
-    assert resp.status_code == 200
-    assert resp.data == png
+    with Image.open(BytesIO(resp.data)) as image:
+        assert image.format == "PNG"
+        assert image.size == (416, 125)
 
     resp = client.post(
         url_for("settings.branding"),
@@ -2778,10 +2804,12 @@ def test_update_brand_logo(client: FlaskClient, admin: User) -> None:
     )
     assert resp.status_code == 200
     assert "Brand logo deleted" in resp.text
+    assert db.session.get(OrganizationSetting, OrganizationSetting.BRAND_LOGO_VARIANTS) is None
 
-    # check the file is not accessible
-    resp = client.get(logo_url, follow_redirects=True)
-    assert resp.status_code == 404
+    # check the files are not accessible
+    for path in paths:
+        resp = client.get(url_for("storage.public", path=path), follow_redirects=True)
+        assert resp.status_code == 404
 
 
 @pytest.mark.usefixtures("_authenticated_admin")
@@ -2798,10 +2826,65 @@ def test_update_brand_logo_requires_file(client: FlaskClient) -> None:
     assert db.session.get(OrganizationSetting, OrganizationSetting.BRAND_LOGO) is None
 
 
+@pytest.mark.usefixtures("_authenticated_admin")
+def test_update_brand_logo_rejects_invalid_image(client: FlaskClient) -> None:
+    resp = client.post(
+        url_for("settings.branding"),
+        data={
+            "logo": (BytesIO(ONE_PIXEL_WHITE_PNG[:-12]), "logo.png"),
+            UpdateBrandLogoForm.submit.name: "",
+        },
+        follow_redirects=True,
+        content_type="multipart/form-data",
+    )
+
+    assert resp.status_code == 400
+    assert "The file is not a valid PNG image." in resp.text
+    assert db.session.get(OrganizationSetting, OrganizationSetting.BRAND_LOGO) is None
+
+
+@pytest.mark.usefixtures("_authenticated_admin")
+def test_brand_logo_is_served_immutable_and_replaced_variants_are_deleted(
+    client: FlaskClient,
+) -> None:
+    old_paths: set[str] = set()
+    for png in (_png(color="white"), _png(color="black")):
+        resp = client.post(
+            url_for("settings.branding"),
+            data={"logo": (BytesIO(png), "logo.png"), UpdateBrandLogoForm.submit.name: ""},
+            content_type="multipart/form-data",
+        )
+        assert resp.status_code == 200
+        old_paths = old_paths or _brand_asset_paths(
+            OrganizationSetting.BRAND_LOGO, OrganizationSetting.BRAND_LOGO_VARIANTS
+        )
+
+    new_paths = _brand_asset_paths(
+        OrganizationSetting.BRAND_LOGO, OrganizationSetting.BRAND_LOGO_VARIANTS
+    )
+    assert not old_paths & new_paths
+    for path in old_paths:
+        assert client.get(url_for("storage.public", path=path)).status_code == 404
+
+    new_url = url_for(
+        "storage.public", path=OrganizationSetting.fetch_one(OrganizationSetting.BRAND_LOGO)
+    )
+    resp = client.get(new_url)
+    assert resp.status_code == 200
+    assert resp.cache_control.public
+    assert resp.cache_control.max_age == 31536000
+    assert resp.cache_control.immutable
+    etag, weak = resp.get_etag()
+    assert etag == sha256(resp.data).hexdigest()
+    assert not weak
+
+    resp = client.get(new_url, headers={"If-None-Match": f'"{etag}"'})
+    assert resp.status_code == 304
+
+
 @pytest.mark.usefixtures("_authenticated_admin")
 def test_update_splash_logo_does_not_change_brand_logo(client: FlaskClient, admin: User) -> None:
-    # 1x1 pixel white png
-    png = ONE_PIXEL_WHITE_PNG
+    png = _png((600, 300))
     OrganizationSetting.upsert(OrganizationSetting.BRAND_SPLASH_SCREEN_ENABLED, True)
     db.session.commit()
 
@@ -2829,8 +2912,12 @@ def test_update_splash_logo_does_not_change_brand_logo(client: FlaskClient, admi
     assert resp.status_code == 200
     assert "Splash logo updated successfully" in resp.text
 
-    brand_logo_url = url_for("storage.public", path=OrganizationSetting.BRAND_LOGO_VALUE)
-    splash_logo_url = url_for("storage.public", path=OrganizationSetting.BRAND_SPLASH_LOGO_VALUE)
+    brand_logo_path = OrganizationSetting.fetch_one(OrganizationSetting.BRAND_LOGO)
+    splash_logo_path = OrganizationSetting.fetch_one(OrganizationSetting.BRAND_SPLASH_LOGO)
+    assert brand_logo_path.startswith(f"{OrganizationSetting.BRAND_LOGO_PATH_STEM}-")
+    assert splash_logo_path.startswith(f"{OrganizationSetting.BRAND_SPLASH_LOGO_PATH_STEM}-")
+    brand_logo_url = url_for("storage.public", path=brand_logo_path)
+    splash_logo_url = url_for("storage.public", path=splash_logo_path)
     soup = BeautifulSoup(resp.text, "html.parser")
     assert soup.select_one(f'header img[src="{brand_logo_url}"]')
     splash = soup.find(id="first-load-splash")
@@ -2840,23 +2927,13 @@ def test_update_splash_logo_does_not_change_brand_logo(client: FlaskClient, admi
     assert splash_logo is not None
     splash_logo_src = splash_logo.get("src")
     assert splash_logo_src is not None
-    assert splash_logo_src.startswith(f"{splash_logo_url}?v=")
-
-    brand_setting = db.session.get(OrganizationSetting, OrganizationSetting.BRAND_LOGO)
-    splash_setting = db.session.get(OrganizationSetting, OrganizationSetting.BRAND_SPLASH_LOGO)
-    splash_cache_buster = db.session.get(
-        OrganizationSetting, OrganizationSetting.BRAND_SPLASH_LOGO_CACHE_BUSTER
-    )
-    assert brand_setting is not None
-    assert brand_setting.value == OrganizationSetting.BRAND_LOGO_VALUE
-    assert splash_setting is not None
-    assert splash_setting.value == OrganizationSetting.BRAND_SPLASH_LOGO_VALUE
-    assert splash_cache_buster is not None
-    assert splash_cache_buster.value
+    assert splash_logo_src == splash_logo_url
+    assert splash.select("picture source")
 
     resp = client.get(splash_logo_src, follow_redirects=True)
     assert resp.status_code == 200
-    assert resp.data == png
+    with Image.open(BytesIO(resp.data)) as image:
+        assert image.size == (416, 208)
 
     resp = client.get(url_for("settings.branding"))
     assert resp.status_code == 200
@@ -2877,12 +2954,10 @@ def test_update_splash_logo_does_not_change_brand_logo(client: FlaskClient, admi
     splash = soup.find(id="first-load-splash")
     assert splash is not None
     assert splash.find("img", src=brand_logo_url)
+    # the brand logo's variants are sized for the header, so only its fallback is used here
+    assert not splash.select("picture source")
     assert db.session.get(OrganizationSetting, OrganizationSetting.BRAND_LOGO) is not None
     assert db.session.get(OrganizationSetting, OrganizationSetting.BRAND_SPLASH_LOGO) is None
-    assert (
-        db.session.get(OrganizationSetting, OrganizationSetting.BRAND_SPLASH_LOGO_CACHE_BUSTER)
-        is None
-    )
 
     resp = client.get(brand_logo_url, follow_redirects=True)
     assert resp.status_code == 200
@@ -2902,10 +2977,6 @@ def test_update_splash_logo_requires_file(client: FlaskClient) -> None:
     assert resp.status_code == 400
     assert "This field is required" in resp.text
     assert db.session.get(OrganizationSetting, OrganizationSetting.BRAND_SPLASH_LOGO) is None
-    assert (
-        db.session.get(OrganizationSetting, OrganizationSetting.BRAND_SPLASH_LOGO_CACHE_BUSTER)
-        is None
-    )
 
 
 @pytest.mark.usefixtures("_authenticated_admin")
@@ -8,6 +8,8 @@ from hushline.config import SPLASH_SCREEN_DURATION_MS
 from hushline.db import db
 from hushline.model import OrganizationSetting
 
+BRAND_LOGO_PATH = f"{OrganizationSetting.BRAND_LOGO_PATH_STEM}-{'a' * 64}.png"
+SPLASH_LOGO_PATH = f"{OrganizationSetting.BRAND_SPLASH_LOGO_PATH_STEM}-{'b' * 64}.png"
 NATIVE_STARTUP_SPLASH_MEDIA = {
     "launch-1125x2436.png": (
         "(width: 375px) and (height: 812px) and (-webkit-device-pixel-ratio: 3) "
@@ -105,12 +107,12 @@ def test_first_load_splash_duration_uses_runtime_config(app: Flask, client: Flas
 
 
 def test_first_load_splash_uses_brand_logo_fallback(client: FlaskClient) -> None:
-    OrganizationSetting.upsert(OrganizationSetting.BRAND_LOGO, OrganizationSetting.BRAND_LOGO_VALUE)
+    OrganizationSetting.upsert(OrganizationSetting.BRAND_LOGO, BRAND_LOGO_PATH)
     db.session.commit()
 
     splash = _get_splash(client)
 
-    brand_logo_url = url_for("storage.public", path=OrganizationSetting.BRAND_LOGO_VALUE)
+    brand_logo_url = url_for("storage.public", path=BRAND_LOGO_PATH)
     logo = splash.find("img", src=brand_logo_url)
     assert logo
     assert logo.get("referrerpolicy") == "no-referrer"
@@ -118,41 +120,20 @@ def test_first_load_splash_uses_brand_logo_fallback(client: FlaskClient) -> None
 
 
 def test_first_load_splash_uses_custom_splash_logo(client: FlaskClient) -> None:
-    OrganizationSetting.upsert(OrganizationSetting.BRAND_LOGO, OrganizationSetting.BRAND_LOGO_VALUE)
-    OrganizationSetting.upsert(
-        OrganizationSetting.BRAND_SPLASH_LOGO, OrganizationSetting.BRAND_SPLASH_LOGO_VALUE
-    )
+    OrganizationSetting.upsert(OrganizationSetting.BRAND_LOGO, BRAND_LOGO_PATH)
+    OrganizationSetting.upsert(OrganizationSetting.BRAND_SPLASH_LOGO, SPLASH_LOGO_PATH)
     db.session.commit()
 
     splash = _get_splash(client)
 
-    splash_logo_url = url_for("storage.public", path=OrganizationSetting.BRAND_SPLASH_LOGO_VALUE)
+    splash_logo_url = url_for("storage.public", path=SPLASH_LOGO_PATH)
     logo = splash.find("img", src=splash_logo_url)
     assert logo
     assert logo.get("referrerpolicy") == "no-referrer"
-    assert not splash.find(
-        "img", src=url_for("storage.public", path=OrganizationSetting.BRAND_LOGO_VALUE)
-    )
+    assert not splash.find("img", src=url_for("storage.public", path=BRAND_LOGO_PATH))
     assert not splash.find("img", src=url_for("static", filename="img/splash-logo.png"))
 
 
-def test_first_load_splash_uses_versioned_custom_splash_logo(client: FlaskClient) -> None:
-    OrganizationSetting.upsert(
-        OrganizationSetting.BRAND_SPLASH_LOGO, OrganizationSetting.BRAND_SPLASH_LOGO_VALUE
-    )
-    OrganizationSetting.upsert(OrganizationSetting.BRAND_SPLASH_LOGO_CACHE_BUSTER, "12345")
-    db.session.commit()
-
-    splash = _get_splash(client)
-
-    splash_logo_url = url_for(
-        "storage.public",
-        path=OrganizationSetting.BRAND_SPLASH_LOGO_VALUE,
-        v="12345",
-    )
-    assert splash.find("img", src=splash_logo_url)
-
-
 def test_first_load_splash_defaults_to_disabled(client: FlaskClient) -> None:
     response = client.get(url_for("register"))
 
@@ -13,7 +13,15 @@ from flask import Flask
 from pytest_mock import MockFixture
 from werkzeug.exceptions import HTTPException, NotFound
 
-from hushline.storage import BlobStorage, FsDriver, S3Driver, StorageDriver, public_store
+from hushline.storage import (
+    IMMUTABLE_MAX_AGE,
+    BlobStorage,
+    FsDriver,
+    S3Driver,
+    StorageDriver,
+    content_hash,
+    public_store,
+)
 
 PATH = "data.bin"
 
@@ -71,6 +79,21 @@ class TestFsDriver:
         with app.test_request_context(), pytest.raises(NotFound):
             public_store.serve(PATH)
 
+    def test_content_addressed_put_and_serve(self, app: Flask) -> None:
+        data = b"waffles"
+        path = public_store.put_content_addressed("brand/logo", BytesIO(data), ".png")
+        public_store.put(PATH, BytesIO(data))
+        digest = content_hash(path)
+        assert path == f"brand/logo-{digest}.png"
+
+        with app.test_request_context():
+            resp = public_store.serve(path, etag=digest)
+            legacy = public_store.serve(PATH)
+        assert resp.cache_control.max_age == IMMUTABLE_MAX_AGE
+        assert resp.cache_control.immutable
+        assert resp.get_etag() == (digest, False)
+        assert not legacy.cache_control.immutable
+
 
 class TestS3Driver:
     @property
@@ -230,6 +253,34 @@ def test_s3_driver_private_serve_uses_presigned_url(mocker: MockFixture) -> None
     fake_client.generate_presigned_url.assert_called_once()
 
 
+def test_s3_driver_marks_content_addressed_puts_immutable(mocker: MockFixture) -> None:
+    app = MagicMock()
+    app.config = {
+        "BLOB_STORAGE_PUBLIC_S3_BUCKET": "bucket",
+        "BLOB_STORAGE_PUBLIC_S3_CDN_ENDPOINT": "https://cdn.example",
+        "BLOB_STORAGE_PUBLIC_S3_REGION": "us-east-1",
+        "BLOB_STORAGE_PUBLIC_S3_ENDPOINT": "https://s3.example",
+        "BLOB_STORAGE_PUBLIC_S3_ACCESS_KEY": "ak",
+        "BLOB_STORAGE_PUBLIC_S3_SECRET_KEY": "sk",
+    }
+    fake_client = MagicMock()
+    mocker.patch("hushline.storage.boto3.session.Session.client", return_value=fake_client)
+
+    driver = S3Driver(app, "PUBLIC", is_public=True)
+    driver.put("brand/logo.png", BytesIO(b"x"))
+    driver.put(f"brand/logo-{'0' * 64}.png", BytesIO(b"x"), immutable=True)
+
+    legacy, immutable = fake_client.put_object.call_args_list
+    assert "CacheControl" not in legacy.kwargs
+    assert immutable.kwargs["CacheControl"] == f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+
+
+def test_content_hash_only_matches_content_addressed_paths() -> None:
+    assert content_hash(f"brand/logo-{'a' * 64}.png") == "a" * 64
+    assert content_hash("brand/logo.png") is None
+    assert content_hash(f"brand/logo-{'A' * 64}.png") is None
+
+
 def test_blob_storage_init_rejects_unknown_driver() -> None:
     app = Flask(__name__)
     app.config["BLOB_STORAGE_DRIVER"] = "bad-driver"
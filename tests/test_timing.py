@@ -0,0 +1,137 @@
+import time
+
+import pytest
+from flask import Flask, url_for
+from flask.testing import FlaskClient
+from helpers import get_profile_submission_data
+from pytest_mock import MockFixture
+
+from hushline.db import db
+from hushline.model import NotificationRecipient, User
+from hushline.timing import (
+    HISTOGRAM_BUCKETS_MS,
+    LatencyHistograms,
+    latency_histograms,
+    server_timing_header,
+    span,
+)
+
+_SUBMISSION_SPANS = {"validate", "captcha", "encrypt", "db_write", "commit"}
+
+
+def _submit(client: FlaskClient, user: User) -> dict[str, str]:
+    username = user.primary_username.username
+    response = client.post(
+        url_for("profile", username=username),
+        data={
+            "field_0": "I prefer Signal.",
+            "field_1": "This is a secret test message.",
+            **get_profile_submission_data(client, username),
+        },
+    )
+    assert response.status_code == 302, response.text
+    return dict(response.headers)
+
+
+def test_latency_histograms_bucket_observations() -> None:
+    histograms = LatencyHistograms()
+    for duration_ms in (0.5, 3, 4, 40, HISTOGRAM_BUCKETS_MS[-1] + 1):
+        histograms.observe("commit", duration_ms)
+
+    (snapshot,) = histograms.snapshot()
+
+    assert snapshot.name == "commit"
+    assert snapshot.count == 5
+    assert snapshot.mean_ms == pytest.approx((0.5 + 3 + 4 + 40 + 10001) / 5)
+    assert snapshot.quantile_ms(0.2) == 1
+    assert snapshot.quantile_ms(0.5) == 5
+    assert snapshot.quantile_ms(0.8) == 50
+    assert snapshot.quantile_ms(0.99) is None
+
+
+def test_server_timing_header_lists_spans_in_order() -> None:
+    assert server_timing_header([("validate", 1.234), ("commit", 10)]) == (
+        "validate;dur=1.2, commit;dur=10.0"
+    )
+
+
+def test_span_does_nothing_when_timing_is_disabled(app: Flask) -> None:
+    with span("commit"):
+        pass
+
+    assert latency_histograms().snapshot() == []
+
+
+@pytest.mark.usefixtures("_authenticated_admin_user", "_pgp_user")
+def test_profile_submission_sends_server_timing_to_admins(
+    app: Flask, client: FlaskClient, user: User
+) -> None:
+    app.config["REQUEST_TIMING_ENABLED"] = True
+
+    headers = _submit(client, user)
+
+    spans = {entry.split(";")[0] for entry in headers["Server-Timing"].split(", ")}
+    assert spans >= _SUBMISSION_SPANS
+    assert "secret" not in headers["Server-Timing"]
+    assert {snapshot.name for snapshot in latency_histograms().snapshot()} == spans
+
+
+@pytest.mark.usefixtures("_pgp_user")
+def test_profile_submission_hides_server_timing_from_others(
+    app: Flask, client: FlaskClient, user: User
+) -> None:
+    app.config["REQUEST_TIMING_ENABLED"] = True
+
+    headers = _submit(client, user)
+
+    assert "Server-Timing" not in headers
+    snapshots = latency_histograms().snapshot()
+    assert {snapshot.name for snapshot in snapshots} >= _SUBMISSION_SPANS
+    assert all(snapshot.count == 1 for snapshot in snapshots)
+
+
+@pytest.mark.usefixtures("_pgp_user")
+def test_profile_submission_times_multi_recipient_sends_as_email_send(
+    app: Flask, client: FlaskClient, user: User, mocker: MockFixture
+) -> None:
+    app.config["REQUEST_TIMING_ENABLED"] = True
+    user.enable_email_notifications = True
+    user.email_include_message_content = True
+    user.email_encrypt_entire_body = False
+    user.email = "primary@example.com"
+    user.notification_recipients.append(
+        NotificationRecipient(position=1, enabled=True, email="secondary@example.com")
+    )
+    db.session.commit()
+    send = mocker.patch(
+        "hushline.routes.profile.send_email_to_user_recipients",
+        side_effect=lambda *_args: time.sleep(0.05),
+    )
+
+    _submit(client, user)
+
+    send.assert_called_once()
+    snapshots = {snapshot.name: snapshot for snapshot in latency_histograms().snapshot()}
+    assert snapshots["email_send"].mean_ms >= 50
+    # the client encrypted every field, so nothing was encrypted server-side
+    assert "notification_encrypt" not in snapshots
+
+
+@pytest.mark.usefixtures("_pgp_user")
+def test_profile_submission_records_nothing_by_default(client: FlaskClient, user: User) -> None:
+    headers = _submit(client, user)
+
+    assert "Server-Timing" not in headers
+    assert latency_histograms().snapshot() == []
+
+
+@pytest.mark.usefixtures("_authenticated_admin_user")
+def test_metrics_page_shows_request_timing(app: Flask, client: FlaskClient) -> None:
+    app.config["REQUEST_TIMING_ENABLED"] = True
+    latency_histograms().observe("commit", 3)
+
+    response = client.get(url_for("settings.metrics"))
+
+    assert response.status_code == 200
+    assert "Request Timing" in response.text
+    assert "commit" in response.text